@@ -0,0 +1,94 @@
+"""記憶體快取."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+D = TypeVar("D")
+
+
+class TTLCache(Generic[K, V]):
+    """有容量上限的 LRU 快取，每筆資料可設定到期時間.
+
+    只在單一 event loop 中使用，不做執行緒同步.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float | None = None) -> None:
+        """初始化.
+
+        Args:
+            maxsize: 最大筆數（超過時淘汰最久未使用的資料）
+            ttl_seconds: 預設存活時間，None 表示不過期
+        """
+        self._maxsize = maxsize
+        self._ttl_seconds = ttl_seconds
+        self._data: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: K, default: D | None = None) -> V | D | None:
+        """取得快取資料（過期或不存在時回傳 default）."""
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self._hits += 1
+                return value
+            del self._data[key]
+        self._misses += 1
+        return default
+
+    def set(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        """寫入快取資料.
+
+        Args:
+            key: 鍵
+            value: 值
+            ttl_seconds: 這筆資料的存活時間，None 表示使用預設值
+        """
+        if self._maxsize <= 0:
+            return
+        ttl = ttl_seconds if ttl_seconds is not None else self._ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """移除快取資料."""
+        self._data.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[K], bool]) -> int:
+        """移除所有鍵符合條件的快取資料.
+
+        Returns:
+            移除的筆數
+        """
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """清除所有快取資料."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        """目前筆數（含尚未清除的過期資料）."""
+        return len(self._data)
+
+    def stats(self) -> dict[str, float | int]:
+        """取得命中統計."""
+        total = self._hits + self._misses
+        return {
+            "size": len(self._data),
+            "maxsize": self._maxsize,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / total, 4) if total else 0.0,
+        }
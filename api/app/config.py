@@ -20,6 +20,7 @@ class RepositoryMode(str, Enum):
 
     MEMORY = "memory"  # In-Memory（開發/測試）
     FIRESTORE = "firestore"  # Firestore（Emulator 或真實）
+    SQLITE = "sqlite"  # SQLite 檔案（自架部署）
 
 
 class Settings(BaseSettings):
@@ -40,19 +41,76 @@ class Settings(BaseSettings):
     gcp_project_id: str = "local-dev"
     firestore_database: str = "(default)"
 
+    # Firestore client（gRPC 連線、deadline 與重試）
+    firestore_channel_pool_size: int = 1  # gRPC channel 數（每條 channel 一條 HTTP/2 連線）
+    firestore_keepalive_seconds: float = 30.0
+    firestore_keepalive_timeout_seconds: float = 10.0
+    firestore_timeout_seconds: float = 10.0  # 一般 RPC 每次嘗試的 deadline
+    firestore_stream_timeout_seconds: float = 60.0  # 串流查詢每次嘗試的 deadline
+    firestore_retry_initial_backoff_seconds: float = 0.1
+    firestore_retry_max_backoff_seconds: float = 2.0
+    firestore_retry_deadline_seconds: float = 20.0  # 含重試的總時限
+    # 重試預算（整個 client 共用的 token bucket），Firestore 持續異常時不放大流量
+    firestore_retry_budget: float = 20
+    firestore_retry_budget_per_second: float = 5
+
     # Repository 設定
     repository_mode: RepositoryMode = RepositoryMode.MEMORY
+    # user_profiles 投影不存在時退回 users 的欄位查詢（Auth Service 補建投影完成後可關閉）
+    firestore_user_profile_fallback: bool = True
+
+    # In-Memory 持久化（snapshot + write-ahead log）；空字串表示不持久化
+    memory_persistence_dir: str = ""
+    memory_fsync: Literal["always", "interval", "never"] = "interval"
+    memory_fsync_interval_seconds: float = 1.0
+    memory_snapshot_interval_seconds: float = 300.0  # 0 表示只在關閉時寫入 snapshot
+
+    # SQLite 設定（REPOSITORY_MODE=sqlite 時使用）
+    sqlite_path: str = "data/baby-weight.db"
+    sqlite_pool_size: int = 4  # 讀取連線數（寫入固定一條連線）
+    sqlite_busy_timeout_ms: int = 5000
+
+    # Repository 讀取快取（使用者、嬰兒、成員資格；0 表示停用）
+    repository_cache_size: int = 10000
+    repository_cache_ttl_seconds: float = 60.0  # 其他 instance 寫入時的最長延遲
+    weight_series_cache_size: int = 1000  # 快取完整體重序列的嬰兒數
+
+    # 身份對應快取（get_current_user 每次請求都會查詢）
+    identity_cache_size: int = 10000
+    identity_cache_ttl_seconds: float = 300.0
+    identity_cache_negative_ttl_seconds: float = 30.0  # 查無 link 時的快取時間
+
+    # 嬰兒刪除設定（背景 purge 子集合的最大寫入速率）
+    baby_purge_ops_per_second: int = 100
+    baby_purge_retry_initial_backoff_seconds: float = 5.0  # 失敗後重試等待（每次加倍）
+    baby_purge_retry_max_backoff_seconds: float = 600.0
+
+    # 對外 HTTP 連線池（JWKS 等對外呼叫共用）
+    http_max_connections: int = 50
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 60.0
+    http_timeout_seconds: float = 5.0
+    http_http2: bool = True  # 需要 httpx[http2]，未安裝時退回 HTTP/1.1
 
     # Auth 設定
     auth_mode: AuthMode = AuthMode.DEV
     auth_issuer: str = "http://localhost:8082"
     auth_audience: str = "baby-weight-api"
     auth_jwks_url: str = ""
+    auth_jwks_ttl_seconds: float = 300.0  # 背景重新載入 JWKS 的間隔
+    auth_jwks_min_refresh_interval_seconds: float = 10.0  # 未知 kid 觸發重新載入的最短間隔
+    auth_jwks_timeout_seconds: float = 5.0
+    auth_token_cache_size: int = 4096  # 已驗證 token 快取筆數（0 表示停用）
+    # 信任 Auth Service 簽入 token 的 baby_roles claim（移除成員最長要等到 token 過期才生效）
+    auth_trust_baby_roles_claim: bool = False
 
     # Dev 模式設定（AUTH_MODE=dev 時使用）
     dev_user_id: str = "dev-user"
     dev_internal_user_id: str = "01DEV000000000000000000000"
 
+    # /metrics 管理端點（Authorization: Bearer <token>）；空字串時停用（回傳 404）
+    metrics_token: str = ""
+
     # CORS
     cors_origins: list[str] = ["*"]
 
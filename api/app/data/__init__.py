@@ -7,6 +7,7 @@ from api.app.data.who_weight_for_age import (
     PERCENTILE_TABLES,
     PERCENTILE_Z_SCORES,
     LMSParams,
+    age_in_months,
     get_lms_params,
     get_percentile_weights,
     percentile_to_weight,
@@ -22,6 +23,7 @@ __all__ = [
     "PERCENTILE_TABLES",
     "PERCENTILE_Z_SCORES",
     "LMSParams",
+    "age_in_months",
     "get_lms_params",
     "get_percentile_weights",
     "percentile_to_weight",
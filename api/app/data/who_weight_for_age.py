@@ -19,6 +19,7 @@ Percentile = Φ(Z) * 100  (標準常態分佈累積機率)
 """
 
 from dataclasses import dataclass
+from datetime import date
 from typing import Literal
 
 
@@ -212,6 +213,15 @@ def get_lms_params(gender: Literal["male", "female"], age_months: int) -> LMSPar
     return data[age_months]
 
 
+def age_in_months(birth_date: date, measure_date: date) -> int:
+    """計算月齡.
+
+    以 30.44 天為一個月（365.25 / 12），四捨五入，
+    讓接近滿月的嬰兒使用正確的月齡標準.
+    """
+    return round((measure_date - birth_date).days / 30.44)
+
+
 def weight_to_zscore(
     weight_kg: float, gender: Literal["male", "female"], age_months: int
 ) -> float | None:
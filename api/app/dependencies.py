@@ -1,12 +1,17 @@
 """依賴注入."""
 
+import asyncio
+import secrets
+from datetime import UTC, datetime
 from typing import Annotated
 
+import httpx
 from fastapi import Depends, HTTPException, Request, status
 from jose.exceptions import JWTError
 
 from api.app.config import Settings, get_settings
-from api.app.models import CurrentUser, Membership
+from api.app.loaders import RequestLoaders
+from api.app.models import CurrentUser, MemberRole, Membership
 from api.app.repositories import (
     BabyRepository,
     IdentityLinkRepository,
@@ -15,6 +20,7 @@ from api.app.repositories import (
     WeightRepository,
 )
 from api.app.services.jwt import JWTVerificationService
+from api.app.services.purge import BabyPurgeService
 
 
 def get_identity_link_repository(request: Request) -> IdentityLinkRepository:
@@ -42,11 +48,46 @@ def get_weight_repository(request: Request) -> WeightRepository:
     return request.app.state.repos.weights  # type: ignore[no-any-return]
 
 
-def get_jwt_verification_service(
-    settings: Annotated[Settings, Depends(get_settings)],
-) -> JWTVerificationService:
+def get_loaders(
+    baby_repo: Annotated[BabyRepository, Depends(get_baby_repository)],
+    user_repo: Annotated[UserRepository, Depends(get_user_repository)],
+    weight_repo: Annotated[WeightRepository, Depends(get_weight_repository)],
+) -> RequestLoaders:
+    """取得 request 範圍的資料載入器（FastAPI 在同一請求內只建立一次）."""
+    return RequestLoaders(baby_repo, user_repo, weight_repo)
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """取得共用的對外 HTTP client."""
+    return request.app.state.http_client  # type: ignore[no-any-return]
+
+
+def get_baby_purge_service(request: Request) -> BabyPurgeService:
+    """取得嬰兒背景刪除服務."""
+    return request.app.state.baby_purger  # type: ignore[no-any-return]
+
+
+def get_jwt_verification_service(request: Request) -> JWTVerificationService:
     """取得 JWT 驗證服務."""
-    return JWTVerificationService(settings)
+    return request.app.state.jwt_verifier  # type: ignore[no-any-return]
+
+
+def require_metrics_token(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> None:
+    """驗證 /metrics 的管理用 token（未設定 METRICS_TOKEN 時不提供 /metrics）."""
+    if not settings.metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    auth_header = request.headers.get("Authorization", "")
+    if not secrets.compare_digest(
+        auth_header.encode(), f"Bearer {settings.metrics_token}".encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
 
 async def get_current_user(
@@ -129,11 +170,19 @@ async def get_current_user(
         # 這表示使用者尚未在系統中註冊
         internal_user_id = None
 
+    # Auth Service 可選擇把嬰兒角色簽入 token，信任時可省去成員資格查詢
+    baby_roles = payload.get("baby_roles") if settings.auth_trust_baby_roles_claim else None
+    issued_at = payload.get("iat")
+
     return CurrentUser(
         provider_iss=provider_iss,
         provider_sub=provider_sub,
         internal_user_id=internal_user_id,
         email=email,
+        baby_roles=baby_roles if isinstance(baby_roles, dict) else None,
+        issued_at=datetime.fromtimestamp(issued_at, UTC)
+        if isinstance(issued_at, int | float)
+        else None,
     )
 
 
@@ -141,20 +190,46 @@ async def require_baby_membership(
     baby_id: str,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     membership_repo: Annotated[MembershipRepository, Depends(get_membership_repository)],
+    loaders: Annotated[RequestLoaders, Depends(get_loaders)],
 ) -> Membership:
-    """要求嬰兒成員資格（任意角色）."""
+    """要求嬰兒成員資格（任意角色）.
+
+    已標記刪除的嬰兒在背景 purge 完成前仍留有成員資料（token 中也可能仍有角色），
+    因此另外確認嬰兒存在；嬰兒經由 loaders 讀取，路由之後讀取同一嬰兒不會再查詢.
+    """
     if not current_user.internal_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User not registered",
         )
 
-    membership = await membership_repo.get(baby_id, current_user.internal_user_id)
+    # token 中已有角色：不查詢（claim 裡沒有的嬰兒仍照常查詢，涵蓋簽發後才加入的成員）
+    role = (current_user.baby_roles or {}).get(baby_id)
+    if role in {r.value for r in MemberRole}:
+        membership: Membership | None = Membership(
+            baby_id=baby_id,
+            internal_user_id=current_user.internal_user_id,
+            role=MemberRole(role),
+            # claim 不含加入時間，以 token 簽發時間代替
+            joined_at=current_user.issued_at or datetime.now(UTC),
+        )
+        baby = await loaders.babies.load(baby_id)
+    else:
+        membership, baby = await asyncio.gather(
+            membership_repo.get(baby_id, current_user.internal_user_id),
+            loaders.babies.load(baby_id),
+        )
+
     if not membership:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No access to this baby",
         )
+    if baby is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Baby not found",
+        )
 
     return membership
 
@@ -163,6 +238,7 @@ async def require_baby_write_access(
     baby_id: str,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     membership_repo: Annotated[MembershipRepository, Depends(get_membership_repository)],
+    loaders: Annotated[RequestLoaders, Depends(get_loaders)],
 ) -> Membership:
     """要求嬰兒寫入權限（owner 或 editor）."""
 
@@ -170,6 +246,7 @@ async def require_baby_write_access(
         baby_id=baby_id,
         current_user=current_user,
         membership_repo=membership_repo,
+        loaders=loaders,
     )
 
     if not membership.can_write():
@@ -187,5 +264,8 @@ UserRepoDep = Annotated[UserRepository, Depends(get_user_repository)]
 BabyRepoDep = Annotated[BabyRepository, Depends(get_baby_repository)]
 MembershipRepoDep = Annotated[MembershipRepository, Depends(get_membership_repository)]
 WeightRepoDep = Annotated[WeightRepository, Depends(get_weight_repository)]
+HttpClientDep = Annotated[httpx.AsyncClient, Depends(get_http_client)]
+LoadersDep = Annotated[RequestLoaders, Depends(get_loaders)]
+BabyPurgeServiceDep = Annotated[BabyPurgeService, Depends(get_baby_purge_service)]
 CurrentUserDep = Annotated[CurrentUser, Depends(get_current_user)]
 SettingsDep = Annotated[Settings, Depends(get_settings)]
@@ -0,0 +1,58 @@
+"""對外 HTTP 連線.
+
+整個 app 共用一個有連線池的 httpx.AsyncClient（lifespan 建立與關閉），
+對外呼叫重複使用既有連線，不必每次重新建立 TCP / TLS 連線.
+"""
+
+import importlib.util
+import logging
+
+import httpx
+
+from api.app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """建立共用的 HTTP client.
+
+    HTTP/2 需要 h2 套件（httpx[http2]），未安裝時退回 HTTP/1.1.
+    """
+    http2 = settings.http_http2 and importlib.util.find_spec("h2") is not None
+    if settings.http_http2 and not http2:
+        logger.warning("h2 is not installed, outbound HTTP client falls back to HTTP/1.1")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=settings.http_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+    )
+
+
+def http_pool_stats(client: httpx.AsyncClient) -> dict[str, int]:
+    """取得連線池統計（用於調整連線數上限）.
+
+    httpx 沒有公開連線池的統計介面，這裡讀取預設 transport 底下的 httpcore 連線池；
+    httpx / httpcore 內部結構改變時回傳空 dict，不影響 /metrics 其他項目.
+    """
+    try:
+        pool = client._transport._pool  # type: ignore[attr-defined]
+        connections = list(pool.connections)
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            "connections": len(connections),
+            "idle": idle,
+            "active": len(connections) - idle,
+            "http2": sum(1 for conn in connections if "HTTP/2" in conn.info()),
+            "queued_requests": sum(1 for request in pool._requests if request.is_queued()),
+            "max_connections": pool._max_connections,
+            "max_keepalive_connections": pool._max_keepalive_connections,
+        }
+    except (AttributeError, TypeError) as e:
+        logger.debug(f"HTTP pool stats unavailable: {e!r}")
+        return {}
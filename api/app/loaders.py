@@ -0,0 +1,99 @@
+"""Request 範圍的資料載入器.
+
+同一個請求內重複讀取的資料只讀一次，同一輪 event loop 中併發的讀取合併成一次批次查詢.
+每個請求建立新的 RequestLoaders（見 dependencies.get_loaders），不跨請求共用資料.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Mapping
+from typing import Generic, TypeVar
+
+from api.app.models import Baby, User, Weight
+from api.app.repositories import BabyRepository, UserRepository, WeightRepository
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """依 key 記憶並批次合併讀取.
+
+    同一輪 event loop 中呼叫的 load() 會先排隊，下一輪由單一 task 呼叫 batch_load 一次取得.
+    """
+
+    def __init__(self, batch_load: Callable[[list[K]], Awaitable[Mapping[K, V]]]) -> None:
+        """初始化.
+
+        Args:
+            batch_load: 批次讀取函式，回傳 key -> value（查無資料的 key 不需出現）
+        """
+        self._batch_load = batch_load
+        self._futures: dict[K, asyncio.Future[V | None]] = {}
+        self._queue: list[tuple[K, asyncio.Future[V | None]]] = []
+        self._dispatch_task: asyncio.Task[None] | None = None
+        self.batches = 0  # 實際呼叫 batch_load 的次數
+
+    async def load(self, key: K) -> V | None:
+        """讀取單筆資料（查無資料時回傳 None）."""
+        future = self._futures.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[key] = future
+            self._queue.append((key, future))
+            if self._dispatch_task is None:
+                self._dispatch_task = asyncio.create_task(self._dispatch())
+        return await future
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        """讀取多筆資料（依 keys 順序回傳）."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V | None) -> None:
+        """寫入已知的資料（已有資料時不覆蓋）."""
+        if key not in self._futures:
+            future: asyncio.Future[V | None] = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def clear(self, key: K) -> None:
+        """移除記憶的資料（同一請求中寫入後使用）."""
+        self._futures.pop(key, None)
+
+    async def _dispatch(self) -> None:
+        """以一次 batch_load 處理目前排隊的 key.
+
+        佇列中保存排入時的 future：批次進行中（或開始前）clear(key) 只影響之後的 load，
+        已在等待的呼叫端仍由這一批的結果喚醒.
+        """
+        pending, self._queue = self._queue, []
+        self._dispatch_task = None
+        self.batches += 1
+        try:
+            results = await self._batch_load(list(dict.fromkeys(key for key, _ in pending)))
+        except Exception as e:
+            for key, future in pending:
+                # 失敗的 key 不記憶，之後可重試（clear 後重新載入的 future 不受影響）
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in pending:
+            if not future.done():
+                future.set_result(results.get(key))
+
+
+class RequestLoaders:
+    """單一請求使用的資料載入器."""
+
+    def __init__(
+        self,
+        baby_repo: BabyRepository,
+        user_repo: UserRepository,
+        weight_repo: WeightRepository,
+    ) -> None:
+        """初始化."""
+        self.babies = DataLoader[str, Baby](baby_repo.get_many)
+        self.users = DataLoader[str, User](user_repo.get_many)
+        # key 為 (baby_id, weight_id)
+        self.weights = DataLoader[tuple[str, str], Weight](weight_repo.get_many)
@@ -10,9 +10,22 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.app.config import get_settings
-from api.app.repositories import FirestoreRepositories, InMemoryRepositories
+from api.app.config import RepositoryMode, get_settings
+from api.app.firestore_client import create_firestore_client, create_sync_firestore_client
+from api.app.http import create_http_client
+from api.app.repositories import (
+    CachingRepositories,
+    FirestoreRepositories,
+    InMemoryRepositories,
+    MemoryPersistence,
+    SqliteRepositories,
+)
 from api.app.routers import babies, health, weights
+from api.app.services import (
+    BabyPurgeService,
+    JWKSKeyManager,
+    JWTVerificationService,
+)
 
 # 設定 logging
 logging.basicConfig(
@@ -30,37 +43,130 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(f"Auth mode: {settings.auth_mode.value}")
     logger.info(f"Repository mode: {settings.repository_mode.value}")
 
+    memory_persistence: MemoryPersistence | None = None
+
     # 檢查是否已經有設定好的 repos（測試用）
     existing_repos = getattr(app.state, "repos", None)
+    # 前一次啟動留下的快取包裝：改用底層的 repositories 重新包裝
+    existing_repos = getattr(existing_repos, "inner", existing_repos)
     if existing_repos is not None:
         logger.info("Using pre-configured repositories (test mode)")
-        repos: InMemoryRepositories | FirestoreRepositories = existing_repos
+        repos: InMemoryRepositories | FirestoreRepositories | SqliteRepositories = existing_repos
     elif settings.use_firestore:
         logger.info(
             f"Using Firestore: project={settings.gcp_project_id}, "
             f"database={settings.firestore_database}"
         )
+        firestore_client = create_firestore_client(
+            settings.gcp_project_id,
+            settings.firestore_database,
+            channel_pool_size=settings.firestore_channel_pool_size,
+            keepalive_seconds=settings.firestore_keepalive_seconds,
+            keepalive_timeout_seconds=settings.firestore_keepalive_timeout_seconds,
+            timeout_seconds=settings.firestore_timeout_seconds,
+            stream_timeout_seconds=settings.firestore_stream_timeout_seconds,
+            retry_initial_backoff_seconds=settings.firestore_retry_initial_backoff_seconds,
+            retry_max_backoff_seconds=settings.firestore_retry_max_backoff_seconds,
+            retry_deadline_seconds=settings.firestore_retry_deadline_seconds,
+            retry_budget=settings.firestore_retry_budget,
+            retry_budget_per_second=settings.firestore_retry_budget_per_second,
+        )
+        # purge（BulkWriter）使用的同步 client：同一組 deadline 與重試設定，共用重試預算
+        purge_client = create_sync_firestore_client(
+            settings.gcp_project_id,
+            settings.firestore_database,
+            timeout_seconds=settings.firestore_timeout_seconds,
+            stream_timeout_seconds=settings.firestore_stream_timeout_seconds,
+            retry_initial_backoff_seconds=settings.firestore_retry_initial_backoff_seconds,
+            retry_max_backoff_seconds=settings.firestore_retry_max_backoff_seconds,
+            retry_deadline_seconds=settings.firestore_retry_deadline_seconds,
+            retry_budget=firestore_client.retry_budget,
+        )
         repos = FirestoreRepositories(
-            project_id=settings.gcp_project_id,
-            database=settings.firestore_database,
+            firestore_client,
+            purge_client,
+            purge_ops_per_second=settings.baby_purge_ops_per_second,
+            user_profile_fallback=settings.firestore_user_profile_fallback,
+        )
+    elif settings.repository_mode == RepositoryMode.SQLITE:
+        logger.info(f"Using SQLite: path={settings.sqlite_path}")
+        repos = SqliteRepositories(
+            settings.sqlite_path,
+            pool_size=settings.sqlite_pool_size,
+            busy_timeout_ms=settings.sqlite_busy_timeout_ms,
         )
     else:
         logger.info("Using In-Memory repositories")
         repos = InMemoryRepositories()
-        # In-Memory + Dev 模式：初始化測試資料
-        if settings.is_dev_auth:
+        if settings.memory_persistence_dir:
+            memory_persistence = MemoryPersistence(
+                repos,
+                settings.memory_persistence_dir,
+                fsync=settings.memory_fsync,
+                fsync_interval_seconds=settings.memory_fsync_interval_seconds,
+                snapshot_interval_seconds=settings.memory_snapshot_interval_seconds,
+            )
+            await memory_persistence.load()
+            await memory_persistence.start()
+        # In-Memory + Dev 模式：初始化測試資料（已從 snapshot 載入資料時略過）
+        if settings.is_dev_auth and repos.is_empty():
             logger.info("Initializing dev data...")
             await repos.init_dev_data()
             logger.info("Dev data initialized")
 
-    app.state.repos = repos
+    # 讀取加上 instance 內快取（身份對應、使用者、嬰兒、成員資格、體重序列）
+    cached_repos = CachingRepositories(
+        repos,
+        maxsize=settings.repository_cache_size,
+        ttl_seconds=settings.repository_cache_ttl_seconds,
+        identity_maxsize=settings.identity_cache_size,
+        identity_ttl_seconds=settings.identity_cache_ttl_seconds,
+        identity_negative_ttl_seconds=settings.identity_cache_negative_ttl_seconds,
+        series_maxsize=settings.weight_series_cache_size,
+    )
+
+    app.state.repos = cached_repos
+    app.state.memory_persistence = memory_persistence
+
+    # 背景刪除已標記刪除的嬰兒
+    baby_purger = BabyPurgeService(
+        cached_repos.babies,
+        retry_initial_backoff_seconds=settings.baby_purge_retry_initial_backoff_seconds,
+        retry_max_backoff_seconds=settings.baby_purge_retry_max_backoff_seconds,
+    )
+    await baby_purger.start()
+    app.state.baby_purger = baby_purger
+
+    # 對外 HTTP 呼叫共用的連線池
+    http_client = create_http_client(settings)
+    app.state.http_client = http_client
+
+    # JWT 驗證（公鑰快取在 app 層級共用）
+    jwks_keys = JWKSKeyManager(
+        jwks_url=settings.effective_jwks_url,
+        ttl_seconds=settings.auth_jwks_ttl_seconds,
+        min_refresh_interval_seconds=settings.auth_jwks_min_refresh_interval_seconds,
+        timeout_seconds=settings.auth_jwks_timeout_seconds,
+        http_client=http_client,
+    )
+    if not settings.is_dev_auth:
+        await jwks_keys.start()
+    app.state.jwks_keys = jwks_keys
+    app.state.jwt_verifier = JWTVerificationService(settings, jwks_keys)
 
     yield
 
     # Shutdown
     logger.info("Shutting down API service")
+    await jwks_keys.stop()
+    await http_client.aclose()
+    await baby_purger.stop()
     if settings.use_firestore and isinstance(repos, FirestoreRepositories):
         await repos.close()
+    if existing_repos is None and isinstance(repos, SqliteRepositories):
+        await repos.close()
+    if memory_persistence is not None:
+        await memory_persistence.close()
 
 
 app = FastAPI(
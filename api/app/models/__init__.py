@@ -5,6 +5,7 @@ from api.app.models.baby import (
     BabyCreate,
     BabyCreateResponse,
     BabyResponse,
+    BabyStats,
     BabyUpdate,
     Gender,
     MemberAdd,
@@ -25,6 +26,7 @@ from api.app.models.weight import (
     WeightAssessmentBrief,
     WeightCreate,
     WeightResponse,
+    WeightStats,
     WeightUpdate,
 )
 
@@ -42,6 +44,7 @@ __all__ = [
     "BabyUpdate",
     "BabyResponse",
     "BabyCreateResponse",
+    "BabyStats",
     "Gender",
     "MemberAdd",
     "MemberResponse",
@@ -50,6 +53,7 @@ __all__ = [
     "WeightCreate",
     "WeightUpdate",
     "WeightResponse",
+    "WeightStats",
     "WeightAssessment",
     "WeightAssessmentBrief",
     "ReferenceRange",
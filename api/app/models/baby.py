@@ -5,6 +5,8 @@ from enum import Enum
 
 from pydantic import BaseModel, Field
 
+from api.app.models.weight import WeightStats
+
 
 class Gender(str, Enum):
     """性別."""
@@ -59,6 +61,13 @@ class BabyCreateResponse(BaseModel):
     baby_id: str = Field(..., description="嬰兒 ID")
 
 
+class BabyStats(BaseModel):
+    """嬰兒統計."""
+
+    member_count: int = Field(..., description="成員數")
+    weights: WeightStats = Field(..., description="體重紀錄統計")
+
+
 class MemberAdd(BaseModel):
     """新增成員請求."""
 
@@ -87,3 +87,7 @@ class CurrentUser(BaseModel):
     provider_sub: str = Field(..., description="IdP Subject (from JWT sub)")
     internal_user_id: str | None = Field(None, description="內部使用者 ID（可能尚未建立）")
     email: str | None = Field(None, description="Email (from JWT)")
+    baby_roles: dict[str, str] | None = Field(
+        default=None, description="嬰兒角色 (from JWT baby_roles，僅在信任該 claim 時設定)"
+    )
+    issued_at: datetime | None = Field(default=None, description="Token 簽發時間 (from JWT iat)")
@@ -48,6 +48,14 @@ class WeightResponse(Weight):
     assessment: "WeightAssessmentBrief | None" = Field(None, description="成長評估")
 
 
+class WeightStats(BaseModel):
+    """體重紀錄統計（由 Repository 的聚合查詢計算）."""
+
+    count: int = Field(..., description="紀錄筆數")
+    sum_g: int = Field(..., description="體重總和（公克）")
+    avg_g: float | None = Field(None, description="平均體重（公克，沒有紀錄時為 null）")
+
+
 class WeightAssessmentBrief(BaseModel):
     """簡易成長評估（用於列表）."""
 
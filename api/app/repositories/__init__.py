@@ -4,8 +4,18 @@ from api.app.repositories.base import (
     BabyRepository,
     IdentityLinkRepository,
     MembershipRepository,
+    Repositories,
     UserRepository,
     WeightRepository,
+    identity_link_id,
+)
+from api.app.repositories.caching import (
+    CachingBabyRepository,
+    CachingIdentityLinkRepository,
+    CachingMembershipRepository,
+    CachingRepositories,
+    CachingUserRepository,
+    CachingWeightRepository,
 )
 from api.app.repositories.firestore import (
     FirestoreBabyRepository,
@@ -23,6 +33,16 @@ from api.app.repositories.memory import (
     InMemoryUserRepository,
     InMemoryWeightRepository,
 )
+from api.app.repositories.persistence import MemoryPersistence
+from api.app.repositories.series import WeightSeries
+from api.app.repositories.sqlite import (
+    SqliteBabyRepository,
+    SqliteIdentityLinkRepository,
+    SqliteMembershipRepository,
+    SqliteRepositories,
+    SqliteUserRepository,
+    SqliteWeightRepository,
+)
 
 __all__ = [
     # Base interfaces
@@ -31,6 +51,8 @@ __all__ = [
     "BabyRepository",
     "MembershipRepository",
     "WeightRepository",
+    "Repositories",
+    "identity_link_id",
     # In-Memory implementations
     "InMemoryIdentityLinkRepository",
     "InMemoryUserRepository",
@@ -38,6 +60,7 @@ __all__ = [
     "InMemoryMembershipRepository",
     "InMemoryWeightRepository",
     "InMemoryRepositories",
+    "MemoryPersistence",
     # Firestore implementations
     "FirestoreIdentityLinkRepository",
     "FirestoreUserRepository",
@@ -45,4 +68,19 @@ __all__ = [
     "FirestoreMembershipRepository",
     "FirestoreWeightRepository",
     "FirestoreRepositories",
+    # SQLite implementations
+    "SqliteIdentityLinkRepository",
+    "SqliteUserRepository",
+    "SqliteBabyRepository",
+    "SqliteMembershipRepository",
+    "SqliteWeightRepository",
+    "SqliteRepositories",
+    # Caching wrappers
+    "CachingIdentityLinkRepository",
+    "CachingUserRepository",
+    "CachingWeightRepository",
+    "CachingBabyRepository",
+    "CachingMembershipRepository",
+    "CachingRepositories",
+    "WeightSeries",
 ]
@@ -1,8 +1,10 @@
 """Repository 基礎介面."""
 
+import hashlib
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from datetime import datetime
-from typing import Generic, TypeVar
+from typing import Generic, Protocol, TypeVar
 
 from api.app.models import (
     Baby,
@@ -15,12 +17,22 @@ from api.app.models import (
     UserCreate,
     Weight,
     WeightCreate,
+    WeightStats,
     WeightUpdate,
 )
+from api.app.repositories.series import weight_zscore
 
 T = TypeVar("T")
 
 
+def identity_link_id(provider_iss: str, provider_sub: str) -> str:
+    """由 IdP 身份計算固定的 link ID.
+
+    同一組 (iss, sub) 永遠對應同一個 ID，查詢時可直接以 key 讀取.
+    """
+    return hashlib.sha256(f"{provider_iss}\n{provider_sub}".encode()).hexdigest()
+
+
 class BaseRepository(ABC, Generic[T]):
     """Repository 基礎類."""
 
@@ -74,6 +86,11 @@ class UserRepository(ABC):
         """取得使用者."""
         pass
 
+    @abstractmethod
+    async def get_many(self, internal_user_ids: list[str]) -> dict[str, User]:
+        """批次取得使用者（查無資料的 ID 不出現在結果中）."""
+        pass
+
     @abstractmethod
     async def get_by_email(self, email: str) -> User | None:
         """透過 Email 取得使用者."""
@@ -93,6 +110,11 @@ class BabyRepository(ABC):
         """取得嬰兒."""
         pass
 
+    @abstractmethod
+    async def get_many(self, baby_ids: list[str]) -> dict[str, Baby]:
+        """批次取得嬰兒（查無資料或已標記刪除的 ID 不出現在結果中）."""
+        pass
+
     @abstractmethod
     async def create(self, data: BabyCreate) -> Baby:
         """建立嬰兒."""
@@ -105,7 +127,33 @@ class BabyRepository(ABC):
 
     @abstractmethod
     async def delete(self, baby_id: str) -> bool:
-        """刪除嬰兒."""
+        """標記刪除嬰兒.
+
+        只標記 baby 為已刪除（之後 get / list 不再回傳），
+        子集合（members、weights）由 purge 在背景清除.
+        """
+        pass
+
+    @abstractmethod
+    async def purge(
+        self,
+        baby_id: str,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """實際刪除已標記刪除的嬰兒及其所有子集合.
+
+        Args:
+            baby_id: 嬰兒 ID
+            on_progress: 進度回呼，參數為目前已刪除的 document 數
+
+        Returns:
+            刪除的 document 總數
+        """
+        pass
+
+    @abstractmethod
+    async def list_deleted_ids(self) -> list[str]:
+        """取得已標記刪除但尚未 purge 的嬰兒 ID."""
         pass
 
     @abstractmethod
@@ -113,6 +161,16 @@ class BabyRepository(ABC):
         """取得使用者可存取的嬰兒列表."""
         pass
 
+    @abstractmethod
+    async def list_with_membership_by_user(
+        self, internal_user_id: str
+    ) -> list[tuple[Baby, Membership]]:
+        """取得使用者可存取的嬰兒列表（含該使用者的成員資格）.
+
+        一次查詢完成嬰兒與角色的對應，呼叫端不需再查 memberships.
+        """
+        pass
+
 
 class MembershipRepository(ABC):
     """成員 Repository."""
@@ -142,6 +200,11 @@ class MembershipRepository(ABC):
         """刪除成員資格."""
         pass
 
+    @abstractmethod
+    async def count_by_baby(self, baby_id: str) -> int:
+        """取得嬰兒的成員數（不讀取成員資料）."""
+        pass
+
 
 class WeightRepository(ABC):
     """體重 Repository."""
@@ -151,6 +214,18 @@ class WeightRepository(ABC):
         """取得體重紀錄."""
         pass
 
+    @abstractmethod
+    async def get_many(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], Weight]:
+        """批次取得體重紀錄.
+
+        Args:
+            keys: (baby_id, weight_id) 列表，可跨嬰兒
+
+        Returns:
+            (baby_id, weight_id) -> Weight（查無資料的 key 不出現在結果中）
+        """
+        pass
+
     @abstractmethod
     async def create(self, baby_id: str, data: WeightCreate, created_by: str) -> Weight:
         """建立體重紀錄."""
@@ -175,3 +250,65 @@ class WeightRepository(ABC):
     ) -> list[Weight]:
         """取得嬰兒的體重紀錄."""
         pass
+
+    @abstractmethod
+    async def count(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> int:
+        """取得嬰兒的體重紀錄筆數（不讀取紀錄內容）."""
+        pass
+
+    @abstractmethod
+    async def stats(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> WeightStats:
+        """取得嬰兒體重紀錄的筆數、總和與平均（單次聚合查詢）."""
+        pass
+
+    async def list_with_zscores(
+        self,
+        baby: Baby,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> list[tuple[Weight, float | None]]:
+        """取得嬰兒的體重紀錄與 weight-for-age Z-score（超出數據範圍為 None）.
+
+        預設逐筆計算；快取實作直接使用預先計算好的 Z-score.
+        """
+        weights = await self.list_by_baby(baby.baby_id, from_date, to_date)
+        return [(weight, weight_zscore(weight, baby)) for weight in weights]
+
+
+class Repositories(Protocol):
+    """一組完整的 Repositories（InMemoryRepositories、FirestoreRepositories 等）."""
+
+    @property
+    def identity_links(self) -> IdentityLinkRepository:
+        """身份對應 Repository."""
+        ...
+
+    @property
+    def users(self) -> UserRepository:
+        """使用者 Repository."""
+        ...
+
+    @property
+    def babies(self) -> BabyRepository:
+        """嬰兒 Repository."""
+        ...
+
+    @property
+    def memberships(self) -> MembershipRepository:
+        """成員 Repository."""
+        ...
+
+    @property
+    def weights(self) -> WeightRepository:
+        """體重 Repository."""
+        ...
@@ -0,0 +1,657 @@
+"""快取 Repository 實作.
+
+包裝其他 Repository 實作，在 instance 內快取讀取結果，
+並在經過同一個包裝的寫入時主動失效.
+其他 instance 的寫入不會通知本 instance，由 TTL 決定最長延遲.
+"""
+
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from typing import Generic, TypeVar
+
+from api.app.cache import TTLCache
+from api.app.models import (
+    Baby,
+    BabyCreate,
+    BabyUpdate,
+    IdentityLink,
+    MemberRole,
+    Membership,
+    User,
+    UserCreate,
+    Weight,
+    WeightCreate,
+    WeightStats,
+    WeightUpdate,
+)
+from api.app.repositories.base import (
+    BabyRepository,
+    IdentityLinkRepository,
+    MembershipRepository,
+    Repositories,
+    UserRepository,
+    WeightRepository,
+)
+from api.app.repositories.series import WeightSeries
+
+# 區分「快取了 None（查無資料）」與「沒有快取」
+_NOT_CACHED = object()
+
+K = TypeVar("K", bound=Hashable)
+
+
+class _WriteGuard(Generic[K]):
+    """避免與寫入重疊的讀取把舊資料寫回快取.
+
+    讀取開始時記下時鐘；寫入進行中標記該 key，結束時記錄當下時鐘.
+    讀取完成時，該 key 仍在寫入、或在讀取開始後完成寫入，結果就不寫入快取.
+    寫入本身的結果只在期間沒有其他寫入重疊時寫入快取.
+    沒有進行中的讀寫時清空寫入紀錄，不會無限成長.
+    """
+
+    def __init__(self) -> None:
+        self._clock = 0
+        self._reads = 0
+        self._writing: dict[K, int] = {}  # key -> 進行中的寫入數
+        self._written: dict[K, int] = {}  # key -> 最後一次寫入完成時的時鐘
+
+    @contextmanager
+    def reading(self) -> Iterator[Callable[[K], bool]]:
+        """標記讀取進行中；產生判斷 key 的讀取結果是否可寫入快取的函式."""
+        started = self._clock
+        self._reads += 1
+
+        def fresh(key: K) -> bool:
+            return key not in self._writing and self._written.get(key, -1) <= started
+
+        try:
+            yield fresh
+        finally:
+            self._reads -= 1
+            self._forget()
+
+    @contextmanager
+    def writing(self, key: K) -> Iterator[Callable[[], bool]]:
+        """標記寫入進行中（從呼叫底層前到寫入完成）；產生判斷是否沒有其他寫入重疊的函式."""
+        started = self._clock
+        self._writing[key] = self._writing.get(key, 0) + 1
+
+        def alone() -> bool:
+            return self._writing[key] == 1 and self._written.get(key, -1) <= started
+
+        try:
+            yield alone
+        finally:
+            self._writing[key] -= 1
+            if not self._writing[key]:
+                del self._writing[key]
+            self._clock += 1
+            self._written[key] = self._clock
+            self._forget()
+
+    def _forget(self) -> None:
+        if not self._reads and not self._writing:
+            self._written.clear()
+
+
+class CachingIdentityLinkRepository(IdentityLinkRepository):
+    """快取身份對應查詢.
+
+    查無資料的結果也會快取（negative caching），但存活時間較短，
+    讓其他 instance 建立的 link 能在短時間內生效.
+    """
+
+    def __init__(
+        self,
+        inner: IdentityLinkRepository,
+        maxsize: int = 10000,
+        ttl_seconds: float = 300.0,
+        negative_ttl_seconds: float = 30.0,
+    ) -> None:
+        """初始化.
+
+        Args:
+            inner: 實際存取資料的 Repository
+            maxsize: 最大快取筆數
+            ttl_seconds: 查到 link 時的快取時間
+            negative_ttl_seconds: 查無 link 時的快取時間
+        """
+        self._inner = inner
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._cache: TTLCache[tuple[str, str], IdentityLink | None] = TTLCache(
+            maxsize=maxsize, ttl_seconds=ttl_seconds
+        )
+
+    async def find_by_provider(self, provider_iss: str, provider_sub: str) -> IdentityLink | None:
+        """透過 IdP 身份查詢."""
+        key = (provider_iss, provider_sub)
+        cached = self._cache.get(key, _NOT_CACHED)
+        if cached is not _NOT_CACHED:
+            return cached  # type: ignore[return-value]
+
+        link = await self._inner.find_by_provider(provider_iss, provider_sub)
+        if link is None:
+            self._cache.set(key, None, ttl_seconds=self._negative_ttl_seconds)
+        else:
+            self._cache.set(key, link)
+        return link
+
+    async def create(
+        self, provider_iss: str, provider_sub: str, internal_user_id: str
+    ) -> IdentityLink:
+        """建立身份對應（同時取代快取中的結果）."""
+        key = (provider_iss, provider_sub)
+        self._cache.pop(key)
+        link = await self._inner.create(provider_iss, provider_sub, internal_user_id)
+        self._cache.set(key, link)
+        return link
+
+    def cache_stats(self) -> dict[str, float | int]:
+        """取得快取命中統計."""
+        return self._cache.stats()
+
+
+class CachingUserRepository(UserRepository):
+    """快取使用者查詢（以 internal_user_id 為鍵，查無資料不快取）."""
+
+    def __init__(
+        self, inner: UserRepository, maxsize: int = 10000, ttl_seconds: float = 60.0
+    ) -> None:
+        """初始化.
+
+        Args:
+            inner: 實際存取資料的 Repository
+            maxsize: 最大快取筆數（0 表示停用）
+            ttl_seconds: 快取時間
+        """
+        self._inner = inner
+        self._cache: TTLCache[str, User] = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+
+    async def get(self, internal_user_id: str) -> User | None:
+        """取得使用者."""
+        user = self._cache.get(internal_user_id)
+        if user is not None:
+            return user
+        user = await self._inner.get(internal_user_id)
+        if user is not None:
+            self._cache.set(internal_user_id, user)
+        return user
+
+    async def get_many(self, internal_user_ids: list[str]) -> dict[str, User]:
+        """批次取得使用者（只向底層查詢未命中的 ID）."""
+        results: dict[str, User] = {}
+        missing: list[str] = []
+        for internal_user_id in internal_user_ids:
+            user = self._cache.get(internal_user_id)
+            if user is not None:
+                results[internal_user_id] = user
+            else:
+                missing.append(internal_user_id)
+        if missing:
+            fetched = await self._inner.get_many(missing)
+            for internal_user_id, user in fetched.items():
+                self._cache.set(internal_user_id, user)
+            results.update(fetched)
+        return results
+
+    async def get_by_email(self, email: str) -> User | None:
+        """透過 Email 取得使用者（不快取 email 對應，查到的資料寫入 ID 快取）."""
+        user = await self._inner.get_by_email(email)
+        if user is not None:
+            self._cache.set(user.internal_user_id, user)
+        return user
+
+    async def create(self, internal_user_id: str, data: UserCreate) -> User:
+        """建立使用者."""
+        self._cache.pop(internal_user_id)
+        user = await self._inner.create(internal_user_id, data)
+        self._cache.set(internal_user_id, user)
+        return user
+
+    def cache_stats(self) -> dict[str, float | int]:
+        """取得快取命中統計."""
+        return self._cache.stats()
+
+
+class CachingMembershipRepository(MembershipRepository):
+    """快取成員資格查詢（查無資料不快取，新加入的成員立即生效）.
+
+    同一個嬰兒有成員異動進行中或在讀取期間完成時，讀取結果不寫入快取，
+    避免被移除的成員在 TTL 內仍保有權限.
+    """
+
+    def __init__(
+        self, inner: MembershipRepository, maxsize: int = 10000, ttl_seconds: float = 60.0
+    ) -> None:
+        """初始化.
+
+        Args:
+            inner: 實際存取資料的 Repository
+            maxsize: 最大快取筆數（0 表示停用）
+            ttl_seconds: 快取時間（其他 instance 異動成員時的最長延遲）
+        """
+        self._inner = inner
+        self._cache: TTLCache[tuple[str, str], Membership] = TTLCache(
+            maxsize=maxsize, ttl_seconds=ttl_seconds
+        )
+        self._guard: _WriteGuard[str] = _WriteGuard()  # 以 baby_id 為 key
+
+    def _prime(
+        self, memberships: list[Membership], fresh: Callable[[str], bool]
+    ) -> list[Membership]:
+        for membership in memberships:
+            if fresh(membership.baby_id):
+                self._cache.set((membership.baby_id, membership.internal_user_id), membership)
+        return memberships
+
+    async def get(self, baby_id: str, internal_user_id: str) -> Membership | None:
+        """取得成員資格."""
+        key = (baby_id, internal_user_id)
+        membership = self._cache.get(key)
+        if membership is not None:
+            return membership
+        with self._guard.reading() as fresh:
+            membership = await self._inner.get(baby_id, internal_user_id)
+            if membership is not None and fresh(baby_id):
+                self._cache.set(key, membership)
+        return membership
+
+    async def create(self, baby_id: str, internal_user_id: str, role: MemberRole) -> Membership:
+        """建立成員資格."""
+        key = (baby_id, internal_user_id)
+        with self._guard.writing(baby_id) as alone:
+            self._cache.pop(key)
+            membership = await self._inner.create(baby_id, internal_user_id, role)
+            if alone():
+                self._cache.set(key, membership)
+        return membership
+
+    async def list_by_baby(self, baby_id: str) -> list[Membership]:
+        """取得嬰兒的所有成員（結果寫入快取）."""
+        with self._guard.reading() as fresh:
+            return self._prime(await self._inner.list_by_baby(baby_id), fresh)
+
+    async def list_by_user(self, internal_user_id: str) -> list[Membership]:
+        """取得使用者的所有成員資格（結果寫入快取）."""
+        with self._guard.reading() as fresh:
+            return self._prime(await self._inner.list_by_user(internal_user_id), fresh)
+
+    async def delete(self, baby_id: str, internal_user_id: str) -> bool:
+        """刪除成員資格."""
+        with self._guard.writing(baby_id):
+            self._cache.pop((baby_id, internal_user_id))
+            return await self._inner.delete(baby_id, internal_user_id)
+
+    async def count_by_baby(self, baby_id: str) -> int:
+        """取得嬰兒的成員數（不快取）."""
+        return await self._inner.count_by_baby(baby_id)
+
+    def invalidate_baby(self, baby_id: str) -> int:
+        """失效嬰兒的所有成員（嬰兒刪除時使用）.
+
+        Returns:
+            失效的筆數
+        """
+        return self._cache.pop_where(lambda key: key[0] == baby_id)
+
+    def cache_stats(self) -> dict[str, float | int]:
+        """取得快取命中統計."""
+        return self._cache.stats()
+
+
+class CachingWeightRepository(WeightRepository):
+    """快取最近存取的嬰兒的完整體重序列（欄位式儲存，見 WeightSeries）.
+
+    列表、區間查詢與 Z-score 由記憶體中的序列以 bisect 切片取得；
+    經由本包裝的寫入直接修改快取中的序列，不需要重新讀取.
+    """
+
+    def __init__(
+        self, inner: WeightRepository, maxsize: int = 1000, ttl_seconds: float = 60.0
+    ) -> None:
+        """初始化.
+
+        Args:
+            inner: 實際存取資料的 Repository
+            maxsize: 最多快取幾個嬰兒的序列（0 表示停用）
+            ttl_seconds: 快取時間（其他 instance 寫入時的最長延遲）
+        """
+        self._inner = inner
+        self._cache: TTLCache[str, WeightSeries] = TTLCache(
+            maxsize=maxsize, ttl_seconds=ttl_seconds
+        )
+        # 與寫入重疊的讀取不快取（讀到的序列可能缺少或已包含該筆寫入，之後再套用會不一致）
+        self._writing: dict[str, int] = {}  # baby_id -> 進行中的寫入數
+        self._loading: dict[str, int] = {}  # baby_id -> 進行中的序列讀取數
+        self._overlapped: set[str] = set()  # 讀取期間有寫入開始的 baby_id
+
+    async def _series(self, baby_id: str) -> WeightSeries:
+        series = self._cache.get(baby_id)
+        if series is not None:
+            return series
+        if self._writing.get(baby_id):
+            return WeightSeries(await self._inner.list_by_baby(baby_id))
+
+        self._loading[baby_id] = self._loading.get(baby_id, 0) + 1
+        try:
+            series = WeightSeries(await self._inner.list_by_baby(baby_id))
+        finally:
+            self._loading[baby_id] -= 1
+            overlapped = baby_id in self._overlapped
+            if not self._loading[baby_id]:
+                del self._loading[baby_id]
+                self._overlapped.discard(baby_id)
+        if not overlapped:
+            self._cache.set(baby_id, series)
+        return series
+
+    @contextmanager
+    def _write(self, baby_id: str) -> Iterator[None]:
+        """標記寫入進行中（從呼叫底層前到套用至快取後）."""
+        self._writing[baby_id] = self._writing.get(baby_id, 0) + 1
+        if baby_id in self._loading:
+            self._overlapped.add(baby_id)
+        try:
+            yield
+        finally:
+            self._writing[baby_id] -= 1
+            if not self._writing[baby_id]:
+                del self._writing[baby_id]
+
+    async def get(self, baby_id: str, weight_id: str) -> Weight | None:
+        """取得體重紀錄（序列未快取時不載入整個序列）."""
+        series = self._cache.get(baby_id)
+        weight = series.get(weight_id) if series is not None else None
+        if weight is not None:
+            return weight
+        # 序列中沒有的紀錄可能是其他 instance 新增的
+        return await self._inner.get(baby_id, weight_id)
+
+    async def get_many(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], Weight]:
+        """批次取得體重紀錄（只向底層查詢序列中沒有的紀錄）."""
+        results: dict[tuple[str, str], Weight] = {}
+        missing: list[tuple[str, str]] = []
+        for baby_id, weight_id in keys:
+            series = self._cache.get(baby_id)
+            weight = series.get(weight_id) if series is not None else None
+            if weight is not None:
+                results[(baby_id, weight_id)] = weight
+            else:
+                missing.append((baby_id, weight_id))
+        if missing:
+            results.update(await self._inner.get_many(missing))
+        return results
+
+    async def create(self, baby_id: str, data: WeightCreate, created_by: str) -> Weight:
+        """建立體重紀錄（加入快取中的序列）."""
+        with self._write(baby_id):
+            weight = await self._inner.create(baby_id, data, created_by)
+            series = self._cache.get(baby_id)
+            if series is not None:
+                series.insert(weight)
+        return weight
+
+    async def update(self, baby_id: str, weight_id: str, data: WeightUpdate) -> Weight | None:
+        """更新體重紀錄（修改快取中的序列）."""
+        with self._write(baby_id):
+            weight = await self._inner.update(baby_id, weight_id, data)
+            series = self._cache.get(baby_id)
+            if weight is not None and series is not None:
+                series.replace(weight)
+        return weight
+
+    async def delete(self, baby_id: str, weight_id: str) -> bool:
+        """刪除體重紀錄（從快取中的序列移除）."""
+        with self._write(baby_id):
+            deleted = await self._inner.delete(baby_id, weight_id)
+            series = self._cache.get(baby_id)
+            if deleted and series is not None:
+                series.remove(weight_id)
+        return deleted
+
+    async def list_by_baby(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> list[Weight]:
+        """取得嬰兒的體重紀錄（未快取時載入完整序列）."""
+        return (await self._series(baby_id)).slice(from_date, to_date)
+
+    async def list_with_zscores(
+        self,
+        baby: Baby,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> list[tuple[Weight, float | None]]:
+        """取得嬰兒的體重紀錄與預先計算的 Z-score."""
+        return (await self._series(baby.baby_id)).with_zscores(baby, from_date, to_date)
+
+    async def count(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> int:
+        """取得嬰兒的體重紀錄筆數（序列未快取時使用底層的聚合查詢）."""
+        series = self._cache.get(baby_id)
+        if series is not None:
+            return series.count(from_date, to_date)
+        return await self._inner.count(baby_id, from_date, to_date)
+
+    async def stats(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> WeightStats:
+        """取得嬰兒體重紀錄的統計（序列未快取時使用底層的聚合查詢）."""
+        series = self._cache.get(baby_id)
+        if series is not None:
+            return series.stats(from_date, to_date)
+        return await self._inner.stats(baby_id, from_date, to_date)
+
+    def invalidate_baby(self, baby_id: str) -> None:
+        """失效嬰兒的序列（嬰兒刪除時使用）."""
+        self._cache.pop(baby_id)
+
+    def cache_stats(self) -> dict[str, float | int]:
+        """取得快取命中統計."""
+        return self._cache.stats()
+
+
+class CachingBabyRepository(BabyRepository):
+    """快取嬰兒查詢（查無資料不快取）.
+
+    刪除嬰兒時一併失效成員與體重序列快取，讓已刪除嬰兒的權限檢查不會命中舊資料；
+    與寫入重疊的讀取結果不寫入快取（見 _WriteGuard）.
+    """
+
+    def __init__(
+        self,
+        inner: BabyRepository,
+        maxsize: int = 10000,
+        ttl_seconds: float = 60.0,
+        memberships: CachingMembershipRepository | None = None,
+        weights: CachingWeightRepository | None = None,
+    ) -> None:
+        """初始化.
+
+        Args:
+            inner: 實際存取資料的 Repository
+            maxsize: 最大快取筆數（0 表示停用）
+            ttl_seconds: 快取時間
+            memberships: 同一組快取的成員 Repository（刪除嬰兒時失效）
+            weights: 同一組快取的體重 Repository（刪除嬰兒時失效）
+        """
+        self._inner = inner
+        self._memberships = memberships
+        self._weights = weights
+        self._cache: TTLCache[str, Baby] = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self._guard: _WriteGuard[str] = _WriteGuard()
+
+    @contextmanager
+    def _delete(self, baby_id: str) -> Iterator[None]:
+        """標記嬰兒刪除進行中（同時標記該嬰兒的成員異動）."""
+        with ExitStack() as stack:
+            stack.enter_context(self._guard.writing(baby_id))
+            if self._memberships is not None:
+                stack.enter_context(self._memberships._guard.writing(baby_id))
+            yield
+
+    def _invalidate(self, baby_id: str) -> None:
+        self._cache.pop(baby_id)
+        if self._memberships is not None:
+            self._memberships.invalidate_baby(baby_id)
+        if self._weights is not None:
+            self._weights.invalidate_baby(baby_id)
+
+    async def get(self, baby_id: str) -> Baby | None:
+        """取得嬰兒."""
+        baby = self._cache.get(baby_id)
+        if baby is not None:
+            return baby
+        with self._guard.reading() as fresh:
+            baby = await self._inner.get(baby_id)
+            if baby is not None and fresh(baby_id):
+                self._cache.set(baby_id, baby)
+        return baby
+
+    async def get_many(self, baby_ids: list[str]) -> dict[str, Baby]:
+        """批次取得嬰兒（只向底層查詢未命中的 ID）."""
+        results: dict[str, Baby] = {}
+        missing: list[str] = []
+        for baby_id in baby_ids:
+            baby = self._cache.get(baby_id)
+            if baby is not None:
+                results[baby_id] = baby
+            else:
+                missing.append(baby_id)
+        if missing:
+            with self._guard.reading() as fresh:
+                fetched = await self._inner.get_many(missing)
+                for baby_id, baby in fetched.items():
+                    if fresh(baby_id):
+                        self._cache.set(baby_id, baby)
+            results.update(fetched)
+        return results
+
+    async def create(self, data: BabyCreate) -> Baby:
+        """建立嬰兒."""
+        baby = await self._inner.create(data)
+        self._cache.set(baby.baby_id, baby)
+        return baby
+
+    async def update(self, baby_id: str, data: BabyUpdate) -> Baby | None:
+        """更新嬰兒."""
+        with self._guard.writing(baby_id) as alone:
+            self._cache.pop(baby_id)
+            baby = await self._inner.update(baby_id, data)
+            if baby is not None and alone():
+                self._cache.set(baby_id, baby)
+        return baby
+
+    async def delete(self, baby_id: str) -> bool:
+        """標記刪除嬰兒（寫入期間與之重疊的讀取不寫入快取）."""
+        with self._delete(baby_id):
+            self._invalidate(baby_id)
+            return await self._inner.delete(baby_id)
+
+    async def purge(
+        self,
+        baby_id: str,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """實際刪除已標記刪除的嬰兒及其所有子集合（完成後再失效一次）."""
+        with self._delete(baby_id):
+            self._invalidate(baby_id)
+            try:
+                return await self._inner.purge(baby_id, on_progress)
+            finally:
+                self._invalidate(baby_id)
+
+    async def list_deleted_ids(self) -> list[str]:
+        """取得已標記刪除但尚未 purge 的嬰兒 ID."""
+        return await self._inner.list_deleted_ids()
+
+    async def list_by_user(self, internal_user_id: str) -> list[Baby]:
+        """取得使用者可存取的嬰兒列表."""
+        return [baby for baby, _ in await self.list_with_membership_by_user(internal_user_id)]
+
+    async def list_with_membership_by_user(
+        self, internal_user_id: str
+    ) -> list[tuple[Baby, Membership]]:
+        """取得使用者可存取的嬰兒列表（結果寫入嬰兒與成員快取）."""
+        with ExitStack() as stack:
+            fresh = stack.enter_context(self._guard.reading())
+            memberships = self._memberships
+            if memberships is not None:
+                fresh_membership = stack.enter_context(memberships._guard.reading())
+            results = await self._inner.list_with_membership_by_user(internal_user_id)
+            for baby, _ in results:
+                if fresh(baby.baby_id):
+                    self._cache.set(baby.baby_id, baby)
+            if memberships is not None:
+                memberships._prime([membership for _, membership in results], fresh_membership)
+        return results
+
+    def cache_stats(self) -> dict[str, float | int]:
+        """取得快取命中統計."""
+        return self._cache.stats()
+
+
+class CachingRepositories:
+    """在任一組 Repositories 前加上 instance 內快取.
+
+    快取 get 類讀取（身份對應、使用者、嬰兒、成員資格），經由本包裝的寫入會主動失效；
+    體重紀錄快取最近存取的嬰兒的完整序列，經由本包裝的寫入直接修改序列.
+    """
+
+    def __init__(
+        self,
+        inner: Repositories,
+        maxsize: int = 10000,
+        ttl_seconds: float = 60.0,
+        identity_maxsize: int = 10000,
+        identity_ttl_seconds: float = 300.0,
+        identity_negative_ttl_seconds: float = 30.0,
+        series_maxsize: int = 1000,
+    ) -> None:
+        """初始化.
+
+        Args:
+            inner: 實際存取資料的 Repositories
+            maxsize: 使用者、嬰兒、成員快取各自的最大筆數（0 表示停用）
+            ttl_seconds: 使用者、嬰兒、成員快取的存活時間
+            identity_maxsize: 身份對應快取的最大筆數
+            identity_ttl_seconds: 查到 link 時的快取時間
+            identity_negative_ttl_seconds: 查無 link 時的快取時間
+            series_maxsize: 最多快取幾個嬰兒的體重序列（0 表示停用）
+        """
+        self.inner = inner
+        identity_links = inner.identity_links
+        if not isinstance(identity_links, CachingIdentityLinkRepository):
+            identity_links = CachingIdentityLinkRepository(
+                identity_links,
+                maxsize=identity_maxsize,
+                ttl_seconds=identity_ttl_seconds,
+                negative_ttl_seconds=identity_negative_ttl_seconds,
+            )
+        self.identity_links: CachingIdentityLinkRepository = identity_links
+        self.users = CachingUserRepository(inner.users, maxsize, ttl_seconds)
+        self.memberships = CachingMembershipRepository(inner.memberships, maxsize, ttl_seconds)
+        self.weights = CachingWeightRepository(inner.weights, series_maxsize, ttl_seconds)
+        self.babies = CachingBabyRepository(
+            inner.babies, maxsize, ttl_seconds, memberships=self.memberships, weights=self.weights
+        )
+
+    def cache_stats(self) -> dict[str, dict[str, float | int]]:
+        """取得各快取的命中統計."""
+        return {
+            "identity_links": self.identity_links.cache_stats(),
+            "users": self.users.cache_stats(),
+            "babies": self.babies.cache_stats(),
+            "memberships": self.memberships.cache_stats(),
+            "weight_series": self.weights.cache_stats(),
+        }
@@ -0,0 +1,93 @@
+"""Firestore document 解碼.
+
+每個 collection 一個解碼函式，集中處理儲存格式的轉換（ISO 日期字串、enum 值）
+與缺少欄位時的預設值，再交給 model constructor 驗證.
+呼叫方式：decode_xxx(doc.to_dict(), **ids)，缺少必填欄位時 KeyError.
+效能見 scripts/bench_firestore_decode.py.
+"""
+
+from collections.abc import Callable
+from datetime import UTC, date, datetime
+from enum import Enum
+from typing import Any
+
+from api.app.models import Baby, Gender, IdentityLink, MemberRole, Membership, User, Weight
+
+
+def _enum(enum: type[Enum]) -> Callable[[Any], Any]:
+    """以 dict 查表取代 Enum(value) 呼叫（未知的值 KeyError）."""
+    return {member.value: member for member in enum}.__getitem__
+
+
+_gender = _enum(Gender)
+_member_role = _enum(MemberRole)
+
+
+def _or_now(value: datetime | None) -> datetime:
+    """舊資料可能沒有時間欄位，以目前時間代替."""
+    return datetime.now(UTC) if value is None else value
+
+
+def _to_date(value: Any) -> date:
+    """ISO 日期字串（或舊資料的 datetime）轉為 date."""
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value  # type: ignore[no-any-return]
+
+
+def decode_identity_link(data: dict[str, Any], *, link_id: str) -> IdentityLink:
+    """identity_links/{link_id}."""
+    return IdentityLink(
+        link_id=link_id,
+        provider_iss=data["provider_iss"],
+        provider_sub=data["provider_sub"],
+        internal_user_id=data["internal_user_id"],
+        created_at=_or_now(data.get("created_at")),
+    )
+
+
+def decode_user(data: dict[str, Any], *, internal_user_id: str) -> User:
+    """users/{internal_user_id} 或 user_profiles/{internal_user_id}."""
+    return User(
+        internal_user_id=internal_user_id,
+        display_name=data.get("display_name", ""),
+        email=data.get("email", ""),
+        created_at=_or_now(data.get("created_at")),
+    )
+
+
+def decode_baby(data: dict[str, Any], *, baby_id: str) -> Baby:
+    """babies/{baby_id}."""
+    return Baby(
+        baby_id=baby_id,
+        name=data["name"],
+        birth_date=_to_date(data["birth_date"]),
+        gender=_gender(data["gender"]),
+        created_at=_or_now(data.get("created_at")),
+    )
+
+
+def decode_membership(data: dict[str, Any], *, baby_id: str, internal_user_id: str) -> Membership:
+    """babies/{baby_id}/members/{internal_user_id}（或 collection group 查詢結果）."""
+    return Membership(
+        baby_id=baby_id,
+        internal_user_id=internal_user_id,
+        role=_member_role(data["role"]),
+        joined_at=_or_now(data.get("joined_at")),
+    )
+
+
+def decode_weight(data: dict[str, Any], *, weight_id: str, baby_id: str) -> Weight:
+    """babies/{baby_id}/weights/{weight_id}."""
+    return Weight(
+        weight_id=weight_id,
+        baby_id=baby_id,
+        timestamp=data["timestamp"],
+        weight_g=data["weight_g"],
+        note=data.get("note"),
+        created_by=data["created_by"],
+        created_at=_or_now(data.get("created_at")),
+        updated_at=data.get("updated_at"),
+    )
@@ -1,16 +1,21 @@
 """Firestore Repository 實作."""
 
+import asyncio
+import threading
+from collections.abc import Callable
 from datetime import UTC, datetime
 from typing import Any
 
 from google.cloud.firestore_v1 import AsyncClient
+from google.cloud.firestore_v1.bulk_writer import BulkWriteFailure, BulkWriter, BulkWriterOptions
+from google.cloud.firestore_v1.field_path import FieldPath
 from ulid import ULID
 
+from api.app.firestore_client import FirestoreClient, SyncFirestoreClient, call_options
 from api.app.models import (
     Baby,
     BabyCreate,
     BabyUpdate,
-    Gender,
     IdentityLink,
     MemberRole,
     Membership,
@@ -18,6 +23,7 @@ from api.app.models import (
     UserCreate,
     Weight,
     WeightCreate,
+    WeightStats,
     WeightUpdate,
 )
 from api.app.repositories.base import (
@@ -26,6 +32,14 @@ from api.app.repositories.base import (
     MembershipRepository,
     UserRepository,
     WeightRepository,
+    identity_link_id,
+)
+from api.app.repositories.decoders import (
+    decode_baby,
+    decode_identity_link,
+    decode_membership,
+    decode_user,
+    decode_weight,
 )
 
 
@@ -34,50 +48,65 @@ def generate_ulid() -> str:
     return str(ULID())
 
 
-def _to_datetime(value: Any) -> datetime:
-    """將 Firestore timestamp 轉換為 datetime."""
-    if value is None:
-        return datetime.now(UTC)
-    if isinstance(value, datetime):
-        return value
-    # Firestore DatetimeWithNanoseconds
-    return value
+async def _aggregate(
+    aggregation: Any,  # AsyncAggregationQuery
+    options: dict[str, Any],
+) -> dict[str, Any]:
+    """執行聚合查詢，回傳 alias -> 值.
+
+    聚合查詢在伺服器端計算，計費為每 1000 筆索引項目一次讀取，不需傳回 document.
+    """
+    results = await aggregation.get(**options)
+    return {result.alias: result.value for result in results[0]} if results else {}
 
 
 class FirestoreIdentityLinkRepository(IdentityLinkRepository):
-    """Firestore 身份對應 Repository."""
+    """Firestore 身份對應 Repository.
+
+    document ID 由 (provider_iss, provider_sub) 決定（見 identity_link_id），
+    查詢時直接以 key 讀取；舊資料（ULID document ID）再退回欄位查詢.
+    """
 
     def __init__(self, db: AsyncClient) -> None:
         """初始化."""
         self._db = db
+        self._options = call_options(db)
         self._collection = "identity_links"
 
+    @staticmethod
+    def _to_link(link_id: str, data: dict[str, Any]) -> IdentityLink:
+        """將 document 資料轉為 IdentityLink."""
+        return decode_identity_link(data, link_id=link_id)
+
     async def find_by_provider(self, provider_iss: str, provider_sub: str) -> IdentityLink | None:
         """透過 IdP 身份查詢."""
+        link_id = identity_link_id(provider_iss, provider_sub)
+        doc = (
+            await self._db.collection(self._collection).document(link_id).get(**self._options.read)
+        )
+        if doc.exists:
+            data = doc.to_dict()
+            if data:
+                return self._to_link(doc.id, data)
+
+        # 舊資料使用 ULID 作為 document ID，需以欄位查詢
         query = (
             self._db.collection(self._collection)
             .where("provider_iss", "==", provider_iss)
             .where("provider_sub", "==", provider_sub)
             .limit(1)
         )
-        docs = query.stream()
-        async for doc in docs:
+        async for doc in query.stream(**self._options.stream):
             data = doc.to_dict()
             if data:
-                return IdentityLink(
-                    link_id=doc.id,
-                    provider_iss=data["provider_iss"],
-                    provider_sub=data["provider_sub"],
-                    internal_user_id=data["internal_user_id"],
-                    created_at=_to_datetime(data.get("created_at")),
-                )
+                return self._to_link(doc.id, data)
         return None
 
     async def create(
         self, provider_iss: str, provider_sub: str, internal_user_id: str
     ) -> IdentityLink:
         """建立身份對應."""
-        link_id = generate_ulid()
+        link_id = identity_link_id(provider_iss, provider_sub)
         now = datetime.now(UTC)
         data = {
             "provider_iss": provider_iss,
@@ -85,7 +114,9 @@ class FirestoreIdentityLinkRepository(IdentityLinkRepository):
             "internal_user_id": internal_user_id,
             "created_at": now,
         }
-        await self._db.collection(self._collection).document(link_id).set(data)
+        await (
+            self._db.collection(self._collection).document(link_id).set(data, **self._options.write)
+        )
         return IdentityLink(
             link_id=link_id,
             provider_iss=provider_iss,
@@ -96,60 +127,117 @@ class FirestoreIdentityLinkRepository(IdentityLinkRepository):
 
 
 class FirestoreUserRepository(UserRepository):
-    """Firestore 使用者 Repository."""
+    """Firestore 使用者 Repository.
 
-    def __init__(self, db: AsyncClient) -> None:
-        """初始化."""
+    Auth Service 的 users 以 user_id 為 document ID，並同步寫入以 internal_user_id 為 key 的
+    user_profiles 投影；讀取時直接以 key 取得（可用 get_all 批次），
+    尚未補建投影的使用者再退回 users 的欄位查詢.
+    """
+
+    # Firestore in 查詢的值數上限
+    IN_QUERY_LIMIT = 30
+
+    def __init__(
+        self,
+        db: AsyncClient,
+        profile_collection: str = "user_profiles",
+        profile_fallback: bool = True,
+    ) -> None:
+        """初始化.
+
+        Args:
+            db: Firestore AsyncClient
+            profile_collection: 以 internal_user_id 為 key 的使用者投影 collection
+            profile_fallback: 投影不存在時退回 users 的欄位查詢
+        """
         self._db = db
+        self._options = call_options(db)
         self._collection = "users"
+        self._profile_collection = profile_collection
+        self._profile_fallback = profile_fallback
+
+    @staticmethod
+    def _to_user(doc: Any) -> User | None:  # DocumentSnapshot
+        """將 document snapshot 轉為 User."""
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        if not data:
+            return None
+        return decode_user(data, internal_user_id=data.get("internal_user_id", doc.id))
 
     async def get(self, internal_user_id: str) -> User | None:
-        """取得使用者（透過 internal_user_id 欄位查詢）."""
-        # Auth Service 使用 user_id 作為 document ID，internal_user_id 是欄位
+        """取得使用者（以 key 讀取投影）."""
+        doc = (
+            await self._db.collection(self._profile_collection)
+            .document(internal_user_id)
+            .get(**self._options.read)
+        )
+        user = self._to_user(doc)
+        if user is not None or not self._profile_fallback:
+            return user
+
+        # 尚未補建投影：Auth Service 使用 user_id 作為 document ID，internal_user_id 是欄位
         query = (
             self._db.collection(self._collection)
             .where("internal_user_id", "==", internal_user_id)
             .limit(1)
         )
-        docs = query.stream()
-        async for doc in docs:
-            data = doc.to_dict()
-            if not data:
-                continue
-            return User(
-                internal_user_id=data.get("internal_user_id", doc.id),
-                display_name=data.get("display_name", ""),
-                email=data.get("email", ""),
-                created_at=_to_datetime(data.get("created_at")),
-            )
+        async for doc in query.stream(**self._options.stream):
+            user = self._to_user(doc)
+            if user:
+                return user
         return None
 
+    async def get_many(self, internal_user_ids: list[str]) -> dict[str, User]:
+        """批次取得使用者（一次 get_all 讀取投影，缺少投影的 ID 再以 in 查詢）."""
+        ids = list(dict.fromkeys(internal_user_ids))
+        if not ids:
+            return {}
+        profiles = self._db.collection(self._profile_collection)
+        users: dict[str, User] = {}
+        async for snapshot in self._db.get_all(
+            [profiles.document(i) for i in ids], **self._options.stream
+        ):
+            user = self._to_user(snapshot)
+            if user:
+                users[user.internal_user_id] = user
+
+        missing = [i for i in ids if i not in users] if self._profile_fallback else []
+        for start in range(0, len(missing), self.IN_QUERY_LIMIT):
+            chunk = missing[start : start + self.IN_QUERY_LIMIT]
+            query = self._db.collection(self._collection).where("internal_user_id", "in", chunk)
+            async for doc in query.stream(**self._options.stream):
+                user = self._to_user(doc)
+                if user:
+                    users[user.internal_user_id] = user
+        return users
+
     async def get_by_email(self, email: str) -> User | None:
         """透過 Email 取得使用者."""
         # Auth Service 存的 email 是小寫
         query = self._db.collection(self._collection).where("email", "==", email.lower()).limit(1)
-        docs = query.stream()
-        async for doc in docs:
-            data = doc.to_dict()
-            if not data:
-                continue
-            return User(
-                internal_user_id=data.get("internal_user_id", doc.id),
-                display_name=data.get("display_name", ""),
-                email=data.get("email", ""),
-                created_at=_to_datetime(data.get("created_at")),
-            )
+        async for doc in query.stream(**self._options.stream):
+            user = self._to_user(doc)
+            if user:
+                return user
         return None
 
     async def create(self, internal_user_id: str, data: UserCreate) -> User:
-        """建立使用者."""
+        """建立使用者（同時寫入投影）."""
         now = datetime.now(UTC)
         doc_data = {
             "display_name": data.display_name,
             "email": data.email,
             "created_at": now,
         }
-        await self._db.collection(self._collection).document(internal_user_id).set(doc_data)
+        batch = self._db.batch()
+        batch.set(self._db.collection(self._collection).document(internal_user_id), doc_data)
+        batch.set(
+            self._db.collection(self._profile_collection).document(internal_user_id),
+            {**doc_data, "internal_user_id": internal_user_id},
+        )
+        await batch.commit(**self._options.write)
         return User(
             internal_user_id=internal_user_id,
             display_name=data.display_name,
@@ -159,28 +247,61 @@ class FirestoreUserRepository(UserRepository):
 
 
 class FirestoreBabyRepository(BabyRepository):
-    """Firestore 嬰兒 Repository."""
+    """Firestore 嬰兒 Repository.
 
-    def __init__(self, db: AsyncClient) -> None:
-        """初始化."""
+    刪除分兩階段：delete 只寫入 deleted_at 標記，
+    purge 以 BulkWriter 節流刪除 members / weights 子集合與 baby document.
+    """
+
+    # 子集合刪除順序：先刪 members，讓 collection group query 盡快不再命中
+    SUBCOLLECTIONS = ("members", "weights")
+    PURGE_CHUNK_SIZE = 500  # 每次查詢、刪除的 document 數
+    PURGE_MAX_ATTEMPTS = 15  # 單筆刪除的最多嘗試次數（與 BulkWriter 預設相同）
+
+    def __init__(
+        self, db: AsyncClient, purge_db: SyncFirestoreClient, purge_ops_per_second: int = 100
+    ) -> None:
+        """初始化.
+
+        Args:
+            db: Firestore AsyncClient
+            purge_db: purge 使用的同步 client（BulkWriter 只支援同步 client）
+            purge_ops_per_second: purge 時 BulkWriter 的最大寫入速率
+        """
         self._db = db
+        self._options = call_options(db)
+        self._purge_db = purge_db
         self._collection = "babies"
+        self._purge_ops_per_second = purge_ops_per_second
 
-    async def get(self, baby_id: str) -> Baby | None:
-        """取得嬰兒."""
-        doc = await self._db.collection(self._collection).document(baby_id).get()
+    def _to_baby(self, doc: Any) -> Baby | None:  # DocumentSnapshot
+        """將 document snapshot 轉為 Baby（已標記刪除者視為不存在）."""
         if not doc.exists:
             return None
         data = doc.to_dict()
-        if not data:
+        if not data or data.get("deleted_at"):
             return None
-        return Baby(
-            baby_id=doc.id,
-            name=data["name"],
-            birth_date=data["birth_date"],
-            gender=Gender(data["gender"]),
-            created_at=_to_datetime(data.get("created_at")),
+        return decode_baby(data, baby_id=doc.id)
+
+    async def get(self, baby_id: str) -> Baby | None:
+        """取得嬰兒."""
+        doc = (
+            await self._db.collection(self._collection).document(baby_id).get(**self._options.read)
         )
+        return self._to_baby(doc)
+
+    async def get_many(self, baby_ids: list[str]) -> dict[str, Baby]:
+        """批次取得嬰兒（一次 get_all）."""
+        if not baby_ids:
+            return {}
+        collection = self._db.collection(self._collection)
+        refs = [collection.document(baby_id) for baby_id in dict.fromkeys(baby_ids)]
+        babies: dict[str, Baby] = {}
+        async for snapshot in self._db.get_all(refs, **self._options.stream):
+            baby = self._to_baby(snapshot)
+            if baby:
+                babies[baby.baby_id] = baby
+        return babies
 
     async def create(self, data: BabyCreate) -> Baby:
         """建立嬰兒."""
@@ -192,7 +313,11 @@ class FirestoreBabyRepository(BabyRepository):
             "gender": data.gender.value,
             "created_at": now,
         }
-        await self._db.collection(self._collection).document(baby_id).set(doc_data)
+        await (
+            self._db.collection(self._collection)
+            .document(baby_id)
+            .set(doc_data, **self._options.write)
+        )
         return Baby(
             baby_id=baby_id,
             name=data.name,
@@ -204,8 +329,7 @@ class FirestoreBabyRepository(BabyRepository):
     async def update(self, baby_id: str, data: BabyUpdate) -> Baby | None:
         """更新嬰兒."""
         doc_ref = self._db.collection(self._collection).document(baby_id)
-        doc = await doc_ref.get()
-        if not doc.exists:
+        if self._to_baby(await doc_ref.get(**self._options.read)) is None:
             return None
 
         update_data: dict[str, Any] = {}
@@ -217,39 +341,132 @@ class FirestoreBabyRepository(BabyRepository):
             update_data["gender"] = data.gender.value
 
         if update_data:
-            await doc_ref.update(update_data)
+            await doc_ref.update(update_data, **self._options.write)
 
         return await self.get(baby_id)
 
     async def delete(self, baby_id: str) -> bool:
-        """刪除嬰兒."""
+        """標記刪除嬰兒（子集合由 purge 清除）."""
         doc_ref = self._db.collection(self._collection).document(baby_id)
-        doc = await doc_ref.get()
-        if not doc.exists:
+        if self._to_baby(await doc_ref.get(**self._options.read)) is None:
             return False
-        await doc_ref.delete()
+        await doc_ref.update({"deleted_at": datetime.now(UTC)}, **self._options.write)
         return True
 
+    async def purge(
+        self,
+        baby_id: str,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """實際刪除已標記刪除的嬰兒及其所有子集合.
+
+        BulkWriter 的 flush 會阻塞呼叫端，因此整個刪除流程在 worker thread 中執行.
+        查詢與 baby document 的刪除帶入 client 的 deadline 與重試設定；
+        BulkWriter 自行重試失敗的刪除，重試同樣取用 client 的重試預算.
+
+        Raises:
+            RuntimeError: 有 document 重試後仍無法刪除（交由 BabyPurgeService 稍後重試）
+        """
+        return await asyncio.to_thread(self._purge_sync, baby_id, on_progress)
+
+    def _purge_sync(self, baby_id: str, on_progress: Callable[[int], None] | None) -> int:
+        """purge 的同步實作（在 worker thread 執行）."""
+        client = self._purge_db
+        options = client.call_options
+        baby_ref = client.collection(self._collection).document(baby_id)
+        writer_options = BulkWriterOptions(
+            initial_ops_per_second=self._purge_ops_per_second,
+            max_ops_per_second=self._purge_ops_per_second,
+        )
+
+        deleted = 0
+        failed = 0
+        # BulkWriter 在自己的 thread pool 中呼叫 callback
+        lock = threading.Lock()
+
+        def _on_write_result(*_: Any) -> None:
+            nonlocal deleted
+            with lock:
+                deleted += 1
+                if on_progress:
+                    on_progress(deleted)
+
+        def _on_write_error(error: BulkWriteFailure, _: BulkWriter) -> bool:
+            nonlocal failed
+            if error.attempts < self.PURGE_MAX_ATTEMPTS and client.retry_budget.try_acquire():
+                return True
+            with lock:
+                failed += 1
+            return False
+
+        for name in self.SUBCOLLECTIONS:
+            # 子集合內沒有更深的子集合，逐批查詢 document ID 後刪除
+            query = (
+                baby_ref.collection(name)
+                .select([FieldPath.document_id()])
+                .limit(self.PURGE_CHUNK_SIZE)
+            )
+            bulk_writer = client.bulk_writer(options=writer_options)
+            bulk_writer.on_write_result(_on_write_result)
+            bulk_writer.on_write_error(_on_write_error)
+            try:
+                while refs := [doc.reference for doc in query.stream(**options.stream)]:
+                    for ref in refs:
+                        bulk_writer.delete(ref)
+                    bulk_writer.flush()
+                    if failed:
+                        raise RuntimeError(f"Failed to delete {failed} documents of baby {baby_id}")
+            finally:
+                bulk_writer.close()
+
+        baby_ref.delete(**options.write)
+        _on_write_result()
+        return deleted
+
+    async def list_deleted_ids(self) -> list[str]:
+        """取得已標記刪除但尚未 purge 的嬰兒 ID."""
+        query = self._db.collection(self._collection).where("deleted_at", "!=", None)
+        return [doc.id async for doc in query.stream(**self._options.stream)]
+
     async def list_by_user(self, internal_user_id: str) -> list[Baby]:
-        """取得使用者可存取的嬰兒列表.
+        """取得使用者可存取的嬰兒列表."""
+        return [baby for baby, _ in await self.list_with_membership_by_user(internal_user_id)]
+
+    async def list_with_membership_by_user(
+        self, internal_user_id: str
+    ) -> list[tuple[Baby, Membership]]:
+        """取得使用者可存取的嬰兒列表（含該使用者的成員資格）.
 
-        透過查詢 memberships subcollection 來找到所有嬰兒.
+        一次 collection group query 取得 members，再以 get_all 批次讀取所有 baby document.
         """
-        # 使用 collection group query 查詢所有 members subcollection
         query = self._db.collection_group("members").where(
             "internal_user_id", "==", internal_user_id
         )
 
-        babies: list[Baby] = []
-        async for doc in query.stream():
+        memberships: list[Membership] = []
+        baby_refs: list[Any] = []  # AsyncDocumentReference
+        async for doc in query.stream(**self._options.stream):
+            data = doc.to_dict()
             # doc.reference.parent.parent 是 baby document
             baby_ref = doc.reference.parent.parent
-            if baby_ref:
-                baby = await self.get(baby_ref.id)
-                if baby:
-                    babies.append(baby)
+            if not data or not baby_ref:
+                continue
+            memberships.append(
+                decode_membership(data, baby_id=baby_ref.id, internal_user_id=internal_user_id)
+            )
+            baby_refs.append(baby_ref)
 
-        return babies
+        if not baby_refs:
+            return []
+
+        # get_all 不保證回傳順序，先建立 map 再依 membership 順序組合
+        babies: dict[str, Baby] = {}
+        async for snapshot in self._db.get_all(baby_refs, **self._options.stream):
+            baby = self._to_baby(snapshot)
+            if baby:
+                babies[baby.baby_id] = baby
+
+        return [(babies[m.baby_id], m) for m in memberships if m.baby_id in babies]
 
 
 class FirestoreMembershipRepository(MembershipRepository):
@@ -261,6 +478,7 @@ class FirestoreMembershipRepository(MembershipRepository):
     def __init__(self, db: AsyncClient) -> None:
         """初始化."""
         self._db = db
+        self._options = call_options(db)
 
     def _get_member_ref(self, baby_id: str, internal_user_id: str) -> Any:  # AsyncDocumentReference
         """取得成員 document reference."""
@@ -273,18 +491,13 @@ class FirestoreMembershipRepository(MembershipRepository):
 
     async def get(self, baby_id: str, internal_user_id: str) -> Membership | None:
         """取得成員資格."""
-        doc = await self._get_member_ref(baby_id, internal_user_id).get()
+        doc = await self._get_member_ref(baby_id, internal_user_id).get(**self._options.read)
         if not doc.exists:
             return None
         data = doc.to_dict()
         if not data:
             return None
-        return Membership(
-            baby_id=baby_id,
-            internal_user_id=internal_user_id,
-            role=MemberRole(data["role"]),
-            joined_at=_to_datetime(data.get("joined_at")),
-        )
+        return decode_membership(data, baby_id=baby_id, internal_user_id=internal_user_id)
 
     async def create(self, baby_id: str, internal_user_id: str, role: MemberRole) -> Membership:
         """建立成員資格."""
@@ -294,7 +507,7 @@ class FirestoreMembershipRepository(MembershipRepository):
             "role": role.value,
             "joined_at": now,
         }
-        await self._get_member_ref(baby_id, internal_user_id).set(data)
+        await self._get_member_ref(baby_id, internal_user_id).set(data, **self._options.write)
         return Membership(
             baby_id=baby_id,
             internal_user_id=internal_user_id,
@@ -306,16 +519,11 @@ class FirestoreMembershipRepository(MembershipRepository):
         """取得嬰兒的所有成員."""
         query = self._db.collection("babies").document(baby_id).collection("members")
         memberships: list[Membership] = []
-        async for doc in query.stream():
+        async for doc in query.stream(**self._options.stream):
             data = doc.to_dict()
             if data:
                 memberships.append(
-                    Membership(
-                        baby_id=baby_id,
-                        internal_user_id=doc.id,
-                        role=MemberRole(data["role"]),
-                        joined_at=_to_datetime(data.get("joined_at")),
-                    )
+                    decode_membership(data, baby_id=baby_id, internal_user_id=doc.id)
                 )
         return memberships
 
@@ -325,30 +533,31 @@ class FirestoreMembershipRepository(MembershipRepository):
             "internal_user_id", "==", internal_user_id
         )
         memberships: list[Membership] = []
-        async for doc in query.stream():
+        async for doc in query.stream(**self._options.stream):
             data = doc.to_dict()
             if data:
                 # 從 path 取得 baby_id: babies/{babyId}/members/{userId}
                 baby_id = doc.reference.parent.parent.id if doc.reference.parent.parent else ""
                 memberships.append(
-                    Membership(
-                        baby_id=baby_id,
-                        internal_user_id=doc.id,
-                        role=MemberRole(data["role"]),
-                        joined_at=_to_datetime(data.get("joined_at")),
-                    )
+                    decode_membership(data, baby_id=baby_id, internal_user_id=doc.id)
                 )
         return memberships
 
     async def delete(self, baby_id: str, internal_user_id: str) -> bool:
         """刪除成員資格."""
         doc_ref = self._get_member_ref(baby_id, internal_user_id)
-        doc = await doc_ref.get()
+        doc = await doc_ref.get(**self._options.read)
         if not doc.exists:
             return False
-        await doc_ref.delete()
+        await doc_ref.delete(**self._options.write)
         return True
 
+    async def count_by_baby(self, baby_id: str) -> int:
+        """取得嬰兒的成員數（count 聚合查詢）."""
+        members = self._db.collection("babies").document(baby_id).collection("members")
+        values = await _aggregate(members.count(alias="count"), self._options.stream)
+        return int(values.get("count", 0))
+
 
 class FirestoreWeightRepository(WeightRepository):
     """Firestore 體重 Repository.
@@ -359,29 +568,47 @@ class FirestoreWeightRepository(WeightRepository):
     def __init__(self, db: AsyncClient) -> None:
         """初始化."""
         self._db = db
+        self._options = call_options(db)
 
     def _get_weights_collection(self, baby_id: str) -> Any:  # AsyncCollectionReference
         """取得體重 collection reference."""
         return self._db.collection("babies").document(baby_id).collection("weights")
 
-    async def get(self, baby_id: str, weight_id: str) -> Weight | None:
-        """取得體重紀錄."""
-        doc = await self._get_weights_collection(baby_id).document(weight_id).get()
+    @staticmethod
+    def _to_weight(baby_id: str, doc: Any) -> Weight | None:  # DocumentSnapshot
+        """將 document snapshot 轉為 Weight."""
         if not doc.exists:
             return None
         data = doc.to_dict()
         if not data:
             return None
-        return Weight(
-            weight_id=doc.id,
-            baby_id=baby_id,
-            timestamp=_to_datetime(data["timestamp"]),
-            weight_g=data["weight_g"],
-            note=data.get("note"),
-            created_by=data["created_by"],
-            created_at=_to_datetime(data.get("created_at")),
-            updated_at=_to_datetime(data.get("updated_at")) if data.get("updated_at") else None,
+        return decode_weight(data, weight_id=doc.id, baby_id=baby_id)
+
+    async def get(self, baby_id: str, weight_id: str) -> Weight | None:
+        """取得體重紀錄."""
+        doc = (
+            await self._get_weights_collection(baby_id)
+            .document(weight_id)
+            .get(**self._options.read)
         )
+        return self._to_weight(baby_id, doc)
+
+    async def get_many(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], Weight]:
+        """批次取得體重紀錄（一次 get_all，可跨嬰兒）."""
+        if not keys:
+            return {}
+        refs = [
+            self._get_weights_collection(baby_id).document(weight_id)
+            for baby_id, weight_id in dict.fromkeys(keys)
+        ]
+        weights: dict[tuple[str, str], Weight] = {}
+        async for snapshot in self._db.get_all(refs, **self._options.stream):
+            # snapshot.reference.parent.parent 是 baby document
+            baby_id = snapshot.reference.parent.parent.id
+            weight = self._to_weight(baby_id, snapshot)
+            if weight:
+                weights[(baby_id, weight.weight_id)] = weight
+        return weights
 
     async def create(self, baby_id: str, data: WeightCreate, created_by: str) -> Weight:
         """建立體重紀錄."""
@@ -396,7 +623,11 @@ class FirestoreWeightRepository(WeightRepository):
         if data.note:
             doc_data["note"] = data.note
 
-        await self._get_weights_collection(baby_id).document(weight_id).set(doc_data)
+        await (
+            self._get_weights_collection(baby_id)
+            .document(weight_id)
+            .set(doc_data, **self._options.write)
+        )
         return Weight(
             weight_id=weight_id,
             baby_id=baby_id,
@@ -411,7 +642,7 @@ class FirestoreWeightRepository(WeightRepository):
     async def update(self, baby_id: str, weight_id: str, data: WeightUpdate) -> Weight | None:
         """更新體重紀錄."""
         doc_ref = self._get_weights_collection(baby_id).document(weight_id)
-        doc = await doc_ref.get()
+        doc = await doc_ref.get(**self._options.read)
         if not doc.exists:
             return None
 
@@ -423,16 +654,16 @@ class FirestoreWeightRepository(WeightRepository):
         if data.note is not None:
             update_data["note"] = data.note
 
-        await doc_ref.update(update_data)
+        await doc_ref.update(update_data, **self._options.write)
         return await self.get(baby_id, weight_id)
 
     async def delete(self, baby_id: str, weight_id: str) -> bool:
         """刪除體重紀錄."""
         doc_ref = self._get_weights_collection(baby_id).document(weight_id)
-        doc = await doc_ref.get()
+        doc = await doc_ref.get(**self._options.read)
         if not doc.exists:
             return False
-        await doc_ref.delete()
+        await doc_ref.delete(**self._options.write)
         return True
 
     async def list_by_baby(
@@ -442,53 +673,86 @@ class FirestoreWeightRepository(WeightRepository):
         to_date: datetime | None = None,
     ) -> list[Weight]:
         """取得嬰兒的體重紀錄."""
-        query: Any = self._get_weights_collection(baby_id)
+        query = self._range_query(baby_id, from_date, to_date).order_by("timestamp")
 
+        weights: list[Weight] = []
+        async for doc in query.stream(**self._options.stream):
+            weight = self._to_weight(baby_id, doc)
+            if weight:
+                weights.append(weight)
+        return weights
+
+    async def count(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> int:
+        """取得嬰兒的體重紀錄筆數（count 聚合查詢）."""
+        query = self._range_query(baby_id, from_date, to_date)
+        values = await _aggregate(query.count(alias="count"), self._options.stream)
+        return int(values.get("count", 0))
+
+    async def stats(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> WeightStats:
+        """取得嬰兒體重紀錄的筆數、總和與平均（count/sum/avg 合併為一次聚合查詢）."""
+        aggregation = (
+            self._range_query(baby_id, from_date, to_date)
+            .count(alias="count")
+            .sum("weight_g", alias="sum_g")
+            .avg("weight_g", alias="avg_g")
+        )
+        values = await _aggregate(aggregation, self._options.stream)
+        count = int(values.get("count", 0))
+        return WeightStats(
+            count=count,
+            sum_g=int(values.get("sum_g") or 0),
+            avg_g=values.get("avg_g") if count else None,
+        )
+
+    def _range_query(
+        self, baby_id: str, from_date: datetime | None, to_date: datetime | None
+    ) -> Any:  # AsyncQuery
+        """體重紀錄的時間區間查詢."""
+        query: Any = self._get_weights_collection(baby_id)
         if from_date:
             query = query.where("timestamp", ">=", from_date)
         if to_date:
             query = query.where("timestamp", "<=", to_date)
-
-        query = query.order_by("timestamp")
-
-        weights: list[Weight] = []
-        async for doc in query.stream():
-            data = doc.to_dict()
-            if data:
-                weights.append(
-                    Weight(
-                        weight_id=doc.id,
-                        baby_id=baby_id,
-                        timestamp=_to_datetime(data["timestamp"]),
-                        weight_g=data["weight_g"],
-                        note=data.get("note"),
-                        created_by=data["created_by"],
-                        created_at=_to_datetime(data.get("created_at")),
-                        updated_at=_to_datetime(data.get("updated_at"))
-                        if data.get("updated_at")
-                        else None,
-                    )
-                )
-        return weights
+        return query
 
 
 class FirestoreRepositories:
     """統一管理所有 Firestore Repositories."""
 
-    def __init__(self, project_id: str, database: str = "(default)") -> None:
+    def __init__(
+        self,
+        db: FirestoreClient,
+        purge_db: SyncFirestoreClient,
+        purge_ops_per_second: int = 100,
+        user_profile_fallback: bool = True,
+    ) -> None:
         """初始化所有 repositories.
 
         Args:
-            project_id: GCP Project ID
-            database: Firestore database name（預設為 "(default)"）
+            db: Firestore client（見 api.app.firestore_client.create_firestore_client）
+            purge_db: 背景 purge 使用的同步 client（見 create_sync_firestore_client）
+            purge_ops_per_second: 刪除嬰兒子集合時的最大寫入速率
+            user_profile_fallback: 使用者投影不存在時退回欄位查詢
         """
-        self._db = AsyncClient(project=project_id, database=database)
-        self.identity_links = FirestoreIdentityLinkRepository(self._db)
-        self.users = FirestoreUserRepository(self._db)
-        self.babies = FirestoreBabyRepository(self._db)
+        self._db = db
+        self._purge_db = purge_db
+        self.identity_links: IdentityLinkRepository = FirestoreIdentityLinkRepository(self._db)
+        self.users = FirestoreUserRepository(self._db, profile_fallback=user_profile_fallback)
+        self.babies = FirestoreBabyRepository(self._db, purge_db, purge_ops_per_second)
         self.memberships = FirestoreMembershipRepository(self._db)
         self.weights = FirestoreWeightRepository(self._db)
 
     async def close(self) -> None:
-        """關閉 Firestore client."""
-        self._db.close()
+        """關閉 Firestore client（含 gRPC channel）."""
+        await self._db.aclose()
+        self._purge_db.close()
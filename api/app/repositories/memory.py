@@ -1,6 +1,14 @@
-"""In-Memory Repository 實作（開發/測試用）."""
+"""In-Memory Repository 實作（開發/測試用）.
 
+除主要的 dict 外，寫入時同步維護次要索引（email、baby/user 成員、每個嬰兒依時間排序的體重），
+查詢不需要全表掃描，可承載壓力測試與開發伺服器的大量資料.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime
+from operator import itemgetter
+from typing import Any
 
 from ulid import ULID
 
@@ -16,6 +24,7 @@ from api.app.models import (
     UserCreate,
     Weight,
     WeightCreate,
+    WeightStats,
     WeightUpdate,
 )
 from api.app.repositories.base import (
@@ -24,8 +33,13 @@ from api.app.repositories.base import (
     MembershipRepository,
     UserRepository,
     WeightRepository,
+    identity_link_id,
 )
 
+# 寫入紀錄 callback（操作名稱, 資料）；啟用持久化時由 MemoryPersistence 設定.
+# 在記憶體資料異動之後 await，回傳時紀錄已依持久化設定寫入
+Journal = Callable[[str, Any], Awaitable[None]]
+
 
 def generate_ulid() -> str:
     """產生 ULID."""
@@ -38,19 +52,21 @@ class InMemoryIdentityLinkRepository(IdentityLinkRepository):
     def __init__(self) -> None:
         """初始化."""
         self._links: dict[str, IdentityLink] = {}
+        self.journal: Journal | None = None
+
+    def _put(self, link: IdentityLink) -> None:
+        """寫入身份對應."""
+        self._links[link.link_id] = link
 
     async def find_by_provider(self, provider_iss: str, provider_sub: str) -> IdentityLink | None:
         """透過 IdP 身份查詢."""
-        for link in self._links.values():
-            if link.provider_iss == provider_iss and link.provider_sub == provider_sub:
-                return link
-        return None
+        return self._links.get(identity_link_id(provider_iss, provider_sub))
 
     async def create(
         self, provider_iss: str, provider_sub: str, internal_user_id: str
     ) -> IdentityLink:
         """建立身份對應."""
-        link_id = generate_ulid()
+        link_id = identity_link_id(provider_iss, provider_sub)
         link = IdentityLink(
             link_id=link_id,
             provider_iss=provider_iss,
@@ -58,7 +74,9 @@ class InMemoryIdentityLinkRepository(IdentityLinkRepository):
             internal_user_id=internal_user_id,
             created_at=datetime.now(UTC),
         )
-        self._links[link_id] = link
+        self._put(link)
+        if self.journal:
+            await self.journal("link.put", link)
         return link
 
 
@@ -68,17 +86,21 @@ class InMemoryUserRepository(UserRepository):
     def __init__(self) -> None:
         """初始化."""
         self._users: dict[str, User] = {}
+        self._ids_by_email: dict[str, str] = {}  # email -> internal_user_id
+        self.journal: Journal | None = None
 
     async def get(self, internal_user_id: str) -> User | None:
         """取得使用者."""
         return self._users.get(internal_user_id)
 
+    async def get_many(self, internal_user_ids: list[str]) -> dict[str, User]:
+        """批次取得使用者."""
+        return {uid: self._users[uid] for uid in internal_user_ids if uid in self._users}
+
     async def get_by_email(self, email: str) -> User | None:
         """透過 Email 取得使用者."""
-        for user in self._users.values():
-            if user.email == email:
-                return user
-        return None
+        internal_user_id = self._ids_by_email.get(email)
+        return self._users.get(internal_user_id) if internal_user_id else None
 
     async def create(self, internal_user_id: str, data: UserCreate) -> User:
         """建立使用者."""
@@ -88,22 +110,55 @@ class InMemoryUserRepository(UserRepository):
             email=data.email,
             created_at=datetime.now(UTC),
         )
-        self._users[internal_user_id] = user
+        self._put(user)
+        if self.journal:
+            await self.journal("user.put", user)
         return user
 
+    def _put(self, user: User) -> None:
+        """寫入使用者並維護 email 索引."""
+        internal_user_id = user.internal_user_id
+        previous = self._users.get(internal_user_id)
+        if previous is not None and self._ids_by_email.get(previous.email) == internal_user_id:
+            del self._ids_by_email[previous.email]
+        self._users[internal_user_id] = user
+        # 與原本的掃描一致：同一個 email 有多位使用者時回傳最早建立的
+        self._ids_by_email.setdefault(user.email, internal_user_id)
+
 
 class InMemoryBabyRepository(BabyRepository):
     """In-Memory 嬰兒 Repository."""
 
-    def __init__(self, membership_repo: "InMemoryMembershipRepository") -> None:
+    def __init__(
+        self,
+        membership_repo: "InMemoryMembershipRepository",
+        weight_repo: "InMemoryWeightRepository | None" = None,
+    ) -> None:
         """初始化."""
         self._babies: dict[str, Baby] = {}
+        self._deleted: set[str] = set()  # 已標記刪除、等待 purge 的 baby_id
         self._membership_repo = membership_repo
+        self._weight_repo = weight_repo
+        self.journal: Journal | None = None
+
+    def _put(self, baby: Baby) -> None:
+        """寫入嬰兒."""
+        self._babies[baby.baby_id] = baby
 
     async def get(self, baby_id: str) -> Baby | None:
         """取得嬰兒."""
+        if baby_id in self._deleted:
+            return None
         return self._babies.get(baby_id)
 
+    async def get_many(self, baby_ids: list[str]) -> dict[str, Baby]:
+        """批次取得嬰兒."""
+        return {
+            baby_id: self._babies[baby_id]
+            for baby_id in baby_ids
+            if baby_id in self._babies and baby_id not in self._deleted
+        }
+
     async def create(self, data: BabyCreate) -> Baby:
         """建立嬰兒."""
         baby_id = generate_ulid()
@@ -114,32 +169,73 @@ class InMemoryBabyRepository(BabyRepository):
             gender=data.gender,
             created_at=datetime.now(UTC),
         )
-        self._babies[baby_id] = baby
+        self._put(baby)
+        if self.journal:
+            await self.journal("baby.put", baby)
         return baby
 
     async def update(self, baby_id: str, data: BabyUpdate) -> Baby | None:
         """更新嬰兒."""
-        baby = self._babies.get(baby_id)
+        baby = await self.get(baby_id)
         if not baby:
             return None
 
         update_data = data.model_dump(exclude_unset=True)
         updated_baby = baby.model_copy(update=update_data)
-        self._babies[baby_id] = updated_baby
+        self._put(updated_baby)
+        if self.journal:
+            await self.journal("baby.put", updated_baby)
         return updated_baby
 
     async def delete(self, baby_id: str) -> bool:
-        """刪除嬰兒."""
-        if baby_id in self._babies:
-            del self._babies[baby_id]
+        """標記刪除嬰兒."""
+        if baby_id in self._babies and baby_id not in self._deleted:
+            self._deleted.add(baby_id)
+            if self.journal:
+                await self.journal("baby.delete", baby_id)
             return True
         return False
 
+    async def purge(
+        self,
+        baby_id: str,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """實際刪除已標記刪除的嬰兒及其所有子集合."""
+        # 先刪 members，讓 list_by_user 立即不再命中這個 baby
+        deleted = self._membership_repo._delete_by_baby(baby_id)
+        if on_progress:
+            on_progress(deleted)
+        if self._weight_repo is not None:
+            deleted += self._weight_repo._delete_by_baby(baby_id)
+            if on_progress:
+                on_progress(deleted)
+        if self._babies.pop(baby_id, None) is not None:
+            deleted += 1
+        self._deleted.discard(baby_id)
+        if self.journal:
+            await self.journal("baby.purge", baby_id)
+        return deleted
+
+    async def list_deleted_ids(self) -> list[str]:
+        """取得已標記刪除但尚未 purge 的嬰兒 ID."""
+        return list(self._deleted)
+
     async def list_by_user(self, internal_user_id: str) -> list[Baby]:
         """取得使用者可存取的嬰兒列表."""
+        return [baby for baby, _ in await self.list_with_membership_by_user(internal_user_id)]
+
+    async def list_with_membership_by_user(
+        self, internal_user_id: str
+    ) -> list[tuple[Baby, Membership]]:
+        """取得使用者可存取的嬰兒列表（含該使用者的成員資格）."""
         memberships = await self._membership_repo.list_by_user(internal_user_id)
-        baby_ids = [m.baby_id for m in memberships]
-        return [b for b in self._babies.values() if b.baby_id in baby_ids]
+        results: list[tuple[Baby, Membership]] = []
+        for membership in memberships:
+            baby = await self.get(membership.baby_id)
+            if baby:
+                results.append((baby, membership))
+        return results
 
 
 class InMemoryMembershipRepository(MembershipRepository):
@@ -148,11 +244,28 @@ class InMemoryMembershipRepository(MembershipRepository):
     def __init__(self) -> None:
         """初始化."""
         self._memberships: dict[tuple[str, str], Membership] = {}
+        # 次要索引（dict 當作保留插入順序的 set）
+        self._users_by_baby: dict[str, dict[str, None]] = {}  # baby_id -> internal_user_ids
+        self._babies_by_user: dict[str, dict[str, None]] = {}  # internal_user_id -> baby_ids
+        self.journal: Journal | None = None
 
     async def get(self, baby_id: str, internal_user_id: str) -> Membership | None:
         """取得成員資格."""
         return self._memberships.get((baby_id, internal_user_id))
 
+    def _unindex(self, baby_id: str, internal_user_id: str) -> None:
+        """從次要索引移除."""
+        users = self._users_by_baby.get(baby_id)
+        if users is not None:
+            users.pop(internal_user_id, None)
+            if not users:
+                del self._users_by_baby[baby_id]
+        babies = self._babies_by_user.get(internal_user_id)
+        if babies is not None:
+            babies.pop(baby_id, None)
+            if not babies:
+                del self._babies_by_user[internal_user_id]
+
     async def create(self, baby_id: str, internal_user_id: str, role: MemberRole) -> Membership:
         """建立成員資格."""
         membership = Membership(
@@ -161,25 +274,55 @@ class InMemoryMembershipRepository(MembershipRepository):
             role=role,
             joined_at=datetime.now(UTC),
         )
-        self._memberships[(baby_id, internal_user_id)] = membership
+        self._put(membership)
+        if self.journal:
+            await self.journal("member.put", membership)
         return membership
 
+    def _put(self, membership: Membership) -> None:
+        """寫入成員資格並維護索引."""
+        baby_id, internal_user_id = membership.baby_id, membership.internal_user_id
+        self._memberships[(baby_id, internal_user_id)] = membership
+        self._users_by_baby.setdefault(baby_id, {})[internal_user_id] = None
+        self._babies_by_user.setdefault(internal_user_id, {})[baby_id] = None
+
     async def list_by_baby(self, baby_id: str) -> list[Membership]:
         """取得嬰兒的所有成員."""
-        return [m for m in self._memberships.values() if m.baby_id == baby_id]
+        return [
+            self._memberships[(baby_id, user_id)]
+            for user_id in self._users_by_baby.get(baby_id, ())
+        ]
 
     async def list_by_user(self, internal_user_id: str) -> list[Membership]:
         """取得使用者的所有成員資格."""
-        return [m for m in self._memberships.values() if m.internal_user_id == internal_user_id]
+        return [
+            self._memberships[(baby_id, internal_user_id)]
+            for baby_id in self._babies_by_user.get(internal_user_id, ())
+        ]
 
     async def delete(self, baby_id: str, internal_user_id: str) -> bool:
         """刪除成員資格."""
         key = (baby_id, internal_user_id)
         if key in self._memberships:
             del self._memberships[key]
+            self._unindex(baby_id, internal_user_id)
+            if self.journal:
+                await self.journal("member.delete", key)
             return True
         return False
 
+    async def count_by_baby(self, baby_id: str) -> int:
+        """取得嬰兒的成員數."""
+        return len(self._users_by_baby.get(baby_id, ()))
+
+    def _delete_by_baby(self, baby_id: str) -> int:
+        """刪除嬰兒的所有成員（purge 用）."""
+        user_ids = list(self._users_by_baby.get(baby_id, ()))
+        for user_id in user_ids:
+            del self._memberships[(baby_id, user_id)]
+            self._unindex(baby_id, user_id)
+        return len(user_ids)
+
 
 class InMemoryWeightRepository(WeightRepository):
     """In-Memory 體重 Repository."""
@@ -187,6 +330,35 @@ class InMemoryWeightRepository(WeightRepository):
     def __init__(self) -> None:
         """初始化."""
         self._weights: dict[str, Weight] = {}
+        # baby_id -> 依 (timestamp, weight_id) 排序的列表，區間查詢以 bisect 定位
+        self._timeline: dict[str, list[tuple[datetime, str]]] = {}
+        self.journal: Journal | None = None
+
+    def _index(self, weight: Weight) -> None:
+        """加入時間索引."""
+        insort(self._timeline.setdefault(weight.baby_id, []), (weight.timestamp, weight.weight_id))
+
+    def _unindex(self, weight: Weight) -> None:
+        """從時間索引移除."""
+        entries = self._timeline.get(weight.baby_id)
+        if not entries:
+            return
+        entry = (weight.timestamp, weight.weight_id)
+        i = bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+        if not entries:
+            del self._timeline[weight.baby_id]
+
+    def _put(self, weight: Weight) -> None:
+        """寫入體重紀錄並維護時間索引."""
+        previous = self._weights.get(weight.weight_id)
+        self._weights[weight.weight_id] = weight
+        if previous is None:
+            self._index(weight)
+        elif previous.timestamp != weight.timestamp or previous.baby_id != weight.baby_id:
+            self._unindex(previous)
+            self._index(weight)
 
     async def get(self, baby_id: str, weight_id: str) -> Weight | None:
         """取得體重紀錄."""
@@ -195,6 +367,15 @@ class InMemoryWeightRepository(WeightRepository):
             return weight
         return None
 
+    async def get_many(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], Weight]:
+        """批次取得體重紀錄."""
+        results: dict[tuple[str, str], Weight] = {}
+        for baby_id, weight_id in keys:
+            weight = self._weights.get(weight_id)
+            if weight and weight.baby_id == baby_id:
+                results[(baby_id, weight_id)] = weight
+        return results
+
     async def create(self, baby_id: str, data: WeightCreate, created_by: str) -> Weight:
         """建立體重紀錄."""
         weight_id = generate_ulid()
@@ -208,7 +389,9 @@ class InMemoryWeightRepository(WeightRepository):
             created_at=datetime.now(UTC),
             updated_at=None,
         )
-        self._weights[weight_id] = weight
+        self._put(weight)
+        if self.journal:
+            await self.journal("weight.put", weight)
         return weight
 
     async def update(self, baby_id: str, weight_id: str, data: WeightUpdate) -> Weight | None:
@@ -220,7 +403,9 @@ class InMemoryWeightRepository(WeightRepository):
         update_data = data.model_dump(exclude_unset=True)
         update_data["updated_at"] = datetime.now(UTC)
         updated_weight = weight.model_copy(update=update_data)
-        self._weights[weight_id] = updated_weight
+        self._put(updated_weight)
+        if self.journal:
+            await self.journal("weight.put", updated_weight)
         return updated_weight
 
     async def delete(self, baby_id: str, weight_id: str) -> bool:
@@ -228,6 +413,9 @@ class InMemoryWeightRepository(WeightRepository):
         weight = await self.get(baby_id, weight_id)
         if weight:
             del self._weights[weight_id]
+            self._unindex(weight)
+            if self.journal:
+                await self.journal("weight.delete", (baby_id, weight_id))
             return True
         return False
 
@@ -237,16 +425,47 @@ class InMemoryWeightRepository(WeightRepository):
         from_date: datetime | None = None,
         to_date: datetime | None = None,
     ) -> list[Weight]:
-        """取得嬰兒的體重紀錄."""
-        weights = [w for w in self._weights.values() if w.baby_id == baby_id]
+        """取得嬰兒的體重紀錄（按時間排序）."""
+        entries, start, end = self._range(baby_id, from_date, to_date)
+        return [self._weights[weight_id] for _, weight_id in entries[start:end]]
 
-        if from_date:
-            weights = [w for w in weights if w.timestamp >= from_date]
-        if to_date:
-            weights = [w for w in weights if w.timestamp <= to_date]
+    async def count(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> int:
+        """取得嬰兒的體重紀錄筆數（只需 bisect 定位）."""
+        _, start, end = self._range(baby_id, from_date, to_date)
+        return end - start
 
-        # 按時間排序
-        return sorted(weights, key=lambda w: w.timestamp)
+    async def stats(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> WeightStats:
+        """取得嬰兒體重紀錄的筆數、總和與平均."""
+        entries, start, end = self._range(baby_id, from_date, to_date)
+        total = sum(self._weights[weight_id].weight_g for _, weight_id in entries[start:end])
+        count = end - start
+        return WeightStats(count=count, sum_g=total, avg_g=total / count if count else None)
+
+    def _range(
+        self, baby_id: str, from_date: datetime | None, to_date: datetime | None
+    ) -> tuple[list[tuple[datetime, str]], int, int]:
+        """以 bisect 定位時間區間，回傳 (時間索引, 起點, 終點)."""
+        entries = self._timeline.get(baby_id, [])
+        start = bisect_left(entries, from_date, key=itemgetter(0)) if from_date else 0
+        end = bisect_right(entries, to_date, key=itemgetter(0)) if to_date else len(entries)
+        return entries, start, end
+
+    def _delete_by_baby(self, baby_id: str) -> int:
+        """刪除嬰兒的所有體重紀錄（purge 用）."""
+        entries = self._timeline.pop(baby_id, [])
+        for _, weight_id in entries:
+            del self._weights[weight_id]
+        return len(entries)
 
 
 class InMemoryRepositories:
@@ -254,11 +473,82 @@ class InMemoryRepositories:
 
     def __init__(self) -> None:
         """初始化所有 repositories."""
-        self.identity_links = InMemoryIdentityLinkRepository()
+        # identity_links 可能被快取包裝取代，持久化直接使用底層 repository
+        self._links = InMemoryIdentityLinkRepository()
+        self.identity_links: IdentityLinkRepository = self._links
         self.users = InMemoryUserRepository()
         self.memberships = InMemoryMembershipRepository()
-        self.babies = InMemoryBabyRepository(self.memberships)
         self.weights = InMemoryWeightRepository()
+        self.babies = InMemoryBabyRepository(self.memberships, self.weights)
+
+    def set_journal(self, journal: Journal | None) -> None:
+        """設定（或移除）所有 repository 的寫入紀錄 callback."""
+        self._links.journal = journal
+        self.users.journal = journal
+        self.babies.journal = journal
+        self.memberships.journal = journal
+        self.weights.journal = journal
+
+    def is_empty(self) -> bool:
+        """是否沒有任何資料."""
+        return not (self._links._links or self.users._users or self.babies._babies)
+
+    def export_state(self) -> dict[str, list[Any]]:
+        """取得目前所有資料（淺層複製；model 只會被取代不會被修改，可在其他執行緒序列化）."""
+        return {
+            "links": list(self._links._links.values()),
+            "users": list(self.users._users.values()),
+            "babies": list(self.babies._babies.values()),
+            "deleted_babies": list(self.babies._deleted),
+            "members": list(self.memberships._memberships.values()),
+            "weights": list(self.weights._weights.values()),
+        }
+
+    def import_state(self, state: dict[str, list[Any]]) -> None:
+        """載入 export_state 的資料（_put 不寫入紀錄）."""
+        for link in state.get("links", []):
+            self._links._put(link)
+        for user in state.get("users", []):
+            self.users._put(user)
+        for baby in state.get("babies", []):
+            self.babies._put(baby)
+        self.babies._deleted.update(state.get("deleted_babies", []))
+        for membership in state.get("members", []):
+            self.memberships._put(membership)
+        for weight in state.get("weights", []):
+            self.weights._put(weight)
+
+    async def apply(self, op: str, payload: Any) -> None:
+        """重播一筆寫入紀錄（不寫入紀錄）.
+
+        Raises:
+            ValueError: 未知的操作
+        """
+        journal = self.weights.journal
+        self.set_journal(None)
+        try:
+            if op == "link.put":
+                self._links._put(payload)
+            elif op == "user.put":
+                self.users._put(payload)
+            elif op == "baby.put":
+                self.babies._put(payload)
+            elif op == "baby.delete":
+                await self.babies.delete(payload)
+            elif op == "baby.purge":
+                await self.babies.purge(payload)
+            elif op == "member.put":
+                self.memberships._put(payload)
+            elif op == "member.delete":
+                await self.memberships.delete(*payload)
+            elif op == "weight.put":
+                self.weights._put(payload)
+            elif op == "weight.delete":
+                await self.weights.delete(*payload)
+            else:
+                raise ValueError(f"Unknown journal operation: {op}")
+        finally:
+            self.set_journal(journal)
 
     async def init_dev_data(self) -> None:
         """初始化開發模式測試資料."""
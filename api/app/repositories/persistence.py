@@ -0,0 +1,405 @@
+"""In-Memory Repository 持久化（snapshot + write-ahead log）.
+
+每次寫入都以一筆紀錄附加到 write-ahead log（wal-<generation>.log），
+定期將全部資料寫成 snapshot（snapshot.bin）並換到新的 log；
+重新啟動時載入 snapshot 再重播之後的 log. 檔案權限皆為 0600.
+
+檔案格式：
+- log 紀錄：<長度 u32><CRC32 u32><pickle((op, payload))>；尾端不完整或 CRC 錯誤的紀錄視為寫入中斷而忽略
+- snapshot：<magic 8 bytes><generation u64><pickle(state)>；generation 之前的 log 都已包含在 snapshot 中
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import pickle
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+from api.app.models import Baby, IdentityLink, Membership, User, Weight
+from api.app.repositories.memory import InMemoryRepositories
+
+logger = logging.getLogger(__name__)
+
+FsyncPolicy = Literal["always", "interval", "never"]
+
+SNAPSHOT_MAGIC = b"BWSNAP01"
+_SNAPSHOT_HEADER = struct.Struct("<8sQ")
+_RECORD_HEADER = struct.Struct("<II")
+
+# 寫入紀錄中 model 的型別（payload 以 model_dump 的 dict 保存，載入時以 model_construct 重建）
+_RECORD_MODELS: dict[str, type[BaseModel]] = {
+    "link.put": IdentityLink,
+    "user.put": User,
+    "baby.put": Baby,
+    "member.put": Membership,
+    "weight.put": Weight,
+}
+_STATE_MODELS: dict[str, type[BaseModel]] = {
+    "links": IdentityLink,
+    "users": User,
+    "babies": Baby,
+    "members": Membership,
+    "weights": Weight,
+}
+
+
+def _encode_record(op: str, payload: Any) -> bytes:
+    """編碼一筆寫入紀錄."""
+    if isinstance(payload, BaseModel):
+        payload = payload.model_dump()
+    body = pickle.dumps((op, payload), protocol=pickle.HIGHEST_PROTOCOL)
+    return _RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def _decode_record(op: str, payload: Any) -> Any:
+    """解碼寫入紀錄的 payload."""
+    model = _RECORD_MODELS.get(op)
+    return model.model_construct(**payload) if model else payload
+
+
+def read_log(path: Path) -> tuple[list[tuple[str, Any]], bool]:
+    """讀取 log 檔.
+
+    Returns:
+        (紀錄列表, 是否在尾端遇到不完整的紀錄)
+    """
+    records: list[tuple[str, Any]] = []
+    data = path.read_bytes()
+    offset = 0
+    while offset < len(data):
+        if offset + _RECORD_HEADER.size > len(data):
+            return records, True
+        length, crc = _RECORD_HEADER.unpack_from(data, offset)
+        start = offset + _RECORD_HEADER.size
+        body = data[start : start + length]
+        if len(body) < length or zlib.crc32(body) != crc:
+            return records, True
+        op, payload = pickle.loads(body)
+        records.append((op, _decode_record(op, payload)))
+        offset = start + length
+    return records, False
+
+
+def _dump_state(state: dict[str, list[Any]]) -> dict[str, list[Any]]:
+    """將 export_state 的 model 轉為 dict（在背景執行緒執行）."""
+    return {
+        key: [m.model_dump() for m in values] if key in _STATE_MODELS else list(values)
+        for key, values in state.items()
+    }
+
+
+def write_snapshot(path: Path, generation: int, state: dict[str, list[Any]]) -> int:
+    """寫入 snapshot（先寫暫存檔並 fsync，再以 rename 原子地取代）.
+
+    Returns:
+        檔案大小（bytes）
+    """
+    body = pickle.dumps(_dump_state(state), protocol=pickle.HIGHEST_PROTOCOL)
+    tmp = path.with_suffix(".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    # 先前留下的暫存檔可能是其他權限（O_CREAT 的 mode 只套用在新檔案）
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, generation))
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp.replace(path)
+    _fsync_dir(path.parent)
+    return _SNAPSHOT_HEADER.size + len(body)
+
+
+def read_snapshot(path: Path) -> tuple[int, dict[str, list[Any]]]:
+    """讀取 snapshot.
+
+    Returns:
+        (generation, state)
+
+    Raises:
+        ValueError: 檔案格式錯誤
+    """
+    data = path.read_bytes()
+    if len(data) < _SNAPSHOT_HEADER.size:
+        raise ValueError(f"Snapshot {path} is truncated")
+    magic, generation = _SNAPSHOT_HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"Snapshot {path} has unknown format")
+    with memoryview(data) as view:
+        raw = pickle.loads(view[_SNAPSHOT_HEADER.size :])
+    state = {
+        key: [model.model_construct(**d) for d in raw.get(key, [])]
+        for key, model in _STATE_MODELS.items()
+    }
+    state["deleted_babies"] = list(raw.get("deleted_babies", []))
+    return generation, state
+
+
+def _fsync_dir(directory: Path) -> None:
+    """fsync 目錄（讓 rename / 新檔案的目錄項目落盤）."""
+    with contextlib.suppress(OSError):
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class MemoryPersistence:
+    """In-Memory Repository 的 snapshot + write-ahead log.
+
+    紀錄在 event loop 上直接 write（維持與記憶體異動相同的順序），fsync 一律在背景執行緒執行.
+
+    fsync 策略：
+    - always：寫入等到 fsync 完成才回傳（最耐久，寫入延遲最高；併發的寫入共用同一次 fsync）
+    - interval：背景每隔 fsync_interval_seconds fsync 一次（斷電時最多遺失這段時間的寫入）
+    - never：只寫入 OS page cache（程序崩潰不遺失，斷電可能遺失）
+    """
+
+    def __init__(
+        self,
+        repos: InMemoryRepositories,
+        directory: str | Path,
+        fsync: FsyncPolicy = "interval",
+        fsync_interval_seconds: float = 1.0,
+        snapshot_interval_seconds: float = 300.0,
+    ) -> None:
+        """初始化.
+
+        Args:
+            repos: 要持久化的 In-Memory Repositories
+            directory: 存放 snapshot 與 log 的目錄
+            fsync: fsync 策略
+            fsync_interval_seconds: fsync=interval 時的間隔
+            snapshot_interval_seconds: 背景寫入 snapshot 的間隔（0 表示只在關閉時寫入）
+        """
+        self._repos = repos
+        self._dir = Path(directory)
+        self._fsync = fsync
+        self._fsync_interval_seconds = fsync_interval_seconds
+        self._snapshot_interval_seconds = snapshot_interval_seconds
+
+        self._generation = 0
+        self._fd: int | None = None
+        self._synced_records = 0  # 已 fsync 的紀錄數（與 _records_written 比較）
+        self._sync_lock = asyncio.Lock()  # fsync 與換 log 互斥
+        self._records_since_snapshot = 0
+        self._snapshot_lock = asyncio.Lock()
+        self._tasks: list[asyncio.Task[None]] = []
+
+        self._records_written = 0
+        self._bytes_written = 0
+        self._append_seconds_total = 0.0
+        self._load_stats: dict[str, float | int] = {}
+        self._last_snapshot: dict[str, float | int] = {}
+
+    @property
+    def snapshot_path(self) -> Path:
+        """Snapshot 檔案路徑."""
+        return self._dir / "snapshot.bin"
+
+    def _log_path(self, generation: int) -> Path:
+        """Log 檔案路徑."""
+        return self._dir / f"wal-{generation:010d}.log"
+
+    def _log_generations(self) -> list[int]:
+        """目錄中現有 log 的 generation（遞增排序）."""
+        generations = []
+        for path in self._dir.glob("wal-*.log"):
+            with contextlib.suppress(ValueError):
+                generations.append(int(path.stem.removeprefix("wal-")))
+        return sorted(generations)
+
+    async def load(self) -> dict[str, float | int]:
+        """載入 snapshot 並重播之後的 log，然後開始寫入新的 log.
+
+        Returns:
+            載入統計
+        """
+        started_at = time.perf_counter()
+        self._dir.mkdir(parents=True, exist_ok=True)
+
+        snapshot_generation = 0
+        snapshot_records = 0
+        if self.snapshot_path.exists():
+            snapshot_generation, state = await asyncio.to_thread(read_snapshot, self.snapshot_path)
+            self._repos.import_state(state)
+            snapshot_records = sum(len(values) for values in state.values())
+        snapshot_seconds = time.perf_counter() - started_at
+
+        replayed = 0
+        generations = [g for g in self._log_generations() if g >= snapshot_generation]
+        for generation in generations:
+            records, torn = await asyncio.to_thread(read_log, self._log_path(generation))
+            for op, payload in records:
+                await self._repos.apply(op, payload)
+            replayed += len(records)
+            if torn:
+                logger.warning(f"Ignoring incomplete tail of {self._log_path(generation).name}")
+
+        # 每次啟動寫入新的 log，不需要截斷舊 log 的不完整尾端
+        self._generation = max([snapshot_generation, *generations], default=0) + 1
+        self._open_log()
+        self._records_since_snapshot = replayed
+        self._repos.set_journal(self._append)
+
+        self._load_stats = {
+            "snapshot_records": snapshot_records,
+            "replayed_records": replayed,
+            "snapshot_seconds": round(snapshot_seconds, 4),
+            "total_seconds": round(time.perf_counter() - started_at, 4),
+        }
+        logger.info(f"In-memory data loaded from {self._dir}: {self._load_stats}")
+        return self._load_stats
+
+    def _open_log(self) -> None:
+        """開啟目前 generation 的 log（附加模式）."""
+        path = self._log_path(self._generation)
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        _fsync_dir(self._dir)
+
+    def _swap_log(self, reopen: bool) -> tuple[int | None, int]:
+        """換掉目前的 log（不經過 await，之後的寫入只會進入新 log；呼叫端需持有 _sync_lock）.
+
+        Args:
+            reopen: 是否換到下一個 generation 的 log（False 表示只關閉）
+
+        Returns:
+            (舊 log 的 fd, 舊 log 包含的紀錄數)
+        """
+        fd, self._fd = self._fd, None
+        if reopen:
+            self._generation += 1
+            self._open_log()
+        return fd, self._records_written
+
+    async def _retire_log(self, fd: int, records: int) -> None:
+        """在背景執行緒 fsync 並關閉換下來的 log."""
+        await asyncio.to_thread(os.fsync, fd)
+        os.close(fd)
+        self._synced_records = max(self._synced_records, records)
+
+    async def _sync(self, records: int) -> None:
+        """fsync 到至少包含前 records 筆紀錄（等待中的寫入由同一次 fsync 涵蓋）."""
+        async with self._sync_lock:
+            if self._synced_records >= records or self._fd is None:
+                return
+            target = self._records_written
+            await asyncio.to_thread(os.fsync, self._fd)
+            self._synced_records = target
+
+    async def _append(self, op: str, payload: Any) -> None:
+        """附加一筆寫入紀錄（Journal callback）.
+
+        await 之前就完成 write，紀錄順序與呼叫順序相同；fsync=always 時等到 fsync 完成才回傳.
+        """
+        if self._fd is None:
+            raise RuntimeError("Memory persistence log is not open")
+        started_at = time.perf_counter()
+        record = _encode_record(op, payload)
+        os.write(self._fd, record)
+        self._records_written += 1
+        self._records_since_snapshot += 1
+        self._bytes_written += len(record)
+        if self._fsync == "always":
+            await self._sync(self._records_written)
+        self._append_seconds_total += time.perf_counter() - started_at
+
+    async def start(self) -> None:
+        """啟動背景 fsync 與 snapshot."""
+        if self._tasks:
+            return
+        if self._fsync == "interval":
+            self._tasks.append(asyncio.create_task(self._fsync_loop()))
+        if self._snapshot_interval_seconds > 0:
+            self._tasks.append(asyncio.create_task(self._snapshot_loop()))
+
+    async def close(self, snapshot: bool = True) -> None:
+        """停止背景工作，寫入最後的 snapshot 並關閉 log."""
+        for task in self._tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        if snapshot and self._fd is not None and self._records_since_snapshot:
+            await self.snapshot()
+        self._repos.set_journal(None)
+        async with self._sync_lock:
+            fd, records = self._swap_log(reopen=False)
+            if fd is not None:
+                await self._retire_log(fd, records)
+
+    async def snapshot(self) -> dict[str, float | int]:
+        """寫入 snapshot 並刪除已包含在 snapshot 中的 log.
+
+        先換到新的 log 並在 event loop 內淺層複製所有資料（之後的寫入只會進入新 log），
+        序列化與寫檔在背景執行緒進行.
+
+        Returns:
+            Snapshot 統計
+        """
+        async with self._snapshot_lock:
+            started_at = time.perf_counter()
+            async with self._sync_lock:
+                fd, records = self._swap_log(reopen=True)
+                generation = self._generation
+                records_before = self._records_since_snapshot
+                state = self._repos.export_state()
+                if fd is not None:
+                    await self._retire_log(fd, records)
+
+            size = await asyncio.to_thread(write_snapshot, self.snapshot_path, generation, state)
+            for old in self._log_generations():
+                if old < generation:
+                    self._log_path(old).unlink(missing_ok=True)
+            self._records_since_snapshot = max(self._records_since_snapshot - records_before, 0)
+
+            self._last_snapshot = {
+                "generation": generation,
+                "records": sum(len(values) for values in state.values()),
+                "bytes": size,
+                "seconds": round(time.perf_counter() - started_at, 4),
+            }
+            logger.info(f"In-memory snapshot written: {self._last_snapshot}")
+            return self._last_snapshot
+
+    def stats(self) -> dict[str, object]:
+        """取得持久化統計."""
+        written = self._records_written
+        return {
+            "fsync": self._fsync,
+            "generation": self._generation,
+            "records_written": written,
+            "bytes_written": self._bytes_written,
+            "append_us_avg": round(self._append_seconds_total / written * 1e6, 2)
+            if written
+            else 0.0,
+            "records_since_snapshot": self._records_since_snapshot,
+            "load": self._load_stats,
+            "last_snapshot": self._last_snapshot,
+        }
+
+    async def _fsync_loop(self) -> None:
+        """定期 fsync."""
+        while True:
+            await asyncio.sleep(self._fsync_interval_seconds)
+            try:
+                await self._sync(self._records_written)
+            except OSError as e:
+                logger.error(f"Failed to fsync in-memory log: {e}")
+
+    async def _snapshot_loop(self) -> None:
+        """定期寫入 snapshot（沒有新寫入時跳過）."""
+        while True:
+            await asyncio.sleep(self._snapshot_interval_seconds)
+            if self._records_since_snapshot:
+                try:
+                    await self.snapshot()
+                except Exception as e:
+                    logger.error(f"Failed to write in-memory snapshot: {e}", exc_info=True)
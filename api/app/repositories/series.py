@@ -0,0 +1,166 @@
+"""單一嬰兒的體重序列（欄位式儲存）.
+
+時間、體重、Z-score 各自存放在 array 中，區間查詢以 bisect 定位後切片；
+統計直接對 array 切片加總，不需要逐筆讀取 model.
+"""
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import UTC, datetime, timedelta
+
+from api.app.data import age_in_months, weight_to_zscore
+from api.app.models import Baby, Weight, WeightStats
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _to_micros(value: datetime) -> int:
+    """datetime 轉為 UTC epoch 微秒（無時區視為 UTC）."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def weight_zscore(weight: Weight, baby: Baby) -> float | None:
+    """計算體重紀錄的 weight-for-age Z-score（超出數據範圍時回傳 None）."""
+    age_months = age_in_months(baby.birth_date, weight.timestamp.date())
+    return weight_to_zscore(weight.weight_g / 1000, baby.gender.value, age_months)  # type: ignore
+
+
+class WeightSeries:
+    """嬰兒的完整體重紀錄，依 (timestamp, weight_id) 排序.
+
+    Z-score 依嬰兒的性別與出生日期計算；第一次需要時整批計算，
+    之後新增或修改紀錄時只計算該筆. 嬰兒資料變更時重新計算.
+    """
+
+    __slots__ = ("_profile", "_timestamps_by_id", "grams", "timestamps", "weights", "z_scores")
+
+    def __init__(self, weights: list[Weight]) -> None:
+        """初始化.
+
+        Args:
+            weights: 依 (timestamp, weight_id) 排序的體重紀錄
+        """
+        self.weights = weights
+        self.timestamps = array("q", [_to_micros(w.timestamp) for w in weights])
+        self.grams = array("i", [w.weight_g for w in weights])
+        self.z_scores = array("d")  # NaN 表示超出數據範圍
+        self._profile: Baby | None = None  # z_scores 依據的嬰兒資料
+        self._timestamps_by_id = {
+            w.weight_id: ts for w, ts in zip(weights, self.timestamps, strict=True)
+        }
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def _bounds(self, from_date: datetime | None, to_date: datetime | None) -> tuple[int, int]:
+        """以 bisect 定位時間區間（包含端點）."""
+        timestamps = self.timestamps
+        start = bisect_left(timestamps, _to_micros(from_date)) if from_date else 0
+        end = bisect_right(timestamps, _to_micros(to_date)) if to_date else len(timestamps)
+        return start, end
+
+    def _find(self, weight_id: str) -> int | None:
+        timestamp = self._timestamps_by_id.get(weight_id)
+        if timestamp is None:
+            return None
+        i = bisect_left(self.timestamps, timestamp)
+        while self.weights[i].weight_id != weight_id:
+            i += 1
+        return i
+
+    def _zscore(self, weight: Weight) -> float:
+        if self._profile is None:
+            return math.nan
+        z_score = weight_zscore(weight, self._profile)
+        return math.nan if z_score is None else z_score
+
+    def get(self, weight_id: str) -> Weight | None:
+        """取得體重紀錄."""
+        i = self._find(weight_id)
+        return None if i is None else self.weights[i]
+
+    def slice(self, from_date: datetime | None, to_date: datetime | None) -> list[Weight]:
+        """取得時間區間內的體重紀錄."""
+        start, end = self._bounds(from_date, to_date)
+        return self.weights[start:end]
+
+    def count(self, from_date: datetime | None, to_date: datetime | None) -> int:
+        """時間區間內的筆數."""
+        start, end = self._bounds(from_date, to_date)
+        return end - start
+
+    def stats(self, from_date: datetime | None, to_date: datetime | None) -> WeightStats:
+        """時間區間內的筆數、總和與平均."""
+        start, end = self._bounds(from_date, to_date)
+        count = end - start
+        total = sum(self.grams[start:end])
+        return WeightStats(count=count, sum_g=total, avg_g=total / count if count else None)
+
+    def with_zscores(
+        self, baby: Baby, from_date: datetime | None, to_date: datetime | None
+    ) -> list[tuple[Weight, float | None]]:
+        """時間區間內的體重紀錄與 Z-score."""
+        profile = self._profile
+        if (
+            profile is None
+            or profile.gender != baby.gender
+            or profile.birth_date != baby.birth_date
+        ):
+            self._profile = baby
+            self.z_scores = array("d", [self._zscore(w) for w in self.weights])
+        start, end = self._bounds(from_date, to_date)
+        return [
+            (weight, None if math.isnan(z_score) else z_score)
+            for weight, z_score in zip(
+                self.weights[start:end], self.z_scores[start:end], strict=True
+            )
+        ]
+
+    def insert(self, weight: Weight) -> None:
+        """加入體重紀錄（時間晚於所有紀錄時直接附加在尾端；已存在時取代原紀錄）."""
+        if weight.weight_id in self._timestamps_by_id:
+            self.replace(weight)
+            return
+        timestamp = _to_micros(weight.timestamp)
+        if not self.timestamps or timestamp > self.timestamps[-1]:
+            i = len(self.weights)
+        else:
+            # 同一時間的紀錄依 weight_id 排序
+            i = bisect_left(self.timestamps, timestamp)
+            end = bisect_right(self.timestamps, timestamp, lo=i)
+            while i < end and self.weights[i].weight_id < weight.weight_id:
+                i += 1
+        self.weights.insert(i, weight)
+        self.timestamps.insert(i, timestamp)
+        self.grams.insert(i, weight.weight_g)
+        if self._profile is not None:
+            self.z_scores.insert(i, self._zscore(weight))
+        self._timestamps_by_id[weight.weight_id] = timestamp
+
+    def remove(self, weight_id: str) -> bool:
+        """移除體重紀錄."""
+        i = self._find(weight_id)
+        if i is None:
+            return False
+        del self.weights[i]
+        del self.timestamps[i]
+        del self.grams[i]
+        if self._profile is not None:
+            del self.z_scores[i]
+        del self._timestamps_by_id[weight_id]
+        return True
+
+    def replace(self, weight: Weight) -> None:
+        """以修改後的紀錄取代原紀錄（時間不變時原地修改）."""
+        i = self._find(weight.weight_id)
+        if i is None or self.timestamps[i] != _to_micros(weight.timestamp):
+            self.remove(weight.weight_id)
+            self.insert(weight)
+            return
+        self.weights[i] = weight
+        self.grams[i] = weight.weight_g
+        if self._profile is not None:
+            self.z_scores[i] = self._zscore(weight)
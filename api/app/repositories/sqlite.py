@@ -0,0 +1,762 @@
+"""SQLite Repository 實作（自架部署用）.
+
+單一資料庫檔案，WAL 模式下一條寫入連線（以 asyncio.Lock 串行化）搭配多條讀取連線，
+讀取不會被寫入阻塞；sqlite3 呼叫都以 asyncio.to_thread 執行，不阻塞 event loop.
+
+SQL 皆為固定字串，由每條連線的 statement cache 重複使用已編譯的 statement.
+時間欄位以 UTC epoch 微秒（INTEGER）保存，排序與區間查詢直接走索引.
+"""
+
+import asyncio
+import sqlite3
+from collections.abc import Callable, Iterator
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any, TypeVar
+
+from ulid import ULID
+
+from api.app.models import (
+    Baby,
+    BabyCreate,
+    BabyUpdate,
+    Gender,
+    IdentityLink,
+    MemberRole,
+    Membership,
+    User,
+    UserCreate,
+    Weight,
+    WeightCreate,
+    WeightStats,
+    WeightUpdate,
+)
+from api.app.repositories.base import (
+    BabyRepository,
+    IdentityLinkRepository,
+    MembershipRepository,
+    UserRepository,
+    WeightRepository,
+    identity_link_id,
+)
+
+R = TypeVar("R")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# 每條連線快取的已編譯 statement 數（需大於本模組的 SQL 數量）
+_STATEMENT_CACHE_SIZE = 128
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS identity_links (
+    link_id TEXT PRIMARY KEY,
+    provider_iss TEXT NOT NULL,
+    provider_sub TEXT NOT NULL,
+    internal_user_id TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    internal_user_id TEXT PRIMARY KEY,
+    display_name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_email ON users (email, created_at);
+CREATE TABLE IF NOT EXISTS babies (
+    baby_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    birth_date TEXT NOT NULL,
+    gender TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS babies_deleted ON babies (deleted) WHERE deleted = 1;
+CREATE TABLE IF NOT EXISTS memberships (
+    baby_id TEXT NOT NULL,
+    internal_user_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    joined_at INTEGER NOT NULL,
+    PRIMARY KEY (baby_id, internal_user_id)
+);
+CREATE INDEX IF NOT EXISTS memberships_by_user ON memberships (internal_user_id, baby_id);
+CREATE TABLE IF NOT EXISTS weights (
+    weight_id TEXT PRIMARY KEY,
+    baby_id TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    weight_g INTEGER NOT NULL,
+    note TEXT,
+    created_by TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER
+);
+CREATE INDEX IF NOT EXISTS weights_by_baby_time ON weights (baby_id, timestamp, weight_id);
+"""
+
+_LINK_COLUMNS = "link_id, provider_iss, provider_sub, internal_user_id, created_at"
+_USER_COLUMNS = "internal_user_id, display_name, email, created_at"
+_BABY_COLUMNS = "baby_id, name, birth_date, gender, created_at"
+_MEMBER_COLUMNS = "baby_id, internal_user_id, role, joined_at"
+_WEIGHT_COLUMNS = (
+    "weight_id, baby_id, timestamp, weight_g, note, created_by, created_at, updated_at"
+)
+
+_SELECT_LINK = f"SELECT {_LINK_COLUMNS} FROM identity_links WHERE link_id = ?"
+_UPSERT_LINK = (
+    f"INSERT INTO identity_links ({_LINK_COLUMNS}) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (link_id) DO UPDATE SET internal_user_id = excluded.internal_user_id, "
+    "created_at = excluded.created_at"
+)
+_SELECT_USER = f"SELECT {_USER_COLUMNS} FROM users WHERE internal_user_id = ?"
+_SELECT_USER_BY_EMAIL = (
+    f"SELECT {_USER_COLUMNS} FROM users WHERE email = ? ORDER BY created_at LIMIT 1"
+)
+_UPSERT_USER = (
+    f"INSERT INTO users ({_USER_COLUMNS}) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (internal_user_id) DO UPDATE SET display_name = excluded.display_name, "
+    "email = excluded.email, created_at = excluded.created_at"
+)
+_SELECT_BABY = f"SELECT {_BABY_COLUMNS} FROM babies WHERE baby_id = ? AND deleted = 0"
+_INSERT_BABY = f"INSERT INTO babies ({_BABY_COLUMNS}) VALUES (?, ?, ?, ?, ?)"
+_UPDATE_BABY = "UPDATE babies SET name = ?, birth_date = ?, gender = ? WHERE baby_id = ?"
+_MARK_BABY_DELETED = "UPDATE babies SET deleted = 1 WHERE baby_id = ? AND deleted = 0"
+_DELETE_BABY = "DELETE FROM babies WHERE baby_id = ?"
+_SELECT_DELETED_BABY_IDS = "SELECT baby_id FROM babies WHERE deleted = 1"
+_SELECT_BABIES_WITH_MEMBERSHIP = (
+    "SELECT b.baby_id, b.name, b.birth_date, b.gender, b.created_at, "
+    "m.baby_id, m.internal_user_id, m.role, m.joined_at "
+    "FROM memberships AS m JOIN babies AS b ON b.baby_id = m.baby_id "
+    "WHERE m.internal_user_id = ? AND b.deleted = 0 ORDER BY m.rowid"
+)
+_SELECT_MEMBER = (
+    f"SELECT {_MEMBER_COLUMNS} FROM memberships WHERE baby_id = ? AND internal_user_id = ?"
+)
+_UPSERT_MEMBER = (
+    f"INSERT INTO memberships ({_MEMBER_COLUMNS}) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (baby_id, internal_user_id) DO UPDATE SET role = excluded.role, "
+    "joined_at = excluded.joined_at"
+)
+_SELECT_MEMBERS_BY_BABY = (
+    f"SELECT {_MEMBER_COLUMNS} FROM memberships WHERE baby_id = ? ORDER BY rowid"
+)
+_SELECT_MEMBERS_BY_USER = (
+    f"SELECT {_MEMBER_COLUMNS} FROM memberships WHERE internal_user_id = ? ORDER BY rowid"
+)
+_DELETE_MEMBER = "DELETE FROM memberships WHERE baby_id = ? AND internal_user_id = ?"
+_DELETE_MEMBERS_BY_BABY = "DELETE FROM memberships WHERE baby_id = ?"
+_COUNT_MEMBERS_BY_BABY = "SELECT COUNT(*) FROM memberships WHERE baby_id = ?"
+_SELECT_WEIGHT = f"SELECT {_WEIGHT_COLUMNS} FROM weights WHERE weight_id = ? AND baby_id = ?"
+_INSERT_WEIGHT = f"INSERT INTO weights ({_WEIGHT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_UPDATE_WEIGHT = (
+    "UPDATE weights SET timestamp = ?, weight_g = ?, note = ?, updated_at = ? "
+    "WHERE weight_id = ? AND baby_id = ?"
+)
+_DELETE_WEIGHT = "DELETE FROM weights WHERE weight_id = ? AND baby_id = ?"
+_DELETE_WEIGHTS_BY_BABY = "DELETE FROM weights WHERE baby_id = ?"
+_SELECT_WEIGHTS_BY_BABY = (
+    f"SELECT {_WEIGHT_COLUMNS} FROM weights WHERE baby_id = ? "
+    "AND timestamp >= ? AND timestamp <= ? ORDER BY timestamp, weight_id"
+)
+
+_COUNT_WEIGHTS_BY_BABY = (
+    "SELECT COUNT(*) FROM weights WHERE baby_id = ? AND timestamp >= ? AND timestamp <= ?"
+)
+_AGGREGATE_WEIGHTS_BY_BABY = (
+    "SELECT COUNT(*), TOTAL(weight_g), AVG(weight_g) FROM weights "
+    "WHERE baby_id = ? AND timestamp >= ? AND timestamp <= ?"
+)
+
+# 區間查詢未指定端點時使用的上下界（INTEGER 範圍）
+_MIN_TIMESTAMP = -(2**63)
+_MAX_TIMESTAMP = 2**63 - 1
+
+
+def generate_ulid() -> str:
+    """產生 ULID."""
+    return str(ULID())
+
+
+def _to_micros(value: datetime) -> int:
+    """datetime 轉為 UTC epoch 微秒（無時區視為 UTC）."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(value: int) -> datetime:
+    """UTC epoch 微秒轉為 datetime."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _range_params(
+    baby_id: str, from_date: datetime | None, to_date: datetime | None
+) -> tuple[str, int, int]:
+    """體重區間查詢的參數（未指定端點時使用 INTEGER 上下界）."""
+    return (
+        baby_id,
+        _to_micros(from_date) if from_date else _MIN_TIMESTAMP,
+        _to_micros(to_date) if to_date else _MAX_TIMESTAMP,
+    )
+
+
+def _to_link(row: tuple[Any, ...]) -> IdentityLink:
+    return IdentityLink(
+        link_id=row[0],
+        provider_iss=row[1],
+        provider_sub=row[2],
+        internal_user_id=row[3],
+        created_at=_from_micros(row[4]),
+    )
+
+
+def _to_user(row: tuple[Any, ...]) -> User:
+    return User(
+        internal_user_id=row[0],
+        display_name=row[1],
+        email=row[2],
+        created_at=_from_micros(row[3]),
+    )
+
+
+def _to_baby(row: tuple[Any, ...]) -> Baby:
+    return Baby(
+        baby_id=row[0],
+        name=row[1],
+        birth_date=date.fromisoformat(row[2]),
+        gender=Gender(row[3]),
+        created_at=_from_micros(row[4]),
+    )
+
+
+def _to_membership(row: tuple[Any, ...]) -> Membership:
+    return Membership(
+        baby_id=row[0],
+        internal_user_id=row[1],
+        role=MemberRole(row[2]),
+        joined_at=_from_micros(row[3]),
+    )
+
+
+def _to_weight(row: tuple[Any, ...]) -> Weight:
+    return Weight(
+        weight_id=row[0],
+        baby_id=row[1],
+        timestamp=_from_micros(row[2]),
+        weight_g=row[3],
+        note=row[4],
+        created_by=row[5],
+        created_at=_from_micros(row[6]),
+        updated_at=_from_micros(row[7]) if row[7] is not None else None,
+    )
+
+
+def _chunks(items: list[str], size: int) -> Iterator[list[str]]:
+    """將列表切成固定大小（IN 查詢的參數數量有上限）."""
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+# SQLite 預設最多 999 個綁定參數
+_MAX_PARAMS = 900
+
+
+class SqliteDatabase:
+    """SQLite 連線池.
+
+    一條寫入連線（同一時間只有一個寫入 transaction）與 pool_size 條讀取連線；
+    連線在 worker thread 中使用，同一時間只會被一個 thread 使用.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, busy_timeout_ms: int = 5000) -> None:
+        """初始化並建立 schema.
+
+        Args:
+            path: 資料庫檔案路徑（父目錄不存在時自動建立）
+            pool_size: 讀取連線數
+            busy_timeout_ms: 等待其他 process 鎖定的最長時間
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._path = path
+        self._busy_timeout_ms = busy_timeout_ms
+        self._writer = self._connect()
+        self._writer.executescript(_SCHEMA)
+        self._write_lock = asyncio.Lock()
+        self._readers: asyncio.Queue[sqlite3.Connection] = asyncio.Queue()
+        self._all_readers = [self._connect() for _ in range(max(1, pool_size))]
+        for conn in self._all_readers:
+            self._readers.put_nowait(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        """建立連線並套用 PRAGMA."""
+        conn = sqlite3.connect(
+            self._path,
+            isolation_level=None,  # 自行以 BEGIN / COMMIT 控制 transaction
+            check_same_thread=False,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")  # WAL 下 commit 不需每次 fsync
+        conn.execute(f"PRAGMA busy_timeout = {int(self._busy_timeout_ms)}")
+        return conn
+
+    async def read(self, fn: Callable[[sqlite3.Connection], R]) -> R:
+        """以讀取連線執行."""
+        conn = await self._readers.get()
+        return await self._run(fn, conn, lambda: self._readers.put_nowait(conn))
+
+    async def write(self, fn: Callable[[sqlite3.Connection], R]) -> R:
+        """以寫入連線在單一 transaction 中執行（失敗時 rollback）."""
+        await self._write_lock.acquire()
+        return await self._run(self._transaction, fn, self._write_lock.release)
+
+    @staticmethod
+    async def _run(fn: Callable[[Any], R], arg: Any, release: Callable[[], None]) -> R:
+        """在 worker thread 執行，thread 結束後才釋放連線.
+
+        呼叫端被取消時 thread 仍會繼續執行到結束，連線不能提早交給其他請求.
+        """
+        future = asyncio.ensure_future(asyncio.to_thread(fn, arg))
+        future.add_done_callback(lambda _: release())
+        return await asyncio.shield(future)
+
+    def _transaction(self, fn: Callable[[sqlite3.Connection], R]) -> R:
+        conn = self._writer
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    async def close(self) -> None:
+        """關閉所有連線（等待進行中的讀取與寫入完成）."""
+        async with self._write_lock:
+            # 取回所有讀取連線：worker thread 仍在使用的連線要等它歸還後才能關閉
+            for _ in self._all_readers:
+                await self._readers.get()
+            for conn in self._all_readers:
+                conn.close()
+            self._writer.close()
+
+
+class SqliteIdentityLinkRepository(IdentityLinkRepository):
+    """SQLite 身份對應 Repository."""
+
+    def __init__(self, db: SqliteDatabase) -> None:
+        """初始化."""
+        self._db = db
+
+    async def find_by_provider(self, provider_iss: str, provider_sub: str) -> IdentityLink | None:
+        """透過 IdP 身份查詢."""
+        link_id = identity_link_id(provider_iss, provider_sub)
+        row = await self._db.read(lambda conn: conn.execute(_SELECT_LINK, (link_id,)).fetchone())
+        return _to_link(row) if row else None
+
+    async def create(
+        self, provider_iss: str, provider_sub: str, internal_user_id: str
+    ) -> IdentityLink:
+        """建立身份對應."""
+        link = IdentityLink(
+            link_id=identity_link_id(provider_iss, provider_sub),
+            provider_iss=provider_iss,
+            provider_sub=provider_sub,
+            internal_user_id=internal_user_id,
+            created_at=datetime.now(UTC),
+        )
+        params = (
+            link.link_id,
+            provider_iss,
+            provider_sub,
+            internal_user_id,
+            _to_micros(link.created_at),
+        )
+        await self._db.write(lambda conn: conn.execute(_UPSERT_LINK, params))
+        return link
+
+
+class SqliteUserRepository(UserRepository):
+    """SQLite 使用者 Repository."""
+
+    def __init__(self, db: SqliteDatabase) -> None:
+        """初始化."""
+        self._db = db
+
+    async def get(self, internal_user_id: str) -> User | None:
+        """取得使用者."""
+        row = await self._db.read(
+            lambda conn: conn.execute(_SELECT_USER, (internal_user_id,)).fetchone()
+        )
+        return _to_user(row) if row else None
+
+    async def get_many(self, internal_user_ids: list[str]) -> dict[str, User]:
+        """批次取得使用者."""
+        ids = list(dict.fromkeys(internal_user_ids))
+        if not ids:
+            return {}
+
+        def query(conn: sqlite3.Connection) -> list[Any]:
+            rows: list[Any] = []
+            for chunk in _chunks(ids, _MAX_PARAMS):
+                placeholders = ", ".join("?" * len(chunk))
+                rows.extend(
+                    conn.execute(
+                        f"SELECT {_USER_COLUMNS} FROM users "
+                        f"WHERE internal_user_id IN ({placeholders})",
+                        chunk,
+                    )
+                )
+            return rows
+
+        return {row[0]: _to_user(row) for row in await self._db.read(query)}
+
+    async def get_by_email(self, email: str) -> User | None:
+        """透過 Email 取得使用者（同一個 email 有多位使用者時回傳最早建立的）."""
+        row = await self._db.read(
+            lambda conn: conn.execute(_SELECT_USER_BY_EMAIL, (email,)).fetchone()
+        )
+        return _to_user(row) if row else None
+
+    async def create(self, internal_user_id: str, data: UserCreate) -> User:
+        """建立使用者."""
+        user = User(
+            internal_user_id=internal_user_id,
+            display_name=data.display_name,
+            email=data.email,
+            created_at=datetime.now(UTC),
+        )
+        params = (internal_user_id, user.display_name, user.email, _to_micros(user.created_at))
+        await self._db.write(lambda conn: conn.execute(_UPSERT_USER, params))
+        return user
+
+
+class SqliteBabyRepository(BabyRepository):
+    """SQLite 嬰兒 Repository."""
+
+    def __init__(self, db: SqliteDatabase) -> None:
+        """初始化."""
+        self._db = db
+
+    async def get(self, baby_id: str) -> Baby | None:
+        """取得嬰兒."""
+        row = await self._db.read(lambda conn: conn.execute(_SELECT_BABY, (baby_id,)).fetchone())
+        return _to_baby(row) if row else None
+
+    async def get_many(self, baby_ids: list[str]) -> dict[str, Baby]:
+        """批次取得嬰兒."""
+        ids = list(dict.fromkeys(baby_ids))
+        if not ids:
+            return {}
+
+        def query(conn: sqlite3.Connection) -> list[Any]:
+            rows: list[Any] = []
+            for chunk in _chunks(ids, _MAX_PARAMS):
+                placeholders = ", ".join("?" * len(chunk))
+                rows.extend(
+                    conn.execute(
+                        f"SELECT {_BABY_COLUMNS} FROM babies "
+                        f"WHERE baby_id IN ({placeholders}) AND deleted = 0",
+                        chunk,
+                    )
+                )
+            return rows
+
+        return {row[0]: _to_baby(row) for row in await self._db.read(query)}
+
+    async def create(self, data: BabyCreate) -> Baby:
+        """建立嬰兒."""
+        baby = Baby(
+            baby_id=generate_ulid(),
+            name=data.name,
+            birth_date=data.birth_date,
+            gender=data.gender,
+            created_at=datetime.now(UTC),
+        )
+        params = (
+            baby.baby_id,
+            baby.name,
+            baby.birth_date.isoformat(),
+            baby.gender.value,
+            _to_micros(baby.created_at),
+        )
+        await self._db.write(lambda conn: conn.execute(_INSERT_BABY, params))
+        return baby
+
+    async def update(self, baby_id: str, data: BabyUpdate) -> Baby | None:
+        """更新嬰兒."""
+        update_data = data.model_dump(exclude_unset=True)
+
+        def transaction(conn: sqlite3.Connection) -> Baby | None:
+            row = conn.execute(_SELECT_BABY, (baby_id,)).fetchone()
+            if row is None:
+                return None
+            baby = _to_baby(row).model_copy(update=update_data)
+            conn.execute(
+                _UPDATE_BABY,
+                (baby.name, baby.birth_date.isoformat(), Gender(baby.gender).value, baby_id),
+            )
+            return baby
+
+        return await self._db.write(transaction)
+
+    async def delete(self, baby_id: str) -> bool:
+        """標記刪除嬰兒."""
+        cursor = await self._db.write(lambda conn: conn.execute(_MARK_BABY_DELETED, (baby_id,)))
+        return cursor.rowcount > 0
+
+    async def purge(
+        self,
+        baby_id: str,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """實際刪除已標記刪除的嬰兒及其所有子集合（單一 transaction）."""
+
+        def transaction(conn: sqlite3.Connection) -> list[int]:
+            return [
+                conn.execute(_DELETE_MEMBERS_BY_BABY, (baby_id,)).rowcount,
+                conn.execute(_DELETE_WEIGHTS_BY_BABY, (baby_id,)).rowcount,
+                conn.execute(_DELETE_BABY, (baby_id,)).rowcount,
+            ]
+
+        deleted = 0
+        for count in await self._db.write(transaction):
+            deleted += count
+            if on_progress:
+                on_progress(deleted)
+        return deleted
+
+    async def list_deleted_ids(self) -> list[str]:
+        """取得已標記刪除但尚未 purge 的嬰兒 ID."""
+        rows = await self._db.read(lambda conn: conn.execute(_SELECT_DELETED_BABY_IDS).fetchall())
+        return [row[0] for row in rows]
+
+    async def list_by_user(self, internal_user_id: str) -> list[Baby]:
+        """取得使用者可存取的嬰兒列表."""
+        return [baby for baby, _ in await self.list_with_membership_by_user(internal_user_id)]
+
+    async def list_with_membership_by_user(
+        self, internal_user_id: str
+    ) -> list[tuple[Baby, Membership]]:
+        """取得使用者可存取的嬰兒列表（含該使用者的成員資格，一次 JOIN 查詢）."""
+        rows = await self._db.read(
+            lambda conn: conn.execute(
+                _SELECT_BABIES_WITH_MEMBERSHIP, (internal_user_id,)
+            ).fetchall()
+        )
+        return [(_to_baby(row[:5]), _to_membership(row[5:])) for row in rows]
+
+
+class SqliteMembershipRepository(MembershipRepository):
+    """SQLite 成員 Repository."""
+
+    def __init__(self, db: SqliteDatabase) -> None:
+        """初始化."""
+        self._db = db
+
+    async def get(self, baby_id: str, internal_user_id: str) -> Membership | None:
+        """取得成員資格."""
+        row = await self._db.read(
+            lambda conn: conn.execute(_SELECT_MEMBER, (baby_id, internal_user_id)).fetchone()
+        )
+        return _to_membership(row) if row else None
+
+    async def create(self, baby_id: str, internal_user_id: str, role: MemberRole) -> Membership:
+        """建立成員資格."""
+        membership = Membership(
+            baby_id=baby_id,
+            internal_user_id=internal_user_id,
+            role=role,
+            joined_at=datetime.now(UTC),
+        )
+        params = (baby_id, internal_user_id, role.value, _to_micros(membership.joined_at))
+        await self._db.write(lambda conn: conn.execute(_UPSERT_MEMBER, params))
+        return membership
+
+    async def list_by_baby(self, baby_id: str) -> list[Membership]:
+        """取得嬰兒的所有成員."""
+        rows = await self._db.read(
+            lambda conn: conn.execute(_SELECT_MEMBERS_BY_BABY, (baby_id,)).fetchall()
+        )
+        return [_to_membership(row) for row in rows]
+
+    async def list_by_user(self, internal_user_id: str) -> list[Membership]:
+        """取得使用者的所有成員資格."""
+        rows = await self._db.read(
+            lambda conn: conn.execute(_SELECT_MEMBERS_BY_USER, (internal_user_id,)).fetchall()
+        )
+        return [_to_membership(row) for row in rows]
+
+    async def delete(self, baby_id: str, internal_user_id: str) -> bool:
+        """刪除成員資格."""
+        cursor = await self._db.write(
+            lambda conn: conn.execute(_DELETE_MEMBER, (baby_id, internal_user_id))
+        )
+        return cursor.rowcount > 0
+
+    async def count_by_baby(self, baby_id: str) -> int:
+        """取得嬰兒的成員數."""
+        row = await self._db.read(
+            lambda conn: conn.execute(_COUNT_MEMBERS_BY_BABY, (baby_id,)).fetchone()
+        )
+        return int(row[0])
+
+
+class SqliteWeightRepository(WeightRepository):
+    """SQLite 體重 Repository."""
+
+    def __init__(self, db: SqliteDatabase) -> None:
+        """初始化."""
+        self._db = db
+
+    async def get(self, baby_id: str, weight_id: str) -> Weight | None:
+        """取得體重紀錄."""
+        row = await self._db.read(
+            lambda conn: conn.execute(_SELECT_WEIGHT, (weight_id, baby_id)).fetchone()
+        )
+        return _to_weight(row) if row else None
+
+    async def get_many(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], Weight]:
+        """批次取得體重紀錄."""
+        wanted = set(keys)
+        ids = list(dict.fromkeys(weight_id for _, weight_id in keys))
+        if not ids:
+            return {}
+
+        def query(conn: sqlite3.Connection) -> list[Any]:
+            rows: list[Any] = []
+            for chunk in _chunks(ids, _MAX_PARAMS):
+                placeholders = ", ".join("?" * len(chunk))
+                rows.extend(
+                    conn.execute(
+                        f"SELECT {_WEIGHT_COLUMNS} FROM weights "
+                        f"WHERE weight_id IN ({placeholders})",
+                        chunk,
+                    )
+                )
+            return rows
+
+        results: dict[tuple[str, str], Weight] = {}
+        for row in await self._db.read(query):
+            key = (row[1], row[0])
+            if key in wanted:
+                results[key] = _to_weight(row)
+        return results
+
+    async def create(self, baby_id: str, data: WeightCreate, created_by: str) -> Weight:
+        """建立體重紀錄."""
+        weight = Weight(
+            weight_id=generate_ulid(),
+            baby_id=baby_id,
+            timestamp=data.timestamp,
+            weight_g=data.weight_g,
+            note=data.note,
+            created_by=created_by,
+            created_at=datetime.now(UTC),
+            updated_at=None,
+        )
+        params = (
+            weight.weight_id,
+            baby_id,
+            _to_micros(weight.timestamp),
+            weight.weight_g,
+            weight.note,
+            created_by,
+            _to_micros(weight.created_at),
+            None,
+        )
+        await self._db.write(lambda conn: conn.execute(_INSERT_WEIGHT, params))
+        return weight
+
+    async def update(self, baby_id: str, weight_id: str, data: WeightUpdate) -> Weight | None:
+        """更新體重紀錄."""
+        update_data = data.model_dump(exclude_unset=True)
+        update_data["updated_at"] = datetime.now(UTC)
+
+        def transaction(conn: sqlite3.Connection) -> Weight | None:
+            row = conn.execute(_SELECT_WEIGHT, (weight_id, baby_id)).fetchone()
+            if row is None:
+                return None
+            weight = _to_weight(row).model_copy(update=update_data)
+            conn.execute(
+                _UPDATE_WEIGHT,
+                (
+                    _to_micros(weight.timestamp),
+                    weight.weight_g,
+                    weight.note,
+                    _to_micros(update_data["updated_at"]),
+                    weight_id,
+                    baby_id,
+                ),
+            )
+            return weight
+
+        return await self._db.write(transaction)
+
+    async def delete(self, baby_id: str, weight_id: str) -> bool:
+        """刪除體重紀錄."""
+        cursor = await self._db.write(
+            lambda conn: conn.execute(_DELETE_WEIGHT, (weight_id, baby_id))
+        )
+        return cursor.rowcount > 0
+
+    async def list_by_baby(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> list[Weight]:
+        """取得嬰兒的體重紀錄（按時間排序，走 (baby_id, timestamp) 索引）."""
+        params = _range_params(baby_id, from_date, to_date)
+        rows = await self._db.read(
+            lambda conn: conn.execute(_SELECT_WEIGHTS_BY_BABY, params).fetchall()
+        )
+        return [_to_weight(row) for row in rows]
+
+    async def count(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> int:
+        """取得嬰兒的體重紀錄筆數（只掃描索引）."""
+        params = _range_params(baby_id, from_date, to_date)
+        row = await self._db.read(
+            lambda conn: conn.execute(_COUNT_WEIGHTS_BY_BABY, params).fetchone()
+        )
+        return int(row[0])
+
+    async def stats(
+        self,
+        baby_id: str,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> WeightStats:
+        """取得嬰兒體重紀錄的筆數、總和與平均."""
+        params = _range_params(baby_id, from_date, to_date)
+        count, total, avg = await self._db.read(
+            lambda conn: conn.execute(_AGGREGATE_WEIGHTS_BY_BABY, params).fetchone()
+        )
+        return WeightStats(count=count, sum_g=int(total), avg_g=avg)
+
+
+class SqliteRepositories:
+    """統一管理所有 SQLite Repositories."""
+
+    def __init__(self, path: str, pool_size: int = 4, busy_timeout_ms: int = 5000) -> None:
+        """初始化所有 repositories.
+
+        Args:
+            path: 資料庫檔案路徑
+            pool_size: 讀取連線數
+            busy_timeout_ms: 等待其他 process 鎖定的最長時間
+        """
+        self._db = SqliteDatabase(path, pool_size=pool_size, busy_timeout_ms=busy_timeout_ms)
+        self.identity_links: IdentityLinkRepository = SqliteIdentityLinkRepository(self._db)
+        self.users = SqliteUserRepository(self._db)
+        self.babies = SqliteBabyRepository(self._db)
+        self.memberships = SqliteMembershipRepository(self._db)
+        self.weights = SqliteWeightRepository(self._db)
+
+    async def close(self) -> None:
+        """關閉資料庫連線."""
+        await self._db.close()
@@ -1,14 +1,18 @@
 """嬰兒 API 路由."""
 
+import asyncio
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from api.app.dependencies import (
+    BabyPurgeServiceDep,
     BabyRepoDep,
     CurrentUserDep,
+    LoadersDep,
     MembershipRepoDep,
     UserRepoDep,
+    WeightRepoDep,
     require_baby_membership,
     require_baby_write_access,
 )
@@ -16,6 +20,7 @@ from api.app.models import (
     BabyCreate,
     BabyCreateResponse,
     BabyResponse,
+    BabyStats,
     BabyUpdate,
     MemberAdd,
     MemberResponse,
@@ -69,18 +74,13 @@ async def create_baby(
 async def list_babies(
     current_user: CurrentUserDep,
     baby_repo: BabyRepoDep,
-    membership_repo: MembershipRepoDep,
 ) -> list[BabyResponse]:
     """列出當前使用者可存取的所有嬰兒。"""
     if not current_user.internal_user_id:
         return []
 
-    # 取得使用者的所有成員資格
-    memberships = await membership_repo.list_by_user(current_user.internal_user_id)
-    membership_map = {m.baby_id: m for m in memberships}
-
-    # 取得嬰兒列表
-    babies = await baby_repo.list_by_user(current_user.internal_user_id)
+    # 一次取得嬰兒與對應的成員資格
+    babies = await baby_repo.list_with_membership_by_user(current_user.internal_user_id)
 
     # 組合回應
     return [
@@ -90,11 +90,9 @@ async def list_babies(
             birth_date=baby.birth_date,
             gender=baby.gender,
             created_at=baby.created_at,
-            role=membership_map[baby.baby_id].role.value
-            if baby.baby_id in membership_map
-            else None,
+            role=membership.role.value,
         )
-        for baby in babies
+        for baby, membership in babies
     ]
 
 
@@ -106,11 +104,11 @@ async def list_babies(
 async def get_baby(
     baby_id: str,
     current_user: CurrentUserDep,
-    baby_repo: BabyRepoDep,
+    loaders: LoadersDep,
     membership: Annotated[Membership, Depends(require_baby_membership)],
 ) -> BabyResponse:
     """取得單一嬰兒資料。"""
-    baby = await baby_repo.get(baby_id)
+    baby = await loaders.babies.load(baby_id)
     if not baby:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -127,6 +125,26 @@ async def get_baby(
     )
 
 
+@router.get(
+    "/{baby_id}/stats",
+    response_model=BabyStats,
+    summary="取得嬰兒統計",
+)
+async def get_baby_stats(
+    baby_id: str,
+    current_user: CurrentUserDep,
+    membership_repo: MembershipRepoDep,
+    weight_repo: WeightRepoDep,
+    membership: Annotated[Membership, Depends(require_baby_membership)],
+) -> BabyStats:
+    """取得成員數與體重紀錄統計（聚合查詢，不讀取成員與體重紀錄）。"""
+    member_count, weights = await asyncio.gather(
+        membership_repo.count_by_baby(baby_id),
+        weight_repo.stats(baby_id),
+    )
+    return BabyStats(member_count=member_count, weights=weights)
+
+
 @router.get(
     "/{baby_id}/growth-curve",
     summary="取得 WHO 生長曲線參考數據",
@@ -134,7 +152,7 @@ async def get_baby(
 async def get_growth_curve(
     baby_id: str,
     current_user: CurrentUserDep,
-    baby_repo: BabyRepoDep,
+    loaders: LoadersDep,
     membership: Annotated[Membership, Depends(require_baby_membership)],
     from_month: int = Query(0, ge=0, le=60, description="起始月齡 (0-60)"),
     to_month: int = Query(60, ge=0, le=60, description="結束月齡 (0-60)"),
@@ -168,7 +186,7 @@ async def get_growth_curve(
     from api.app.data import get_percentile_weights
 
     # 取得嬰兒資料
-    baby = await baby_repo.get(baby_id)
+    baby = await loaders.babies.load(baby_id)
     if not baby:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -247,9 +265,13 @@ async def delete_baby(
     baby_id: str,
     current_user: CurrentUserDep,
     baby_repo: BabyRepoDep,
+    baby_purger: BabyPurgeServiceDep,
     membership: Annotated[Membership, Depends(require_baby_membership)],
 ) -> None:
-    """刪除嬰兒。只有 owner 可以刪除。"""
+    """刪除嬰兒。只有 owner 可以刪除。
+
+    嬰兒會立即標記為已刪除，成員與體重紀錄由背景 worker 清除。
+    """
     if not membership.can_manage():
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -263,6 +285,8 @@ async def delete_baby(
             detail="Baby not found",
         )
 
+    baby_purger.schedule(baby_id)
+
 
 # ==================== 成員管理 ====================
 
@@ -276,16 +300,17 @@ async def list_members(
     baby_id: str,
     current_user: CurrentUserDep,
     membership_repo: MembershipRepoDep,
-    user_repo: UserRepoDep,
+    loaders: LoadersDep,
     membership: Annotated[Membership, Depends(require_baby_membership)],
 ) -> list[MemberResponse]:
     """列出嬰兒的所有成員。"""
     memberships = await membership_repo.list_by_baby(baby_id)
 
-    # 取得成員資訊
+    # 一次批次取得所有成員的使用者資訊
+    users = await loaders.users.load_many(m.internal_user_id for m in memberships)
+
     results = []
-    for m in memberships:
-        user = await user_repo.get(m.internal_user_id)
+    for m, user in zip(memberships, users, strict=True):
         results.append(
             MemberResponse(
                 internal_user_id=m.internal_user_id,
@@ -1,6 +1,9 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Request
+
+from api.app.dependencies import require_metrics_token
+from api.app.http import http_pool_stats
 
 router = APIRouter()
 
@@ -16,3 +19,18 @@ async def readiness_check() -> dict[str, str]:
     """就緒檢查端點。"""
     # TODO: 檢查 Firestore 連線
     return {"status": "ready"}
+
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_token)])
+async def metrics(request: Request) -> dict[str, object]:
+    """執行期統計（快取命中率、背景工作進度等；需要 METRICS_TOKEN）。"""
+    state = request.app.state
+    persistence = getattr(state, "memory_persistence", None)
+    return {
+        "token_cache": state.jwt_verifier.cache_stats(),
+        "repository_cache": state.repos.cache_stats(),
+        "jwks": state.jwks_keys.stats(),
+        "http_pool": http_pool_stats(state.http_client),
+        "baby_purge": state.baby_purger.stats(),
+        "memory_persistence": persistence.stats() if persistence else None,
+    }
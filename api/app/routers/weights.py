@@ -1,22 +1,25 @@
 """體重 API 路由."""
 
+import asyncio
 from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from api.app.dependencies import (
-    BabyRepoDep,
     CurrentUserDep,
+    LoadersDep,
     WeightRepoDep,
     require_baby_membership,
     require_baby_write_access,
 )
 from api.app.models import (
     Membership,
+    Weight,
     WeightAssessment,
     WeightCreate,
     WeightResponse,
+    WeightStats,
     WeightUpdate,
 )
 from api.app.services import AssessmentService
@@ -72,7 +75,7 @@ async def create_weight(
 async def list_weights(
     baby_id: str,
     current_user: CurrentUserDep,
-    baby_repo: BabyRepoDep,
+    loaders: LoadersDep,
     weight_repo: WeightRepoDep,
     membership: Annotated[Membership, Depends(require_baby_membership)],
     from_date: datetime | None = Query(None, alias="from", description="起始時間"),
@@ -80,28 +83,21 @@ async def list_weights(
     include_assessment: bool = Query(False, description="是否包含成長評估"),
 ) -> list[WeightResponse]:
     """查詢體重紀錄。"""
-    weights = await weight_repo.list_by_baby(
-        baby_id=baby_id,
-        from_date=from_date,
-        to_date=to_date,
-    )
-
-    # 如果需要評估，取得嬰兒資料
-    baby = None
-    if include_assessment:
-        baby = await baby_repo.get(baby_id)
+    # 如果需要評估，取得嬰兒資料，與體重紀錄的 Z-score 一起取得
+    baby = await loaders.babies.load(baby_id) if include_assessment else None
+    rows: list[tuple[Weight, float | None]]
+    if baby:
+        rows = await weight_repo.list_with_zscores(baby, from_date=from_date, to_date=to_date)
+    else:
+        weights = await weight_repo.list_by_baby(
+            baby_id=baby_id,
+            from_date=from_date,
+            to_date=to_date,
+        )
+        rows = [(w, None) for w in weights]
 
     results = []
-    for w in weights:
-        assessment = None
-        if include_assessment and baby:
-            assessment = AssessmentService.assess_weight_brief(
-                weight_g=w.weight_g,
-                gender=baby.gender.value,  # type: ignore
-                birth_date=baby.birth_date,
-                measure_date=w.timestamp.date(),
-            )
-
+    for w, z_score in rows:
         results.append(
             WeightResponse(
                 weight_id=w.weight_id,
@@ -112,13 +108,31 @@ async def list_weights(
                 created_by=w.created_by,
                 created_at=w.created_at,
                 updated_at=w.updated_at,
-                assessment=assessment,
+                assessment=AssessmentService.assess_zscore_brief(z_score),
             )
         )
 
     return results
 
 
+# 需宣告在 /{weight_id} 之前，否則 "stats" 會被當成 weight_id
+@router.get(
+    "/stats",
+    response_model=WeightStats,
+    summary="體重紀錄統計",
+)
+async def get_weight_stats(
+    baby_id: str,
+    current_user: CurrentUserDep,
+    weight_repo: WeightRepoDep,
+    membership: Annotated[Membership, Depends(require_baby_membership)],
+    from_date: datetime | None = Query(None, alias="from", description="起始時間"),
+    to_date: datetime | None = Query(None, alias="to", description="結束時間"),
+) -> WeightStats:
+    """取得體重紀錄的筆數、總和與平均（聚合查詢，不讀取個別紀錄）。"""
+    return await weight_repo.stats(baby_id, from_date=from_date, to_date=to_date)
+
+
 @router.get(
     "/{weight_id}",
     response_model=WeightResponse,
@@ -216,8 +230,7 @@ async def get_weight_assessment(
     baby_id: str,
     weight_id: str,
     current_user: CurrentUserDep,
-    baby_repo: BabyRepoDep,
-    weight_repo: WeightRepoDep,
+    loaders: LoadersDep,
     membership: Annotated[Membership, Depends(require_baby_membership)],
 ) -> WeightAssessment:
     """取得單筆體重的成長曲線評估.
@@ -236,16 +249,17 @@ async def get_weight_assessment(
 
     注意：目前支援 0-24 個月的嬰兒。超出範圍會回傳 400 錯誤。
     """
-    # 取得體重紀錄
-    weight = await weight_repo.get(baby_id, weight_id)
+    # 同時取得體重紀錄與嬰兒資料
+    weight, baby = await asyncio.gather(
+        loaders.weights.load((baby_id, weight_id)),
+        loaders.babies.load(baby_id),
+    )
     if not weight:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Weight record not found",
         )
 
-    # 取得嬰兒資料
-    baby = await baby_repo.get(baby_id)
     if not baby:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
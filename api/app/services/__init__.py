@@ -1,9 +1,13 @@
 """API Service Services."""
 
 from api.app.services.assessment import AssessmentService
+from api.app.services.jwks import JWKSKeyManager
 from api.app.services.jwt import JWTVerificationService
+from api.app.services.purge import BabyPurgeService
 
 __all__ = [
     "AssessmentService",
+    "BabyPurgeService",
+    "JWKSKeyManager",
     "JWTVerificationService",
 ]
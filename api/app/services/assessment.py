@@ -8,9 +8,11 @@ from typing import Literal
 
 from api.app.data import (
     MAX_AGE_MONTHS,
+    age_in_months,
     get_percentile_weights,
     weight_to_percentile,
     weight_to_zscore,
+    zscore_to_percentile,
 )
 from api.app.models.weight import (
     ReferenceRange,
@@ -42,10 +44,7 @@ class AssessmentService:
         Returns:
             月齡（四捨五入取整數）
         """
-        days = (measure_date - birth_date).days
-        # 以 30.44 天為一個月（365.25 / 12）
-        # 使用四捨五入，讓接近滿月的嬰兒使用正確的月齡標準
-        return round(days / 30.44)
+        return age_in_months(birth_date, measure_date)
 
     @staticmethod
     def calculate_age_in_days(birth_date: date, measure_date: date) -> int:
@@ -167,16 +166,22 @@ class AssessmentService:
             WeightAssessmentBrief 或 None
         """
         age_months = cls.calculate_age_in_months(birth_date, measure_date)
+        return cls.assess_zscore_brief(weight_to_zscore(weight_g / 1000, gender, age_months))
 
-        if age_months < 0 or age_months > MAX_AGE_MONTHS:
-            return None
+    @classmethod
+    def assess_zscore_brief(cls, z_score: float | None) -> WeightAssessmentBrief | None:
+        """由 Z-score 簡易評估（用於列表，Z-score 可預先計算）.
 
-        weight_kg = weight_g / 1000
-        percentile = weight_to_percentile(weight_kg, gender, age_months)
+        Args:
+            z_score: Z-score（None 表示超出數據範圍）
 
-        if percentile is None:
+        Returns:
+            WeightAssessmentBrief 或 None
+        """
+        if z_score is None:
             return None
 
+        percentile = zscore_to_percentile(z_score)
         assessment_key, message = cls.get_assessment_level(percentile)
 
         return WeightAssessmentBrief(
@@ -0,0 +1,192 @@
+"""JWKS 公鑰管理.
+
+App 層級共用的公鑰快取：以 kid 索引已解析的公鑰，背景依 TTL 重新載入，
+遇到未知 kid 時做限速的即時重新載入；Auth Service 無法連線時繼續使用最後一次成功取得的公鑰.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any
+
+import httpx
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError, JWTError
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSKeyManager:
+    """JWKS 公鑰管理."""
+
+    def __init__(
+        self,
+        jwks_url: str,
+        ttl_seconds: float = 300.0,
+        min_refresh_interval_seconds: float = 10.0,
+        timeout_seconds: float = 5.0,
+        algorithm: str = "RS256",
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
+        """初始化.
+
+        Args:
+            jwks_url: JWKS 端點 URL
+            ttl_seconds: 背景重新載入的間隔
+            min_refresh_interval_seconds: 兩次重新載入之間的最短間隔（未知 kid 觸發時的限速）
+            timeout_seconds: 取得 JWKS 的逾時時間
+            algorithm: 公鑰演算法
+            http_client: 共用的 HTTP client（由呼叫端關閉）；None 時自行建立
+        """
+        self._jwks_url = jwks_url
+        self._ttl_seconds = ttl_seconds
+        self._min_refresh_interval_seconds = min_refresh_interval_seconds
+        self._timeout_seconds = timeout_seconds
+        self._algorithm = algorithm
+
+        self._keys: dict[str, Key] = {}
+        self._etag: str | None = None  # 上次取得的 JWKS ETag（用於條件式請求）
+        self._last_attempt = 0.0  # monotonic
+        self._last_success = 0.0  # monotonic
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._client = http_client
+        self._owns_client = http_client is None
+
+    async def start(self) -> None:
+        """首次載入公鑰並啟動背景重新載入."""
+        if self._refresh_task is not None:
+            return
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self._timeout_seconds)
+        await self.refresh()
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """停止背景重新載入."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_keys(self, kid: str | None) -> list[Key]:
+        """取得驗證用公鑰.
+
+        Args:
+            kid: Token header 中的 kid；沒有 kid 時回傳所有公鑰
+
+        Returns:
+            公鑰列表
+
+        Raises:
+            JWTError: 找不到對應的公鑰
+        """
+        if kid is None:
+            if not self._keys:
+                await self._refresh_if_allowed()
+            return list(self._keys.values())
+
+        key = self._keys.get(kid)
+        if key is None:
+            # 可能是 Auth Service 已輪替金鑰，限速重新載入一次
+            await self._refresh_if_allowed()
+            key = self._keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown key id: {kid}")
+        return [key]
+
+    def load_jwks(self, jwks: dict[str, Any]) -> int:
+        """解析 JWKS 並取代目前的公鑰.
+
+        Args:
+            jwks: JWKS 字典（含 keys 陣列）
+
+        Returns:
+            載入的公鑰數量
+        """
+        keys: dict[str, Key] = {}
+        for key_data in jwks.get("keys", []):
+            kid = key_data.get("kid")
+            if not kid:
+                logger.warning("Skipping JWK without kid")
+                continue
+            try:
+                keys[kid] = jwk.construct(key_data, key_data.get("alg", self._algorithm))
+            except JWKError as e:
+                logger.warning(f"Skipping invalid JWK {kid}: {e}")
+        if not keys:
+            raise ValueError("JWKS contains no usable keys")
+        self._keys = keys
+        self._etag = None
+        self._last_success = time.monotonic()
+        return len(keys)
+
+    async def refresh(self) -> bool:
+        """從 JWKS 端點重新載入公鑰.
+
+        失敗時保留原本的公鑰.
+
+        Returns:
+            是否成功
+        """
+        async with self._refresh_lock:
+            self._last_attempt = time.monotonic()
+            try:
+                client = self._client or httpx.AsyncClient(timeout=self._timeout_seconds)
+                try:
+                    headers = {"If-None-Match": self._etag} if self._etag and self._keys else {}
+                    response = await client.get(
+                        self._jwks_url, headers=headers, timeout=self._timeout_seconds
+                    )
+                    if response.status_code == httpx.codes.NOT_MODIFIED:
+                        # 公鑰未變更，不需重新解析
+                        self._last_success = time.monotonic()
+                        return True
+                    response.raise_for_status()
+                    count = self.load_jwks(response.json())
+                    self._etag = response.headers.get("ETag")
+                finally:
+                    if client is not self._client:
+                        await client.aclose()
+            except Exception as e:
+                logger.warning(
+                    f"Failed to refresh JWKS from {self._jwks_url}: {e}, "
+                    f"keeping {len(self._keys)} cached keys"
+                )
+                return False
+            logger.info(f"JWKS refreshed: {count} keys")
+            return True
+
+    def stats(self) -> dict[str, object]:
+        """取得公鑰快取狀態."""
+        now = time.monotonic()
+        return {
+            "keys": len(self._keys),
+            "seconds_since_refresh": round(now - self._last_success, 1)
+            if self._last_success
+            else None,
+        }
+
+    async def _refresh_if_allowed(self) -> None:
+        """限速的即時重新載入."""
+        if time.monotonic() - self._last_attempt < self._min_refresh_interval_seconds:
+            return
+        if self._refresh_lock.locked():
+            # 已有其他請求正在重新載入，等它完成即可
+            async with self._refresh_lock:
+                return
+        await self.refresh()
+
+    async def _refresh_loop(self) -> None:
+        """背景依 TTL 重新載入."""
+        while True:
+            ok = self._last_success and self._last_success >= self._last_attempt
+            delay = self._ttl_seconds if ok else self._min_refresh_interval_seconds
+            await asyncio.sleep(delay)
+            await self.refresh()
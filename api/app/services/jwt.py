@@ -1,43 +1,34 @@
 """JWT 驗證服務."""
 
+import hashlib
 import logging
+import time
 from typing import Any
 
-import httpx
 from jose import jwt
 
+from api.app.cache import TTLCache
 from api.app.config import Settings
+from api.app.services.jwks import JWKSKeyManager
 
 logger = logging.getLogger(__name__)
 
 
 class JWTVerificationService:
-    """JWT 驗證服務."""
+    """JWT 驗證服務.
 
-    def __init__(self, settings: Settings):
+    公鑰由 app 層級的 JWKSKeyManager 提供，驗證時只需以 kid 查表再做簽章驗證.
+    驗證通過的 token 以 SHA-256 digest 為鍵快取 claims 直到 exp，
+    同一個 token 重複呼叫時只需一次雜湊與查表.
+    """
+
+    def __init__(self, settings: Settings, key_manager: JWKSKeyManager):
         """初始化."""
         self._settings = settings
-        self._jwks_cache: dict[str, Any] | None = None
-
-    async def _fetch_jwks(self) -> dict[str, Any]:
-        """取得 JWKS（帶快取）."""
-        if self._jwks_cache is None:
-            jwks_url = self._settings.effective_jwks_url
-            logger.info(f"Fetching JWKS from {jwks_url}")
-
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.get(jwks_url, timeout=5.0)
-                    response.raise_for_status()
-                    self._jwks_cache = response.json()
-                    logger.info(
-                        f"JWKS fetched successfully: {len(self._jwks_cache.get('keys', []))} keys"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to fetch JWKS from {jwks_url}: {e}")
-                    raise
-
-        return self._jwks_cache
+        self._key_manager = key_manager
+        self._token_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(
+            maxsize=settings.auth_token_cache_size
+        )
 
     async def verify_token(self, token: str) -> dict[str, Any]:
         """驗證 JWT Token.
@@ -51,34 +42,33 @@ class JWTVerificationService:
         Raises:
             JWTError: Token 無效或驗證失敗
         """
-        # 取得 JWKS
-        jwks = await self._fetch_jwks()
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        cached = self._token_cache.get(digest)
+        if cached is not None:
+            return dict(cached)
 
         # 取得未驗證的 header（需要 kid）
         unverified_header = jwt.get_unverified_header(token)
-        kid = unverified_header.get("kid")
-
-        # 如果有 kid，記錄日誌（但不強制要求匹配，讓 python-jose 自動處理）
-        if kid:
-            key_found = any(key.get("kid") == kid for key in jwks.get("keys", []))
-            if not key_found:
-                logger.warning(
-                    f"Token kid '{kid}' not found in JWKS, "
-                    f"but will try all keys in JWKS for verification"
-                )
-
-        # 驗證並解碼 token（python-jose 會自動從 JWKS 中找到對應的 key）
-        # 如果 kid 不匹配，python-jose 會嘗試所有 key 直到找到能驗證的
+        keys = await self._key_manager.get_keys(unverified_header.get("kid"))
+
+        # 驗證並解碼 token（沒有 kid 時 python-jose 會逐一嘗試所有公鑰）
         payload = jwt.decode(
             token,
-            jwks,  # 傳入完整的 JWKS 字典
+            keys,
             algorithms=["RS256"],
             audience=self._settings.auth_audience,
             issuer=self._settings.auth_issuer,
         )
 
+        # 只快取有 exp 的 token，存活時間不超過 token 剩餘效期
+        exp = payload.get("exp")
+        if isinstance(exp, int | float):
+            remaining = exp - time.time()
+            if remaining > 0:
+                self._token_cache.set(digest, dict(payload), ttl_seconds=remaining)
+
         return payload
 
-    def clear_cache(self) -> None:
-        """清除 JWKS 快取（用於測試或重新載入）."""
-        self._jwks_cache = None
+    def cache_stats(self) -> dict[str, float | int]:
+        """取得已驗證 token 快取的命中統計."""
+        return self._token_cache.stats()
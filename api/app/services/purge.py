@@ -0,0 +1,134 @@
+"""嬰兒背景刪除服務.
+
+DELETE /v1/babies/{baby_id} 只標記刪除，實際的子集合刪除交由這裡的背景 worker 執行，
+避免刪除成本落在 request path 上.
+"""
+
+import asyncio
+import contextlib
+import logging
+
+from api.app.repositories import BabyRepository
+
+logger = logging.getLogger(__name__)
+
+
+class BabyPurgeService:
+    """嬰兒背景刪除服務."""
+
+    def __init__(
+        self,
+        baby_repo: BabyRepository,
+        progress_log_interval: int = 500,
+        retry_initial_backoff_seconds: float = 5.0,
+        retry_max_backoff_seconds: float = 600.0,
+    ) -> None:
+        """初始化.
+
+        Args:
+            baby_repo: 嬰兒 Repository
+            progress_log_interval: 每刪除多少 document 記錄一次進度
+            retry_initial_backoff_seconds: 刪除失敗後第一次重試的等待時間（之後每次加倍）
+            retry_max_backoff_seconds: 重試等待時間上限
+        """
+        self._baby_repo = baby_repo
+        self._progress_log_interval = progress_log_interval
+        self._retry_initial_backoff_seconds = retry_initial_backoff_seconds
+        self._retry_max_backoff_seconds = retry_max_backoff_seconds
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._worker: asyncio.Task[None] | None = None
+        self._in_progress: dict[str, int] = {}  # baby_id -> 已刪除 document 數
+        self._failures: dict[str, int] = {}  # baby_id -> 連續失敗次數
+        self._retries: dict[str, asyncio.TimerHandle] = {}  # baby_id -> 排定的重試
+        self._purged_babies = 0
+        self._purged_documents = 0
+        self._failed_babies = 0
+
+    async def start(self) -> None:
+        """啟動背景 worker，並接手先前未完成的刪除."""
+        if self._worker is not None:
+            return
+        for baby_id in await self._baby_repo.list_deleted_ids():
+            self.schedule(baby_id)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止背景 worker（未完成的刪除會在下次啟動時接手）."""
+        for handle in self._retries.values():
+            handle.cancel()
+        self._retries.clear()
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._worker
+        self._worker = None
+
+    def schedule(self, baby_id: str) -> None:
+        """排入刪除佇列."""
+        self._queue.put_nowait(baby_id)
+
+    async def join(self) -> None:
+        """等待佇列中的刪除全部完成."""
+        await self._queue.join()
+
+    def stats(self) -> dict[str, object]:
+        """取得刪除進度統計（只回傳數量，不含嬰兒 ID）."""
+        return {
+            "queued": self._queue.qsize(),
+            "in_progress": len(self._in_progress),
+            "in_progress_documents": sum(self._in_progress.values()),
+            "retrying": len(self._retries),
+            "max_consecutive_failures": max(
+                (self._failures[baby_id] for baby_id in self._retries), default=0
+            ),
+            "purged_babies": self._purged_babies,
+            "purged_documents": self._purged_documents,
+            "failed_babies": self._failed_babies,
+        }
+
+    def _retry(self, baby_id: str) -> None:
+        """重新排入失敗的刪除."""
+        self._retries.pop(baby_id, None)
+        self.schedule(baby_id)
+
+    async def _run(self) -> None:
+        """背景 worker 主迴圈."""
+        while True:
+            baby_id = await self._queue.get()
+            try:
+                await self._purge(baby_id)
+            finally:
+                self._queue.task_done()
+
+    async def _purge(self, baby_id: str) -> None:
+        """刪除單一嬰兒."""
+        logger.info(f"Purging baby {baby_id}")
+        self._in_progress[baby_id] = 0
+
+        def _on_progress(deleted: int) -> None:
+            self._in_progress[baby_id] = deleted
+            if deleted and deleted % self._progress_log_interval == 0:
+                logger.info(f"Purging baby {baby_id}: {deleted} documents deleted")
+
+        try:
+            deleted = await self._baby_repo.purge(baby_id, on_progress=_on_progress)
+        except Exception as e:
+            # 保留 deleted_at 標記，退避後重試（重新啟動時也會重新排入）
+            self._failed_babies += 1
+            failures = self._failures[baby_id] = self._failures.get(baby_id, 0) + 1
+            delay = min(
+                self._retry_initial_backoff_seconds * 2 ** (failures - 1),
+                self._retry_max_backoff_seconds,
+            )
+            logger.error(f"Failed to purge baby {baby_id} (retry in {delay:.0f}s): {e}")
+            self._retries[baby_id] = asyncio.get_running_loop().call_later(
+                delay, self._retry, baby_id
+            )
+        else:
+            self._failures.pop(baby_id, None)
+            self._purged_babies += 1
+            self._purged_documents += deleted
+            logger.info(f"Purged baby {baby_id}: {deleted} documents deleted")
+        finally:
+            self._in_progress.pop(baby_id, None)
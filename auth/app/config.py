@@ -32,30 +32,88 @@ class Settings(BaseSettings):
     gcp_project_id: str = "local-dev"
     firestore_database: str = "(default)"
 
+    # Firestore client（gRPC 連線、deadline 與重試）
+    firestore_channel_pool_size: int = 1  # gRPC channel 數（每條 channel 一條 HTTP/2 連線）
+    firestore_keepalive_seconds: float = 30.0
+    firestore_keepalive_timeout_seconds: float = 10.0
+    firestore_timeout_seconds: float = 10.0  # 一般 RPC 每次嘗試的 deadline
+    firestore_stream_timeout_seconds: float = 60.0  # 串流查詢每次嘗試的 deadline
+    firestore_retry_initial_backoff_seconds: float = 0.1
+    firestore_retry_max_backoff_seconds: float = 2.0
+    firestore_retry_deadline_seconds: float = 20.0  # 含重試的總時限
+    # 重試預算（整個 client 共用的 token bucket），Firestore 持續異常時不放大流量
+    firestore_retry_budget: float = 20
+    firestore_retry_budget_per_second: float = 5
+
     # Repository 設定
     repository_mode: RepositoryMode = RepositoryMode.MEMORY
+    # Email 索引（user_emails）查無資料時改用欄位查詢，相容建立索引前註冊的使用者；
+    # 所有使用者都有索引後可關閉
+    firestore_email_index_fallback: bool = True
+    # 建立使用者時同步寫入以 internal_user_id 為 key 的 user_profiles 投影（供 API Service 讀取）
+    firestore_write_user_profiles: bool = True
 
     # JWT 設定
     jwt_issuer: str = "http://localhost:8082"
     jwt_audience: str = "baby-weight-api"
     jwt_algorithm: str = "RS256"
     jwt_expiration_seconds: int = 3600  # 1 小時
+    # 將使用者的嬰兒角色簽入 token（baby_roles claim），API 信任後可省去成員資格查詢
+    jwt_include_baby_roles: bool = False
+    # Refresh token（輪替式，換發 access token 時不需重新驗證密碼）
+    refresh_token_expiration_seconds: int = 30 * 24 * 3600  # 30 天
 
     # Secret Manager（JWT 私鑰）
     jwt_private_key_secret_id: str = "jwt-private-key-dev"
     jwt_private_key_secret_version: str = "latest"
+    # 額外發布在 JWKS 的 PEM 公鑰（金鑰輪替時放入舊金鑰或即將啟用的新金鑰）
+    jwt_published_public_keys: list[str] = []
+    # JWKS 回應的 Cache-Control max-age（新金鑰需發布超過這段時間後才可開始簽章）
+    jwks_max_age_seconds: int = 300
+
+    # Secret 快取（啟動時預先載入，背景依 TTL 重新載入）
+    secret_backend: Literal["secret_manager", "local"] = "secret_manager"
+    local_secrets_dir: str = ""  # secret_backend=local 時存放 secret 檔案的目錄
+    secret_cache_ttl_seconds: float = 300.0
+    secret_refresh_interval_seconds: float = 60.0
 
     # 邀請碼設定
     invite_codes_secret_id: str = "invite-codes-dev"
     invite_codes_secret_version: str = "latest"
+    invite_codes_reload_interval_seconds: float = 60.0
+    # 啟用限定使用次數的邀請碼（存放在 invite_codes collection）
+    invite_code_store_enabled: bool = False
 
     # 密碼設定
     password_min_length: int = 8
     password_max_length: int = 128
+    password_hash_workers: int = 2  # bcrypt 執行緒數
+    password_hash_max_queue: int = 32  # 等待中的雜湊工作上限，超過時回傳 503
+    # 同時進行中的密碼驗證上限（登入），超過時回傳 429
+    password_verify_max_concurrency: int = 16
+
+    # 登入/註冊速率限制（token bucket）
+    rate_limit_enabled: bool = True
+    # memory：單一 instance 內生效；firestore：多個 instance 共用（需 repository_mode=firestore）
+    rate_limit_backend: Literal["memory", "firestore"] = "memory"
+    rate_limit_email_capacity: float = 10  # 每個 email 允許的突發量
+    rate_limit_email_per_minute: float = 5  # 每個 email 每分鐘補充量
+    rate_limit_ip_capacity: float = 60  # 每個 IP 允許的突發量
+    rate_limit_ip_per_minute: float = 30  # 每個 IP 每分鐘補充量
+    # 位於幾層 proxy 之後（從 X-Forwarded-For 右邊數第 N 個為 client IP）；0 表示使用連線來源 IP
+    rate_limit_trusted_proxy_hops: int = 0
+
+    # /metrics 管理端點（Authorization: Bearer <token>）；空字串時停用（回傳 404）
+    metrics_token: str = ""
 
     # CORS
     cors_origins: list[str] = ["*"]
 
+    @property
+    def use_local_secrets(self) -> bool:
+        """是否使用本地 secret 來源（本地開發專案不呼叫 Secret Manager）."""
+        return self.secret_backend == "local" or self.gcp_project_id == "local-dev"
+
     @property
     def use_firestore(self) -> bool:
         """是否使用 Firestore."""
@@ -1,14 +1,19 @@
 """依賴注入."""
 
+import secrets
 from typing import Annotated
 
-from fastapi import Depends, Request
+from fastapi import Depends, HTTPException, Request, status
 
 from auth.app.config import Settings, get_settings
 from auth.app.repositories import UserRepository
 from auth.app.services.invite import InviteCodeService
 from auth.app.services.jwt import JWTService
-from auth.app.services.secrets import SecretService
+from auth.app.services.keyring import KeyRing
+from auth.app.services.password import PasswordHasher
+from auth.app.services.ratelimit import ConcurrencyLimiter, RateLimiter, create_rate_limiter
+from auth.app.services.refresh import RefreshTokenService
+from auth.app.services.secrets import SecretService, SecretStore, create_secret_store
 
 
 def get_user_repository(request: Request) -> UserRepository:
@@ -16,21 +21,142 @@ def get_user_repository(request: Request) -> UserRepository:
     return request.app.state.user_repo  # type: ignore[no-any-return]
 
 
-def get_secret_service(settings: Annotated[Settings, Depends(get_settings)]) -> SecretService:
-    """取得 SecretService."""
-    return SecretService(project_id=settings.gcp_project_id)
+def get_secret_store(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> SecretStore:
+    """取得 app 層級共用的 SecretStore（lifespan 未執行時於第一次使用時建立）."""
+    store: SecretStore | None = getattr(request.app.state, "secret_store", None)
+    if store is None:
+        store = create_secret_store(settings)
+        request.app.state.secret_store = store
+    return store
+
+
+def get_secret_service(
+    settings: Annotated[Settings, Depends(get_settings)],
+    store: Annotated[SecretStore, Depends(get_secret_store)],
+) -> SecretService:
+    """取得 SecretService（只讀取 SecretStore 快取）."""
+    return SecretService(project_id=settings.gcp_project_id, store=store)
 
 
 def get_invite_service(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
     secret_service: Annotated[SecretService, Depends(get_secret_service)],
 ) -> InviteCodeService:
-    """取得 InviteCodeService."""
-    return InviteCodeService(secret_service)
+    """取得 app 層級共用的 InviteCodeService（lifespan 未執行時於第一次使用時建立）."""
+    invite_service: InviteCodeService | None = getattr(request.app.state, "invite_service", None)
+    if invite_service is None:
+        invite_service = InviteCodeService(
+            secret_service,
+            code_repo=getattr(request.app.state, "invite_code_repo", None),
+            reload_interval_seconds=settings.invite_codes_reload_interval_seconds,
+        )
+        request.app.state.invite_service = invite_service
+    return invite_service
 
 
-def get_jwt_service(
+def get_key_ring(
+    request: Request,
     settings: Annotated[Settings, Depends(get_settings)],
     secret_service: Annotated[SecretService, Depends(get_secret_service)],
+) -> KeyRing:
+    """取得 app 層級共用的 KeyRing（lifespan 未執行時於第一次使用時載入）."""
+    key_ring: KeyRing | None = getattr(request.app.state, "key_ring", None)
+    if key_ring is None:
+        key_ring = KeyRing.load(settings, secret_service)
+        request.app.state.key_ring = key_ring
+    return key_ring
+
+
+def get_jwt_service(
+    settings: Annotated[Settings, Depends(get_settings)],
+    key_ring: Annotated[KeyRing, Depends(get_key_ring)],
 ) -> JWTService:
     """取得 JWTService."""
-    return JWTService(settings, secret_service)
+    return JWTService(settings, key_ring)
+
+
+def get_password_hasher(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> PasswordHasher:
+    """取得 app 層級共用的 PasswordHasher（lifespan 未執行時於第一次使用時建立）."""
+    hasher: PasswordHasher | None = getattr(request.app.state, "password_hasher", None)
+    if hasher is None:
+        hasher = PasswordHasher(
+            max_workers=settings.password_hash_workers,
+            max_queue_depth=settings.password_hash_max_queue,
+        )
+        request.app.state.password_hasher = hasher
+    return hasher
+
+
+def get_refresh_token_service(
+    settings: Annotated[Settings, Depends(get_settings)],
+    user_repo: Annotated[UserRepository, Depends(get_user_repository)],
+) -> RefreshTokenService:
+    """取得 RefreshTokenService."""
+    return RefreshTokenService(user_repo, settings.refresh_token_expiration_seconds)
+
+
+def get_rate_limiter(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> RateLimiter:
+    """取得 app 層級共用的 RateLimiter（lifespan 未執行時於第一次使用時建立 In-Memory 版本）."""
+    limiter: RateLimiter | None = getattr(request.app.state, "rate_limiter", None)
+    if limiter is None:
+        limiter = create_rate_limiter(settings)
+        request.app.state.rate_limiter = limiter
+    return limiter
+
+
+def get_verify_limiter(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> ConcurrencyLimiter:
+    """取得 app 層級共用的密碼驗證併發上限."""
+    limiter: ConcurrencyLimiter | None = getattr(request.app.state, "verify_limiter", None)
+    if limiter is None:
+        limiter = ConcurrencyLimiter(settings.password_verify_max_concurrency)
+        request.app.state.verify_limiter = limiter
+    return limiter
+
+
+def require_metrics_token(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> None:
+    """驗證 /metrics 的管理用 token（未設定 METRICS_TOKEN 時不提供 /metrics）."""
+    if not settings.metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    auth_header = request.headers.get("Authorization", "")
+    if not secrets.compare_digest(
+        auth_header.encode(), f"Bearer {settings.metrics_token}".encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def get_client_ip(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> str | None:
+    """取得 client IP.
+
+    位於 proxy 之後時，X-Forwarded-For 最左邊的值可由 client 偽造，
+    因此從右邊數第 rate_limit_trusted_proxy_hops 個（由最外層的可信 proxy 寫入）.
+    """
+    hops = settings.rate_limit_trusted_proxy_hops
+    if hops > 0:
+        forwarded = [ip.strip() for ip in request.headers.get("x-forwarded-for", "").split(",")]
+        forwarded = [ip for ip in forwarded if ip]
+        if forwarded:
+            return forwarded[-min(hops, len(forwarded))]
+    return request.client.host if request.client else None
@@ -0,0 +1,456 @@
+"""Firestore client 設定.
+
+預設的 AsyncClient 只有一條 gRPC channel，每次 RPC 的 deadline 是 60 秒（查詢 300 秒），
+重試最長也是 60 秒：Firestore 短暫異常時請求會一直掛著. 這裡集中設定：
+
+- 每次 RPC 的 deadline（一般呼叫與串流查詢分開設定）
+- 重試：可重試的錯誤類型與 GAPIC 相同（寫入不是冪等，只重試伺服器未處理的錯誤），
+  改用較短的退避上限與總時限；退避已含 full jitter. 整個 client 共用一個重試預算
+  （token bucket），Firestore 持續異常時不會因大量重試放大流量
+- channel pool：多條 channel（各自一條 HTTP/2 連線）輪流使用，避免單一連線的並行 stream 上限
+- keep-alive：定期 ping，及早發現被中斷的閒置連線
+
+deadline 與重試以公開的 retry= / timeout= 參數傳入每次呼叫（見 CallOptions）；
+背景工作使用的同步 client（SyncFirestoreClient）套用同一組設定並共用重試預算.
+channel 設定沒有公開的介面，FirestoreClient 改寫了 _firestore_api；
+內部結構改變而無法建立時記錄警告並退回預設 channel，deadline 與重試不受影響.
+api 與 auth 各自打包，兩份模組內容必須相同（測試會比對）.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+import grpc
+from google.api_core import exceptions
+from google.api_core.retry import AsyncRetry, Retry, if_exception_type
+from google.cloud.firestore_v1 import AsyncClient, Client
+from google.cloud.firestore_v1.services.firestore import async_client as firestore_client
+from google.cloud.firestore_v1.services.firestore.transports import grpc_asyncio
+from grpc import aio
+
+logger = logging.getLogger(__name__)
+
+# 與 google-cloud-firestore 相同：不限制訊息大小
+_MESSAGE_SIZE_OPTIONS: list[tuple[str, Any]] = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+]
+
+# 與 GAPIC 各方法的預設相同：讀取重試暫時性錯誤，寫入（commit）只重試伺服器未處理的錯誤
+_READ_ERRORS = (
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+    exceptions.ResourceExhausted,
+    exceptions.ServiceUnavailable,
+)
+_WRITE_ERRORS = (exceptions.ResourceExhausted, exceptions.ServiceUnavailable)
+
+
+class RetryBudget:
+    """重試預算（token bucket）.
+
+    每次重試取用一個 token，token 依固定速率補充；用完時不再重試、直接回傳錯誤.
+    同步 client 在 worker thread 中使用，因此以 lock 保護.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float) -> None:
+        """初始化.
+
+        Args:
+            capacity: 允許的突發重試次數
+            refill_per_second: 每秒補充的重試次數
+        """
+        self._capacity = capacity
+        self._refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._exhausted = False
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.rejected = 0
+
+    def try_acquire(self) -> bool:
+        """取用一次重試；預算不足時回傳 False."""
+        with self._lock:
+            return self._try_acquire()
+
+    def _try_acquire(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated_at) * self._refill_per_second
+        )
+        self._updated_at = now
+        if self._tokens < 1:
+            if not self._exhausted:
+                logger.warning("Firestore retry budget exhausted, failing fast")
+                self._exhausted = True
+            self.rejected += 1
+            return False
+        self._exhausted = False
+        self._tokens -= 1
+        self.retries += 1
+        return True
+
+    def wrap(self, predicate: Callable[[Exception], bool]) -> Callable[[Exception], bool]:
+        """包裝重試判斷：可重試的錯誤還需要取得預算."""
+
+        def budgeted(exc: Exception) -> bool:
+            return predicate(exc) and self.try_acquire()
+
+        return budgeted
+
+    def stats(self) -> dict[str, float]:
+        """重試統計."""
+        return {
+            "tokens": round(self._tokens, 2),
+            "retries": self.retries,
+            "rejected": self.rejected,
+        }
+
+
+class _RoundRobin:
+    """依序分派到各 channel 的 multi-callable."""
+
+    def __init__(self, callables: list[Any]) -> None:
+        self._next = itertools.cycle(callables).__next__
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._next()(*args, **kwargs)
+
+
+# google-api-core 依 multi-callable 的型別決定如何包裝串流呼叫
+class _UnaryUnary(_RoundRobin, aio.UnaryUnaryMultiCallable):
+    pass
+
+
+class _UnaryStream(_RoundRobin, aio.UnaryStreamMultiCallable):
+    pass
+
+
+class _StreamUnary(_RoundRobin, aio.StreamUnaryMultiCallable):
+    pass
+
+
+class _StreamStream(_RoundRobin, aio.StreamStreamMultiCallable):
+    pass
+
+
+class _Interceptors:
+    """將 interceptor 加到每一條 channel."""
+
+    def __init__(self, channels: list[aio.Channel]) -> None:
+        self._channels = channels
+
+    def append(self, interceptor: Any) -> None:
+        for channel in self._channels:
+            channel._unary_unary_interceptors.append(interceptor)
+
+
+class _ChannelPool(aio.Channel):
+    """多條 gRPC channel 組成的 channel，每次 RPC 輪流使用其中一條."""
+
+    def __init__(self, channels: list[aio.Channel]) -> None:
+        self._channels = channels
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    @property
+    def _unary_unary_interceptors(self) -> "_Interceptors":
+        # transport 初始化時直接在 channel 的 interceptor 清單加入 logging interceptor
+        return _Interceptors(self._channels)
+
+    async def __aenter__(self) -> "_ChannelPool":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def close(self, grace: float | None = None) -> None:
+        for channel in self._channels:
+            await channel.close(grace)
+
+    def get_state(self, try_to_connect: bool = False) -> grpc.ChannelConnectivity:
+        return self._channels[0].get_state(try_to_connect)
+
+    async def wait_for_state_change(self, last_observed_state: grpc.ChannelConnectivity) -> None:
+        await self._channels[0].wait_for_state_change(last_observed_state)
+
+    async def channel_ready(self) -> None:
+        for channel in self._channels:
+            await channel.channel_ready()
+
+    def unary_unary(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        return _UnaryUnary([c.unary_unary(method, *args, **kwargs) for c in self._channels])
+
+    def unary_stream(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        return _UnaryStream([c.unary_stream(method, *args, **kwargs) for c in self._channels])
+
+    def stream_unary(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        return _StreamUnary([c.stream_unary(method, *args, **kwargs) for c in self._channels])
+
+    def stream_stream(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        return _StreamStream([c.stream_stream(method, *args, **kwargs) for c in self._channels])
+
+
+class CallOptions(NamedTuple):
+    """傳給每次呼叫的 retry / timeout 參數（以 ** 展開）."""
+
+    read: dict[str, Any]  # document get、transaction 內的讀取
+    stream: dict[str, Any]  # 查詢、get_all、聚合查詢
+    write: dict[str, Any]  # set / update / delete / create、batch.commit
+
+
+# 不是 FirestoreClient 時（例如 scripts 直接建立的 AsyncClient）沿用 GAPIC 預設
+DEFAULT_CALL_OPTIONS = CallOptions({}, {}, {})
+
+
+def call_options(db: Any) -> CallOptions:
+    """取得 client 的呼叫參數（repository 初始化時取得一次）."""
+    if isinstance(db, FirestoreClient | SyncFirestoreClient):
+        return db.call_options
+    return DEFAULT_CALL_OPTIONS
+
+
+def _build_call_options(
+    retry_class: type[AsyncRetry] | type[Retry],
+    budget: RetryBudget,
+    *,
+    timeout_seconds: float,
+    stream_timeout_seconds: float,
+    retry_initial_backoff_seconds: float,
+    retry_max_backoff_seconds: float,
+    retry_deadline_seconds: float,
+) -> CallOptions:
+    def retry(errors: tuple[type[Exception], ...]) -> AsyncRetry | Retry:
+        return retry_class(
+            predicate=budget.wrap(if_exception_type(*errors)),
+            initial=retry_initial_backoff_seconds,
+            maximum=retry_max_backoff_seconds,
+            multiplier=2.0,
+            timeout=retry_deadline_seconds,
+        )
+
+    read_retry = retry(_READ_ERRORS)
+    return CallOptions(
+        read={"retry": read_retry, "timeout": timeout_seconds},
+        stream={"retry": read_retry, "timeout": stream_timeout_seconds},
+        write={"retry": retry(_WRITE_ERRORS), "timeout": timeout_seconds},
+    )
+
+
+class FirestoreClient(AsyncClient):
+    """套用連線、deadline 與重試設定的 Firestore AsyncClient."""
+
+    def __init__(
+        self,
+        project: str,
+        database: str = "(default)",
+        *,
+        channel_pool_size: int = 1,
+        keepalive_seconds: float = 30.0,
+        keepalive_timeout_seconds: float = 10.0,
+        timeout_seconds: float = 10.0,
+        stream_timeout_seconds: float = 60.0,
+        retry_initial_backoff_seconds: float = 0.1,
+        retry_max_backoff_seconds: float = 2.0,
+        retry_deadline_seconds: float = 20.0,
+        retry_budget: RetryBudget | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """初始化.
+
+        Args:
+            project: GCP Project ID
+            database: Firestore database name
+            channel_pool_size: gRPC channel 數（連線 Emulator 時固定為 1）
+            keepalive_seconds: keep-alive ping 間隔
+            keepalive_timeout_seconds: ping 無回應多久後視為連線中斷
+            timeout_seconds: 一般 RPC 的 deadline
+            stream_timeout_seconds: 串流查詢（查詢、批次讀取、聚合）的 deadline
+            retry_initial_backoff_seconds: 第一次重試的退避上限
+            retry_max_backoff_seconds: 退避上限
+            retry_deadline_seconds: 含重試的總時限（超過後不再重試）
+            retry_budget: 重試預算（None 表示 20 次突發、每秒補充 5 次）
+            **kwargs: 傳給 AsyncClient（credentials、client_options 等）
+        """
+        super().__init__(project=project, database=database, **kwargs)
+        self.channel_pool_size = max(1, channel_pool_size)
+        self.keepalive_seconds = keepalive_seconds
+        self.keepalive_timeout_seconds = keepalive_timeout_seconds
+        self.retry_budget = retry_budget or RetryBudget(capacity=20, refill_per_second=5)
+        self._tuned_channel = True  # 內部結構改變時改為 False，之後使用預設 channel
+        self.call_options = _build_call_options(
+            AsyncRetry,
+            self.retry_budget,
+            timeout_seconds=timeout_seconds,
+            stream_timeout_seconds=stream_timeout_seconds,
+            retry_initial_backoff_seconds=retry_initial_backoff_seconds,
+            retry_max_backoff_seconds=retry_max_backoff_seconds,
+            retry_deadline_seconds=retry_deadline_seconds,
+        )
+
+    @property
+    def _firestore_api(self) -> Any:
+        """GAPIC client（第一次使用時建立，套用 channel pool 與 keep-alive）."""
+        if self._tuned_channel and getattr(self, "_firestore_api_internal", None) is None:
+            try:
+                self._create_firestore_api()
+            except (AttributeError, TypeError) as e:
+                logger.warning(
+                    "Firestore client internals changed (%r), using the default channel", e
+                )
+                self._tuned_channel = False
+        return super()._firestore_api
+
+    def _create_firestore_api(self) -> None:
+        """沿用 BaseClient._firestore_api_helper 的作法，改用自己建立的 channel."""
+        if self._emulator_host is not None:
+            self._tuned_channel = False  # Emulator：預設 channel 即可
+            return
+        transport = grpc_asyncio.FirestoreGrpcAsyncIOTransport(
+            host=self._target, channel=self._create_channel()
+        )
+        api = firestore_client.FirestoreAsyncClient(
+            transport=transport, client_options=self._client_options
+        )
+        firestore_client._client_info = self._client_info  # type: ignore[attr-defined]
+        self._transport = transport
+        self._firestore_api_internal = api
+
+    def _create_channel(self) -> aio.Channel:
+        options = [
+            ("grpc.keepalive_time_ms", int(self.keepalive_seconds * 1000)),
+            ("grpc.keepalive_timeout_ms", int(self.keepalive_timeout_seconds * 1000)),
+            *_MESSAGE_SIZE_OPTIONS,
+        ]
+        create_channel = grpc_asyncio.FirestoreGrpcAsyncIOTransport.create_channel
+        if self.channel_pool_size == 1:
+            return create_channel(self._target, credentials=self._credentials, options=options)
+        # 參數相同的 channel 會共用同一條連線，各 channel 使用自己的 subchannel pool
+        return _ChannelPool(
+            [
+                create_channel(
+                    self._target,
+                    credentials=self._credentials,
+                    options=[*options, ("grpc.use_local_subchannel_pool", 1)],
+                )
+                for _ in range(self.channel_pool_size)
+            ]
+        )
+
+    async def aclose(self) -> None:
+        """關閉 gRPC channel（AsyncClient.close 不會關閉 channel）."""
+        self.close()
+        transport = getattr(self, "_transport", None)
+        if getattr(self, "_firestore_api_internal", None) is not None and transport is not None:
+            await transport.close()
+            self._firestore_api_internal = None
+
+    def stats(self) -> dict[str, object]:
+        """Client 統計."""
+        return {
+            "channel_pool_size": self.channel_pool_size if self._tuned_channel else 1,
+            "retry": self.retry_budget.stats(),
+        }
+
+
+class SyncFirestoreClient(Client):
+    """套用 deadline 與重試設定的同步 Firestore Client（BulkWriter 只支援同步 client）.
+
+    只用於背景工作，使用預設 channel；參數說明見 FirestoreClient.
+    """
+
+    def __init__(
+        self,
+        project: str,
+        database: str = "(default)",
+        *,
+        timeout_seconds: float = 10.0,
+        stream_timeout_seconds: float = 60.0,
+        retry_initial_backoff_seconds: float = 0.1,
+        retry_max_backoff_seconds: float = 2.0,
+        retry_deadline_seconds: float = 20.0,
+        retry_budget: RetryBudget | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """初始化."""
+        super().__init__(project=project, database=database, **kwargs)
+        self.retry_budget = retry_budget or RetryBudget(capacity=20, refill_per_second=5)
+        self.call_options = _build_call_options(
+            Retry,
+            self.retry_budget,
+            timeout_seconds=timeout_seconds,
+            stream_timeout_seconds=stream_timeout_seconds,
+            retry_initial_backoff_seconds=retry_initial_backoff_seconds,
+            retry_max_backoff_seconds=retry_max_backoff_seconds,
+            retry_deadline_seconds=retry_deadline_seconds,
+        )
+
+
+def create_firestore_client(
+    project: str,
+    database: str = "(default)",
+    *,
+    channel_pool_size: int = 1,
+    keepalive_seconds: float = 30.0,
+    keepalive_timeout_seconds: float = 10.0,
+    timeout_seconds: float = 10.0,
+    stream_timeout_seconds: float = 60.0,
+    retry_initial_backoff_seconds: float = 0.1,
+    retry_max_backoff_seconds: float = 2.0,
+    retry_deadline_seconds: float = 20.0,
+    retry_budget: float = 20,
+    retry_budget_per_second: float = 5.0,
+) -> FirestoreClient:
+    """建立 Firestore client（參數說明見 FirestoreClient）.
+
+    Args:
+        retry_budget: 重試預算的突發上限
+        retry_budget_per_second: 重試預算每秒補充量
+    """
+    return FirestoreClient(
+        project=project,
+        database=database,
+        channel_pool_size=channel_pool_size,
+        keepalive_seconds=keepalive_seconds,
+        keepalive_timeout_seconds=keepalive_timeout_seconds,
+        timeout_seconds=timeout_seconds,
+        stream_timeout_seconds=stream_timeout_seconds,
+        retry_initial_backoff_seconds=retry_initial_backoff_seconds,
+        retry_max_backoff_seconds=retry_max_backoff_seconds,
+        retry_deadline_seconds=retry_deadline_seconds,
+        retry_budget=RetryBudget(capacity=retry_budget, refill_per_second=retry_budget_per_second),
+    )
+
+
+def create_sync_firestore_client(
+    project: str,
+    database: str = "(default)",
+    *,
+    timeout_seconds: float = 10.0,
+    stream_timeout_seconds: float = 60.0,
+    retry_initial_backoff_seconds: float = 0.1,
+    retry_max_backoff_seconds: float = 2.0,
+    retry_deadline_seconds: float = 20.0,
+    retry_budget: RetryBudget | None = None,
+) -> SyncFirestoreClient:
+    """建立同步 Firestore client（參數說明見 FirestoreClient）.
+
+    Args:
+        retry_budget: 與 AsyncClient 共用的重試預算（FirestoreClient.retry_budget）
+    """
+    return SyncFirestoreClient(
+        project=project,
+        database=database,
+        timeout_seconds=timeout_seconds,
+        stream_timeout_seconds=stream_timeout_seconds,
+        retry_initial_backoff_seconds=retry_initial_backoff_seconds,
+        retry_max_backoff_seconds=retry_max_backoff_seconds,
+        retry_deadline_seconds=retry_deadline_seconds,
+        retry_budget=retry_budget,
+    )
@@ -9,11 +9,29 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from google.cloud.firestore_v1 import AsyncClient
 
 from auth.app.config import get_settings
-from auth.app.repositories import FirestoreUserRepository, InMemoryUserRepository, UserRepository
+from auth.app.firestore_client import FirestoreClient, create_firestore_client
+from auth.app.repositories import (
+    FirestoreInviteCodeRepository,
+    FirestoreRateLimitRepository,
+    FirestoreUserRepository,
+    InMemoryInviteCodeRepository,
+    InMemoryUserRepository,
+    InviteCodeRepository,
+    RateLimitRepository,
+    UserRepository,
+)
 from auth.app.routers import auth, health, jwks
+from auth.app.services import (
+    ConcurrencyLimiter,
+    InviteCodeService,
+    KeyRing,
+    PasswordHasher,
+    SecretService,
+    create_rate_limiter,
+    create_secret_store,
+)
 
 # 設定 logging
 logging.basicConfig(
@@ -32,6 +50,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # 檢查是否已經有設定好的 repo（測試用）
     existing_repo = getattr(app.state, "user_repo", None)
+    invite_code_repo: InviteCodeRepository | None = None
+    rate_limit_repo: RateLimitRepository | None = None
+    firestore_client: FirestoreClient | None = None
     if existing_repo is not None:
         logger.info("Using pre-configured repository (test mode)")
         user_repo: UserRepository = existing_repo
@@ -40,19 +61,79 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             f"Using Firestore: project={settings.gcp_project_id}, "
             f"database={settings.firestore_database}"
         )
-        db = AsyncClient(project=settings.gcp_project_id, database=settings.firestore_database)
-        user_repo = FirestoreUserRepository(db)
+        firestore_client = create_firestore_client(
+            settings.gcp_project_id,
+            settings.firestore_database,
+            channel_pool_size=settings.firestore_channel_pool_size,
+            keepalive_seconds=settings.firestore_keepalive_seconds,
+            keepalive_timeout_seconds=settings.firestore_keepalive_timeout_seconds,
+            timeout_seconds=settings.firestore_timeout_seconds,
+            stream_timeout_seconds=settings.firestore_stream_timeout_seconds,
+            retry_initial_backoff_seconds=settings.firestore_retry_initial_backoff_seconds,
+            retry_max_backoff_seconds=settings.firestore_retry_max_backoff_seconds,
+            retry_deadline_seconds=settings.firestore_retry_deadline_seconds,
+            retry_budget=settings.firestore_retry_budget,
+            retry_budget_per_second=settings.firestore_retry_budget_per_second,
+        )
+        user_repo = FirestoreUserRepository(
+            firestore_client,
+            email_index_fallback=settings.firestore_email_index_fallback,
+            write_profiles=settings.firestore_write_user_profiles,
+        )
+        if settings.invite_code_store_enabled:
+            invite_code_repo = FirestoreInviteCodeRepository(firestore_client)
+        if settings.rate_limit_backend == "firestore":
+            rate_limit_repo = FirestoreRateLimitRepository(firestore_client)
     else:
         logger.info("Using In-Memory repository")
         user_repo = InMemoryUserRepository()
 
+    if invite_code_repo is None and settings.invite_code_store_enabled:
+        invite_code_repo = InMemoryInviteCodeRepository()
+
     app.state.user_repo = user_repo
+    app.state.invite_code_repo = invite_code_repo
+
+    # Secret 在啟動時預先載入（於執行緒中），之後由背景 task 重新載入
+    secret_store = create_secret_store(settings)
+    await secret_store.start([settings.jwt_private_key_secret_id, settings.invite_codes_secret_id])
+    app.state.secret_store = secret_store
+    secret_service = SecretService(settings.gcp_project_id, store=secret_store)
+
+    # JWT 簽章金鑰只在啟動時載入一次
+    if getattr(app.state, "key_ring", None) is None:
+        app.state.key_ring = KeyRing.load(settings, secret_service)
+
+    # 邀請碼在 app 層級共用，定期從 SecretStore 重新載入
+    invite_service = InviteCodeService(
+        secret_service,
+        code_repo=invite_code_repo,
+        reload_interval_seconds=settings.invite_codes_reload_interval_seconds,
+    )
+    await invite_service.start()
+    app.state.invite_service = invite_service
+
+    # bcrypt 在專用執行緒池中執行，不佔用 event loop
+    password_hasher = PasswordHasher(
+        max_workers=settings.password_hash_workers,
+        max_queue_depth=settings.password_hash_max_queue,
+    )
+    app.state.password_hasher = password_hasher
+
+    # 登入/註冊速率限制與密碼驗證併發上限（超過時立即回 429）
+    app.state.rate_limiter = create_rate_limiter(settings, rate_limit_repo)
+    app.state.verify_limiter = ConcurrencyLimiter(settings.password_verify_max_concurrency)
 
     yield
 
     # Shutdown
     logger.info("Shutting down Auth service")
+    await invite_service.stop()
     await user_repo.close()
+    if firestore_client is not None:
+        await firestore_client.aclose()
+    await secret_store.stop()
+    password_hasher.shutdown()
 
 
 app = FastAPI(
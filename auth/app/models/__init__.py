@@ -1,8 +1,12 @@
 """Auth Service Models."""
 
+from auth.app.models.token import RefreshRequest, RefreshToken, RevokeRequest
 from auth.app.models.user import User, UserBase, UserCreate, UserInDB, UserLogin
 
 __all__ = [
+    "RefreshRequest",
+    "RefreshToken",
+    "RevokeRequest",
     "User",
     "UserBase",
     "UserCreate",
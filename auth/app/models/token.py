@@ -0,0 +1,31 @@
+"""Refresh token 相關資料模型."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class RefreshToken(BaseModel):
+    """資料庫中的 refresh token（只保存雜湊值）."""
+
+    token_id: str = Field(..., description="Token ID (ULID)")
+    internal_user_id: str = Field(..., description="內部使用者 ID")
+    device_id: str = Field(..., description="裝置 ID（同一裝置輪替出的 token 共用）")
+    token_hash: str = Field(..., description="SHA-256(secret) 的十六進位字串")
+    created_at: datetime = Field(..., description="建立時間")
+    expires_at: datetime = Field(..., description="過期時間")
+    revoked_at: datetime | None = Field(default=None, description="撤銷（或已輪替）時間")
+    replaced_by: str | None = Field(default=None, description="輪替後的新 token ID")
+
+
+class RefreshRequest(BaseModel):
+    """以 refresh token 換發 access token 的請求."""
+
+    refresh_token: str = Field(..., description="Refresh token")
+
+
+class RevokeRequest(BaseModel):
+    """撤銷 refresh token 的請求."""
+
+    refresh_token: str = Field(..., description="Refresh token")
+    all_devices: bool = Field(default=False, description="撤銷使用者所有裝置的 refresh token")
@@ -47,3 +47,6 @@ class UserLogin(BaseModel):
 
     email: EmailStr = Field(..., description="電子郵件")
     password: str = Field(..., description="密碼")
+    device_id: str | None = Field(
+        default=None, max_length=64, description="裝置 ID（未提供時每次登入視為新裝置）"
+    )
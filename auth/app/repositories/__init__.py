@@ -1,11 +1,31 @@
 """Auth Service Repositories."""
 
-from auth.app.repositories.base import UserRepository
-from auth.app.repositories.firestore import FirestoreUserRepository
-from auth.app.repositories.memory import InMemoryUserRepository
+from auth.app.repositories.base import (
+    InviteCodeRepository,
+    RateLimitRepository,
+    UserRepository,
+    take_from_bucket,
+)
+from auth.app.repositories.firestore import (
+    FirestoreInviteCodeRepository,
+    FirestoreRateLimitRepository,
+    FirestoreUserRepository,
+)
+from auth.app.repositories.memory import (
+    InMemoryInviteCodeRepository,
+    InMemoryRateLimitRepository,
+    InMemoryUserRepository,
+)
 
 __all__ = [
     "UserRepository",
     "InMemoryUserRepository",
     "FirestoreUserRepository",
+    "InviteCodeRepository",
+    "InMemoryInviteCodeRepository",
+    "FirestoreInviteCodeRepository",
+    "RateLimitRepository",
+    "InMemoryRateLimitRepository",
+    "FirestoreRateLimitRepository",
+    "take_from_bucket",
 ]
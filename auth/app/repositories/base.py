@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 
-from auth.app.models import UserCreate, UserInDB
+from auth.app.models import RefreshToken, UserCreate, UserInDB
 
 
 class UserRepository(ABC):
@@ -28,7 +28,128 @@ class UserRepository(ABC):
         """建立使用者."""
         pass
 
+    @abstractmethod
+    async def list_baby_roles(self, internal_user_id: str) -> dict[str, str]:
+        """取得使用者在各嬰兒的角色（baby_id -> role），用於簽入 token."""
+        pass
+
+    @abstractmethod
+    async def create_refresh_token(self, token: RefreshToken) -> None:
+        """儲存 refresh token."""
+        pass
+
+    @abstractmethod
+    async def get_refresh_token(self, token_id: str) -> RefreshToken | None:
+        """根據 token ID 取得 refresh token."""
+        pass
+
+    @abstractmethod
+    async def rotate_refresh_token(self, token_id: str, new_token: RefreshToken) -> bool:
+        """輪替 refresh token（原子地撤銷舊 token 並儲存新 token）.
+
+        Returns:
+            是否輪替成功（舊 token 不存在或已撤銷時為 False，且不儲存新 token）
+        """
+        pass
+
+    @abstractmethod
+    async def revoke_refresh_tokens(
+        self, internal_user_id: str, device_id: str | None = None
+    ) -> int:
+        """撤銷使用者的 refresh token.
+
+        Args:
+            internal_user_id: 內部使用者 ID
+            device_id: 只撤銷此裝置；None 表示所有裝置
+
+        Returns:
+            撤銷的 token 數量
+        """
+        pass
+
     @abstractmethod
     async def close(self) -> None:
         """關閉 Repository（清理資源）."""
         pass
+
+
+class InviteCodeRepository(ABC):
+    """限定使用次數的邀請碼 Repository.
+
+    code 皆為正規化後（去除空白、大寫）的值.
+    """
+
+    @abstractmethod
+    async def create(self, code: str, max_uses: int = 1) -> None:
+        """建立邀請碼（已存在時覆蓋）."""
+        pass
+
+    @abstractmethod
+    async def redeem(self, code: str) -> bool:
+        """兌換邀請碼（原子地扣除一次使用次數）.
+
+        Returns:
+            是否兌換成功（不存在或已用完時為 False）
+        """
+        pass
+
+    @abstractmethod
+    async def release(self, code: str) -> None:
+        """歸還一次使用次數（兌換後註冊失敗時使用，不超過 max_uses）."""
+        pass
+
+    @abstractmethod
+    async def remaining_uses(self, code: str) -> int:
+        """取得剩餘使用次數（不存在時為 0）."""
+        pass
+
+
+def take_from_bucket(
+    tokens: float,
+    elapsed_seconds: float,
+    capacity: float,
+    refill_per_second: float,
+    cost: float = 1.0,
+) -> tuple[float, float]:
+    """計算 token bucket 補充後取出 token 的結果（各 RateLimitRepository 共用）.
+
+    Args:
+        tokens: 上次更新時的 token 數
+        elapsed_seconds: 距離上次更新的秒數
+        capacity: Bucket 容量
+        refill_per_second: 每秒補充的 token 數
+        cost: 本次取出的 token 數
+
+    Returns:
+        (更新後的 token 數, 需要等待的秒數；0 表示允許)
+    """
+    tokens = min(capacity, tokens + max(elapsed_seconds, 0.0) * refill_per_second)
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    if refill_per_second <= 0:
+        return tokens, float("inf")
+    return tokens, (cost - tokens) / refill_per_second
+
+
+class RateLimitRepository(ABC):
+    """Token bucket 狀態儲存.
+
+    In-Memory 實作只在單一 instance 內生效；Firestore 實作讓多個 instance 共用同一組 bucket.
+    """
+
+    @abstractmethod
+    async def consume(
+        self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0
+    ) -> float:
+        """從 bucket 取出 token.
+
+        Args:
+            key: Bucket key
+            capacity: Bucket 容量（允許的突發量）
+            refill_per_second: 每秒補充的 token 數
+            cost: 本次取出的 token 數
+
+        Returns:
+            0 表示允許；否則為需要等待的秒數（本次不扣除）
+        """
+        pass
@@ -1,15 +1,25 @@
 """Firestore Repository 實作."""
 
-from datetime import UTC
+import contextlib
+import hashlib
+import time
+from datetime import UTC, timedelta
 from datetime import datetime as dt
 from typing import Any
 
+from google.api_core.exceptions import AlreadyExists
 from google.cloud import firestore
-from google.cloud.firestore_v1 import AsyncClient
+from google.cloud.firestore_v1 import AsyncClient, Increment, async_transactional
 from ulid import ULID
 
-from auth.app.models import UserCreate, UserInDB
-from auth.app.repositories.base import UserRepository
+from auth.app.firestore_client import call_options
+from auth.app.models import RefreshToken, UserCreate, UserInDB
+from auth.app.repositories.base import (
+    InviteCodeRepository,
+    RateLimitRepository,
+    UserRepository,
+    take_from_bucket,
+)
 
 
 def _convert_timestamp_to_datetime(value: Any) -> dt:
@@ -45,17 +55,81 @@ def _convert_timestamp_to_datetime(value: Any) -> dt:
     raise TypeError(f"Cannot convert {type(value)} ({value}) to datetime")
 
 
+def user_profile_data(user_id: str, user_data: dict[str, Any]) -> dict[str, Any]:
+    """由使用者文件產生 user_profiles 投影（不含密碼雜湊，供 API Service 讀取）."""
+    return {
+        "user_id": user_id,
+        "internal_user_id": user_data["internal_user_id"],
+        "display_name": user_data["display_name"],
+        "email": user_data["email"],
+        "created_at": user_data["created_at"],
+        "updated_at": user_data["updated_at"],
+    }
+
+
+def _to_refresh_token(token_id: str, data: dict[str, Any]) -> RefreshToken:
+    """將 Firestore 文件轉換為 RefreshToken."""
+    revoked_at = data.get("revoked_at")
+    return RefreshToken(
+        token_id=token_id,
+        internal_user_id=data["internal_user_id"],
+        device_id=data["device_id"],
+        token_hash=data["token_hash"],
+        created_at=_convert_timestamp_to_datetime(data["created_at"]),
+        expires_at=_convert_timestamp_to_datetime(data["expires_at"]),
+        revoked_at=_convert_timestamp_to_datetime(revoked_at) if revoked_at else None,
+        replaced_by=data.get("replaced_by"),
+    )
+
+
 class FirestoreUserRepository(UserRepository):
-    """Firestore 使用者 Repository."""
+    """Firestore 使用者 Repository.
 
-    def __init__(self, db: AsyncClient, collection_name: str = "users"):
-        """初始化."""
+    Email 唯一性由 user_emails/{email} 索引文件保證：索引與使用者文件在同一個 transaction 中建立，
+    查詢 email 只需 key 讀取，不需要欄位查詢.
+
+    使用者文件以 user_id 為 key，另外同步寫入以 internal_user_id 為 key 的 user_profiles 投影
+    （dual-write），讓 API Service 以 key 讀取（可用 get_all 批次）. 既有使用者以
+    backfill_profiles（scripts/migrate_user_profiles.py）補建.
+
+    Refresh token 存放在 refresh_tokens/{tokenId}，以 token ID 作為 document ID，
+    換發時只需一次 key 讀取；過期文件可交由 Firestore TTL policy（expires_at 欄位）清除.
+    """
+
+    def __init__(
+        self,
+        db: AsyncClient,
+        collection_name: str = "users",
+        refresh_token_collection_name: str = "refresh_tokens",
+        email_index_collection_name: str = "user_emails",
+        email_index_fallback: bool = True,
+        profile_collection_name: str = "user_profiles",
+        write_profiles: bool = True,
+    ):
+        """初始化.
+
+        Args:
+            db: Firestore client
+            collection_name: 使用者 collection
+            refresh_token_collection_name: Refresh token collection
+            email_index_collection_name: Email 索引 collection（document ID 為小寫 email）
+            email_index_fallback: 索引查無資料時改用 email 欄位查詢（相容建立索引前的使用者），
+                查到時順便補建索引
+            profile_collection_name: 以 internal_user_id 為 key 的使用者投影 collection
+            write_profiles: 建立使用者時同步寫入投影
+        """
         self._db = db
+        self._options = call_options(db)
         self._collection = db.collection(collection_name)
+        self._refresh_tokens = db.collection(refresh_token_collection_name)
+        self._email_index = db.collection(email_index_collection_name)
+        self._email_index_fallback = email_index_fallback
+        self._profiles = db.collection(profile_collection_name)
+        self._write_profiles = write_profiles
 
     async def get_by_id(self, user_id: str) -> UserInDB | None:
         """根據 ID 取得使用者."""
-        doc = await self._collection.document(user_id).get()
+        doc = await self._collection.document(user_id).get(**self._options.read)
         if not doc.exists:
             return None
         data = doc.to_dict()
@@ -72,29 +146,49 @@ class FirestoreUserRepository(UserRepository):
         return None
 
     async def get_by_email(self, email: str) -> UserInDB | None:
-        """根據 Email 取得使用者."""
-        query = self._collection.where("email", "==", email.lower()).limit(1)
-        docs = [doc async for doc in query.stream()]
+        """根據 Email 取得使用者（透過 email 索引做 key 讀取）."""
+        email = email.lower()
+        index_doc = await self._email_index.document(email).get(**self._options.read)
+        if index_doc.exists:
+            user_id = (index_doc.to_dict() or {}).get("user_id")
+            return await self.get_by_id(user_id) if user_id else None
+        if not self._email_index_fallback:
+            return None
+
+        # 建立索引前註冊的使用者：以欄位查詢並補建索引
+        query = self._collection.where("email", "==", email).limit(1)
+        docs = [doc async for doc in query.stream(**self._options.stream)]
         if not docs:
             return None
         doc = docs[0]
         data = doc.to_dict()
-        if data:
-            return UserInDB(
-                id=doc.id,
-                internal_user_id=data["internal_user_id"],
-                display_name=data["display_name"],
-                email=data["email"],
-                hashed_password=data["hashed_password"],
-                created_at=_convert_timestamp_to_datetime(data["created_at"]),
-                updated_at=_convert_timestamp_to_datetime(data["updated_at"]),
+        if not data:
+            return None
+        with contextlib.suppress(AlreadyExists):
+            await self._email_index.document(email).create(
+                {"user_id": doc.id, "internal_user_id": data["internal_user_id"]},
+                **self._options.write,
             )
-        return None
+        return UserInDB(
+            id=doc.id,
+            internal_user_id=data["internal_user_id"],
+            display_name=data["display_name"],
+            email=data["email"],
+            hashed_password=data["hashed_password"],
+            created_at=_convert_timestamp_to_datetime(data["created_at"]),
+            updated_at=_convert_timestamp_to_datetime(data["updated_at"]),
+        )
 
     async def get_by_internal_id(self, internal_user_id: str) -> UserInDB | None:
-        """根據內部使用者 ID 取得使用者."""
+        """根據內部使用者 ID 取得使用者（先以投影取得 user_id，沒有投影時改用欄位查詢）."""
+        profile = await self._profiles.document(internal_user_id).get(**self._options.read)
+        if profile.exists:
+            user_id = (profile.to_dict() or {}).get("user_id")
+            if user_id:
+                return await self.get_by_id(user_id)
+
         query = self._collection.where("internal_user_id", "==", internal_user_id).limit(1)
-        docs = [doc async for doc in query.stream()]
+        docs = [doc async for doc in query.stream(**self._options.stream)]
         if not docs:
             return None
         doc = docs[0]
@@ -112,26 +206,49 @@ class FirestoreUserRepository(UserRepository):
         return None
 
     async def create(self, user_create: UserCreate, hashed_password: str) -> UserInDB:
-        """建立使用者."""
-        # 檢查 email 是否已存在
-        existing = await self.get_by_email(user_create.email)
-        if existing:
-            raise ValueError(f"Email {user_create.email} already exists")
+        """建立使用者.
 
+        Email 索引與使用者文件在同一個 transaction 中建立，併發註冊同一個 email 時只有一個成功.
+
+        Raises:
+            ValueError: Email 已存在
+        """
         now = dt.now(UTC)
         user_id = str(ULID())
         internal_user_id = str(ULID())
+        email = user_create.email.lower()  # 統一轉為小寫
 
         user_data = {
             "internal_user_id": internal_user_id,
             "display_name": user_create.display_name,
-            "email": user_create.email.lower(),  # 統一轉為小寫
+            "email": email,
             "hashed_password": hashed_password,
             "created_at": now,
             "updated_at": now,
         }
+        email_ref = self._email_index.document(email)
+        user_ref = self._collection.document(user_id)
 
-        await self._collection.document(user_id).set(user_data)
+        @async_transactional
+        async def _create(transaction: Any) -> None:
+            snapshot = await email_ref.get(transaction=transaction, **self._options.read)
+            if snapshot.exists:
+                raise ValueError(f"Email {user_create.email} already exists")
+            transaction.create(
+                email_ref,
+                {"user_id": user_id, "internal_user_id": internal_user_id, "created_at": now},
+            )
+            transaction.create(user_ref, user_data)
+            if self._write_profiles:
+                transaction.set(
+                    self._profiles.document(internal_user_id),
+                    user_profile_data(user_id, user_data),
+                )
+
+        try:
+            await _create(self._db.transaction())
+        except AlreadyExists as e:
+            raise ValueError(f"Email {user_create.email} already exists") from e
 
         return UserInDB(
             id=user_id,
@@ -143,6 +260,235 @@ class FirestoreUserRepository(UserRepository):
             updated_at=now,
         )
 
+    async def backfill_profiles(self, dry_run: bool = False) -> int:
+        """為既有使用者補建 user_profiles 投影（可重複執行）.
+
+        Args:
+            dry_run: 只計算數量，不寫入
+
+        Returns:
+            寫入（或將寫入）的投影數量
+        """
+        batch = self._db.batch()
+        pending = 0
+        count = 0
+        async for doc in self._collection.stream(**self._options.stream):
+            data = doc.to_dict()
+            if not data or "internal_user_id" not in data:
+                continue
+            count += 1
+            if dry_run:
+                continue
+            batch.set(
+                self._profiles.document(data["internal_user_id"]), user_profile_data(doc.id, data)
+            )
+            pending += 1
+            # Firestore batch 上限 500 筆
+            if pending == 500:
+                await batch.commit(**self._options.write)
+                batch = self._db.batch()
+                pending = 0
+        if pending:
+            await batch.commit(**self._options.write)
+        return count
+
+    async def list_baby_roles(self, internal_user_id: str) -> dict[str, str]:
+        """取得使用者在各嬰兒的角色.
+
+        成員資料由 API Service 存放在 babies/{babyId}/members/{internalUserId}，
+        以 collection group query 一次取得.
+        """
+        query = self._db.collection_group("members").where(
+            "internal_user_id", "==", internal_user_id
+        )
+        roles: dict[str, str] = {}
+        async for doc in query.stream(**self._options.stream):
+            data = doc.to_dict()
+            baby_ref = doc.reference.parent.parent
+            if data and baby_ref is not None:
+                roles[baby_ref.id] = data["role"]
+        return roles
+
+    async def create_refresh_token(self, token: RefreshToken) -> None:
+        """儲存 refresh token."""
+        await self._refresh_tokens.document(token.token_id).set(
+            token.model_dump(exclude={"token_id"}), **self._options.write
+        )
+
+    async def get_refresh_token(self, token_id: str) -> RefreshToken | None:
+        """根據 token ID 取得 refresh token."""
+        doc = await self._refresh_tokens.document(token_id).get(**self._options.read)
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        return _to_refresh_token(doc.id, data) if data else None
+
+    async def rotate_refresh_token(self, token_id: str, new_token: RefreshToken) -> bool:
+        """在 transaction 中撤銷舊 token 並儲存新 token（同一 token 併發換發時只有一個成功）."""
+        old_ref = self._refresh_tokens.document(token_id)
+        new_ref = self._refresh_tokens.document(new_token.token_id)
+
+        @async_transactional
+        async def _rotate(transaction: Any) -> bool:
+            snapshot = await old_ref.get(transaction=transaction, **self._options.read)
+            if not snapshot.exists:
+                return False
+            if (snapshot.to_dict() or {}).get("revoked_at"):
+                return False
+            transaction.update(
+                old_ref,
+                {"revoked_at": new_token.created_at, "replaced_by": new_token.token_id},
+            )
+            transaction.set(new_ref, new_token.model_dump(exclude={"token_id"}))
+            return True
+
+        return await _rotate(self._db.transaction())  # type: ignore[no-any-return]
+
+    async def revoke_refresh_tokens(
+        self, internal_user_id: str, device_id: str | None = None
+    ) -> int:
+        """撤銷使用者的 refresh token（以 batch 更新）."""
+        query = self._refresh_tokens.where("internal_user_id", "==", internal_user_id)
+        if device_id is not None:
+            query = query.where("device_id", "==", device_id)
+
+        now = dt.now(UTC)
+        batch = self._db.batch()
+        count = 0
+        async for doc in query.stream(**self._options.stream):
+            if (doc.to_dict() or {}).get("revoked_at"):
+                continue
+            batch.update(doc.reference, {"revoked_at": now})
+            count += 1
+            # Firestore batch 上限 500 筆
+            if count % 500 == 0:
+                await batch.commit(**self._options.write)
+                batch = self._db.batch()
+        if count % 500:
+            await batch.commit(**self._options.write)
+        return count
+
     async def close(self) -> None:
-        """關閉 Repository（Firestore AsyncClient 無需手動關閉）."""
+        """關閉 Repository（Firestore client 由 lifespan 關閉）."""
         pass
+
+
+class FirestoreInviteCodeRepository(InviteCodeRepository):
+    """Firestore 邀請碼 Repository.
+
+    邀請碼存放在 invite_codes/{code}，以 code 作為 document ID，驗證只需一次 key 讀取.
+    """
+
+    def __init__(self, db: AsyncClient, collection_name: str = "invite_codes"):
+        """初始化."""
+        self._db = db
+        self._options = call_options(db)
+        self._collection = db.collection(collection_name)
+
+    async def create(self, code: str, max_uses: int = 1) -> None:
+        """建立邀請碼."""
+        await self._collection.document(code).set(
+            {
+                "remaining_uses": max_uses,
+                "max_uses": max_uses,
+                "redeemed_count": 0,
+                "created_at": dt.now(UTC),
+            },
+            **self._options.write,
+        )
+
+    async def redeem(self, code: str) -> bool:
+        """在 transaction 中檢查並扣除使用次數（併發兌換時由 Firestore 重試）."""
+        ref = self._collection.document(code)
+
+        @async_transactional
+        async def _redeem(transaction: Any) -> bool:
+            snapshot = await ref.get(transaction=transaction, **self._options.read)
+            if not snapshot.exists:
+                return False
+            remaining = (snapshot.to_dict() or {}).get("remaining_uses", 0)
+            if remaining <= 0:
+                return False
+            transaction.update(
+                ref,
+                {
+                    "remaining_uses": remaining - 1,
+                    "redeemed_count": Increment(1),
+                    "last_redeemed_at": dt.now(UTC),
+                },
+            )
+            return True
+
+        return await _redeem(self._db.transaction())  # type: ignore[no-any-return]
+
+    async def release(self, code: str) -> None:
+        """在 transaction 中歸還一次使用次數（不超過 max_uses）."""
+        ref = self._collection.document(code)
+
+        @async_transactional
+        async def _release(transaction: Any) -> None:
+            snapshot = await ref.get(transaction=transaction, **self._options.read)
+            if not snapshot.exists:
+                return
+            data = snapshot.to_dict() or {}
+            remaining = data.get("remaining_uses", 0)
+            if remaining >= data.get("max_uses", 0):
+                return
+            transaction.update(
+                ref, {"remaining_uses": remaining + 1, "redeemed_count": Increment(-1)}
+            )
+
+        await _release(self._db.transaction())
+
+    async def remaining_uses(self, code: str) -> int:
+        """取得剩餘使用次數."""
+        snapshot = await self._collection.document(code).get(**self._options.read)
+        if not snapshot.exists:
+            return 0
+        return int((snapshot.to_dict() or {}).get("remaining_uses", 0))
+
+
+class FirestoreRateLimitRepository(RateLimitRepository):
+    """Firestore token bucket（多個 instance 共用）.
+
+    Bucket 存放在 rate_limits/{sha256(key)}，key 含 email 等個資所以只保存雜湊值；
+    以 transaction 讀取並更新. expires_at 欄位可搭配 Firestore TTL policy 清除閒置 bucket.
+    """
+
+    def __init__(self, db: AsyncClient, collection_name: str = "rate_limits"):
+        """初始化."""
+        self._db = db
+        self._options = call_options(db)
+        self._collection = db.collection(collection_name)
+
+    async def consume(
+        self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0
+    ) -> float:
+        """在 transaction 中補充並取出 token."""
+        ref = self._collection.document(hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+        @async_transactional
+        async def _consume(transaction: Any) -> float:
+            snapshot = await ref.get(transaction=transaction, **self._options.read)
+            data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+            now = time.time()
+            tokens, wait = take_from_bucket(
+                float(data.get("tokens", capacity)),
+                now - float(data.get("updated_at", now)),
+                capacity,
+                refill_per_second,
+                cost,
+            )
+            # bucket 補滿所需時間之後即可刪除
+            idle_seconds = capacity / refill_per_second if refill_per_second > 0 else 86400.0
+            transaction.set(
+                ref,
+                {
+                    "tokens": tokens,
+                    "updated_at": now,
+                    "expires_at": dt.now(UTC) + timedelta(seconds=idle_seconds),
+                },
+            )
+            return wait
+
+        return await _consume(self._db.transaction())  # type: ignore[no-any-return]
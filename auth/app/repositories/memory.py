@@ -1,11 +1,18 @@
 """In-Memory Repository 實作（開發/測試用）."""
 
+import time
+from collections import OrderedDict
 from datetime import UTC, datetime
 
 from ulid import ULID
 
-from auth.app.models import UserCreate, UserInDB
-from auth.app.repositories.base import UserRepository
+from auth.app.models import RefreshToken, UserCreate, UserInDB
+from auth.app.repositories.base import (
+    InviteCodeRepository,
+    RateLimitRepository,
+    UserRepository,
+    take_from_bucket,
+)
 
 
 class InMemoryUserRepository(UserRepository):
@@ -16,6 +23,7 @@ class InMemoryUserRepository(UserRepository):
         self._users: dict[str, UserInDB] = {}
         self._users_by_email: dict[str, str] = {}  # email -> user_id
         self._users_by_internal_id: dict[str, str] = {}  # internal_user_id -> user_id
+        self._refresh_tokens: dict[str, RefreshToken] = {}  # token_id -> token
 
     async def get_by_id(self, user_id: str) -> UserInDB | None:
         """根據 ID 取得使用者."""
@@ -61,6 +69,100 @@ class InMemoryUserRepository(UserRepository):
 
         return user
 
+    async def list_baby_roles(self, internal_user_id: str) -> dict[str, str]:  # noqa: ARG002
+        """取得使用者在各嬰兒的角色（In-Memory 模式沒有嬰兒資料）."""
+        return {}
+
+    async def create_refresh_token(self, token: RefreshToken) -> None:
+        """儲存 refresh token."""
+        self._refresh_tokens[token.token_id] = token
+
+    async def get_refresh_token(self, token_id: str) -> RefreshToken | None:
+        """根據 token ID 取得 refresh token."""
+        return self._refresh_tokens.get(token_id)
+
+    async def rotate_refresh_token(self, token_id: str, new_token: RefreshToken) -> bool:
+        """輪替 refresh token（單一 event loop 內檢查與更新之間不會被打斷）."""
+        old = self._refresh_tokens.get(token_id)
+        if old is None or old.revoked_at is not None:
+            return False
+        self._refresh_tokens[token_id] = old.model_copy(
+            update={"revoked_at": new_token.created_at, "replaced_by": new_token.token_id}
+        )
+        self._refresh_tokens[new_token.token_id] = new_token
+        return True
+
+    async def revoke_refresh_tokens(
+        self, internal_user_id: str, device_id: str | None = None
+    ) -> int:
+        """撤銷使用者的 refresh token."""
+        now = datetime.now(UTC)
+        count = 0
+        for token_id, token in self._refresh_tokens.items():
+            if token.internal_user_id != internal_user_id or token.revoked_at is not None:
+                continue
+            if device_id is not None and token.device_id != device_id:
+                continue
+            self._refresh_tokens[token_id] = token.model_copy(update={"revoked_at": now})
+            count += 1
+        return count
+
     async def close(self) -> None:
         """關閉 Repository（In-Memory 無需清理）."""
         pass
+
+
+class InMemoryInviteCodeRepository(InviteCodeRepository):
+    """In-Memory 邀請碼 Repository."""
+
+    def __init__(self) -> None:
+        """初始化."""
+        self._remaining: dict[str, int] = {}  # code -> 剩餘使用次數
+        self._max_uses: dict[str, int] = {}
+
+    async def create(self, code: str, max_uses: int = 1) -> None:
+        """建立邀請碼."""
+        self._remaining[code] = max_uses
+        self._max_uses[code] = max_uses
+
+    async def redeem(self, code: str) -> bool:
+        """兌換邀請碼（單一 event loop 內檢查與扣除之間不會被打斷）."""
+        remaining = self._remaining.get(code, 0)
+        if remaining <= 0:
+            return False
+        self._remaining[code] = remaining - 1
+        return True
+
+    async def release(self, code: str) -> None:
+        """歸還一次使用次數."""
+        if code in self._remaining:
+            self._remaining[code] = min(self._remaining[code] + 1, self._max_uses[code])
+
+    async def remaining_uses(self, code: str) -> int:
+        """取得剩餘使用次數."""
+        return self._remaining.get(code, 0)
+
+
+class InMemoryRateLimitRepository(RateLimitRepository):
+    """In-Memory token bucket（只在單一 instance 內生效）.
+
+    以 LRU 保留最多 maxsize 個 bucket；被淘汰的 bucket 下次使用時視為已補滿.
+    """
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        """初始化."""
+        self._maxsize = maxsize
+        # key -> (token 數, 上次更新時間 monotonic)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def consume(
+        self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0
+    ) -> float:
+        """從 bucket 取出 token."""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (capacity, now))
+        tokens, wait = take_from_bucket(tokens, now - updated_at, capacity, refill_per_second, cost)
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self._maxsize:
+            self._buckets.popitem(last=False)
+        return wait
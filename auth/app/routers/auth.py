@@ -5,25 +5,87 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
+from auth.app.config import Settings, get_settings
 from auth.app.dependencies import (
+    get_client_ip,
     get_invite_service,
     get_jwt_service,
+    get_password_hasher,
+    get_rate_limiter,
+    get_refresh_token_service,
     get_user_repository,
+    get_verify_limiter,
 )
-from auth.app.models import User, UserCreate, UserLogin
+from auth.app.models import RefreshRequest, RevokeRequest, User, UserCreate, UserLogin
 from auth.app.repositories import UserRepository
 from auth.app.services.invite import InviteCodeService
 from auth.app.services.jwt import JWTService
-from auth.app.services.password import hash_password, verify_password
+from auth.app.services.password import PasswordHasher, PasswordHasherBusyError
+from auth.app.services.ratelimit import (
+    ConcurrencyLimiter,
+    RateLimiter,
+    RateLimitExceededError,
+)
+from auth.app.services.refresh import InvalidRefreshTokenError, RefreshTokenService
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
+def _server_busy() -> HTTPException:
+    """密碼雜湊工作已滿時的回應."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, please retry later",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _invalid_invite_code() -> HTTPException:
+    """邀請碼無效或已用完時的回應."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid invite code",
+    )
+
+
+def _too_many_requests(error: RateLimitExceededError) -> HTTPException:
+    """超過速率限制或密碼驗證併發上限時的回應."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many requests, please retry later",
+        headers={"Retry-After": error.retry_after_header},
+    )
+
+
+async def _create_access_token(
+    user_repo: UserRepository,
+    jwt_service: JWTService,
+    settings: Settings,
+    internal_user_id: str,
+    email: str,
+) -> str:
+    """簽發 access token."""
+    # 使用 internal_user_id 作為 subject（未來可改為 provider_sub）
+    baby_roles = None
+    if settings.jwt_include_baby_roles:
+        baby_roles = await user_repo.list_baby_roles(internal_user_id)
+
+    return jwt_service.create_token(
+        subject=internal_user_id,
+        email=email,
+        internal_user_id=internal_user_id,
+        baby_roles=baby_roles,
+    )
+
+
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
 async def register(
     user_create: UserCreate,
     user_repo: Annotated[UserRepository, Depends(get_user_repository)],
     invite_service: Annotated[InviteCodeService, Depends(get_invite_service)],
+    password_hasher: Annotated[PasswordHasher, Depends(get_password_hasher)],
+    rate_limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+    client_ip: Annotated[str | None, Depends(get_client_ip)],
 ) -> User:
     """註冊新使用者.
 
@@ -31,21 +93,26 @@ async def register(
         user_create: 註冊請求
         user_repo: User Repository
         invite_service: 邀請碼服務
+        password_hasher: 密碼雜湊
+        rate_limiter: 速率限制
+        client_ip: Client IP
 
     Returns:
         建立的使用者（不含密碼）
 
     Raises:
-        HTTPException: 邀請碼無效或 Email 已存在
+        HTTPException: 超過速率限制、邀請碼無效或 Email 已存在
     """
-    # 驗證邀請碼
-    if not invite_service.validate(user_create.invite_code):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid invite code",
-        )
+    try:
+        await rate_limiter.check("register", user_create.email, client_ip)
+    except RateLimitExceededError as e:
+        raise _too_many_requests(e) from e
 
-    # 檢查 Email 是否已存在
+    # 驗證邀請碼（此時不扣除使用次數，確定可以建立使用者後才兌換）
+    if not await invite_service.check(user_create.invite_code):
+        raise _invalid_invite_code()
+
+    # 檢查 Email 是否已存在（key 讀取，避免為重複註冊做 bcrypt；唯一性由 create 的 transaction 保證）
     existing_user = await user_repo.get_by_email(user_create.email)
     if existing_user:
         raise HTTPException(
@@ -54,16 +121,27 @@ async def register(
         )
 
     # 雜湊密碼
-    hashed_password = hash_password(user_create.password)
+    try:
+        hashed_password = await password_hasher.hash(user_create.password)
+    except PasswordHasherBusyError as e:
+        raise _server_busy() from e
 
-    # 建立使用者
+    # 兌換邀請碼（併發兌換時限定使用次數的邀請碼可能已用完）
+    if not await invite_service.redeem(user_create.invite_code):
+        raise _invalid_invite_code()
+
+    # 建立使用者（併發註冊同一個 email 時只有一個成功）；失敗時歸還邀請碼的使用次數
     try:
         user_in_db = await user_repo.create(user_create, hashed_password)
     except ValueError as e:
+        await invite_service.release(user_create.invite_code)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail=str(e),
+            detail=f"Email {user_create.email} already registered",
         ) from e
+    except Exception:
+        await invite_service.release(user_create.invite_code)
+        raise
 
     # 返回使用者（不含密碼）
     return User(
@@ -81,22 +159,39 @@ async def login(
     user_login: UserLogin,
     user_repo: Annotated[UserRepository, Depends(get_user_repository)],
     jwt_service: Annotated[JWTService, Depends(get_jwt_service)],
-) -> dict[str, str]:
+    settings: Annotated[Settings, Depends(get_settings)],
+    password_hasher: Annotated[PasswordHasher, Depends(get_password_hasher)],
+    refresh_service: Annotated[RefreshTokenService, Depends(get_refresh_token_service)],
+    rate_limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+    verify_limiter: Annotated[ConcurrencyLimiter, Depends(get_verify_limiter)],
+    client_ip: Annotated[str | None, Depends(get_client_ip)],
+) -> dict[str, str | int]:
     """登入取得 JWT Token.
 
     Args:
         user_login: 登入請求
         user_repo: User Repository
         jwt_service: JWT 服務
+        settings: 應用程式設定
+        password_hasher: 密碼雜湊
+        refresh_service: Refresh token 服務
+        rate_limiter: 速率限制
+        verify_limiter: 密碼驗證併發上限
+        client_ip: Client IP
 
     Returns:
-        JWT Token
+        JWT Token 與 refresh token
 
     Raises:
-        HTTPException: Email 或密碼錯誤
+        HTTPException: 超過速率限制或 Email 或密碼錯誤
     """
     logger = logging.getLogger(__name__)
 
+    try:
+        await rate_limiter.check("login", user_login.email, client_ip)
+    except RateLimitExceededError as e:
+        raise _too_many_requests(e) from e
+
     try:
         # 取得使用者
         user = await user_repo.get_by_email(user_login.email)
@@ -107,23 +202,35 @@ async def login(
             )
 
         # 驗證密碼
-        if not verify_password(user_login.password, user.hashed_password):
+        try:
+            async with verify_limiter.acquire():
+                password_ok = await password_hasher.verify(
+                    user_login.password, user.hashed_password
+                )
+        except RateLimitExceededError as e:
+            raise _too_many_requests(e) from e
+        except PasswordHasherBusyError as e:
+            raise _server_busy() from e
+        if not password_ok:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
             )
 
-        # 建立 JWT Token
-        # 使用 internal_user_id 作為 subject（未來可改為 provider_sub）
-        token = jwt_service.create_token(
-            subject=user.internal_user_id,
-            email=user.email,
-            internal_user_id=user.internal_user_id,
+        # 建立 JWT Token 與 refresh token
+        token = await _create_access_token(
+            user_repo, jwt_service, settings, user.internal_user_id, user.email
+        )
+        refresh_token, device_id = await refresh_service.issue(
+            user.internal_user_id, user_login.device_id
         )
 
         return {
             "access_token": token,
             "token_type": "Bearer",
+            "expires_in": settings.jwt_expiration_seconds,
+            "refresh_token": refresh_token,
+            "device_id": device_id,
         }
     except HTTPException:
         raise
@@ -133,3 +240,78 @@ async def login(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {e!s}",
         ) from e
+
+
+@router.post("/refresh")
+async def refresh(
+    refresh_request: RefreshRequest,
+    user_repo: Annotated[UserRepository, Depends(get_user_repository)],
+    jwt_service: Annotated[JWTService, Depends(get_jwt_service)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    refresh_service: Annotated[RefreshTokenService, Depends(get_refresh_token_service)],
+) -> dict[str, str | int]:
+    """以 refresh token 換發 JWT Token（不需重新驗證密碼）.
+
+    每次換發都會回傳新的 refresh token，舊的 refresh token 隨即失效.
+
+    Args:
+        refresh_request: 換發請求
+        user_repo: User Repository
+        jwt_service: JWT 服務
+        settings: 應用程式設定
+        refresh_service: Refresh token 服務
+
+    Returns:
+        JWT Token 與新的 refresh token
+
+    Raises:
+        HTTPException: Refresh token 無效、過期或已撤銷
+    """
+    try:
+        token, refresh_token = await refresh_service.rotate(refresh_request.refresh_token)
+    except InvalidRefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        ) from e
+
+    user = await user_repo.get_by_internal_id(token.internal_user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+    access_token = await _create_access_token(
+        user_repo, jwt_service, settings, user.internal_user_id, user.email
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "Bearer",
+        "expires_in": settings.jwt_expiration_seconds,
+        "refresh_token": refresh_token,
+        "device_id": token.device_id,
+    }
+
+
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke(
+    revoke_request: RevokeRequest,
+    refresh_service: Annotated[RefreshTokenService, Depends(get_refresh_token_service)],
+) -> None:
+    """撤銷 refresh token 所屬裝置（或所有裝置）的 refresh token（登出）.
+
+    Args:
+        revoke_request: 撤銷請求
+        refresh_service: Refresh token 服務
+
+    Raises:
+        HTTPException: Refresh token 無效或過期
+    """
+    try:
+        await refresh_service.revoke(revoke_request.refresh_token, revoke_request.all_devices)
+    except InvalidRefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        ) from e
@@ -1,6 +1,19 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from auth.app.dependencies import (
+    get_password_hasher,
+    get_rate_limiter,
+    get_secret_store,
+    get_verify_limiter,
+    require_metrics_token,
+)
+from auth.app.services.password import PasswordHasher
+from auth.app.services.ratelimit import ConcurrencyLimiter, RateLimiter
+from auth.app.services.secrets import SecretStore
 
 router = APIRouter()
 
@@ -16,3 +29,19 @@ async def readiness_check() -> dict[str, str]:
     """就緒檢查端點。"""
     # TODO: 檢查 Firestore 連線
     return {"status": "ready"}
+
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_token)])
+async def metrics(
+    password_hasher: Annotated[PasswordHasher, Depends(get_password_hasher)],
+    secret_store: Annotated[SecretStore, Depends(get_secret_store)],
+    rate_limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+    verify_limiter: Annotated[ConcurrencyLimiter, Depends(get_verify_limiter)],
+) -> dict[str, object]:
+    """執行期統計（密碼雜湊排隊與執行時間、secret 快取狀態、速率限制等；需要 METRICS_TOKEN）。"""
+    return {
+        "password_hasher": password_hasher.stats(),
+        "password_verify": verify_limiter.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "secrets": secret_store.stats(),
+    }
@@ -2,23 +2,49 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response, status
 
-from auth.app.dependencies import get_jwt_service
-from auth.app.services.jwt import JWTService
+from auth.app.config import Settings, get_settings
+from auth.app.dependencies import get_key_ring
+from auth.app.services.keyring import KeyRing
 
 router = APIRouter()
 
 
-@router.get("/.well-known/jwks.json")
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """比對 If-None-Match（weak comparison，W/ 前綴視為相同）."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+@router.get(
+    "/.well-known/jwks.json",
+    response_class=Response,
+    responses={200: {"content": {"application/json": {}}}, 304: {"description": "Not Modified"}},
+)
 async def get_jwks(
-    jwt_service: Annotated[JWTService, Depends(get_jwt_service)],
-) -> dict[str, list[dict[str, str]]]:
+    request: Request,
+    key_ring: Annotated[KeyRing, Depends(get_key_ring)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> Response:
     """取得 JWKS (JSON Web Key Set).
 
     這個端點提供用於驗證 JWT 的公鑰信息，符合 OIDC 標準。
+    回應在金鑰異動時才重新序列化，並附上 ETag 與 Cache-Control；
+    If-None-Match 相符時回傳 304。
 
     Returns:
         JWKS 格式的 JSON，包含公鑰信息
     """
-    return jwt_service.get_jwks()
+    headers = {
+        "ETag": key_ring.jwks_etag,
+        "Cache-Control": f"public, max-age={settings.jwks_max_age_seconds}",
+    }
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and _etag_matches(if_none_match, key_ring.jwks_etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=key_ring.jwks_bytes, media_type="application/json", headers=headers)
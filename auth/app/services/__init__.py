@@ -2,13 +2,49 @@
 
 from auth.app.services.invite import InviteCodeService
 from auth.app.services.jwt import JWTService
-from auth.app.services.password import hash_password, verify_password
-from auth.app.services.secrets import SecretService
+from auth.app.services.keyring import KeyRing
+from auth.app.services.password import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    hash_password,
+    verify_password,
+)
+from auth.app.services.ratelimit import (
+    BucketPolicy,
+    ConcurrencyLimiter,
+    RateLimiter,
+    RateLimitExceededError,
+    create_rate_limiter,
+)
+from auth.app.services.refresh import InvalidRefreshTokenError, RefreshTokenService
+from auth.app.services.secrets import (
+    LocalSecretBackend,
+    SecretBackend,
+    SecretManagerBackend,
+    SecretService,
+    SecretStore,
+    create_secret_store,
+)
 
 __all__ = [
     "hash_password",
+    "PasswordHasher",
+    "PasswordHasherBusyError",
     "verify_password",
     "SecretService",
+    "SecretBackend",
+    "SecretManagerBackend",
+    "LocalSecretBackend",
+    "SecretStore",
+    "create_secret_store",
     "InviteCodeService",
     "JWTService",
+    "KeyRing",
+    "InvalidRefreshTokenError",
+    "RefreshTokenService",
+    "BucketPolicy",
+    "ConcurrencyLimiter",
+    "RateLimiter",
+    "RateLimitExceededError",
+    "create_rate_limiter",
 ]
@@ -1,32 +1,86 @@
 """邀請碼驗證服務."""
 
+import asyncio
+import contextlib
 import logging
 
+from auth.app.repositories.base import InviteCodeRepository
 from auth.app.services.secrets import SecretService
 
 logger = logging.getLogger(__name__)
 
 
+def normalize_invite_code(code: str) -> str:
+    """正規化邀請碼（去除空白、不區分大小寫）."""
+    return code.strip().upper()
+
+
 class InviteCodeService:
-    """邀請碼驗證服務."""
+    """邀請碼驗證服務.
+
+    App 層級共用：SecretService 中的邀請碼正規化後存成 frozenset，驗證為 O(1) 查表，
+    並由背景 task 定期重新載入. 另可搭配 InviteCodeRepository 提供限定使用次數的邀請碼.
+    """
 
-    def __init__(self, secret_service: SecretService):
-        """初始化."""
+    def __init__(
+        self,
+        secret_service: SecretService,
+        code_repo: InviteCodeRepository | None = None,
+        reload_interval_seconds: float = 60.0,
+    ):
+        """初始化.
+
+        Args:
+            secret_service: Secret 服務（提供可重複使用的邀請碼）
+            code_repo: 限定使用次數的邀請碼；None 表示不啟用
+            reload_interval_seconds: 重新載入邀請碼的間隔
+        """
         self._secret_service = secret_service
-        self._cached_codes: list[str] | None = None
-
-    def _get_codes(self) -> list[str]:
-        """取得邀請碼列表（帶快取）."""
-        if self._cached_codes is None:
-            try:
-                self._cached_codes = self._secret_service.get_invite_codes()
-            except Exception as e:
-                logger.warning(f"Failed to load invite codes: {e}, using empty list")
-                self._cached_codes = []
-        return self._cached_codes
+        self._code_repo = code_repo
+        self._reload_interval_seconds = reload_interval_seconds
+        self._codes: frozenset[str] | None = None
+        self._reload_task: asyncio.Task[None] | None = None
+
+    def _get_codes(self) -> frozenset[str]:
+        """取得正規化後的邀請碼集合（第一次使用時載入）."""
+        if self._codes is None:
+            self.reload()
+        return self._codes or frozenset()
+
+    def reload(self) -> int:
+        """重新載入邀請碼.
+
+        載入失敗時保留原本的邀請碼（第一次載入失敗時為空集合）.
+
+        Returns:
+            邀請碼數量
+        """
+        try:
+            codes = self._secret_service.get_invite_codes()
+        except Exception as e:
+            logger.warning(f"Failed to load invite codes: {e}, keeping previous codes")
+            if self._codes is None:
+                self._codes = frozenset()
+            return len(self._codes)
+        self._codes = frozenset(normalize_invite_code(c) for c in codes if c.strip())
+        return len(self._codes)
+
+    async def start(self) -> None:
+        """載入邀請碼並啟動定期重新載入."""
+        self.reload()
+        if self._reload_task is None:
+            self._reload_task = asyncio.create_task(self._reload_loop())
+
+    async def stop(self) -> None:
+        """停止定期重新載入."""
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reload_task
+            self._reload_task = None
 
     def validate(self, code: str) -> bool:
-        """驗證邀請碼.
+        """驗證可重複使用的邀請碼.
 
         Args:
             code: 邀請碼
@@ -34,10 +88,63 @@ class InviteCodeService:
         Returns:
             是否有效
         """
-        codes = self._get_codes()
         # 不區分大小寫比較
-        return code.strip().upper() in [c.upper() for c in codes]
+        return normalize_invite_code(code) in self._get_codes()
+
+    async def check(self, code: str) -> bool:
+        """檢查邀請碼是否可用（不扣除使用次數）.
+
+        Args:
+            code: 邀請碼
+
+        Returns:
+            是否有效（限定使用次數的邀請碼需尚有剩餘次數）
+        """
+        if self.validate(code):
+            return True
+        normalized = normalize_invite_code(code)
+        if self._code_repo is None or not normalized:
+            return False
+        return await self._code_repo.remaining_uses(normalized) > 0
+
+    async def redeem(self, code: str) -> bool:
+        """驗證並使用邀請碼.
+
+        先查可重複使用的邀請碼，再以 transaction 兌換限定使用次數的邀請碼.
+
+        Args:
+            code: 邀請碼
+
+        Returns:
+            是否有效（限定使用次數的邀請碼會扣除一次）
+        """
+        if self.validate(code):
+            return True
+        if self._code_repo is None:
+            return False
+        normalized = normalize_invite_code(code)
+        if not normalized:
+            return False
+        return await self._code_repo.redeem(normalized)
+
+    async def release(self, code: str) -> None:
+        """歸還 redeem 扣除的使用次數（兌換後註冊失敗時使用）.
+
+        Args:
+            code: 邀請碼
+        """
+        if self.validate(code) or self._code_repo is None:
+            return
+        normalized = normalize_invite_code(code)
+        if normalized:
+            await self._code_repo.release(normalized)
 
     def refresh_cache(self) -> None:
-        """重新載入邀請碼（清除快取）."""
-        self._cached_codes = None
+        """重新載入邀請碼."""
+        self.reload()
+
+    async def _reload_loop(self) -> None:
+        """定期重新載入."""
+        while True:
+            await asyncio.sleep(self._reload_interval_seconds)
+            self.reload()
@@ -1,59 +1,26 @@
 """JWT 服務."""
 
-import base64
-import hashlib
 import logging
 from datetime import UTC, datetime, timedelta
 
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
 from jose import jwt
 
 from auth.app.config import Settings
-from auth.app.services.secrets import SecretService
+from auth.app.services.keyring import KeyRing
 
 logger = logging.getLogger(__name__)
 
 
 class JWTService:
-    """JWT 服務."""
+    """JWT 服務.
 
-    def __init__(self, settings: Settings, secret_service: SecretService):
+    金鑰由 app 層級的 KeyRing 提供，簽發 token 時不需重新載入或序列化私鑰.
+    """
+
+    def __init__(self, settings: Settings, key_ring: KeyRing):
         """初始化."""
         self._settings = settings
-        self._secret_service = secret_service
-        self._private_key: rsa.RSAPrivateKey | None = None
-
-    def _get_private_key(self) -> rsa.RSAPrivateKey:
-        """取得 JWT 私鑰（延遲載入並快取）."""
-        if self._private_key is None:
-            try:
-                key_pem = self._secret_service.get_jwt_private_key()
-                # 如果為空字串，表示使用臨時私鑰（本地開發模式）
-                if not key_pem or key_pem.strip() == "":
-                    raise ValueError("Empty key, using temporary key")
-                loaded_key = serialization.load_pem_private_key(
-                    key_pem.encode("utf-8") if isinstance(key_pem, str) else key_pem,
-                    password=None,
-                )
-                # 類型檢查：確保是 RSA 私鑰
-                if not isinstance(loaded_key, rsa.RSAPrivateKey):
-                    raise ValueError("Key is not an RSA private key")
-                self._private_key = loaded_key
-            except (ValueError, Exception) as e:
-                logger.warning(f"Failed to load JWT private key: {e}")
-                # 開發模式或本地模式：生成臨時私鑰
-                if (
-                    self._settings.environment == "dev"
-                    or self._settings.gcp_project_id == "local-dev"
-                ):
-                    logger.warning("Using temporary RSA key for dev/local mode")
-                    self._private_key = rsa.generate_private_key(
-                        public_exponent=65537, key_size=2048
-                    )
-                else:
-                    raise
-        return self._private_key
+        self._key_ring = key_ring
 
     def create_token(
         self,
@@ -61,6 +28,7 @@ class JWTService:
         email: str | None = None,
         internal_user_id: str | None = None,
         expires_in_seconds: int | None = None,
+        baby_roles: dict[str, str] | None = None,
     ) -> str:
         """建立 JWT Token.
 
@@ -69,6 +37,7 @@ class JWTService:
             email: Email
             internal_user_id: 內部使用者 ID
             expires_in_seconds: 過期時間（秒），預設使用設定值
+            baby_roles: 嬰兒角色（baby_id -> role），None 表示不簽入
 
         Returns:
             JWT Token 字串
@@ -76,7 +45,7 @@ class JWTService:
         now = datetime.now(UTC)
         exp = now + timedelta(seconds=expires_in_seconds or self._settings.jwt_expiration_seconds)
 
-        payload = {
+        payload: dict[str, object] = {
             "iss": self._settings.jwt_issuer,
             "sub": subject,
             "aud": self._settings.jwt_audience,
@@ -90,89 +59,22 @@ class JWTService:
         if internal_user_id:
             payload["internal_user_id"] = internal_user_id
 
-        private_key = self._get_private_key()
-        public_key = private_key.public_key()
-        kid = self._calculate_kid(public_key)
-
-        # 添加 kid 到 header
-        headers = {"kid": kid}
+        if baby_roles is not None:
+            payload["baby_roles"] = baby_roles
 
-        # python-jose 需要 PEM 格式的字串，而不是 RSAPrivateKey 對象
-        private_key_pem = private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption(),
-        ).decode("utf-8")
+        signing_key = self._key_ring.signing_key
 
         return jwt.encode(
             payload,
-            private_key_pem,
+            signing_key.key,
             algorithm=self._settings.jwt_algorithm,
-            headers=headers,
-        )
-
-    def _get_public_key(self) -> rsa.RSAPublicKey:
-        """取得公鑰."""
-        private_key = self._get_private_key()
-        return private_key.public_key()
-
-    def _calculate_kid(self, public_key: rsa.RSAPublicKey) -> str:
-        """計算 Key ID (kid).
-
-        Args:
-            public_key: RSA 公鑰
-
-        Returns:
-            Key ID（使用公鑰 DER 編碼的 SHA-256 哈希前 8 字節的 base64url 編碼）
-        """
-        # 將公鑰序列化為 DER 格式
-        public_key_der = public_key.public_bytes(
-            encoding=serialization.Encoding.DER,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            headers={"kid": signing_key.kid},
         )
-        # 計算 SHA-256 哈希
-        hash_bytes = hashlib.sha256(public_key_der).digest()
-        # 取前 8 字節並進行 base64url 編碼
-        kid_bytes = hash_bytes[:8]
-        kid = base64.urlsafe_b64encode(kid_bytes).decode("utf-8").rstrip("=")
-        return kid
-
-    def _int_to_base64url(self, value: int) -> str:
-        """將整數轉換為 base64url 編碼的字串.
-
-        Args:
-            value: 要編碼的整數
-
-        Returns:
-            base64url 編碼的字串（無填充）
-        """
-        # 計算需要的字節數
-        byte_length = (value.bit_length() + 7) // 8
-        # 轉換為字節
-        value_bytes = value.to_bytes(byte_length, byteorder="big")
-        # base64url 編碼並移除填充
-        return base64.urlsafe_b64encode(value_bytes).decode("utf-8").rstrip("=")
 
     def get_jwks(self) -> dict[str, list[dict[str, str]]]:
         """取得 JWKS (JSON Web Key Set).
 
         Returns:
-            JWKS 格式的字典，包含 keys 數組
+            JWKS 格式的字典，包含目前的簽章公鑰與輪替中的其他公鑰
         """
-        public_key = self._get_public_key()
-        public_numbers = public_key.public_numbers()
-
-        # 計算 Key ID
-        kid = self._calculate_kid(public_key)
-
-        # 構建 JWK
-        jwk = {
-            "kty": "RSA",
-            "use": "sig",
-            "kid": kid,
-            "n": self._int_to_base64url(public_numbers.n),  # 模數
-            "e": self._int_to_base64url(public_numbers.e),  # 指數
-            "alg": self._settings.jwt_algorithm,
-        }
-
-        return {"keys": [jwk]}
+        return self._key_ring.jwks()
@@ -0,0 +1,188 @@
+"""JWT 簽章金鑰.
+
+App 層級的金鑰環：啟動時載入一次私鑰，快取簽章用的金鑰物件、kid 與 JWK.
+除了目前的簽章金鑰，也可發布其他公鑰（輪替前的舊金鑰或即將啟用的新金鑰），
+讓輪替期間以任一把金鑰簽發的 token 都能通過驗證.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk
+from jose.backends.base import Key
+
+from auth.app.config import Settings
+from auth.app.services.secrets import SecretService
+
+logger = logging.getLogger(__name__)
+
+
+def calculate_kid(public_key: rsa.RSAPublicKey) -> str:
+    """計算 Key ID (kid).
+
+    Args:
+        public_key: RSA 公鑰
+
+    Returns:
+        Key ID（使用公鑰 DER 編碼的 SHA-256 哈希前 8 字節的 base64url 編碼）
+    """
+    public_key_der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    kid_bytes = hashlib.sha256(public_key_der).digest()[:8]
+    return base64.urlsafe_b64encode(kid_bytes).decode("utf-8").rstrip("=")
+
+
+def _int_to_base64url(value: int) -> str:
+    """將整數轉換為 base64url 編碼的字串（無填充）."""
+    byte_length = (value.bit_length() + 7) // 8
+    value_bytes = value.to_bytes(byte_length, byteorder="big")
+    return base64.urlsafe_b64encode(value_bytes).decode("utf-8").rstrip("=")
+
+
+def public_jwk(public_key: rsa.RSAPublicKey, algorithm: str) -> dict[str, str]:
+    """將 RSA 公鑰轉為 JWK."""
+    public_numbers = public_key.public_numbers()
+    return {
+        "kty": "RSA",
+        "use": "sig",
+        "kid": calculate_kid(public_key),
+        "n": _int_to_base64url(public_numbers.n),  # 模數
+        "e": _int_to_base64url(public_numbers.e),  # 指數
+        "alg": algorithm,
+    }
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """已解析的簽章金鑰."""
+
+    kid: str
+    key: Key  # python-jose 金鑰物件，簽章時不需再解析 PEM
+    jwk: dict[str, str]
+
+
+class KeyRing:
+    """JWT 金鑰環."""
+
+    def __init__(self, private_key: rsa.RSAPrivateKey, algorithm: str = "RS256") -> None:
+        """初始化.
+
+        Args:
+            private_key: 目前用來簽章的私鑰
+            algorithm: 簽章演算法
+        """
+        self._algorithm = algorithm
+        self._signing_key = self._to_signing_key(private_key)
+        # 只發布公鑰、不用來簽章的金鑰（kid -> JWK）
+        self._published: dict[str, dict[str, str]] = {}
+        self._jwks_bytes = b""
+        self._jwks_etag = ""
+        self._rebuild_jwks()
+
+    @classmethod
+    def load(cls, settings: Settings, secret_service: SecretService) -> "KeyRing":
+        """依設定載入私鑰與額外發布的公鑰.
+
+        開發或本地模式無法取得私鑰時產生臨時私鑰（整個 app 生命週期共用同一把）.
+        """
+        try:
+            key_pem = secret_service.get_jwt_private_key()
+            # 如果為空字串，表示使用臨時私鑰（本地開發模式）
+            if not key_pem or key_pem.strip() == "":
+                raise ValueError("Empty key, using temporary key")
+            loaded_key = serialization.load_pem_private_key(key_pem.encode("utf-8"), password=None)
+            # 類型檢查：確保是 RSA 私鑰
+            if not isinstance(loaded_key, rsa.RSAPrivateKey):
+                raise ValueError("Key is not an RSA private key")
+            private_key = loaded_key
+        except Exception as e:
+            logger.warning(f"Failed to load JWT private key: {e}")
+            if settings.environment != "dev" and settings.gcp_project_id != "local-dev":
+                raise
+            logger.warning("Using temporary RSA key for dev/local mode")
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+        key_ring = cls(private_key, algorithm=settings.jwt_algorithm)
+        for public_pem in settings.jwt_published_public_keys:
+            key_ring.publish(public_pem)
+        return key_ring
+
+    @property
+    def signing_key(self) -> SigningKey:
+        """目前用來簽章的金鑰."""
+        return self._signing_key
+
+    def publish(self, public_pem: str) -> str:
+        """額外發布一把公鑰（輪替用）.
+
+        Args:
+            public_pem: PEM 格式的 RSA 公鑰
+
+        Returns:
+            公鑰的 kid
+        """
+        public_key = serialization.load_pem_public_key(public_pem.encode("utf-8"))
+        if not isinstance(public_key, rsa.RSAPublicKey):
+            raise ValueError("Key is not an RSA public key")
+        key_jwk = public_jwk(public_key, self._algorithm)
+        self._published[key_jwk["kid"]] = key_jwk
+        self._rebuild_jwks()
+        return key_jwk["kid"]
+
+    def rotate(self, private_key: rsa.RSAPrivateKey, keep_previous: bool = True) -> str:
+        """改用新的私鑰簽章.
+
+        Args:
+            private_key: 新的私鑰
+            keep_previous: 是否繼續發布舊的公鑰（讓已簽發的 token 在過期前仍可驗證）
+
+        Returns:
+            新金鑰的 kid
+        """
+        previous = self._signing_key
+        self._signing_key = self._to_signing_key(private_key)
+        self._published.pop(self._signing_key.kid, None)
+        if keep_previous:
+            self._published[previous.kid] = previous.jwk
+        self._rebuild_jwks()
+        return self._signing_key.kid
+
+    def retire(self, kid: str) -> bool:
+        """停止發布一把公鑰（目前的簽章金鑰不可停止發布）."""
+        retired = self._published.pop(kid, None) is not None
+        if retired:
+            self._rebuild_jwks()
+        return retired
+
+    def jwks(self) -> dict[str, list[dict[str, str]]]:
+        """取得 JWKS（目前的簽章金鑰在前）."""
+        return {"keys": [self._signing_key.jwk, *self._published.values()]}
+
+    @property
+    def jwks_bytes(self) -> bytes:
+        """序列化後的 JWKS（金鑰異動時才重新產生）."""
+        return self._jwks_bytes
+
+    @property
+    def jwks_etag(self) -> str:
+        """JWKS 的 strong ETag（含引號）."""
+        return self._jwks_etag
+
+    def _rebuild_jwks(self) -> None:
+        """重新序列化 JWKS 並計算 ETag."""
+        self._jwks_bytes = json.dumps(self.jwks(), separators=(",", ":")).encode("utf-8")
+        self._jwks_etag = f'"{hashlib.sha256(self._jwks_bytes).hexdigest()[:32]}"'
+
+    def _to_signing_key(self, private_key: rsa.RSAPrivateKey) -> SigningKey:
+        """解析私鑰並計算 kid 與 JWK."""
+        key_jwk = public_jwk(private_key.public_key(), self._algorithm)
+        key: Any = jwk.construct(private_key, self._algorithm)
+        return SigningKey(kid=key_jwk["kid"], key=key, jwk=key_jwk)
@@ -1,8 +1,16 @@
 """密碼雜湊服務."""
 
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
 import bcrypt
 from passlib.context import CryptContext
 
+T = TypeVar("T")
+
 
 def _get_pwd_context() -> CryptContext:
     """取得密碼雜湊上下文（延遲初始化以避免 bcrypt 版本檢測問題）."""
@@ -41,3 +49,104 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
     except Exception:
         return False
+
+
+class PasswordHasherBusyError(Exception):
+    """等待中的雜湊工作已達上限."""
+
+
+class PasswordHasher:
+    """在專用執行緒池中執行 bcrypt.
+
+    bcrypt（cost 12）每次約需 200-300 ms，直接在 handler 中呼叫會卡住 event loop，
+    連 /health 都無法回應. bcrypt 計算時會釋放 GIL，執行緒池即可平行處理.
+    排隊中的工作超過上限時直接拒絕，避免請求無限堆積.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue_depth: int = 32) -> None:
+        """初始化.
+
+        Args:
+            max_workers: 執行緒數
+            max_queue_depth: 最多等待中的工作數（不含執行中）
+        """
+        self._max_workers = max_workers
+        self._max_queue_depth = max_queue_depth
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hasher"
+        )
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._queue_seconds_total = 0.0
+        self._queue_seconds_max = 0.0
+        self._exec_seconds_total = 0.0
+        self._exec_seconds_max = 0.0
+
+    async def hash(self, password: str) -> str:
+        """雜湊密碼.
+
+        Raises:
+            PasswordHasherBusyError: 等待中的工作已達上限
+        """
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """驗證密碼.
+
+        Raises:
+            PasswordHasherBusyError: 等待中的工作已達上限
+        """
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        """關閉執行緒池（等待執行中的工作完成）."""
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> dict[str, float | int]:
+        """取得排隊與執行時間統計."""
+        completed = self._completed
+        return {
+            "workers": self._max_workers,
+            "max_queue_depth": self._max_queue_depth,
+            "in_flight": self._in_flight,
+            "queued": max(self._in_flight - self._max_workers, 0),
+            "completed": completed,
+            "rejected": self._rejected,
+            "queue_ms_avg": round(self._queue_seconds_total / completed * 1000, 2)
+            if completed
+            else 0.0,
+            "queue_ms_max": round(self._queue_seconds_max * 1000, 2),
+            "exec_ms_avg": round(self._exec_seconds_total / completed * 1000, 2)
+            if completed
+            else 0.0,
+            "exec_ms_max": round(self._exec_seconds_max * 1000, 2),
+        }
+
+    async def _run(self, func: Callable[..., T], *args: str) -> T:
+        """在執行緒池中執行並記錄時間."""
+        if self._in_flight - self._max_workers >= self._max_queue_depth:
+            self._rejected += 1
+            raise PasswordHasherBusyError("Too many pending password hashing requests")
+
+        submitted_at = time.perf_counter()
+
+        def _timed() -> tuple[T, float, float]:
+            started_at = time.perf_counter()
+            result = func(*args)
+            return result, started_at - submitted_at, time.perf_counter() - started_at
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, queue_seconds, exec_seconds = await loop.run_in_executor(self._executor, _timed)
+        finally:
+            self._in_flight -= 1
+
+        # 統計只在 event loop 執行緒更新，不需要鎖
+        self._completed += 1
+        self._queue_seconds_total += queue_seconds
+        self._queue_seconds_max = max(self._queue_seconds_max, queue_seconds)
+        self._exec_seconds_total += exec_seconds
+        self._exec_seconds_max = max(self._exec_seconds_max, exec_seconds)
+        return result
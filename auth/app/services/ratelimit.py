@@ -0,0 +1,169 @@
+"""登入/註冊的速率限制與密碼驗證併發上限.
+
+bcrypt 佔用 CPU，同一個 instance 上的大量登入或註冊請求（打錯密碼重試、腳本迴圈）
+會拖慢所有請求. 以 token bucket 分別限制每個 email 與每個 client IP，
+並限制同時進行中的密碼驗證數量，超過時立即回 429 而不是排隊.
+"""
+
+import hashlib
+import logging
+import math
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from auth.app.config import Settings
+from auth.app.repositories import InMemoryRateLimitRepository, RateLimitRepository
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceededError(Exception):
+    """超過速率限制或併發上限."""
+
+    def __init__(self, retry_after_seconds: float, scope: str) -> None:
+        """初始化.
+
+        Args:
+            retry_after_seconds: 建議等待秒數
+            scope: 觸發限制的範圍（例如 "ip"、"email"、"verify"）
+        """
+        super().__init__(f"Rate limit exceeded ({scope}), retry after {retry_after_seconds:.1f}s")
+        self.retry_after_seconds = retry_after_seconds
+        self.scope = scope
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After header 值（整數秒，至少 1）."""
+        if math.isinf(self.retry_after_seconds):
+            return "3600"
+        return str(max(1, math.ceil(self.retry_after_seconds)))
+
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    """Token bucket 參數."""
+
+    capacity: float  # 允許的突發量
+    refill_per_minute: float  # 每分鐘補充的 token 數
+
+    @property
+    def refill_per_second(self) -> float:
+        """每秒補充的 token 數."""
+        return self.refill_per_minute / 60.0
+
+
+class RateLimiter:
+    """以 token bucket 限制每個 email 與每個 client IP 的請求數."""
+
+    def __init__(
+        self,
+        repo: RateLimitRepository,
+        email_policy: BucketPolicy,
+        ip_policy: BucketPolicy,
+        enabled: bool = True,
+    ) -> None:
+        """初始化.
+
+        Args:
+            repo: Bucket 狀態儲存（In-Memory 或多 instance 共用的 Firestore）
+            email_policy: 每個 email 的 bucket 參數
+            ip_policy: 每個 client IP 的 bucket 參數
+            enabled: 是否啟用
+        """
+        self._repo = repo
+        self._email_policy = email_policy
+        self._ip_policy = ip_policy
+        self._enabled = enabled
+        self._allowed = 0
+        self._limited: dict[str, int] = {}
+
+    async def check(self, action: str, email: str | None, client_ip: str | None) -> None:
+        """檢查並扣除 IP 與 email 的額度.
+
+        Args:
+            action: 動作名稱（"login"、"register"），不同動作使用不同 bucket
+            email: 請求中的 email
+            client_ip: Client IP
+
+        Raises:
+            RateLimitExceededError: 超過速率限制
+        """
+        if not self._enabled:
+            return
+        # 先檢查 IP：單一來源大量嘗試不同 email 時不會消耗各 email 的額度
+        if client_ip:
+            await self._consume(action, "ip", client_ip, self._ip_policy)
+        if email:
+            # email 只保存雜湊值
+            digest = hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()
+            await self._consume(action, "email", digest, self._email_policy)
+        self._allowed += 1
+
+    async def _consume(self, action: str, scope: str, value: str, policy: BucketPolicy) -> None:
+        """從指定 bucket 取出一個 token."""
+        wait = await self._repo.consume(
+            f"{action}:{scope}:{value}", policy.capacity, policy.refill_per_second
+        )
+        if wait > 0:
+            key = f"{action}:{scope}"
+            self._limited[key] = self._limited.get(key, 0) + 1
+            raise RateLimitExceededError(wait, scope)
+
+    def stats(self) -> dict[str, object]:
+        """取得允許與被限制的請求數."""
+        return {"enabled": self._enabled, "allowed": self._allowed, "limited": dict(self._limited)}
+
+
+class ConcurrencyLimiter:
+    """限制同時進行中的工作數，額滿時立即拒絕（fail fast）."""
+
+    def __init__(self, limit: int, retry_after_seconds: float = 1.0) -> None:
+        """初始化.
+
+        Args:
+            limit: 同時進行中的工作上限
+            retry_after_seconds: 額滿時建議的等待秒數
+        """
+        self._limit = limit
+        self._retry_after_seconds = retry_after_seconds
+        self._in_flight = 0
+        self._rejected = 0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """取得執行名額.
+
+        Raises:
+            RateLimitExceededError: 已達上限
+        """
+        # 檢查與遞增之間沒有 await，單一 event loop 內不需要鎖
+        if self._in_flight >= self._limit:
+            self._rejected += 1
+            raise RateLimitExceededError(self._retry_after_seconds, "verify")
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+
+    def stats(self) -> dict[str, int]:
+        """取得進行中與被拒絕的數量."""
+        return {"limit": self._limit, "in_flight": self._in_flight, "rejected": self._rejected}
+
+
+def create_rate_limiter(settings: Settings, repo: RateLimitRepository | None = None) -> RateLimiter:
+    """依設定建立 RateLimiter.
+
+    Args:
+        settings: 應用程式設定
+        repo: Bucket 狀態儲存；None 時使用 In-Memory
+    """
+    return RateLimiter(
+        repo or InMemoryRateLimitRepository(),
+        email_policy=BucketPolicy(
+            settings.rate_limit_email_capacity, settings.rate_limit_email_per_minute
+        ),
+        ip_policy=BucketPolicy(settings.rate_limit_ip_capacity, settings.rate_limit_ip_per_minute),
+        enabled=settings.rate_limit_enabled,
+    )
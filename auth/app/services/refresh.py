@@ -0,0 +1,133 @@
+"""Refresh token 服務.
+
+Refresh token 格式為 `<token_id>.<secret>`：token_id 是 ULID，作為儲存的 key；
+secret 只以 SHA-256 雜湊保存. 換發 access token 只需一次 key 讀取與一次雜湊比對，不經過 bcrypt.
+
+每次換發都會輪替出新的 refresh token 並撤銷舊的；已輪替的 token 再次出現時視為外洩，
+撤銷該裝置所有 refresh token（reuse detection）.
+"""
+
+import hashlib
+import hmac
+import logging
+import secrets
+from datetime import UTC, datetime, timedelta
+
+from ulid import ULID
+
+from auth.app.models import RefreshToken
+from auth.app.repositories import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidRefreshTokenError(Exception):
+    """Refresh token 無效、過期或已撤銷."""
+
+
+def _hash_secret(secret: str) -> str:
+    """計算 refresh token secret 的雜湊值."""
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()
+
+
+class RefreshTokenService:
+    """Refresh token 簽發、輪替與撤銷."""
+
+    def __init__(self, user_repo: UserRepository, expiration_seconds: int = 30 * 24 * 3600):
+        """初始化.
+
+        Args:
+            user_repo: User Repository（存放 refresh token）
+            expiration_seconds: Refresh token 有效時間
+        """
+        self._user_repo = user_repo
+        self._expiration_seconds = expiration_seconds
+
+    def _new_token(self, internal_user_id: str, device_id: str) -> tuple[RefreshToken, str]:
+        """產生新的 refresh token（回傳儲存用資料與交給 client 的字串）."""
+        now = datetime.now(UTC)
+        token_id = str(ULID())
+        secret = secrets.token_urlsafe(32)
+        token = RefreshToken(
+            token_id=token_id,
+            internal_user_id=internal_user_id,
+            device_id=device_id,
+            token_hash=_hash_secret(secret),
+            created_at=now,
+            expires_at=now + timedelta(seconds=self._expiration_seconds),
+        )
+        return token, f"{token_id}.{secret}"
+
+    async def issue(self, internal_user_id: str, device_id: str | None = None) -> tuple[str, str]:
+        """登入時簽發 refresh token.
+
+        Args:
+            internal_user_id: 內部使用者 ID
+            device_id: 裝置 ID；None 時產生新的裝置 ID
+
+        Returns:
+            (refresh token 字串, 裝置 ID)
+        """
+        device_id = device_id or str(ULID())
+        token, raw = self._new_token(internal_user_id, device_id)
+        await self._user_repo.create_refresh_token(token)
+        return raw, device_id
+
+    async def _lookup(self, raw: str) -> RefreshToken:
+        """解析並驗證 refresh token 字串（不檢查是否已撤銷）."""
+        token_id, sep, secret = raw.partition(".")
+        if not sep or not token_id or not secret:
+            raise InvalidRefreshTokenError("Malformed refresh token")
+
+        token = await self._user_repo.get_refresh_token(token_id)
+        if token is None or not hmac.compare_digest(token.token_hash, _hash_secret(secret)):
+            raise InvalidRefreshTokenError("Invalid refresh token")
+        if token.expires_at <= datetime.now(UTC):
+            raise InvalidRefreshTokenError("Refresh token expired")
+        return token
+
+    async def rotate(self, raw: str) -> tuple[RefreshToken, str]:
+        """以 refresh token 換發新的 refresh token.
+
+        Args:
+            raw: Client 提供的 refresh token 字串
+
+        Returns:
+            (新的 refresh token 資料, 新的 refresh token 字串)
+
+        Raises:
+            InvalidRefreshTokenError: Token 無效、過期或已撤銷
+        """
+        token = await self._lookup(raw)
+        if token.revoked_at is None:
+            new_token, new_raw = self._new_token(token.internal_user_id, token.device_id)
+            if await self._user_repo.rotate_refresh_token(token.token_id, new_token):
+                return new_token, new_raw
+
+        # 已輪替或撤銷的 token 被重複使用：可能已外洩，撤銷整個裝置
+        revoked = await self._user_repo.revoke_refresh_tokens(
+            token.internal_user_id, token.device_id
+        )
+        logger.warning(
+            f"Refresh token reuse detected: user={token.internal_user_id}, "
+            f"device={token.device_id}, revoked={revoked}"
+        )
+        raise InvalidRefreshTokenError("Refresh token revoked")
+
+    async def revoke(self, raw: str, all_devices: bool = False) -> int:
+        """撤銷 refresh token 所屬裝置（或使用者所有裝置）的 refresh token.
+
+        Args:
+            raw: Client 提供的 refresh token 字串
+            all_devices: 撤銷使用者所有裝置
+
+        Returns:
+            撤銷的 token 數量
+
+        Raises:
+            InvalidRefreshTokenError: Token 無效或過期
+        """
+        token = await self._lookup(raw)
+        return await self._user_repo.revoke_refresh_tokens(
+            token.internal_user_id, None if all_devices else token.device_id
+        )
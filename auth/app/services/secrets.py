@@ -1,18 +1,42 @@
-"""Secret Manager 服務."""
+"""Secret Manager 服務.
 
+SecretStore 是 app 層級的 secret 快取：啟動時在執行緒中預先載入，
+之後由背景 task 依 TTL 重新載入，請求只讀取快取，不會等待 Secret Manager.
+"""
+
+import asyncio
+import contextlib
 import json
 import logging
 import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
 
 from google.cloud import secretmanager
 
+from auth.app.config import Settings
+
 logger = logging.getLogger(__name__)
 
 
-class SecretService:
-    """Secret Manager 服務."""
+class SecretBackend(ABC):
+    """Secret 來源（同步呼叫，由 SecretStore 放到執行緒中執行）."""
+
+    @abstractmethod
+    def fetch(self, secret_id: str, version: str = "latest") -> str:
+        """取得 Secret 值.
+
+        Raises:
+            KeyError: Secret 不存在
+        """
+        pass
 
-    def __init__(self, project_id: str):
+
+class SecretManagerBackend(SecretBackend):
+    """GCP Secret Manager."""
+
+    def __init__(self, project_id: str) -> None:
         """初始化."""
         self._project_id = project_id
         self._client: secretmanager.SecretManagerServiceClient | None = None
@@ -23,6 +47,195 @@ class SecretService:
             self._client = secretmanager.SecretManagerServiceClient()
         return self._client
 
+    def fetch(self, secret_id: str, version: str = "latest") -> str:
+        """取得 Secret 值."""
+        # 如果 secret_id 是完整名稱（projects/.../secrets/...），直接使用
+        # 否則構建完整名稱
+        if secret_id.startswith("projects/"):
+            name = f"{secret_id}/versions/{version}"
+        else:
+            name = f"projects/{self._project_id}/secrets/{secret_id}/versions/{version}"
+
+        response = self._get_client().access_secret_version(request={"name": name})
+        return response.payload.data.decode("UTF-8")
+
+
+class LocalSecretBackend(SecretBackend):
+    """本地 Secret 來源（開發/測試用）.
+
+    依序查詢：建構時傳入的值、環境變數 SECRET_<ID>（大寫，- 換成 _）、
+    目錄中名為 secret_id 的檔案.
+    """
+
+    def __init__(self, values: dict[str, str] | None = None, directory: str = "") -> None:
+        """初始化.
+
+        Args:
+            values: 固定的 secret 值
+            directory: 存放 secret 檔案的目錄（空字串表示不使用）
+        """
+        self._values = dict(values or {})
+        self._directory = Path(directory) if directory else None
+
+    def set(self, secret_id: str, value: str) -> None:
+        """設定 secret 值（測試用）."""
+        self._values[secret_id] = value
+
+    def fetch(self, secret_id: str, version: str = "latest") -> str:  # noqa: ARG002
+        """取得 Secret 值."""
+        if secret_id in self._values:
+            return self._values[secret_id]
+        env_value = os.getenv("SECRET_" + secret_id.upper().replace("-", "_"))
+        if env_value is not None:
+            return env_value
+        if self._directory is not None:
+            path = self._directory / secret_id
+            if path.is_file():
+                return path.read_text(encoding="utf-8").strip()
+        raise KeyError(secret_id)
+
+
+class SecretStore:
+    """App 層級的 Secret 快取."""
+
+    def __init__(
+        self,
+        backend: SecretBackend,
+        ttl_seconds: float = 300.0,
+        refresh_interval_seconds: float = 60.0,
+    ) -> None:
+        """初始化.
+
+        Args:
+            backend: Secret 來源
+            ttl_seconds: 快取值超過這段時間後由背景 task 重新載入
+            refresh_interval_seconds: 背景 task 檢查的間隔
+        """
+        self._backend = backend
+        self._ttl_seconds = ttl_seconds
+        self._refresh_interval_seconds = refresh_interval_seconds
+        # (secret_id, version) -> (值, 取得時間 monotonic)
+        self._values: dict[tuple[str, str], tuple[str, float]] = {}
+        self._pending: set[tuple[str, str]] = set()  # 尚未載入成功、等待背景載入
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._fetch_tasks: set[asyncio.Task[None]] = set()
+        self._misses = 0
+        self._refresh_failures = 0
+
+    async def start(self, secret_ids: list[str] | None = None) -> None:
+        """預先載入 secret 並啟動背景重新載入."""
+        if secret_ids:
+            await asyncio.gather(*(self._fetch((secret_id, "latest")) for secret_id in secret_ids))
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """停止背景重新載入."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
+        for task in list(self._fetch_tasks):
+            task.cancel()
+
+    def get(self, secret_id: str, version: str = "latest") -> str:
+        """讀取快取中的 secret（不等待 Secret Manager）.
+
+        尚未載入時排入背景載入並拋出 LookupError，呼叫端應使用預設值或稍後重試.
+
+        Raises:
+            LookupError: Secret 尚未載入
+        """
+        key = (secret_id, version)
+        entry = self._values.get(key)
+        if entry is not None:
+            return entry[0]
+
+        self._misses += 1
+        if key not in self._pending:
+            self._pending.add(key)
+            self._schedule_fetch(key)
+        raise LookupError(f"Secret {secret_id} is not loaded yet")
+
+    def stats(self) -> dict[str, object]:
+        """取得快取狀態（不含 secret 名稱）."""
+        now = time.monotonic()
+        return {
+            "loaded": len(self._values),
+            "max_age_seconds": round(
+                max((now - fetched_at for _, fetched_at in self._values.values()), default=0.0), 1
+            ),
+            "pending": len(self._pending),
+            "misses": self._misses,
+            "refresh_failures": self._refresh_failures,
+        }
+
+    def _schedule_fetch(self, key: tuple[str, str]) -> None:
+        """在背景載入（沒有執行中的 event loop 時略過，等背景 task 處理）."""
+        try:
+            task = asyncio.get_running_loop().create_task(self._fetch(key))
+        except RuntimeError:
+            return
+        self._fetch_tasks.add(task)
+        task.add_done_callback(self._fetch_tasks.discard)
+
+    async def _fetch(self, key: tuple[str, str]) -> None:
+        """在執行緒中載入一個 secret，失敗時保留原本的值."""
+        secret_id, version = key
+        try:
+            value = await asyncio.to_thread(self._backend.fetch, secret_id, version)
+        except Exception as e:
+            self._refresh_failures += 1
+            self._pending.add(key)
+            logger.warning(f"Failed to load secret {secret_id}: {e}")
+            return
+        self._values[key] = (value, time.monotonic())
+        self._pending.discard(key)
+
+    async def _refresh_loop(self) -> None:
+        """背景重新載入過期或尚未載入的 secret."""
+        while True:
+            await asyncio.sleep(self._refresh_interval_seconds)
+            now = time.monotonic()
+            keys = [
+                key
+                for key, (_, fetched_at) in self._values.items()
+                if now - fetched_at >= self._ttl_seconds
+            ]
+            keys.extend(self._pending)
+            if keys:
+                await asyncio.gather(*(self._fetch(key) for key in set(keys)))
+
+
+def create_secret_store(settings: Settings) -> SecretStore:
+    """依設定建立 SecretStore."""
+    backend: SecretBackend
+    if settings.use_local_secrets:
+        backend = LocalSecretBackend(directory=settings.local_secrets_dir)
+    else:
+        backend = SecretManagerBackend(settings.gcp_project_id)
+    return SecretStore(
+        backend,
+        ttl_seconds=settings.secret_cache_ttl_seconds,
+        refresh_interval_seconds=settings.secret_refresh_interval_seconds,
+    )
+
+
+class SecretService:
+    """Secret Manager 服務."""
+
+    def __init__(self, project_id: str, store: SecretStore | None = None):
+        """初始化.
+
+        Args:
+            project_id: GCP 專案 ID
+            store: app 層級的 secret 快取；None 時直接同步呼叫 Secret Manager
+        """
+        self._project_id = project_id
+        self._store = store
+        self._backend: SecretManagerBackend | None = None
+
     def get_secret(self, secret_id: str, version: str = "latest") -> str:
         """取得 Secret 值.
 
@@ -33,16 +246,13 @@ class SecretService:
         Returns:
             Secret 值（字串）
         """
-        # 如果 secret_id 是完整名稱（projects/.../secrets/...），直接使用
-        # 否則構建完整名稱
-        if secret_id.startswith("projects/"):
-            name = f"{secret_id}/versions/{version}"
-        else:
-            name = f"projects/{self._project_id}/secrets/{secret_id}/versions/{version}"
+        if self._store is not None:
+            return self._store.get(secret_id, version)
 
+        if self._backend is None:
+            self._backend = SecretManagerBackend(self._project_id)
         try:
-            response = self._get_client().access_secret_version(request={"name": name})
-            return response.payload.data.decode("UTF-8")
+            return self._backend.fetch(secret_id, version)
         except Exception as e:
             logger.error(f"Failed to get secret {secret_id}: {e}")
             raise
@@ -61,7 +271,7 @@ class SecretService:
         if env_key:
             return env_key
 
-        # 本地開發模式：返回空字串（JWTService 會生成臨時私鑰）
+        # 本地開發模式：返回空字串（KeyRing 會生成臨時私鑰）
         if self._project_id == "local-dev":
             logger.info("Using temporary JWT key for local development")
             return ""
@@ -54,12 +54,60 @@ except ImportError:
 KONG_URL = "https://kong-gateway-dev-ggofz32qfa-de.a.run.app"
 
 
+# Refresh token 快取（每個帳號一筆），下次執行時不需重新以密碼登入
+TOKEN_CACHE_PATH = Path.home() / ".cache" / "baby-weight" / "refresh_tokens.json"
+
+
+def _load_refresh_tokens() -> dict[str, str]:
+    """讀取快取的 refresh token。"""
+    try:
+        data = json.loads(TOKEN_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_refresh_token(email: str, refresh_token: str | None) -> None:
+    """儲存 refresh token（檔案權限僅限本人讀寫）。"""
+    if not refresh_token:
+        return
+    tokens = _load_refresh_tokens()
+    tokens[email.lower()] = refresh_token
+    try:
+        TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        TOKEN_CACHE_PATH.touch(mode=0o600, exist_ok=True)
+        TOKEN_CACHE_PATH.write_text(json.dumps(tokens), encoding="utf-8")
+    except OSError as e:
+        print(f"⚠️  無法儲存 refresh token: {e}")
+
+
 def login(email: str, password: str) -> str:
-    """登入並取得 JWT token."""
-    url = f"{KONG_URL}/auth/token"
+    """登入並取得 JWT token（優先以快取的 refresh token 換發）。"""
     with httpx.Client(timeout=30.0) as http_client:
+        refresh_token = _load_refresh_tokens().get(email.lower())
+        if refresh_token:
+            try:
+                response = http_client.post(
+                    f"{KONG_URL}/auth/refresh",
+                    json={"refresh_token": refresh_token},
+                    headers={"Content-Type": "application/json"},
+                )
+            except httpx.HTTPError as e:
+                print(f"⚠️  refresh token 換發失敗，改用密碼登入: {e}")
+            else:
+                if response.status_code == 200:
+                    data = response.json()
+                    _save_refresh_token(email, data.get("refresh_token"))
+                    return data["access_token"]
+                # 401 表示 refresh token 已過期或撤銷，直接改用密碼登入
+                if response.status_code != 401:
+                    print(
+                        f"⚠️  refresh token 換發失敗（HTTP {response.status_code}），改用密碼登入: "
+                        f"{response.text[:200]}"
+                    )
+
         response = http_client.post(
-            url,
+            f"{KONG_URL}/auth/token",
             json={"email": email, "password": password},
             headers={"Content-Type": "application/json"},
         )
@@ -68,6 +116,7 @@ def login(email: str, password: str) -> str:
         token = data.get("access_token")
         if not token:
             raise ValueError("Failed to get access_token from login response")
+        _save_refresh_token(email, data.get("refresh_token"))
         return token
 
 
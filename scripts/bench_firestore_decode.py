@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Firestore document 解碼基準測試。
+
+比較直接以 model constructor 建立 model（各 Repository 原本的作法）與 decoders 模組
+的解碼函式（含儲存格式轉換與預設值），每筆 document 的平均耗時。不需要連線 Firestore。
+
+用法（於專案根目錄）：
+  python -m scripts.bench_firestore_decode --documents 100000
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+
+from api.app.models import Baby, Gender, MemberRole, Membership, Weight
+from api.app.repositories.decoders import decode_baby, decode_membership, decode_weight
+
+
+def _timestamp(minutes: int) -> DatetimeWithNanoseconds:
+    """模擬 Firestore 回傳的 timestamp。"""
+    value = datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=minutes)
+    return DatetimeWithNanoseconds.fromtimestamp(value.timestamp(), UTC)
+
+
+def _weight_documents(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "timestamp": _timestamp(i),
+            "weight_g": 3000 + i % 5000,
+            "note": "note" if i % 3 == 0 else None,
+            "created_by": "01USER",
+            "created_at": _timestamp(i),
+        }
+        for i in range(count)
+    ]
+
+
+def _validated_weight(data: dict[str, Any]) -> Weight:
+    return Weight(
+        weight_id="01WEIGHT",
+        baby_id="01BABY",
+        timestamp=data["timestamp"],
+        weight_g=data["weight_g"],
+        note=data.get("note"),
+        created_by=data["created_by"],
+        created_at=data["created_at"],
+        updated_at=data.get("updated_at"),
+    )
+
+
+def _validated_baby(data: dict[str, Any]) -> Baby:
+    return Baby(
+        baby_id="01BABY",
+        name=data["name"],
+        birth_date=data["birth_date"],
+        gender=Gender(data["gender"]),
+        created_at=data["created_at"],
+    )
+
+
+def _validated_membership(data: dict[str, Any]) -> Membership:
+    return Membership(
+        baby_id="01BABY",
+        internal_user_id="01USER",
+        role=MemberRole(data["role"]),
+        joined_at=data["joined_at"],
+    )
+
+
+def _measure(
+    decode: Callable[[dict[str, Any]], Any], documents: list[dict[str, Any]], repeat: int
+) -> float:
+    """回傳每筆平均微秒（取 repeat 次中最快的一次，降低雜訊）。"""
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for data in documents:
+            decode(data)
+        best = min(best, time.perf_counter() - started_at)
+    return best / len(documents) * 1e6
+
+
+def run(count: int, repeat: int) -> None:
+    """執行基準測試。"""
+    created_at = _timestamp(0)
+    cases: list[tuple[str, list[dict[str, Any]], Callable[..., Any], Callable[..., Any]]] = [
+        (
+            "weights",
+            _weight_documents(count),
+            _validated_weight,
+            lambda data: decode_weight(data, weight_id="01WEIGHT", baby_id="01BABY"),
+        ),
+        (
+            "babies",
+            [
+                {
+                    "name": f"Baby {i}",
+                    "birth_date": date(2026, 1, 1).isoformat(),
+                    "gender": "male",
+                    "created_at": created_at,
+                }
+                for i in range(count)
+            ],
+            _validated_baby,
+            lambda data: decode_baby(data, baby_id="01BABY"),
+        ),
+        (
+            "memberships",
+            [{"role": "owner", "joined_at": created_at} for _ in range(count)],
+            _validated_membership,
+            lambda data: decode_membership(data, baby_id="01BABY", internal_user_id="01USER"),
+        ),
+    ]
+
+    print(f"{'collection':<14} {'validated':>12} {'decoder':>12} {'speedup':>8}")
+    for name, documents, validated, decoder in cases:
+        assert validated(documents[0]) == decoder(documents[0])
+        before = _measure(validated, documents, repeat)
+        after = _measure(decoder, documents, repeat)
+        print(f"{name:<14} {before:>9.2f} µs {after:>9.2f} µs {before / after:>7.1f}x")
+
+
+def main() -> None:
+    """主函數."""
+    parser = argparse.ArgumentParser(
+        description="Firestore document 解碼基準測試",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--documents", type=int, default=100_000, help="每個 collection 的筆數")
+    parser.add_argument("--repeat", type=int, default=5, help="重複次數（取最快的一次）")
+    args = parser.parse_args()
+    run(args.documents, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""In-Memory 持久化基準測試。
+
+量測各 fsync 策略的寫入延遲、snapshot 寫入時間，以及重新啟動時
+（snapshot 載入 + log 重播）的耗時。
+
+用法（於專案根目錄）：
+  python -m scripts.bench_memory_persistence --records 100000 --babies 100
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from api.app.models import BabyCreate, Gender, MemberRole, WeightCreate
+from api.app.repositories import InMemoryRepositories, MemoryPersistence
+
+if TYPE_CHECKING:
+    from api.app.repositories.persistence import FsyncPolicy
+
+
+async def _write(repos: InMemoryRepositories, records: int, babies: int) -> float:
+    """寫入體重紀錄，回傳每筆平均微秒。"""
+    baby_ids = []
+    for i in range(babies):
+        baby = await repos.babies.create(
+            BabyCreate(name=f"Baby {i}", birth_date=date(2026, 1, 1), gender=Gender.MALE)
+        )
+        await repos.memberships.create(baby.baby_id, "bench-user", MemberRole.OWNER)
+        baby_ids.append(baby.baby_id)
+
+    t0 = datetime(2026, 1, 1, tzinfo=UTC)
+    started_at = time.perf_counter()
+    for i in range(records):
+        await repos.weights.create(
+            baby_ids[i % babies],
+            WeightCreate(timestamp=t0 + timedelta(minutes=i), weight_g=3000 + i % 5000, note=None),
+            "bench-user",
+        )
+    return (time.perf_counter() - started_at) / records * 1e6
+
+
+async def _restart(directory: str) -> dict[str, float | int]:
+    """模擬重新啟動：載入 snapshot 並重播 log。"""
+    persistence = MemoryPersistence(InMemoryRepositories(), directory)
+    stats = await persistence.load()
+    await persistence.close(snapshot=False)
+    return stats
+
+
+async def run(records: int, babies: int, fsync_records: int) -> None:
+    """執行基準測試。"""
+    baseline = await _write(InMemoryRepositories(), records, babies)
+    print(f"{'no persistence':<24} {baseline:>10.1f} µs/write")
+
+    policies: tuple[FsyncPolicy, ...] = ("never", "interval", "always")
+    for fsync in policies:
+        # always 每筆 fsync，筆數過多時耗時很長
+        count = fsync_records if fsync == "always" else records
+        with tempfile.TemporaryDirectory() as directory:
+            repos = InMemoryRepositories()
+            persistence = MemoryPersistence(repos, directory, fsync=fsync)
+            await persistence.load()
+            await persistence.start()
+            per_write = await _write(repos, count, babies)
+            print(f"{'fsync=' + fsync:<24} {per_write:>10.1f} µs/write ({count} records)")
+
+            if fsync == "never":
+                await persistence.close(snapshot=False)
+                replay = await _restart(directory)
+                print(f"{'restart (log replay)':<24} {replay['total_seconds']:>10.3f} s")
+
+                persistence = MemoryPersistence(InMemoryRepositories(), directory)
+                await persistence.load()
+                snapshot = await persistence.snapshot()
+                await persistence.close(snapshot=False)
+                print(
+                    f"{'snapshot write':<24} {snapshot['seconds']:>10.3f} s "
+                    f"({snapshot['bytes'] / 1e6:.1f} MB)"
+                )
+                loaded = await _restart(directory)
+                print(f"{'restart (snapshot)':<24} {loaded['total_seconds']:>10.3f} s")
+            else:
+                await persistence.close(snapshot=False)
+
+
+def main() -> None:
+    """主函數."""
+    parser = argparse.ArgumentParser(
+        description="In-Memory 持久化基準測試",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--records", type=int, default=100_000, help="體重紀錄筆數")
+    parser.add_argument("--babies", type=int, default=100, help="嬰兒數")
+    parser.add_argument(
+        "--fsync-records", type=int, default=2_000, help="fsync=always 時的寫入筆數"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.records, args.babies, args.fsync_records))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""建立限定使用次數的邀請碼。
+
+邀請碼寫入 invite_codes/{code}（正規化為大寫），Auth Service 註冊成功時扣除使用次數。
+重複建立同一個邀請碼會重設其使用次數。
+
+用法（於專案根目錄）：
+  # 指定邀請碼
+  python -m scripts.create_invite_codes --project PROJECT_ID --code FRIEND2024 --max-uses 5
+
+  # 產生 10 組單次使用的隨機邀請碼
+  python -m scripts.create_invite_codes --project PROJECT_ID --count 10 [--database "(default)"]
+"""
+
+import argparse
+import asyncio
+import secrets
+
+from google.cloud.firestore_v1 import AsyncClient
+
+from auth.app.repositories.firestore import FirestoreInviteCodeRepository
+from auth.app.services.invite import normalize_invite_code
+
+# 不含容易混淆的字元（0/O、1/I/L）
+ALPHABET = "23456789ABCDEFGHJKMNPQRSTUVWXYZ"
+
+
+def generate_code(length: int = 8) -> str:
+    """產生隨機邀請碼。"""
+    return "".join(secrets.choice(ALPHABET) for _ in range(length))
+
+
+async def create_codes(project_id: str, database: str, codes: list[str], max_uses: int) -> None:
+    """建立邀請碼。"""
+    db = AsyncClient(project=project_id, database=database)
+    try:
+        repo = FirestoreInviteCodeRepository(db)
+        await asyncio.gather(*(repo.create(code, max_uses=max_uses) for code in codes))
+    finally:
+        db.close()
+
+
+def main() -> None:
+    """主函數."""
+    parser = argparse.ArgumentParser(
+        description="建立限定使用次數的邀請碼",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--project", required=True, help="GCP 專案 ID")
+    parser.add_argument("--database", default="(default)", help="Firestore database")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--code", action="append", help="邀請碼（可重複指定）")
+    group.add_argument("--count", type=int, help="產生的隨機邀請碼數量")
+    parser.add_argument("--max-uses", type=int, default=1, help="每個邀請碼可使用次數")
+    args = parser.parse_args()
+
+    if args.max_uses < 1:
+        parser.error("--max-uses 必須至少為 1")
+    if args.code:
+        codes = [normalize_invite_code(code) for code in args.code]
+        if not all(codes):
+            parser.error("--code 不可為空白")
+    else:
+        if args.count < 1:
+            parser.error("--count 必須至少為 1")
+        codes = [generate_code() for _ in range(args.count)]
+
+    asyncio.run(create_codes(args.project, args.database, codes, args.max_uses))
+    print(f"✅ 已建立 {len(codes)} 個邀請碼（每個可使用 {args.max_uses} 次）")
+    for code in codes:
+        print(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""補建 user_profiles 投影。
+
+Auth Service 的使用者文件以 user_id 為 key；API Service 需要以 internal_user_id 讀取，
+因此 Auth Service 建立使用者時會同步寫入 user_profiles/{internal_user_id}。
+此腳本為啟用 dual-write 之前註冊的使用者補建投影（可重複執行）。
+
+用法（於專案根目錄）：
+  # 只計算數量
+  python -m scripts.migrate_user_profiles --project PROJECT_ID --dry-run
+
+  # 寫入
+  python -m scripts.migrate_user_profiles --project PROJECT_ID [--database "(default)"]
+"""
+
+import argparse
+import asyncio
+
+from google.cloud.firestore_v1 import AsyncClient
+
+from auth.app.repositories.firestore import FirestoreUserRepository
+
+
+async def migrate(project_id: str, database: str, dry_run: bool) -> int:
+    """補建投影並回傳數量。"""
+    db = AsyncClient(project=project_id, database=database)
+    try:
+        return await FirestoreUserRepository(db).backfill_profiles(dry_run=dry_run)
+    finally:
+        db.close()
+
+
+def main() -> None:
+    """主函數."""
+    parser = argparse.ArgumentParser(
+        description="補建 user_profiles 投影",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--project", required=True, help="GCP 專案 ID")
+    parser.add_argument("--database", default="(default)", help="Firestore database")
+    parser.add_argument("--dry-run", action="store_true", help="只計算數量，不寫入")
+    args = parser.parse_args()
+
+    count = asyncio.run(migrate(args.project, args.database, args.dry_run))
+    action = "將補建" if args.dry_run else "已補建"
+    print(f"✅ {action} {count} 筆 user_profiles")
+
+
+if __name__ == "__main__":
+    main()
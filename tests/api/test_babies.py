@@ -133,6 +133,34 @@ class TestListBabies:
         assert data[0]["name"] == "Demo Baby"
         assert data[0]["role"] == "owner"
 
+    async def test_list_babies_with_roles(
+        self,
+        api_client: TestClient,
+        dev_headers: dict[str, str],
+        repos: InMemoryRepositories,
+    ) -> None:
+        """列表中每個嬰兒帶有使用者對應的角色."""
+        await repos.init_dev_data()
+
+        from datetime import date
+
+        from api.app.models import BabyCreate, Gender, MemberRole
+
+        shared_baby = await repos.babies.create(
+            BabyCreate(name="Shared Baby", birth_date=date(2026, 1, 1), gender=Gender.FEMALE)
+        )
+        await repos.memberships.create(
+            baby_id=shared_baby.baby_id,
+            internal_user_id="01DEV000000000000000000000",
+            role=MemberRole.VIEWER,
+        )
+
+        response = api_client.get("/v1/babies", headers=dev_headers)
+
+        assert response.status_code == 200
+        roles = {b["name"]: b["role"] for b in response.json()}
+        assert roles == {"Demo Baby": "owner", "Shared Baby": "viewer"}
+
 
 @pytest.mark.unit
 class TestGetBaby:
@@ -294,6 +322,96 @@ class TestDeleteBaby:
 
         assert response.status_code == 403
 
+    async def test_deleted_baby_rejected_before_purge(
+        self,
+        api_client: TestClient,
+        dev_headers: dict[str, str],
+        repos: InMemoryRepositories,
+    ) -> None:
+        """標記刪除後、purge 完成前，成員資料仍在也回傳 404."""
+        await repos.init_dev_data()
+        baby = (await repos.babies.list_by_user("01DEV000000000000000000000"))[0]
+
+        # 只標記刪除，不排入背景 purge
+        assert await repos.babies.delete(baby.baby_id) is True
+        assert await repos.memberships.list_by_baby(baby.baby_id) != []
+
+        for path in ("", "/weights", "/weights/stats", "/stats"):
+            response = api_client.get(f"/v1/babies/{baby.baby_id}{path}", headers=dev_headers)
+            assert response.status_code == 404, path
+        response = api_client.post(
+            f"/v1/babies/{baby.baby_id}/weights",
+            headers=dev_headers,
+            json={"timestamp": "2026-01-10T08:00:00Z", "weight_g": 3500},
+        )
+        assert response.status_code == 404
+
+    async def test_delete_baby_purges_members_and_weights(
+        self,
+        repos: InMemoryRepositories,
+    ) -> None:
+        """標記刪除後，背景 worker 清除成員與體重紀錄."""
+        from api.app.services import BabyPurgeService
+
+        await repos.init_dev_data()
+        baby = (await repos.babies.list_by_user("01DEV000000000000000000000"))[0]
+
+        assert await repos.babies.delete(baby.baby_id) is True
+        assert await repos.babies.get(baby.baby_id) is None
+        assert await repos.babies.delete(baby.baby_id) is False
+
+        # start() 會接手已標記刪除但尚未 purge 的嬰兒
+        purger = BabyPurgeService(repos.babies)
+        await purger.start()
+        await purger.join()
+        await purger.stop()
+
+        assert await repos.memberships.list_by_baby(baby.baby_id) == []
+        assert await repos.weights.list_by_baby(baby.baby_id) == []
+        assert await repos.babies.list_deleted_ids() == []
+        stats = purger.stats()
+        assert stats["purged_babies"] == 1
+        assert stats["purged_documents"] == 7  # 1 member + 5 weights + baby
+
+    async def test_failed_purge_is_retried_with_backoff(
+        self,
+        repos: InMemoryRepositories,
+    ) -> None:
+        """purge 失敗後依退避時間重試，不需等到重新啟動."""
+        import asyncio
+
+        from api.app.services import BabyPurgeService
+
+        await repos.init_dev_data()
+        baby = (await repos.babies.list_by_user("01DEV000000000000000000000"))[0]
+        await repos.babies.delete(baby.baby_id)
+
+        purge = repos.babies.purge
+        attempts = 0
+
+        async def flaky_purge(baby_id, on_progress=None):  # type: ignore[no-untyped-def]
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise RuntimeError("unavailable")
+            return await purge(baby_id, on_progress)
+
+        repos.babies.purge = flaky_purge  # type: ignore[method-assign]
+        purger = BabyPurgeService(repos.babies, retry_initial_backoff_seconds=0.01)
+        await purger.start()
+        await purger.join()
+        stats = purger.stats()
+        assert (stats["retrying"], stats["max_consecutive_failures"]) == (1, 1)
+
+        await asyncio.sleep(0.05)
+        await purger.join()
+        await purger.stop()
+
+        assert attempts == 2
+        assert await repos.babies.list_deleted_ids() == []
+        stats = purger.stats()
+        assert (stats["failed_babies"], stats["purged_babies"], stats["retrying"]) == (1, 1, 0)
+
 
 # ==================== 成員管理測試 ====================
 
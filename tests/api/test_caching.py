@@ -0,0 +1,379 @@
+"""快取 Repository 測試."""
+
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from api.app.dependencies import require_baby_membership
+from api.app.loaders import RequestLoaders
+from api.app.models import (
+    Baby,
+    BabyCreate,
+    BabyUpdate,
+    CurrentUser,
+    Gender,
+    MemberRole,
+    Membership,
+    UserCreate,
+    Weight,
+    WeightCreate,
+    WeightUpdate,
+)
+from api.app.repositories import (
+    CachingIdentityLinkRepository,
+    CachingRepositories,
+    CachingWeightRepository,
+    InMemoryIdentityLinkRepository,
+    InMemoryRepositories,
+    InMemoryWeightRepository,
+    WeightSeries,
+    identity_link_id,
+)
+
+
+@pytest.mark.unit
+class TestCachingIdentityLinkRepository:
+    """CachingIdentityLinkRepository tests."""
+
+    async def test_link_id_is_deterministic(self) -> None:
+        """同一組 (iss, sub) 產生相同的 link ID."""
+        repo = InMemoryIdentityLinkRepository()
+        link = await repo.create("http://idp", "user-1", "01USER")
+
+        assert link.link_id == identity_link_id("http://idp", "user-1")
+        assert link.link_id != identity_link_id("http://idp", "user-2")
+
+    async def test_found_link_is_cached(self) -> None:
+        """查到的 link 會被快取."""
+        inner = InMemoryIdentityLinkRepository()
+        await inner.create("http://idp", "user-1", "01USER")
+        repo = CachingIdentityLinkRepository(inner)
+
+        first = await repo.find_by_provider("http://idp", "user-1")
+        second = await repo.find_by_provider("http://idp", "user-1")
+
+        assert first is not None
+        assert second == first
+        assert repo.cache_stats()["hits"] == 1
+
+    async def test_unknown_subject_is_negatively_cached(self) -> None:
+        """查無 link 的結果也會被快取."""
+        inner = InMemoryIdentityLinkRepository()
+        repo = CachingIdentityLinkRepository(inner)
+
+        assert await repo.find_by_provider("http://idp", "unknown") is None
+        # 繞過包裝直接寫入：快取仍回傳 None
+        await inner.create("http://idp", "unknown", "01USER")
+        assert await repo.find_by_provider("http://idp", "unknown") is None
+        assert repo.cache_stats()["hits"] == 1
+
+    async def test_create_invalidates_negative_entry(self) -> None:
+        """經由包裝建立 link 會取代快取中的 None."""
+        repo = CachingIdentityLinkRepository(InMemoryIdentityLinkRepository())
+
+        assert await repo.find_by_provider("http://idp", "user-1") is None
+        await repo.create("http://idp", "user-1", "01USER")
+
+        link = await repo.find_by_provider("http://idp", "user-1")
+        assert link is not None
+        assert link.internal_user_id == "01USER"
+
+
+@pytest.mark.unit
+class TestCachingRepositories:
+    """CachingRepositories tests."""
+
+    async def test_baby_reads_are_cached_and_updates_write_through(self) -> None:
+        """嬰兒讀取命中快取，經由包裝的更新立即生效."""
+        inner = InMemoryRepositories()
+        repos = CachingRepositories(inner)
+        baby = await inner.babies.create(
+            BabyCreate(name="Baby", birth_date=date(2026, 1, 1), gender=Gender.MALE)
+        )
+
+        assert await repos.babies.get(baby.baby_id) == baby
+        assert await repos.babies.get(baby.baby_id) == baby
+        assert repos.cache_stats()["babies"]["hits"] == 1
+
+        await repos.babies.update(baby.baby_id, BabyUpdate(name="Renamed"))
+        cached = await repos.babies.get(baby.baby_id)
+        assert cached is not None
+        assert cached.name == "Renamed"
+
+    async def test_baby_delete_invalidates_baby_and_memberships(self) -> None:
+        """刪除嬰兒時失效嬰兒與成員快取."""
+        inner = InMemoryRepositories()
+        repos = CachingRepositories(inner)
+        baby = await repos.babies.create(
+            BabyCreate(name="Baby", birth_date=date(2026, 1, 1), gender=Gender.MALE)
+        )
+        await repos.memberships.create(baby.baby_id, "user-1", MemberRole.OWNER)
+
+        assert await repos.babies.delete(baby.baby_id)
+        assert await repos.babies.get(baby.baby_id) is None
+        await repos.babies.purge(baby.baby_id)
+        assert await repos.memberships.get(baby.baby_id, "user-1") is None
+
+    async def test_purge_invalidates_reads_made_during_purge(self) -> None:
+        """purge 期間的讀取寫回快取的成員資格，在 purge 完成後失效."""
+        inner = InMemoryRepositories()
+        repos = CachingRepositories(inner)
+        baby = await repos.babies.create(
+            BabyCreate(name="Baby", birth_date=date(2026, 1, 1), gender=Gender.MALE)
+        )
+        await repos.memberships.create(baby.baby_id, "user-1", MemberRole.OWNER)
+        await repos.babies.delete(baby.baby_id)
+        purge = inner.babies.purge
+
+        async def purge_with_concurrent_read(baby_id, on_progress=None):  # type: ignore[no-untyped-def]
+            assert await repos.memberships.get(baby_id, "user-1") is not None
+            return await purge(baby_id, on_progress)
+
+        inner.babies.purge = purge_with_concurrent_read  # type: ignore[method-assign]
+        await repos.babies.purge(baby.baby_id)
+
+        assert await repos.memberships.get(baby.baby_id, "user-1") is None
+
+    async def test_reads_overlapping_deletes_are_not_cached(self) -> None:
+        """讀取等待底層時完成的刪除，不會被讀到的舊成員資格與嬰兒寫回快取."""
+        inner = InMemoryRepositories()
+        repos = CachingRepositories(inner)
+        baby = await repos.babies.create(
+            BabyCreate(name="Baby", birth_date=date(2026, 1, 1), gender=Gender.MALE)
+        )
+        await repos.memberships.create(baby.baby_id, "user-1", MemberRole.OWNER)
+        await repos.memberships.create(baby.baby_id, "user-2", MemberRole.VIEWER)
+        repos.babies._cache.pop(baby.baby_id)
+        repos.memberships.invalidate_baby(baby.baby_id)
+        read_started = asyncio.Event()
+        release = asyncio.Event()
+        get_membership, get_baby = inner.memberships.get, inner.babies.get
+
+        async def slow_get_membership(baby_id: str, internal_user_id: str) -> Membership | None:
+            membership = await get_membership(baby_id, internal_user_id)
+            read_started.set()
+            await release.wait()
+            return membership
+
+        async def slow_get_baby(baby_id: str) -> Baby | None:
+            found = await get_baby(baby_id)
+            read_started.set()
+            await release.wait()
+            return found
+
+        inner.memberships.get = slow_get_membership  # type: ignore[method-assign]
+        inner.babies.get = slow_get_baby  # type: ignore[method-assign]
+
+        # 移除成員時，進行中的讀取不可讓被移除的成員保有權限
+        read = asyncio.create_task(repos.memberships.get(baby.baby_id, "user-2"))
+        await read_started.wait()
+        await repos.memberships.delete(baby.baby_id, "user-2")
+        release.set()
+        assert await read is not None
+        assert await repos.memberships.get(baby.baby_id, "user-2") is None
+
+        # 刪除嬰兒時，進行中的讀取不可把嬰兒與成員資格寫回快取
+        read_started.clear()
+        release.clear()
+        reads = asyncio.gather(
+            repos.memberships.get(baby.baby_id, "user-1"), repos.babies.get(baby.baby_id)
+        )
+        await read_started.wait()
+        await repos.babies.delete(baby.baby_id)
+        release.set()
+        assert all(result is not None for result in await reads)
+        assert repos.memberships._cache.get((baby.baby_id, "user-1")) is None
+        assert await repos.babies.get(baby.baby_id) is None
+
+    async def test_get_many_only_fetches_missing_users(self) -> None:
+        """批次取得只查詢未命中的使用者."""
+        inner = InMemoryRepositories()
+        repos = CachingRepositories(inner)
+        await repos.users.create("user-1", UserCreate(display_name="A", email="a@x.com"))
+        await inner.users.create("user-2", UserCreate(display_name="B", email="b@x.com"))
+
+        users = await repos.users.get_many(["user-1", "user-2", "missing"])
+
+        assert sorted(users) == ["user-1", "user-2"]
+        assert repos.cache_stats()["users"]["hits"] == 1
+        assert await repos.users.get("user-2") == users["user-2"]
+        assert repos.cache_stats()["users"]["hits"] == 2
+
+    async def test_disabled_cache_reads_through(self) -> None:
+        """maxsize=0 時每次都讀取底層資料."""
+        inner = InMemoryRepositories()
+        repos = CachingRepositories(inner, maxsize=0)
+        membership = await repos.memberships.create("baby-1", "user-1", MemberRole.VIEWER)
+        await inner.memberships.delete("baby-1", "user-1")
+
+        assert membership is not None
+        assert await repos.memberships.get("baby-1", "user-1") is None
+
+
+def _day(n: int) -> datetime:
+    return datetime(2026, 1, 1, tzinfo=UTC) + timedelta(days=n)
+
+
+@pytest.mark.unit
+class TestCachingWeightRepository:
+    """CachingWeightRepository tests."""
+
+    async def test_writes_patch_cached_series(self) -> None:
+        """經由包裝的新增、修改、刪除直接修改快取中的序列."""
+        inner = InMemoryWeightRepository()
+        repo = CachingWeightRepository(inner)
+        for n in [0, 2, 4]:
+            await inner.create("baby-1", WeightCreate(timestamp=_day(n), weight_g=3000 + n), "u")
+        assert len(await repo.list_by_baby("baby-1")) == 3
+
+        created = await repo.create("baby-1", WeightCreate(timestamp=_day(3), weight_g=3003), "u")
+        appended = await repo.create("baby-1", WeightCreate(timestamp=_day(5), weight_g=3005), "u")
+        first = (await inner.list_by_baby("baby-1"))[0]
+        await repo.update("baby-1", first.weight_id, WeightUpdate(timestamp=_day(6)))
+        await repo.update("baby-1", created.weight_id, WeightUpdate(weight_g=3333))
+        assert await repo.delete("baby-1", appended.weight_id)
+
+        assert await repo.list_by_baby("baby-1") == await inner.list_by_baby("baby-1")
+        assert await repo.list_by_baby("baby-1", _day(2), _day(4)) == await inner.list_by_baby(
+            "baby-1", _day(2), _day(4)
+        )
+        assert await repo.stats("baby-1", to_date=_day(4)) == await inner.stats(
+            "baby-1", to_date=_day(4)
+        )
+        assert await repo.get("baby-1", created.weight_id) == await inner.get(
+            "baby-1", created.weight_id
+        )
+        # 只在第一次查詢時載入序列
+        assert repo.cache_stats()["misses"] == 1
+
+    async def test_list_during_in_flight_create_does_not_duplicate(self) -> None:
+        """寫入已提交但尚未回傳時的讀取不快取，之後套用寫入也不會重複."""
+        release = asyncio.Event()
+
+        class SlowCreate(InMemoryWeightRepository):
+            async def create(self, baby_id: str, data: WeightCreate, created_by: str) -> Weight:
+                weight = await super().create(baby_id, data, created_by)
+                await release.wait()
+                return weight
+
+        inner = SlowCreate()
+        repo = CachingWeightRepository(inner)
+        create = asyncio.create_task(
+            repo.create("baby-1", WeightCreate(timestamp=_day(0), weight_g=3000), "u")
+        )
+        await asyncio.sleep(0)
+
+        assert len(await repo.list_by_baby("baby-1")) == 1
+        release.set()
+        await create
+
+        assert await repo.list_by_baby("baby-1") == await inner.list_by_baby("baby-1")
+        assert len(await repo.list_by_baby("baby-1")) == 1
+
+    async def test_series_insert_is_idempotent(self) -> None:
+        """同一筆紀錄重複加入時取代原紀錄."""
+        inner = InMemoryWeightRepository()
+        weight = await inner.create("baby-1", WeightCreate(timestamp=_day(0), weight_g=3000), "u")
+        series = WeightSeries([weight])
+
+        series.insert(weight.model_copy(update={"weight_g": 3100}))
+
+        assert [w.weight_g for w in series.slice(None, None)] == [3100]
+
+    async def test_zscores_match_uncached_and_follow_birth_date(self) -> None:
+        """預先計算的 Z-score 與逐筆計算相同，出生日期修改後重新計算."""
+        inner = InMemoryRepositories()
+        repos = CachingRepositories(inner)
+        baby = await repos.babies.create(
+            BabyCreate(name="Baby", birth_date=date(2025, 12, 1), gender=Gender.FEMALE)
+        )
+        for n in range(3):
+            await repos.weights.create(
+                baby.baby_id, WeightCreate(timestamp=_day(n * 30), weight_g=4000 + n * 500), "u"
+            )
+
+        cached = await repos.weights.list_with_zscores(baby)
+        await repos.weights.create(
+            baby.baby_id, WeightCreate(timestamp=_day(100), weight_g=6000), "u"
+        )
+        assert await repos.weights.list_with_zscores(baby) == await inner.weights.list_with_zscores(
+            baby
+        )
+        assert len(cached) == 3
+
+        older = baby.model_copy(update={"birth_date": date(2025, 1, 1)})
+        assert await repos.weights.list_with_zscores(
+            older
+        ) == await inner.weights.list_with_zscores(older)
+
+    async def test_baby_purge_drops_series(self) -> None:
+        """purge 嬰兒時失效體重序列."""
+        inner = InMemoryRepositories()
+        repos = CachingRepositories(inner)
+        baby = await repos.babies.create(
+            BabyCreate(name="Baby", birth_date=date(2026, 1, 1), gender=Gender.MALE)
+        )
+        await repos.weights.create(
+            baby.baby_id, WeightCreate(timestamp=_day(0), weight_g=3000), "u"
+        )
+        assert len(await repos.weights.list_by_baby(baby.baby_id)) == 1
+
+        assert await repos.babies.delete(baby.baby_id)
+        await repos.babies.purge(baby.baby_id)
+
+        assert await repos.weights.list_by_baby(baby.baby_id) == []
+
+
+@pytest.mark.unit
+class TestRequireBabyMembership:
+    """require_baby_membership tests."""
+
+    async def test_membership_lookup_is_cached(self) -> None:
+        """成員資格由 CachingMembershipRepository 快取，非成員不快取."""
+        repos = CachingRepositories(InMemoryRepositories())
+        baby = await repos.babies.create(
+            BabyCreate(name="Baby", birth_date=date(2026, 1, 1), gender=Gender.MALE)
+        )
+        await repos.memberships.create(baby.baby_id, "user-1", MemberRole.EDITOR)
+        user = CurrentUser(
+            provider_iss="http://idp", provider_sub="user-1", internal_user_id="user-1"
+        )
+        loaders = RequestLoaders(repos.babies, repos.users, repos.weights)
+
+        membership = await require_baby_membership(baby.baby_id, user, repos.memberships, loaders)
+
+        assert membership.role == MemberRole.EDITOR
+        assert repos.cache_stats()["memberships"]["hits"] == 1
+        stranger = user.model_copy(update={"internal_user_id": "user-2"})
+        with pytest.raises(HTTPException) as exc_info:
+            await require_baby_membership(baby.baby_id, stranger, repos.memberships, loaders)
+        assert exc_info.value.status_code == 403
+        await repos.memberships.create(baby.baby_id, "user-2", MemberRole.VIEWER)
+        assert await require_baby_membership(baby.baby_id, stranger, repos.memberships, loaders)
+
+    async def test_role_from_token_claim(self) -> None:
+        """token 帶有 baby_roles 時不查詢成員資格；嬰兒已標記刪除時仍拒絕."""
+        repos = InMemoryRepositories()
+        baby = await repos.babies.create(
+            BabyCreate(name="Baby", birth_date=date(2026, 1, 1), gender=Gender.MALE)
+        )
+        user = CurrentUser(
+            provider_iss="http://idp",
+            provider_sub="user-1",
+            internal_user_id="user-1",
+            baby_roles={baby.baby_id: "editor"},
+        )
+
+        def loaders() -> RequestLoaders:
+            return RequestLoaders(repos.babies, repos.users, repos.weights)
+
+        membership = await require_baby_membership(baby.baby_id, user, repos.memberships, loaders())
+
+        assert membership.role == MemberRole.EDITOR
+
+        await repos.babies.delete(baby.baby_id)
+        with pytest.raises(HTTPException) as exc_info:
+            await require_baby_membership(baby.baby_id, user, repos.memberships, loaders())
+        assert exc_info.value.status_code == 404
@@ -0,0 +1,84 @@
+"""Firestore document 解碼測試."""
+
+from datetime import UTC, date, datetime
+
+import pytest
+
+from api.app.models import Baby, Gender, MemberRole, Membership, User, Weight
+from api.app.repositories.decoders import (
+    decode_baby,
+    decode_membership,
+    decode_user,
+    decode_weight,
+)
+
+T0 = datetime(2026, 1, 1, 8, 0, tzinfo=UTC)
+
+
+@pytest.mark.unit
+class TestDecoders:
+    """Firestore decoder tests."""
+
+    def test_weight_matches_validated_model(self) -> None:
+        """解碼結果與驗證建立的 model 相同."""
+        data = {"timestamp": T0, "weight_g": 3200, "created_by": "u", "created_at": T0}
+
+        weight = decode_weight(data, weight_id="w1", baby_id="b1")
+
+        expected = Weight(
+            weight_id="w1",
+            baby_id="b1",
+            timestamp=T0,
+            weight_g=3200,
+            note=None,
+            created_by="u",
+            created_at=T0,
+            updated_at=None,
+        )
+        assert weight == expected
+        assert weight.model_dump() == expected.model_dump()
+        assert weight.model_copy(update={"weight_g": 3300}).weight_g == 3300
+
+    def test_storage_formats_are_converted(self) -> None:
+        """ISO 日期字串與 enum 值轉為 model 型別."""
+        baby = decode_baby(
+            {"name": "Baby", "birth_date": "2026-01-01", "gender": "female", "created_at": T0},
+            baby_id="b1",
+        )
+        membership = decode_membership(
+            {"role": "editor", "joined_at": T0}, baby_id="b1", internal_user_id="u1"
+        )
+
+        assert baby == Baby(
+            baby_id="b1",
+            name="Baby",
+            birth_date=date(2026, 1, 1),
+            gender=Gender.FEMALE,
+            created_at=T0,
+        )
+        assert membership == Membership(
+            baby_id="b1", internal_user_id="u1", role=MemberRole.EDITOR, joined_at=T0
+        )
+
+    def test_defaults_and_required_fields(self) -> None:
+        """選填欄位套用預設值，缺少必填欄位時 KeyError."""
+        user = decode_user({"display_name": "A", "email": "a@x.com"}, internal_user_id="u1")
+        weight = decode_weight(
+            {"timestamp": T0, "weight_g": 3200, "created_by": "u"}, weight_id="w1", baby_id="b1"
+        )
+
+        assert isinstance(user, User)
+        assert user.created_at.tzinfo is not None
+        assert weight.note is None
+        assert weight.updated_at is None
+        with pytest.raises(KeyError):
+            decode_weight({"timestamp": T0}, weight_id="w1", baby_id="b1")
+
+    def test_invalid_documents_are_rejected(self) -> None:
+        """document 內容不符合 model 定義時由 model 驗證拒絕."""
+        with pytest.raises(ValueError, match="weight_g"):
+            decode_weight(
+                {"timestamp": T0, "weight_g": -1, "created_by": "u", "created_at": T0},
+                weight_id="w1",
+                baby_id="b1",
+            )
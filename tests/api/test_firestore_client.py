@@ -0,0 +1,151 @@
+"""Firestore client 設定測試（連到不存在的 endpoint，不需要 Firestore）."""
+
+import importlib
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pytest
+from google.api_core import exceptions
+from google.api_core.client_options import ClientOptions
+from google.auth.credentials import AnonymousCredentials
+
+from api.app.firestore_client import RetryBudget
+
+# api 與 auth 各自打包一份相同的模組
+MODULES = ["api.app.firestore_client", "auth.app.firestore_client"]
+
+
+@pytest.fixture(autouse=True)
+def _no_emulator(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("FIRESTORE_EMULATOR_HOST", raising=False)
+
+
+@pytest.fixture(params=MODULES)
+def module(request: pytest.FixtureRequest) -> ModuleType:
+    return importlib.import_module(request.param)
+
+
+def _client(module: ModuleType, budget: Any, **kwargs: Any) -> Any:
+    return module.FirestoreClient(
+        "test-project",
+        credentials=AnonymousCredentials(),
+        client_options=ClientOptions(api_endpoint="127.0.0.1:1"),
+        retry_initial_backoff_seconds=0.01,
+        retry_max_backoff_seconds=0.02,
+        retry_budget=budget,
+        **kwargs,
+    )
+
+
+@pytest.mark.unit
+class TestRetryBudget:
+    """RetryBudget tests."""
+
+    def test_refills_over_time(self) -> None:
+        """用完後依速率補充."""
+        budget = RetryBudget(capacity=2, refill_per_second=1000)
+        assert budget.try_acquire()
+        assert budget.try_acquire()
+        time.sleep(0.01)
+        assert budget.try_acquire()
+
+    def test_wrap_only_spends_on_retryable_errors(self) -> None:
+        """不可重試的錯誤不消耗預算."""
+        budget = RetryBudget(capacity=1, refill_per_second=0)
+        predicate = budget.wrap(lambda exc: isinstance(exc, exceptions.ServiceUnavailable))
+
+        assert not predicate(exceptions.NotFound("x"))
+        assert predicate(exceptions.ServiceUnavailable("x"))
+        assert not predicate(exceptions.ServiceUnavailable("x"))
+        assert budget.stats() == {"tokens": 0, "retries": 1, "rejected": 1}
+
+
+@pytest.mark.unit
+class TestFirestoreClient:
+    """FirestoreClient tests."""
+
+    def test_modules_are_identical(self) -> None:
+        """api 與 auth 的 firestore_client.py 內容相同."""
+        root = Path(__file__).parents[2]
+        api_source, auth_source = (
+            (root / name.replace(".", "/")).with_suffix(".py").read_text(encoding="utf-8")
+            for name in MODULES
+        )
+        assert api_source == auth_source
+
+    async def test_retries_stop_when_budget_is_spent(self, module: ModuleType) -> None:
+        """Firestore 無法連線時，重試次數受預算限制（所有方法共用）."""
+        budget = module.RetryBudget(capacity=2, refill_per_second=0)
+        client = _client(module, budget, channel_pool_size=2)
+        try:
+            options = module.call_options(client)
+            with pytest.raises(exceptions.ServiceUnavailable):
+                await client.collection("babies").document("b1").get(**options.read)
+            assert (budget.retries, budget.rejected) == (2, 1)
+
+            with pytest.raises(exceptions.ServiceUnavailable):
+                [doc async for doc in client.collection("babies").stream(**options.stream)]
+            assert (budget.retries, budget.rejected) == (2, 2)
+            assert client.stats()["channel_pool_size"] == 2
+        finally:
+            await client.aclose()
+
+    async def test_retry_deadline_bounds_latency(self, module: ModuleType) -> None:
+        """預算充足時，重試在總時限後停止."""
+        client = _client(
+            module,
+            module.RetryBudget(capacity=1000, refill_per_second=0),
+            retry_deadline_seconds=0.2,
+        )
+        started_at = time.monotonic()
+        try:
+            with pytest.raises(exceptions.RetryError):
+                await client.collection("babies").document("b1").get(**client.call_options.read)
+        finally:
+            await client.aclose()
+        assert time.monotonic() - started_at < 2
+        assert client.retry_budget.retries > 1
+
+    async def test_falls_back_to_default_channel(
+        self, module: ModuleType, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """無法建立 channel pool（內部結構改變）時退回預設 channel，重試設定不受影響."""
+
+        def changed(self: Any) -> None:
+            raise AttributeError("_target")
+
+        monkeypatch.setattr(module.FirestoreClient, "_create_firestore_api", changed)
+        budget = module.RetryBudget(capacity=1, refill_per_second=0)
+        client = _client(module, budget, channel_pool_size=2)
+        try:
+            with pytest.raises(exceptions.ServiceUnavailable):
+                await client.collection("babies").document("b1").get(**client.call_options.read)
+            assert (budget.retries, budget.rejected) == (1, 1)
+            assert client.stats()["channel_pool_size"] == 1
+        finally:
+            await client.aclose()
+
+    def test_plain_client_uses_library_defaults(self, module: ModuleType) -> None:
+        """不是 FirestoreClient 時不傳入 retry / timeout."""
+        assert module.call_options(object()) == module.DEFAULT_CALL_OPTIONS
+
+    def test_sync_client_shares_retry_budget(self, module: ModuleType) -> None:
+        """purge 使用的同步 client 套用相同的重試設定，並與 AsyncClient 共用預算."""
+        budget = module.RetryBudget(capacity=1, refill_per_second=0)
+        client = module.SyncFirestoreClient(
+            "test-project",
+            credentials=AnonymousCredentials(),
+            client_options=ClientOptions(api_endpoint="127.0.0.1:1"),
+            retry_initial_backoff_seconds=0.01,
+            retry_max_backoff_seconds=0.02,
+            retry_budget=budget,
+        )
+        try:
+            assert module.call_options(client) is client.call_options
+            with pytest.raises(exceptions.ServiceUnavailable):
+                client.collection("babies").document("b1").get(**client.call_options.read)
+            assert (budget.retries, budget.rejected) == (1, 1)
+        finally:
+            client.close()
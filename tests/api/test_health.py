@@ -1,8 +1,13 @@
 """API health endpoint tests."""
 
+from collections.abc import Generator
+
 import pytest
 from fastapi.testclient import TestClient
 
+from api.app.config import Settings, get_settings
+from api.app.main import app as api_app
+
 
 @pytest.mark.unit
 def test_health_check(api_client: TestClient) -> None:
@@ -28,3 +33,55 @@ def test_root(api_client: TestClient) -> None:
     data = response.json()
     assert data["message"] == "Baby Weight Recorder API"
     assert "version" in data
+
+
+@pytest.fixture
+def metrics_headers() -> Generator[dict[str, str], None, None]:
+    """設定 METRICS_TOKEN 並回傳對應的 headers."""
+    api_app.dependency_overrides[get_settings] = lambda: Settings(metrics_token="metrics-secret")
+    yield {"Authorization": "Bearer metrics-secret"}
+    api_app.dependency_overrides.clear()
+
+
+@pytest.mark.unit
+def test_metrics(api_client: TestClient, metrics_headers: dict[str, str]) -> None:
+    """測試執行期統計端點。"""
+    response = api_client.get("/metrics", headers=metrics_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert {"hits", "misses", "hit_rate"} <= data["token_cache"].keys()
+    assert data["baby_purge"]["in_progress"] == 0
+    assert "purged_babies" in data["baby_purge"]
+    assert data["http_pool"]["connections"] == 0
+
+
+@pytest.mark.unit
+def test_metrics_requires_token(api_client: TestClient, metrics_headers: dict[str, str]) -> None:
+    """/metrics 需要 METRICS_TOKEN；未設定時不提供。"""
+    assert api_client.get("/metrics").status_code == 401
+    response = api_client.get("/metrics", headers={"Authorization": "Bearer dev"})
+    assert response.status_code == 401
+
+    api_app.dependency_overrides.clear()
+    assert api_client.get("/metrics", headers=metrics_headers).status_code == 404
+
+
+@pytest.mark.unit
+def test_metrics_survives_http_pool_internals_change(
+    api_client: TestClient, metrics_headers: dict[str, str]
+) -> None:
+    """httpcore 連線池內部結構改變時，/metrics 其他項目仍可使用。"""
+    from types import SimpleNamespace
+
+    import httpx
+
+    transport = httpx.AsyncHTTPTransport()
+    transport._pool = SimpleNamespace(connections=[])  # type: ignore[assignment]
+    original = api_app.state.http_client
+    api_app.state.http_client = httpx.AsyncClient(transport=transport)
+    try:
+        response = api_client.get("/metrics", headers=metrics_headers)
+    finally:
+        api_app.state.http_client = original
+    assert response.status_code == 200
+    assert response.json()["http_pool"] == {}
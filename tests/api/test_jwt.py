@@ -0,0 +1,185 @@
+"""JWT 驗證與 JWKS 公鑰管理測試."""
+
+import time
+from typing import Any
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from jose.exceptions import JWTError
+
+from api.app.config import Settings
+from api.app.services.jwks import JWKSKeyManager
+from api.app.services.jwt import JWTVerificationService
+
+# 無法連線的 JWKS URL（模擬 Auth Service 停機）
+UNREACHABLE_JWKS_URL = "http://127.0.0.1:9/.well-known/jwks.json"
+
+
+def _make_key(kid: str) -> tuple[str, dict[str, Any]]:
+    """產生 RSA 私鑰（PEM）與對應的 JWK."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_jwk = jwk.construct(private_pem, "RS256").public_key().to_dict()
+    public_jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_pem, public_jwk
+
+
+@pytest.fixture
+def signing_key() -> tuple[str, dict[str, Any]]:
+    """測試用簽章金鑰."""
+    return _make_key("test-kid")
+
+
+@pytest.mark.unit
+class TestJWKSKeyManager:
+    """JWKSKeyManager tests."""
+
+    async def test_get_keys_by_kid(self, signing_key: tuple[str, dict[str, Any]]) -> None:
+        """以 kid 取得公鑰並可驗證簽章."""
+        private_pem, public_jwk = signing_key
+        manager = JWKSKeyManager(UNREACHABLE_JWKS_URL)
+        assert manager.load_jwks({"keys": [public_jwk]}) == 1
+
+        token = jwt.encode({"sub": "user"}, private_pem, algorithm="RS256")
+        keys = await manager.get_keys("test-kid")
+
+        assert len(keys) == 1
+        assert jwt.decode(token, keys, algorithms=["RS256"])["sub"] == "user"
+
+    async def test_unknown_kid_raises(self, signing_key: tuple[str, dict[str, Any]]) -> None:
+        """未知 kid 在重新載入後仍找不到時拋出 JWTError."""
+        _, public_jwk = signing_key
+        manager = JWKSKeyManager(UNREACHABLE_JWKS_URL, min_refresh_interval_seconds=60)
+        manager.load_jwks({"keys": [public_jwk]})
+
+        with pytest.raises(JWTError, match="Unknown key id"):
+            await manager.get_keys("other-kid")
+
+    async def test_refresh_failure_keeps_last_good_keys(
+        self, signing_key: tuple[str, dict[str, Any]]
+    ) -> None:
+        """Auth Service 無法連線時保留原本的公鑰."""
+        _, public_jwk = signing_key
+        manager = JWKSKeyManager(UNREACHABLE_JWKS_URL, timeout_seconds=1)
+        manager.load_jwks({"keys": [public_jwk]})
+
+        assert await manager.refresh() is False
+        assert len(await manager.get_keys("test-kid")) == 1
+
+    async def test_on_demand_refresh_is_rate_limited(self) -> None:
+        """未知 kid 觸發的重新載入受最短間隔限制."""
+        manager = JWKSKeyManager(
+            UNREACHABLE_JWKS_URL, min_refresh_interval_seconds=60, timeout_seconds=1
+        )
+
+        with pytest.raises(JWTError):
+            await manager.get_keys("missing")
+        first_attempt = manager._last_attempt
+
+        with pytest.raises(JWTError):
+            await manager.get_keys("missing")
+        assert manager._last_attempt == first_attempt
+
+    async def test_refresh_uses_etag(self, signing_key: tuple[str, dict[str, Any]]) -> None:
+        """重新載入時送出 If-None-Match，304 時保留原本的公鑰."""
+        _, public_jwk = signing_key
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, json={"keys": [public_jwk]}, headers={"ETag": '"v1"'})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            manager = JWKSKeyManager(UNREACHABLE_JWKS_URL, http_client=client)
+            assert await manager.refresh() is True
+            assert await manager.refresh() is True
+
+        assert "If-None-Match" not in requests[0].headers
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert len(await manager.get_keys("test-kid")) == 1
+
+    async def test_shared_http_client_is_not_closed(self) -> None:
+        """使用共用的 HTTP client 時，stop 不會關閉它."""
+        async with httpx.AsyncClient() as client:
+            manager = JWKSKeyManager(UNREACHABLE_JWKS_URL, timeout_seconds=1, http_client=client)
+            await manager.start()
+            await manager.stop()
+
+            assert not client.is_closed
+
+
+@pytest.mark.unit
+class TestVerifiedTokenCache:
+    """JWTVerificationService token cache tests."""
+
+    @pytest.fixture
+    def service(self, signing_key: tuple[str, dict[str, Any]]) -> JWTVerificationService:
+        """建立已載入公鑰的驗證服務."""
+        _, public_jwk = signing_key
+        manager = JWKSKeyManager(UNREACHABLE_JWKS_URL)
+        manager.load_jwks({"keys": [public_jwk]})
+        settings = Settings(auth_issuer="http://issuer", auth_audience="aud")
+        return JWTVerificationService(settings, manager)
+
+    def _token(self, private_pem: str, expires_in: int) -> str:
+        now = int(time.time())
+        claims = {
+            "iss": "http://issuer",
+            "aud": "aud",
+            "sub": "user",
+            "iat": now,
+            "exp": now + expires_in,
+        }
+        return jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": "test-kid"})
+
+    async def test_repeated_token_hits_cache(
+        self,
+        service: JWTVerificationService,
+        signing_key: tuple[str, dict[str, Any]],
+    ) -> None:
+        """同一個 token 第二次驗證命中快取."""
+        token = self._token(signing_key[0], expires_in=3600)
+
+        first = await service.verify_token(token)
+        second = await service.verify_token(token)
+
+        assert first == second
+        stats = service.cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    async def test_cached_claims_are_copies(
+        self,
+        service: JWTVerificationService,
+        signing_key: tuple[str, dict[str, Any]],
+    ) -> None:
+        """修改回傳的 claims 不影響快取內容."""
+        token = self._token(signing_key[0], expires_in=3600)
+
+        payload = await service.verify_token(token)
+        payload["sub"] = "tampered"
+
+        assert (await service.verify_token(token))["sub"] == "user"
+
+    async def test_invalid_token_not_cached(
+        self,
+        service: JWTVerificationService,
+    ) -> None:
+        """驗證失敗的 token 不會寫入快取."""
+        other_pem, _ = _make_key("test-kid")
+        token = self._token(other_pem, expires_in=3600)
+
+        for _ in range(2):
+            with pytest.raises(JWTError):
+                await service.verify_token(token)
+
+        assert service.cache_stats()["size"] == 0
@@ -0,0 +1,112 @@
+"""Request 範圍資料載入器測試."""
+
+import asyncio
+
+import pytest
+
+from api.app.loaders import DataLoader
+
+
+class RecordingBatchLoad:
+    """記錄每次批次讀取的 key."""
+
+    def __init__(self, data: dict[str, int]) -> None:
+        self.data = data
+        self.calls: list[list[str]] = []
+
+    async def __call__(self, keys: list[str]) -> dict[str, int]:
+        self.calls.append(keys)
+        return {key: self.data[key] for key in keys if key in self.data}
+
+
+@pytest.mark.unit
+class TestDataLoader:
+    """DataLoader tests."""
+
+    async def test_concurrent_loads_are_batched(self) -> None:
+        """併發讀取合併成一次批次查詢."""
+        batch_load = RecordingBatchLoad({"a": 1, "b": 2})
+        loader = DataLoader(batch_load)
+
+        results = await asyncio.gather(loader.load("a"), loader.load("b"), loader.load("c"))
+
+        assert results == [1, 2, None]
+        assert batch_load.calls == [["a", "b", "c"]]
+
+    async def test_loads_are_memoized(self) -> None:
+        """同一個 key 只讀取一次."""
+        batch_load = RecordingBatchLoad({"a": 1})
+        loader = DataLoader(batch_load)
+
+        assert await loader.load("a") == 1
+        assert await loader.load_many(["a", "a"]) == [1, 1]
+        assert batch_load.calls == [["a"]]
+
+    async def test_prime_and_clear(self) -> None:
+        """prime 的資料不需讀取，clear 後重新讀取."""
+        batch_load = RecordingBatchLoad({"a": 1})
+        loader = DataLoader(batch_load)
+
+        loader.prime("a", 100)
+        assert await loader.load("a") == 100
+        assert batch_load.calls == []
+
+        loader.clear("a")
+        assert await loader.load("a") == 1
+        assert batch_load.calls == [["a"]]
+
+    async def test_failed_batch_is_not_memoized(self) -> None:
+        """批次讀取失敗時所有等待者收到例外，之後可重試."""
+        attempts = 0
+
+        async def flaky(keys: list[str]) -> dict[str, int]:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise RuntimeError("backend unavailable")
+            return dict.fromkeys(keys, 1)
+
+        loader = DataLoader(flaky)
+
+        with pytest.raises(RuntimeError):
+            await asyncio.gather(loader.load("a"), loader.load("b"))
+        assert await loader.load("a") == 1
+        assert loader.batches == 2
+
+    async def test_clear_during_batch(self) -> None:
+        """批次進行中 clear，等待中的 load 仍取得結果，之後的 load 重新讀取."""
+        started = asyncio.Event()
+        release = asyncio.Event()
+        calls: list[list[str]] = []
+
+        async def slow(keys: list[str]) -> dict[str, int]:
+            calls.append(keys)
+            started.set()
+            await release.wait()
+            return dict.fromkeys(keys, len(calls))
+
+        loader = DataLoader(slow)
+        pending = asyncio.create_task(loader.load("a"))
+        await started.wait()
+        loader.clear("a")
+        release.set()
+
+        assert await asyncio.wait_for(pending, timeout=1) == 1
+        assert await loader.load("a") == 2
+        assert calls == [["a"], ["a"]]
+
+    async def test_clear_before_dispatch(self) -> None:
+        """排隊中 clear 後再次 load，兩個呼叫端都由同一批取得結果."""
+        batch_load = RecordingBatchLoad({"a": 1})
+        loader = DataLoader(batch_load)
+
+        async def clear_and_load() -> int | None:
+            loader.clear("a")
+            return await loader.load("a")
+
+        # 兩個 task 在同一輪執行：第一個排入 "a"，第二個在批次開始前 clear 並重新排入
+        first = asyncio.create_task(loader.load("a"))
+        second = asyncio.create_task(clear_and_load())
+
+        assert await asyncio.wait_for(asyncio.gather(first, second), timeout=1) == [1, 1]
+        assert batch_load.calls == [["a"]]
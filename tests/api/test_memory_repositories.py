@@ -0,0 +1,90 @@
+"""In-Memory Repository 索引測試."""
+
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from api.app.models import BabyCreate, Gender, MemberRole, UserCreate, WeightCreate, WeightUpdate
+from api.app.repositories import InMemoryRepositories
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _day(n: int) -> datetime:
+    return T0 + timedelta(days=n)
+
+
+@pytest.mark.unit
+class TestInMemoryIndexes:
+    """次要索引維護測試."""
+
+    async def test_weight_range_query_is_inclusive_and_sorted(self) -> None:
+        """區間查詢包含端點且依時間排序."""
+        repos = InMemoryRepositories()
+        for n in [3, 1, 4, 0, 2]:
+            await repos.weights.create(
+                "baby-1", WeightCreate(timestamp=_day(n), weight_g=3000 + n), "u"
+            )
+        await repos.weights.create("baby-2", WeightCreate(timestamp=_day(2), weight_g=9999), "u")
+
+        weights = await repos.weights.list_by_baby("baby-1", from_date=_day(1), to_date=_day(3))
+
+        assert [w.weight_g for w in weights] == [3001, 3002, 3003]
+        assert len(await repos.weights.list_by_baby("baby-1")) == 5
+        assert await repos.weights.list_by_baby("baby-3") == []
+
+    async def test_weight_update_and_delete_maintain_index(self) -> None:
+        """修改時間與刪除後索引保持正確."""
+        repos = InMemoryRepositories()
+        first = await repos.weights.create(
+            "baby-1", WeightCreate(timestamp=_day(0), weight_g=3000), "u"
+        )
+        second = await repos.weights.create(
+            "baby-1", WeightCreate(timestamp=_day(1), weight_g=3100), "u"
+        )
+
+        await repos.weights.update("baby-1", first.weight_id, WeightUpdate(timestamp=_day(5)))
+        weights = await repos.weights.list_by_baby("baby-1")
+        assert [w.weight_id for w in weights] == [second.weight_id, first.weight_id]
+        assert weights[1].timestamp == _day(5)
+
+        await repos.weights.delete("baby-1", second.weight_id)
+        assert [w.weight_id for w in await repos.weights.list_by_baby("baby-1")] == [
+            first.weight_id
+        ]
+
+    async def test_membership_indexes(self) -> None:
+        """成員索引在新增、刪除與 purge 後保持正確."""
+        repos = InMemoryRepositories()
+        baby = await repos.babies.create(
+            BabyCreate(name="Baby", birth_date=date(2026, 1, 1), gender=Gender.FEMALE)
+        )
+        await repos.memberships.create(baby.baby_id, "user-1", MemberRole.OWNER)
+        await repos.memberships.create(baby.baby_id, "user-2", MemberRole.VIEWER)
+        await repos.weights.create(
+            baby.baby_id, WeightCreate(timestamp=_day(0), weight_g=3000), "user-1"
+        )
+
+        assert [m.internal_user_id for m in await repos.memberships.list_by_baby(baby.baby_id)] == [
+            "user-1",
+            "user-2",
+        ]
+        assert [b.baby_id for b in await repos.babies.list_by_user("user-2")] == [baby.baby_id]
+
+        await repos.memberships.delete(baby.baby_id, "user-2")
+        assert await repos.memberships.list_by_user("user-2") == []
+
+        await repos.babies.delete(baby.baby_id)
+        assert await repos.babies.purge(baby.baby_id) == 3
+        assert await repos.memberships.list_by_user("user-1") == []
+        assert await repos.weights.list_by_baby(baby.baby_id) == []
+
+    async def test_user_email_index(self) -> None:
+        """Email 索引."""
+        repos = InMemoryRepositories()
+        await repos.users.create("user-1", UserCreate(display_name="A", email="a@example.com"))
+
+        user = await repos.users.get_by_email("a@example.com")
+        assert user is not None
+        assert user.internal_user_id == "user-1"
+        assert await repos.users.get_by_email("b@example.com") is None
@@ -0,0 +1,161 @@
+"""In-Memory 持久化測試."""
+
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from api.app.models import BabyCreate, Gender, MemberRole, UserCreate, WeightCreate, WeightUpdate
+from api.app.repositories import InMemoryRepositories, MemoryPersistence
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+async def _populate(repos: InMemoryRepositories) -> tuple[str, str]:
+    """建立測試資料，回傳 (baby_id, 保留的 weight_id)."""
+    await repos.identity_links.create("http://idp", "sub-1", "user-1")
+    await repos.users.create("user-1", UserCreate(display_name="A", email="a@example.com"))
+    baby = await repos.babies.create(
+        BabyCreate(name="Baby", birth_date=date(2026, 1, 1), gender=Gender.MALE)
+    )
+    gone = await repos.babies.create(
+        BabyCreate(name="Gone", birth_date=date(2026, 1, 1), gender=Gender.FEMALE)
+    )
+    await repos.babies.delete(gone.baby_id)
+    await repos.memberships.create(baby.baby_id, "user-1", MemberRole.OWNER)
+    await repos.memberships.create(baby.baby_id, "user-2", MemberRole.VIEWER)
+    await repos.memberships.delete(baby.baby_id, "user-2")
+
+    kept = await repos.weights.create(baby.baby_id, WeightCreate(timestamp=T0, weight_g=3000), "u")
+    removed = await repos.weights.create(
+        baby.baby_id, WeightCreate(timestamp=T0 + timedelta(days=1), weight_g=3100), "u"
+    )
+    await repos.weights.update(
+        baby.baby_id, kept.weight_id, WeightUpdate(timestamp=T0 + timedelta(days=2), note="x")
+    )
+    await repos.weights.delete(baby.baby_id, removed.weight_id)
+    return baby.baby_id, kept.weight_id
+
+
+async def _assert_restored(repos: InMemoryRepositories, baby_id: str, weight_id: str) -> None:
+    link = await repos.identity_links.find_by_provider("http://idp", "sub-1")
+    assert link is not None
+    assert link.internal_user_id == "user-1"
+    user = await repos.users.get_by_email("a@example.com")
+    assert user is not None
+    assert [b.baby_id for b in await repos.babies.list_by_user("user-1")] == [baby_id]
+    assert len(await repos.babies.list_deleted_ids()) == 1
+    assert [m.internal_user_id for m in await repos.memberships.list_by_baby(baby_id)] == ["user-1"]
+    weights = await repos.weights.list_by_baby(baby_id)
+    assert [(w.weight_id, w.note) for w in weights] == [(weight_id, "x")]
+    assert weights[0].timestamp == T0 + timedelta(days=2)
+    assert weights[0].created_at.tzinfo is not None
+
+
+@pytest.mark.unit
+class TestMemoryPersistence:
+    """MemoryPersistence tests."""
+
+    @pytest.mark.parametrize("fsync", ["always", "interval", "never"])
+    async def test_restore_from_log(self, tmp_path, fsync) -> None:
+        """沒有 snapshot 時重播 log 還原."""
+        repos = InMemoryRepositories()
+        persistence = MemoryPersistence(repos, tmp_path, fsync=fsync)
+        await persistence.load()
+        baby_id, weight_id = await _populate(repos)
+        await persistence.close(snapshot=False)
+        assert not (tmp_path / "snapshot.bin").exists()
+
+        restored = InMemoryRepositories()
+        stats = await MemoryPersistence(restored, tmp_path).load()
+
+        assert stats["replayed_records"] > 0
+        await _assert_restored(restored, baby_id, weight_id)
+
+    async def test_restore_from_snapshot_and_log_tail(self, tmp_path) -> None:
+        """Snapshot 之後的寫入由 log 補上，舊 log 已刪除."""
+        repos = InMemoryRepositories()
+        persistence = MemoryPersistence(repos, tmp_path)
+        await persistence.load()
+        baby_id, weight_id = await _populate(repos)
+        await persistence.snapshot()
+        await repos.weights.update(baby_id, weight_id, WeightUpdate(weight_g=3333))
+        await persistence.close(snapshot=False)
+
+        assert len(list(tmp_path.glob("wal-*.log"))) == 1
+
+        restored = InMemoryRepositories()
+        stats = await MemoryPersistence(restored, tmp_path).load()
+
+        assert stats["replayed_records"] == 1
+        await _assert_restored(restored, baby_id, weight_id)
+        weight = await restored.weights.get(baby_id, weight_id)
+        assert weight is not None
+        assert weight.weight_g == 3333
+
+    async def test_incomplete_log_tail_is_ignored(self, tmp_path) -> None:
+        """寫入中斷造成的不完整紀錄被忽略."""
+        repos = InMemoryRepositories()
+        persistence = MemoryPersistence(repos, tmp_path)
+        await persistence.load()
+        await repos.users.create("user-1", UserCreate(display_name="A", email="a@example.com"))
+        await persistence.close(snapshot=False)
+
+        (log,) = tmp_path.glob("wal-*.log")
+        with log.open("ab") as f:
+            f.write(b"\x40\x00\x00\x00garbage")
+
+        restored = InMemoryRepositories()
+        persistence = MemoryPersistence(restored, tmp_path)
+        await persistence.load()
+        assert await restored.users.get("user-1") is not None
+
+        # 之後的寫入仍可還原
+        await restored.users.create("user-2", UserCreate(display_name="B", email="b@example.com"))
+        await persistence.close()
+        again = InMemoryRepositories()
+        await MemoryPersistence(again, tmp_path).load()
+        assert await again.users.get("user-2") is not None
+
+    async def test_snapshot_is_private(self, tmp_path) -> None:
+        """Snapshot 權限為 0600（先前留下的暫存檔權限也會修正）."""
+        repos = InMemoryRepositories()
+        persistence = MemoryPersistence(repos, tmp_path)
+        await persistence.load()
+        await repos.users.create("user-1", UserCreate(display_name="A", email="a@example.com"))
+        (tmp_path / "snapshot.tmp").touch(mode=0o644)
+        await persistence.close()
+
+        assert (tmp_path / "snapshot.bin").stat().st_mode & 0o777 == 0o600
+        (log,) = tmp_path.glob("wal-*.log")
+        assert log.stat().st_mode & 0o777 == 0o600
+
+    async def test_fsync_always_runs_off_event_loop(self, tmp_path, monkeypatch) -> None:
+        """fsync=always：寫入在背景執行緒 fsync 完成後才回傳，併發寫入共用 fsync."""
+        import asyncio
+        import os
+        import threading
+
+        fsync_threads: list[int] = []
+        real_fsync = os.fsync
+
+        def recording_fsync(fd: int) -> None:
+            fsync_threads.append(threading.get_ident())
+            real_fsync(fd)
+
+        repos = InMemoryRepositories()
+        persistence = MemoryPersistence(repos, tmp_path, fsync="always")
+        await persistence.load()
+        monkeypatch.setattr(os, "fsync", recording_fsync)
+
+        await asyncio.gather(
+            *(
+                repos.users.create(f"user-{i}", UserCreate(display_name="A", email=f"{i}@x.com"))
+                for i in range(20)
+            )
+        )
+
+        assert fsync_threads
+        assert threading.get_ident() not in fsync_threads
+        assert len(fsync_threads) < 20
+        assert persistence._synced_records == 20
+        await persistence.close(snapshot=False)
@@ -0,0 +1,174 @@
+"""SQLite Repository 測試."""
+
+import asyncio
+import sqlite3
+import threading
+from collections.abc import AsyncGenerator
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from api.app.models import (
+    BabyCreate,
+    BabyUpdate,
+    Gender,
+    MemberRole,
+    UserCreate,
+    WeightCreate,
+    WeightUpdate,
+)
+from api.app.repositories import SqliteRepositories
+from api.app.repositories.sqlite import SqliteDatabase
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _day(n: int) -> datetime:
+    return T0 + timedelta(days=n)
+
+
+@pytest.fixture
+async def repos(tmp_path: Path) -> AsyncGenerator[SqliteRepositories, None]:
+    """建立暫存目錄中的 SQLite repositories."""
+    repos = SqliteRepositories(str(tmp_path / "test.db"), pool_size=2)
+    yield repos
+    await repos.close()
+
+
+@pytest.mark.unit
+class TestSqliteRepositories:
+    """SqliteRepositories tests."""
+
+    async def test_identity_link_and_user(self, repos: SqliteRepositories) -> None:
+        """身份對應與使用者讀寫."""
+        link = await repos.identity_links.create("http://idp", "sub-1", "user-1")
+        assert await repos.identity_links.find_by_provider("http://idp", "sub-1") == link
+        assert await repos.identity_links.find_by_provider("http://idp", "sub-2") is None
+
+        user = await repos.users.create("user-1", UserCreate(display_name="A", email="a@x.com"))
+        assert await repos.users.get("user-1") == user
+        assert await repos.users.get_by_email("a@x.com") == user
+        assert await repos.users.get_many(["user-1", "missing"]) == {"user-1": user}
+
+    async def test_weight_range_query_is_inclusive_and_sorted(
+        self, repos: SqliteRepositories
+    ) -> None:
+        """區間查詢包含端點且依時間排序."""
+        for n in [3, 1, 4, 0, 2]:
+            await repos.weights.create(
+                "baby-1", WeightCreate(timestamp=_day(n), weight_g=3000 + n), "u"
+            )
+        await repos.weights.create("baby-2", WeightCreate(timestamp=_day(2), weight_g=9999), "u")
+
+        weights = await repos.weights.list_by_baby("baby-1", from_date=_day(1), to_date=_day(3))
+
+        assert [w.weight_g for w in weights] == [3001, 3002, 3003]
+        assert weights[0].timestamp == _day(1)
+        assert len(await repos.weights.list_by_baby("baby-1")) == 5
+        assert await repos.weights.list_by_baby("baby-3") == []
+
+        assert await repos.weights.count("baby-1", from_date=_day(1), to_date=_day(3)) == 3
+        stats = await repos.weights.stats("baby-1", to_date=_day(1))
+        assert (stats.count, stats.sum_g, stats.avg_g) == (2, 6001, 3000.5)
+        empty = await repos.weights.stats("baby-3")
+        assert (empty.count, empty.sum_g, empty.avg_g) == (0, 0, None)
+
+    async def test_weight_update_delete_and_get_many(self, repos: SqliteRepositories) -> None:
+        """體重修改、刪除與批次取得."""
+        first = await repos.weights.create(
+            "baby-1", WeightCreate(timestamp=_day(0), weight_g=3000, note="n"), "u"
+        )
+        second = await repos.weights.create(
+            "baby-1", WeightCreate(timestamp=_day(1), weight_g=3100), "u"
+        )
+
+        updated = await repos.weights.update(
+            "baby-1", first.weight_id, WeightUpdate(timestamp=_day(5))
+        )
+        assert updated is not None
+        assert updated.note == "n"
+        assert updated.updated_at is not None
+        assert await repos.weights.get("baby-1", first.weight_id) == updated
+        assert await repos.weights.update("baby-2", first.weight_id, WeightUpdate()) is None
+
+        found = await repos.weights.get_many(
+            [("baby-1", first.weight_id), ("baby-2", second.weight_id)]
+        )
+        assert list(found) == [("baby-1", first.weight_id)]
+
+        assert await repos.weights.delete("baby-1", second.weight_id)
+        assert not await repos.weights.delete("baby-1", second.weight_id)
+        assert [w.weight_id for w in await repos.weights.list_by_baby("baby-1")] == [
+            first.weight_id
+        ]
+
+    async def test_baby_membership_delete_and_purge(self, repos: SqliteRepositories) -> None:
+        """嬰兒、成員、標記刪除與 purge."""
+        baby = await repos.babies.create(
+            BabyCreate(name="Baby", birth_date=date(2026, 1, 1), gender=Gender.FEMALE)
+        )
+        await repos.memberships.create(baby.baby_id, "user-1", MemberRole.OWNER)
+        await repos.memberships.create(baby.baby_id, "user-2", MemberRole.VIEWER)
+        await repos.weights.create(
+            baby.baby_id, WeightCreate(timestamp=_day(0), weight_g=3000), "user-1"
+        )
+
+        renamed = await repos.babies.update(baby.baby_id, BabyUpdate(name="Renamed"))
+        assert renamed is not None
+        assert await repos.babies.get(baby.baby_id) == renamed
+        pairs = await repos.babies.list_with_membership_by_user("user-2")
+        assert [(b.name, m.role) for b, m in pairs] == [("Renamed", MemberRole.VIEWER)]
+        assert [m.internal_user_id for m in await repos.memberships.list_by_baby(baby.baby_id)] == [
+            "user-1",
+            "user-2",
+        ]
+        assert await repos.memberships.count_by_baby(baby.baby_id) == 2
+
+        assert await repos.babies.delete(baby.baby_id)
+        assert await repos.babies.get(baby.baby_id) is None
+        assert await repos.babies.list_by_user("user-1") == []
+        assert await repos.babies.list_deleted_ids() == [baby.baby_id]
+
+        progress: list[int] = []
+        assert await repos.babies.purge(baby.baby_id, on_progress=progress.append) == 4
+        assert progress[-1] == 4
+        assert await repos.babies.list_deleted_ids() == []
+        assert await repos.memberships.list_by_user("user-1") == []
+        assert await repos.weights.list_by_baby(baby.baby_id) == []
+
+    async def test_data_survives_reopen(self, tmp_path: Path) -> None:
+        """關閉後重新開啟仍保有資料."""
+        path = str(tmp_path / "reopen.db")
+        repos = SqliteRepositories(path)
+        weight = await repos.weights.create(
+            "baby-1", WeightCreate(timestamp=_day(0), weight_g=3000), "u"
+        )
+        await repos.close()
+
+        reopened = SqliteRepositories(path)
+        try:
+            assert await reopened.weights.get("baby-1", weight.weight_id) == weight
+        finally:
+            await reopened.close()
+
+    async def test_close_waits_for_in_flight_reads(self, tmp_path: Path) -> None:
+        """關閉時等待 worker thread 中的讀取完成後才關閉連線."""
+        db = SqliteDatabase(str(tmp_path / "close.db"), pool_size=2)
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_read(conn: sqlite3.Connection) -> int:
+            started.set()
+            release.wait(5)
+            return int(conn.execute("SELECT 1").fetchone()[0])
+
+        read = asyncio.create_task(db.read(slow_read))
+        await asyncio.to_thread(started.wait, 5)
+        close = asyncio.create_task(db.close())
+        await asyncio.sleep(0.05)
+        assert not close.done()
+
+        release.set()
+        assert await read == 1
+        await close
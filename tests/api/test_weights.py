@@ -210,6 +210,59 @@ class TestListWeights:
         assert response.json() == []
 
 
+@pytest.mark.unit
+class TestWeightStats:
+    """GET /v1/babies/{baby_id}/weights/stats tests."""
+
+    async def test_weight_stats(
+        self,
+        api_client: TestClient,
+        dev_headers: dict[str, str],
+        repos: InMemoryRepositories,
+    ) -> None:
+        """筆數、總和與平均（含時間範圍篩選）."""
+        await repos.init_dev_data()
+
+        list_response = api_client.get("/v1/babies", headers=dev_headers)
+        baby_id = list_response.json()[0]["baby_id"]
+
+        response = api_client.get(f"/v1/babies/{baby_id}/weights/stats", headers=dev_headers)
+        assert response.status_code == 200
+        assert response.json() == {"count": 5, "sum_g": 18250, "avg_g": 3650.0}
+
+        response = api_client.get(
+            f"/v1/babies/{baby_id}/weights/stats",
+            headers=dev_headers,
+            params={"from": "2025-12-08T00:00:00Z", "to": "2025-12-22T23:59:59Z"},
+        )
+        assert response.json() == {"count": 3, "sum_g": 10850, "avg_g": 10850 / 3}
+
+        response = api_client.get(
+            f"/v1/babies/{baby_id}/weights/stats",
+            headers=dev_headers,
+            params={"from": "2026-06-01T00:00:00Z"},
+        )
+        assert response.json() == {"count": 0, "sum_g": 0, "avg_g": None}
+
+    async def test_baby_stats(
+        self,
+        api_client: TestClient,
+        dev_headers: dict[str, str],
+        repos: InMemoryRepositories,
+    ) -> None:
+        """嬰兒統計含成員數."""
+        await repos.init_dev_data()
+
+        list_response = api_client.get("/v1/babies", headers=dev_headers)
+        baby_id = list_response.json()[0]["baby_id"]
+
+        response = api_client.get(f"/v1/babies/{baby_id}/stats", headers=dev_headers)
+
+        assert response.status_code == 200
+        assert response.json()["member_count"] == 1
+        assert response.json()["weights"]["count"] == 5
+
+
 @pytest.mark.unit
 class TestGetWeight:
     """GET /v1/babies/{baby_id}/weights/{weight_id} tests."""
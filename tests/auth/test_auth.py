@@ -14,6 +14,8 @@ def client():
     # 設定測試用的 repository
     user_repo = InMemoryUserRepository()
     app.state.user_repo = user_repo
+    # 每個測試使用新的速率限制狀態
+    app.state.rate_limiter = None
     return TestClient(app)
 
 
@@ -122,8 +124,8 @@ def test_login_success(client, sample_user_create, monkeypatch):
         mock_secret = SecretService("local-dev")
         return MockInviteService(mock_secret)
 
-    def get_mock_jwt_service(settings, secret_service):
-        return MockJWTService(settings, secret_service)
+    def get_mock_jwt_service(settings, key_ring):
+        return MockJWTService(settings, key_ring)
 
     monkeypatch.setattr("auth.app.dependencies.get_invite_service", get_mock_invite_service)
     monkeypatch.setattr("auth.app.dependencies.get_jwt_service", get_mock_jwt_service)
@@ -189,3 +191,189 @@ def test_login_invalid_password(client, sample_user_create, monkeypatch):
     )
     assert login_response.status_code == 401
     assert "Invalid email or password" in login_response.json()["detail"]
+
+
+def test_create_token_with_baby_roles():
+    """測試 baby_roles claim 簽入 token."""
+    from jose import jwt
+
+    from auth.app.config import Settings
+    from auth.app.services.jwt import JWTService
+    from auth.app.services.keyring import KeyRing
+    from auth.app.services.secrets import SecretService
+
+    settings = Settings()
+    jwt_service = JWTService(settings, KeyRing.load(settings, SecretService("local-dev")))
+
+    token = jwt_service.create_token(subject="user-1", baby_roles={"baby-1": "owner"})
+    assert jwt.get_unverified_claims(token)["baby_roles"] == {"baby-1": "owner"}
+
+    token = jwt_service.create_token(subject="user-1")
+    assert "baby_roles" not in jwt.get_unverified_claims(token)
+
+
+def test_register_password_hasher_busy(client, sample_user_create, monkeypatch):
+    """測試密碼雜湊工作已滿時註冊回傳 503."""
+    from auth.app.services.invite import InviteCodeService
+    from auth.app.services.password import PasswordHasher, PasswordHasherBusyError
+    from auth.app.services.secrets import SecretService
+
+    class MockInviteService(InviteCodeService):
+        def validate(self, code: str) -> bool:
+            return code == "TEST_CODE"
+
+    class BusyPasswordHasher(PasswordHasher):
+        async def hash(self, password: str) -> str:  # noqa: ARG002
+            raise PasswordHasherBusyError
+
+    def get_mock_invite_service(*args, **kwargs):
+        mock_secret = SecretService("local-dev")
+        return MockInviteService(mock_secret)
+
+    monkeypatch.setattr("auth.app.dependencies.get_invite_service", get_mock_invite_service)
+    monkeypatch.setattr(app.state, "password_hasher", BusyPasswordHasher(), raising=False)
+
+    response = client.post("/auth/register", json=sample_user_create.model_dump())
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_refresh_token_rotation(client, sample_user_create):
+    """測試以 refresh token 換發 access token（不經過密碼驗證）並輪替."""
+    from auth.app.services.password import PasswordHasher
+
+    register_response = client.post("/auth/register", json=sample_user_create.model_dump())
+    assert register_response.status_code == 201
+
+    login_response = client.post(
+        "/auth/token",
+        json={
+            "email": sample_user_create.email,
+            "password": sample_user_create.password,
+            "device_id": "laptop",
+        },
+    )
+    assert login_response.status_code == 200
+    login_data = login_response.json()
+    assert login_data["device_id"] == "laptop"
+    first_refresh = login_data["refresh_token"]
+
+    class NoPasswordHasher(PasswordHasher):
+        async def verify(self, password: str, hashed_password: str) -> bool:  # noqa: ARG002
+            raise AssertionError("refresh must not verify the password")
+
+    original_hasher = app.state.password_hasher
+    app.state.password_hasher = NoPasswordHasher()
+    try:
+        refresh_response = client.post("/auth/refresh", json={"refresh_token": first_refresh})
+    finally:
+        app.state.password_hasher = original_hasher
+    assert refresh_response.status_code == 200
+    data = refresh_response.json()
+    assert len(data["access_token"].split(".")) == 3
+    assert data["device_id"] == "laptop"
+    second_refresh = data["refresh_token"]
+    assert second_refresh != first_refresh
+
+    # 舊 token 被重複使用：拒絕並撤銷整個裝置
+    reuse_response = client.post("/auth/refresh", json={"refresh_token": first_refresh})
+    assert reuse_response.status_code == 401
+    revoked_response = client.post("/auth/refresh", json={"refresh_token": second_refresh})
+    assert revoked_response.status_code == 401
+
+
+def test_revoke_refresh_token_per_device(client, sample_user_create):
+    """測試撤銷單一裝置的 refresh token 不影響其他裝置."""
+    client.post("/auth/register", json=sample_user_create.model_dump())
+    credentials = {"email": sample_user_create.email, "password": sample_user_create.password}
+    phone = client.post("/auth/token", json={**credentials, "device_id": "phone"}).json()
+    laptop = client.post("/auth/token", json={**credentials, "device_id": "laptop"}).json()
+
+    response = client.post("/auth/revoke", json={"refresh_token": phone["refresh_token"]})
+    assert response.status_code == 204
+
+    phone_refresh = client.post("/auth/refresh", json={"refresh_token": phone["refresh_token"]})
+    assert phone_refresh.status_code == 401
+    laptop_refresh = client.post("/auth/refresh", json={"refresh_token": laptop["refresh_token"]})
+    assert laptop_refresh.status_code == 200
+
+
+def test_refresh_invalid_token(client):
+    """測試無效的 refresh token."""
+    for token in ["garbage", "01UNKNOWN.secret", ""]:
+        response = client.post("/auth/refresh", json={"refresh_token": token})
+        assert response.status_code == 401
+
+
+def test_login_rate_limited_per_email(client, sample_user_create):
+    """測試同一 email 超過登入次數後回傳 429."""
+    from auth.app.repositories import InMemoryRateLimitRepository
+    from auth.app.services.ratelimit import BucketPolicy, RateLimiter
+
+    client.post("/auth/register", json=sample_user_create.model_dump())
+    app.state.rate_limiter = RateLimiter(
+        InMemoryRateLimitRepository(),
+        email_policy=BucketPolicy(capacity=2, refill_per_minute=1),
+        ip_policy=BucketPolicy(capacity=100, refill_per_minute=100),
+    )
+
+    credentials = {"email": sample_user_create.email, "password": "wrong_password"}
+    assert client.post("/auth/token", json=credentials).status_code == 401
+    assert client.post("/auth/token", json=credentials).status_code == 401
+
+    response = client.post("/auth/token", json=credentials)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    # 其他 email 不受影響
+    other = {"email": "other@example.com", "password": "wrong_password"}
+    assert client.post("/auth/token", json=other).status_code == 401
+
+
+def test_login_verify_concurrency_cap(client, sample_user_create):
+    """測試密碼驗證併發已滿時立即回傳 429."""
+    from auth.app.services.ratelimit import ConcurrencyLimiter
+
+    client.post("/auth/register", json=sample_user_create.model_dump())
+    original_limiter = getattr(app.state, "verify_limiter", None)
+    app.state.verify_limiter = ConcurrencyLimiter(limit=0)
+    try:
+        response = client.post(
+            "/auth/token",
+            json={"email": sample_user_create.email, "password": sample_user_create.password},
+        )
+    finally:
+        app.state.verify_limiter = original_limiter
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+async def test_failed_register_does_not_spend_limited_invite_code(client, monkeypatch):
+    """Email 重複的註冊不會用掉限定使用次數的邀請碼."""
+    from auth.app.repositories import InMemoryInviteCodeRepository
+    from auth.app.services.invite import InviteCodeService
+    from auth.app.services.secrets import SecretService
+
+    code_repo = InMemoryInviteCodeRepository()
+    await code_repo.create("ONCE", max_uses=2)
+    monkeypatch.setattr(
+        app.state,
+        "invite_service",
+        InviteCodeService(SecretService("local-dev"), code_repo=code_repo),
+        raising=False,
+    )
+
+    def register(email: str) -> int:
+        payload = {
+            "display_name": "User",
+            "email": email,
+            "password": "test_password_123",
+            "invite_code": "once",
+        }
+        return client.post("/auth/register", json=payload).status_code
+
+    assert register("first@example.com") == 201
+    assert register("first@example.com") == 409
+    assert await code_repo.remaining_uses("ONCE") == 1
+    assert register("second@example.com") == 201
+    assert register("third@example.com") == 400
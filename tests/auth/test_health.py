@@ -1,8 +1,13 @@
 """Auth health endpoint tests."""
 
+from collections.abc import Generator
+
 import pytest
 from fastapi.testclient import TestClient
 
+from auth.app.config import Settings, get_settings
+from auth.app.main import app as auth_app
+
 
 @pytest.mark.unit
 def test_health_check(auth_client: TestClient) -> None:
@@ -28,3 +33,34 @@ def test_root(auth_client: TestClient) -> None:
     data = response.json()
     assert data["message"] == "Baby Weight Recorder Auth Service"
     assert "version" in data
+
+
+@pytest.fixture
+def metrics_headers() -> Generator[dict[str, str], None, None]:
+    """設定 METRICS_TOKEN 並回傳對應的 headers."""
+    auth_app.dependency_overrides[get_settings] = lambda: Settings(metrics_token="metrics-secret")
+    yield {"Authorization": "Bearer metrics-secret"}
+    auth_app.dependency_overrides.clear()
+
+
+@pytest.mark.unit
+def test_metrics_requires_token(auth_client: TestClient, metrics_headers: dict[str, str]) -> None:
+    """/metrics 需要 METRICS_TOKEN；未設定時不提供。"""
+    assert auth_client.get("/metrics").status_code == 401
+    response = auth_client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+
+    auth_app.dependency_overrides.clear()
+    assert auth_client.get("/metrics", headers=metrics_headers).status_code == 404
+
+
+@pytest.mark.unit
+def test_metrics(auth_client: TestClient, metrics_headers: dict[str, str]) -> None:
+    """測試執行期統計端點。"""
+    response = auth_client.get("/metrics", headers=metrics_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert {"loaded", "max_age_seconds"} <= data["secrets"].keys()
+    assert {"in_flight", "queued", "rejected", "queue_ms_avg", "exec_ms_avg"} <= data[
+        "password_hasher"
+    ].keys()
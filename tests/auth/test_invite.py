@@ -0,0 +1,99 @@
+"""邀請碼服務測試."""
+
+from auth.app.repositories import InMemoryInviteCodeRepository
+from auth.app.services.invite import InviteCodeService
+from auth.app.services.secrets import SecretService
+
+
+class StubSecretService(SecretService):
+    """回傳可變更邀請碼的 SecretService."""
+
+    def __init__(self, codes: list[str]) -> None:
+        super().__init__("test-project")
+        self.codes = codes
+        self.fail = False
+        self.calls = 0
+
+    def get_invite_codes(self) -> list[str]:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("Secret Manager unavailable")
+        return self.codes
+
+
+def test_validate_is_case_insensitive():
+    """邀請碼比較不區分大小寫並忽略空白."""
+    service = InviteCodeService(StubSecretService(["Alpha", " beta "]))
+
+    assert service.validate("ALPHA")
+    assert service.validate(" beta")
+    assert not service.validate("gamma")
+
+
+def test_codes_loaded_once():
+    """邀請碼只在第一次使用時載入."""
+    secrets = StubSecretService(["ALPHA"])
+    service = InviteCodeService(secrets)
+
+    for _ in range(5):
+        service.validate("ALPHA")
+
+    assert secrets.calls == 1
+
+
+def test_reload_picks_up_new_codes_and_keeps_old_on_failure():
+    """重新載入後使用新的邀請碼，失敗時保留原本的."""
+    secrets = StubSecretService(["ALPHA"])
+    service = InviteCodeService(secrets)
+    assert service.validate("ALPHA")
+
+    secrets.codes = ["BETA"]
+    assert service.reload() == 1
+    assert service.validate("BETA")
+    assert not service.validate("ALPHA")
+
+    secrets.fail = True
+    service.reload()
+    assert service.validate("BETA")
+
+
+async def test_limited_use_code_redeems_max_uses_times():
+    """限定使用次數的邀請碼只能兌換指定次數."""
+    repo = InMemoryInviteCodeRepository()
+    await repo.create("SINGLE", max_uses=2)
+    service = InviteCodeService(StubSecretService(["ALPHA"]), code_repo=repo)
+
+    assert await service.redeem("Single")
+    assert await service.redeem("SINGLE")
+    assert not await service.redeem("single")
+    assert await repo.remaining_uses("SINGLE") == 0
+
+    # 可重複使用的邀請碼不受影響
+    assert await service.redeem("alpha")
+    assert await service.redeem("alpha")
+
+
+async def test_redeem_without_store():
+    """未啟用邀請碼儲存時只接受可重複使用的邀請碼."""
+    service = InviteCodeService(StubSecretService(["ALPHA"]))
+
+    assert await service.redeem("alpha")
+    assert not await service.redeem("unknown")
+    assert not await service.redeem("   ")
+
+
+async def test_check_does_not_spend_and_release_gives_use_back():
+    """check 不扣除使用次數；release 歸還一次（不超過 max_uses）."""
+    repo = InMemoryInviteCodeRepository()
+    await repo.create("SINGLE", max_uses=1)
+    service = InviteCodeService(StubSecretService(["ALPHA"]), code_repo=repo)
+
+    assert await service.check("single")
+    assert await service.check("single")
+    assert await service.redeem("single")
+    assert not await service.check("single")
+
+    await service.release("single")
+    await service.release("single")
+    assert await repo.remaining_uses("SINGLE") == 1
+    await service.release("alpha")  # 可重複使用的邀請碼不需歸還
@@ -70,8 +70,8 @@ def test_jwks_has_kid(client):
     assert isinstance(key["kid"], str)
     assert len(key["kid"]) > 0
 
-    # 注意：在本地開發模式下，每次可能生成新的臨時私鑰，
-    # 所以 kid 可能不同，這是正常的
+    # 金鑰在 app 生命週期內只載入一次，kid 不會改變
+    assert client.get("/.well-known/jwks.json").json()["keys"][0]["kid"] == key["kid"]
 
 
 def test_jwks_contains_valid_rsa_key(client):
@@ -102,3 +102,21 @@ def test_jwks_contains_valid_rsa_key(client):
         assert len(e_bytes) > 0
     except Exception as e:
         pytest.fail(f"Invalid base64url encoding in JWKS: {e}")
+
+
+def test_jwks_conditional_request(client):
+    """測試 JWKS 的 ETag、Cache-Control 與 304."""
+    response = client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith('"')
+    assert "max-age=" in response.headers["Cache-Control"]
+
+    not_modified = client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    modified = client.get("/.well-known/jwks.json", headers={"If-None-Match": '"stale"'})
+    assert modified.status_code == 200
+    assert modified.json() == response.json()
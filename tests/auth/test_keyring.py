@@ -0,0 +1,73 @@
+"""JWT 金鑰環測試."""
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from auth.app.config import Settings
+from auth.app.services.jwt import JWTService
+from auth.app.services.keyring import KeyRing, calculate_kid
+from auth.app.services.secrets import SecretService
+
+
+def _new_key() -> rsa.RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _verify(token: str, key_ring: KeyRing) -> dict:
+    """以 JWKS 中對應 kid 的公鑰驗證."""
+    kid = jwt.get_unverified_header(token)["kid"]
+    key_data = next(k for k in key_ring.jwks()["keys"] if k["kid"] == kid)
+    return jwt.decode(
+        token,
+        jwk.construct(key_data, "RS256"),
+        algorithms=["RS256"],
+        audience=Settings().jwt_audience,
+    )
+
+
+def test_load_uses_one_key_for_app_lifetime():
+    """本地模式的臨時私鑰只產生一次，連續簽發的 token 使用同一把金鑰."""
+    settings = Settings()
+    key_ring = KeyRing.load(settings, SecretService("local-dev"))
+    jwt_service = JWTService(settings, key_ring)
+
+    first = jwt_service.create_token(subject="user-1")
+    second = jwt_service.create_token(subject="user-2")
+
+    assert jwt.get_unverified_header(first)["kid"] == jwt.get_unverified_header(second)["kid"]
+    assert _verify(first, key_ring)["sub"] == "user-1"
+
+
+def test_rotate_keeps_previous_key_published():
+    """輪替後舊金鑰仍在 JWKS 中，輪替前簽發的 token 可繼續驗證."""
+    key_ring = KeyRing(_new_key())
+    jwt_service = JWTService(Settings(), key_ring)
+    old_token = jwt_service.create_token(subject="user-1")
+    old_kid = key_ring.signing_key.kid
+
+    new_kid = key_ring.rotate(_new_key())
+    new_token = jwt_service.create_token(subject="user-1")
+
+    assert [k["kid"] for k in key_ring.jwks()["keys"]] == [new_kid, old_kid]
+    assert _verify(old_token, key_ring)["sub"] == "user-1"
+    assert jwt.get_unverified_header(new_token)["kid"] == new_kid
+
+    assert key_ring.retire(old_kid) is True
+    assert [k["kid"] for k in key_ring.jwks()["keys"]] == [new_kid]
+
+
+def test_publish_public_key():
+    """可額外發布只用於驗證的公鑰."""
+    key_ring = KeyRing(_new_key())
+    next_public_key = _new_key().public_key()
+    public_pem = next_public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    kid = key_ring.publish(public_pem)
+
+    assert kid == calculate_kid(next_public_key)
+    assert key_ring.jwks()["keys"][0]["kid"] == key_ring.signing_key.kid
+    assert key_ring.jwks()["keys"][1]["kid"] == kid
@@ -1,6 +1,13 @@
 """密碼雜湊服務測試."""
 
-from auth.app.services.password import hash_password, verify_password
+import asyncio
+
+from auth.app.services.password import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    hash_password,
+    verify_password,
+)
 
 
 def test_hash_password():
@@ -45,3 +52,33 @@ def test_hash_same_password_different_hash():
     # 但驗證都應該成功
     assert verify_password(password, hashed1) is True
     assert verify_password(password, hashed2) is True
+
+
+async def test_password_hasher_hash_and_verify():
+    """測試在執行緒池中雜湊與驗證."""
+    hasher = PasswordHasher(max_workers=1)
+    try:
+        hashed = await hasher.hash("test_password_123")
+
+        assert await hasher.verify("test_password_123", hashed) is True
+        assert await hasher.verify("wrong_password", hashed) is False
+        stats = hasher.stats()
+        assert stats["completed"] == 3
+        assert stats["exec_ms_avg"] > 0
+    finally:
+        hasher.shutdown()
+
+
+async def test_password_hasher_rejects_when_queue_full():
+    """測試等待中的工作達上限時拒絕."""
+    hasher = PasswordHasher(max_workers=1, max_queue_depth=0)
+    try:
+        results = await asyncio.gather(
+            hasher.hash("password1"), hasher.hash("password2"), return_exceptions=True
+        )
+
+        assert isinstance(results[0], str)
+        assert isinstance(results[1], PasswordHasherBusyError)
+        assert hasher.stats()["rejected"] == 1
+    finally:
+        hasher.shutdown()
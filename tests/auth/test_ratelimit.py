@@ -0,0 +1,89 @@
+"""速率限制測試."""
+
+import pytest
+
+from auth.app.repositories import InMemoryRateLimitRepository, take_from_bucket
+from auth.app.services.ratelimit import (
+    BucketPolicy,
+    ConcurrencyLimiter,
+    RateLimiter,
+    RateLimitExceededError,
+)
+
+
+def test_take_from_bucket_refill():
+    """Token 依經過時間補充，且不超過容量."""
+    assert take_from_bucket(0.0, 10.0, capacity=5, refill_per_second=1) == (4.0, 0.0)
+    assert take_from_bucket(0.0, 100.0, capacity=5, refill_per_second=1) == (4.0, 0.0)
+
+    tokens, wait = take_from_bucket(0.5, 0.0, capacity=5, refill_per_second=0.5)
+    assert tokens == 0.5
+    assert wait == pytest.approx(1.0)
+
+
+async def test_bucket_exhausts_and_reports_wait():
+    """Bucket 用完後回傳等待秒數."""
+    repo = InMemoryRateLimitRepository()
+
+    for _ in range(3):
+        assert await repo.consume("k", capacity=3, refill_per_second=0.1) == 0
+    assert await repo.consume("k", capacity=3, refill_per_second=0.1) > 0
+    assert await repo.consume("other", capacity=3, refill_per_second=0.1) == 0
+
+
+async def test_in_memory_buckets_are_bounded():
+    """超過上限時淘汰最久未使用的 bucket."""
+    repo = InMemoryRateLimitRepository(maxsize=2)
+    for key in ["a", "b", "c"]:
+        await repo.consume(key, capacity=1, refill_per_second=0.01)
+
+    # a 已被淘汰，視為補滿
+    assert await repo.consume("a", capacity=1, refill_per_second=0.01) == 0
+    assert await repo.consume("c", capacity=1, refill_per_second=0.01) > 0
+
+
+async def test_rate_limiter_email_independent_of_ip():
+    """同一 email 從不同 IP 嘗試也會被限制."""
+    limiter = RateLimiter(
+        InMemoryRateLimitRepository(),
+        email_policy=BucketPolicy(capacity=2, refill_per_minute=1),
+        ip_policy=BucketPolicy(capacity=100, refill_per_minute=100),
+    )
+
+    await limiter.check("login", "User@Example.com", "10.0.0.1")
+    await limiter.check("login", "user@example.com", "10.0.0.2")
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await limiter.check("login", "user@example.com", "10.0.0.3")
+
+    assert exc_info.value.scope == "email"
+    assert int(exc_info.value.retry_after_header) >= 1
+    # 註冊使用不同的 bucket
+    await limiter.check("register", "user@example.com", "10.0.0.3")
+    assert limiter.stats()["limited"] == {"login:email": 1}
+
+
+async def test_rate_limiter_disabled():
+    """停用時不限制."""
+    limiter = RateLimiter(
+        InMemoryRateLimitRepository(),
+        email_policy=BucketPolicy(capacity=0, refill_per_minute=0),
+        ip_policy=BucketPolicy(capacity=0, refill_per_minute=0),
+        enabled=False,
+    )
+
+    await limiter.check("login", "user@example.com", "10.0.0.1")
+
+
+async def test_concurrency_limiter_fails_fast():
+    """併發已滿時立即拒絕，釋放後可再取得."""
+    limiter = ConcurrencyLimiter(limit=1)
+
+    async with limiter.acquire():
+        with pytest.raises(RateLimitExceededError):
+            async with limiter.acquire():
+                pass
+        assert limiter.stats()["in_flight"] == 1
+
+    async with limiter.acquire():
+        pass
+    assert limiter.stats() == {"limit": 1, "in_flight": 0, "rejected": 1}
@@ -94,3 +94,34 @@ async def test_get_nonexistent_user(user_repo):
     assert await user_repo.get_by_id("nonexistent") is None
     assert await user_repo.get_by_email("nonexistent@example.com") is None
     assert await user_repo.get_by_internal_id("nonexistent") is None
+
+
+@pytest.mark.asyncio
+async def test_rotate_refresh_token_only_once(user_repo):
+    """測試同一個 refresh token 只能輪替一次."""
+    from datetime import UTC, datetime, timedelta
+
+    from auth.app.models import RefreshToken
+
+    now = datetime.now(UTC)
+
+    def make(token_id: str) -> RefreshToken:
+        return RefreshToken(
+            token_id=token_id,
+            internal_user_id="user-1",
+            device_id="device-1",
+            token_hash="hash",
+            created_at=now,
+            expires_at=now + timedelta(days=1),
+        )
+
+    await user_repo.create_refresh_token(make("t1"))
+
+    assert await user_repo.rotate_refresh_token("t1", make("t2"))
+    assert not await user_repo.rotate_refresh_token("t1", make("t3"))
+    assert await user_repo.get_refresh_token("t3") is None
+
+    old = await user_repo.get_refresh_token("t1")
+    assert old is not None
+    assert old.replaced_by == "t2"
+    assert await user_repo.revoke_refresh_tokens("user-1", "device-1") == 1
@@ -0,0 +1,95 @@
+"""Secret 快取測試."""
+
+import asyncio
+
+import pytest
+
+from auth.app.services.secrets import (
+    LocalSecretBackend,
+    SecretBackend,
+    SecretService,
+    SecretStore,
+)
+
+
+class FlakyBackend(SecretBackend):
+    """可切換成失敗的 secret 來源."""
+
+    def __init__(self) -> None:
+        self.value = "v1"
+        self.fail = False
+        self.calls = 0
+
+    def fetch(self, secret_id: str, version: str = "latest") -> str:  # noqa: ARG002
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("Secret Manager unavailable")
+        return self.value
+
+
+def test_local_backend_sources(tmp_path, monkeypatch):
+    """測試本地來源依序查詢固定值、環境變數、檔案."""
+    (tmp_path / "from-file").write_text("file-value\n")
+    monkeypatch.setenv("SECRET_FROM_ENV", "env-value")
+    backend = LocalSecretBackend({"fixed": "fixed-value"}, directory=str(tmp_path))
+
+    assert backend.fetch("fixed") == "fixed-value"
+    assert backend.fetch("from-env") == "env-value"
+    assert backend.fetch("from-file") == "file-value"
+    with pytest.raises(KeyError):
+        backend.fetch("missing")
+
+
+async def test_store_serves_prefetched_values():
+    """測試預先載入後只讀取快取."""
+    backend = FlakyBackend()
+    store = SecretStore(backend)
+    await store.start(["jwt-key"])
+    try:
+        assert store.get("jwt-key") == "v1"
+        assert store.get("jwt-key") == "v1"
+        assert backend.calls == 1
+    finally:
+        await store.stop()
+
+
+async def test_store_miss_loads_in_background():
+    """測試未載入的 secret 不等待，改由背景載入."""
+    backend = FlakyBackend()
+    store = SecretStore(backend)
+
+    with pytest.raises(LookupError):
+        store.get("invite-codes")
+    await asyncio.sleep(0.05)
+
+    assert store.get("invite-codes") == "v1"
+
+
+async def test_store_keeps_value_when_refresh_fails():
+    """測試重新載入失敗時保留原本的值."""
+    backend = FlakyBackend()
+    store = SecretStore(backend, ttl_seconds=0, refresh_interval_seconds=0.01)
+    await store.start(["jwt-key"])
+    try:
+        backend.fail = True
+        await asyncio.sleep(0.05)
+        assert store.get("jwt-key") == "v1"
+        assert store.stats()["refresh_failures"] > 0
+
+        backend.fail = False
+        backend.value = "v2"
+        await asyncio.sleep(0.05)
+        assert store.get("jwt-key") == "v2"
+    finally:
+        await store.stop()
+
+
+async def test_secret_service_reads_from_store():
+    """測試 SecretService 透過 SecretStore 讀取."""
+    store = SecretStore(LocalSecretBackend({"invite-codes-dev": '["CODE1", "CODE2"]'}))
+    await store.start(["invite-codes-dev"])
+    try:
+        service = SecretService("my-project", store=store)
+        assert service.get_invite_codes() == ["CODE1", "CODE2"]
+    finally:
+        await store.stop()
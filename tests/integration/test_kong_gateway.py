@@ -40,22 +40,21 @@ def api_client(monkeypatch):
 def auth_client(monkeypatch):
     """建立 Auth 測試客戶端."""
     from auth.app.config import get_settings as get_auth_settings
-    from auth.app.dependencies import get_jwt_service
+    from auth.app.dependencies import get_key_ring
     from auth.app.repositories.memory import InMemoryUserRepository
-    from auth.app.services.jwt import JWTService
+    from auth.app.services.keyring import KeyRing
     from auth.app.services.secrets import SecretService
 
     user_repo = InMemoryUserRepository()
     auth_app.state.user_repo = user_repo
 
-    # 創建共享的 JWTService 實例
+    # 創建共享的 KeyRing（簽發 token 與 JWKS 端點使用同一把金鑰）
     auth_settings = get_auth_settings()
     auth_secret_service = SecretService("local-dev")
-    shared_jwt_service = JWTService(auth_settings, auth_secret_service)
-    _ = shared_jwt_service.get_jwks()
+    shared_key_ring = KeyRing.load(auth_settings, auth_secret_service)
 
     # 使用 FastAPI 的 dependency_overrides
-    auth_app.dependency_overrides[get_jwt_service] = lambda: shared_jwt_service
+    auth_app.dependency_overrides[get_key_ring] = lambda: shared_key_ring
 
     with TestClient(auth_app) as client:
         yield client
@@ -162,15 +161,8 @@ async def test_kong_api_service_routes(api_client, auth_client, sample_user, mon
     jwks_response = auth_client.get("/.well-known/jwks.json")
     jwks_data = jwks_response.json()
 
-    # Mock API Service 的 JWKS 請求
-    from api.app.services.jwt import JWTVerificationService
-
-    async def mock_fetch_jwks(self):
-        if self._jwks_cache is None:
-            self._jwks_cache = jwks_data
-        return self._jwks_cache
-
-    monkeypatch.setattr(JWTVerificationService, "_fetch_jwks", mock_fetch_jwks)
+    # 將 Auth Service 的 JWKS 直接載入 API Service 的公鑰快取（測試環境無法連線 JWKS URL）
+    api_app.state.jwks_keys.load_jwks(jwks_data)
 
     # 4. 測試 API Service 的健康檢查端點（模擬通過 Kong 的路由 /health）
     health_response = api_client.get("/health")
@@ -243,15 +235,8 @@ async def test_kong_full_flow(auth_client, api_client, sample_user, monkeypatch)
     jwks_response = auth_client.get("/.well-known/jwks.json")
     jwks_data = jwks_response.json()
 
-    # Mock API Service 的 JWKS 請求
-    from api.app.services.jwt import JWTVerificationService
-
-    async def mock_fetch_jwks(self):
-        if self._jwks_cache is None:
-            self._jwks_cache = jwks_data
-        return self._jwks_cache
-
-    monkeypatch.setattr(JWTVerificationService, "_fetch_jwks", mock_fetch_jwks)
+    # 將 Auth Service 的 JWKS 直接載入 API Service 的公鑰快取（測試環境無法連線 JWKS URL）
+    api_app.state.jwks_keys.load_jwks(jwks_data)
 
     # 4. 通過 Kong 使用 JWT 呼叫 API（/v1/babies）
     headers = {"Authorization": f"Bearer {token}"}